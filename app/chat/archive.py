@@ -0,0 +1,236 @@
+"""
+Cold message archival with read-through for message history.
+
+Long-lived conversations keep years of messages that are rarely read. With
+CHAT_ARCHIVE_AFTER_DAYS set, the archive_cold_messages Celery task moves
+messages older than that into chat_message_archive, so chat_message, its
+GIN and b-tree indexes and its recent partitions only hold the hot window.
+
+Read-through:
+    - Conversation.archived_until records the newest archived message
+    - MessageViewSet.list reads chat_message directly while the requested
+      page starts after archived_until, and the chat_message_timeline view
+      (hot UNION ALL archive) once the cursor walks past the hot window
+    - MessageService.get_edit_history falls back to the edit history
+      embedded in the archived row
+    - SyncService.get_changes returns archived messages from the archive
+
+Archived messages are read-only: they cannot be edited, deleted, reacted to
+or found by search, and no longer count towards rebuilt unread counts.
+Users can still remove their own reactions (ReactionService updates the
+archived reaction_counts), and reply counts buffered by CoalescedUpdates
+before a root was archived are applied to the archived row.
+Emptied message partitions can be detached (see chat/partitions.py).
+
+Design Decisions:
+    - One statement per batch moves rows, embeds and deletes edit history
+      and advances archived_until, so a batch is all-or-nothing
+    - Reaction rows are kept (their message foreign key has no database
+      constraint), so who reacted survives and reactions stay removable
+    - Roots with a reply newer than the cutoff stay hot until the replies
+      age out, so hot replies never point at an archived parent. Older
+      replies follow their root in the same or a later batch
+    - Change log rows are left to SyncService.prune (by age): sync cursor
+      expiry depends on the cursor's change row surviving, so deleting rows
+      by message would expire cursors that nothing was pruned after
+    - Batches lock rows with SKIP LOCKED, so concurrent runs do not block
+      each other or message writers
+    - Serialized history pages stay valid: archived messages serialize
+      exactly like hot ones
+
+Usage:
+    from chat.archive import MessageArchive
+
+    if MessageArchive.is_enabled():
+        MessageArchive.archive()
+
+    queryset = MessageArchive.timeline(conversation)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.services import BaseService, ServiceResult
+
+from chat.constants import MESSAGE_ARCHIVE_CONFIG
+from chat.models import (
+    ArchivedMessage,
+    Conversation,
+    MessageEditHistory,
+    MessageTimeline,
+)
+
+
+class MessageArchive(BaseService):
+    """
+    Archival job and read-through helpers for cold messages.
+
+    All methods are classmethods.
+    """
+
+    # Move one batch of the oldest messages past the cutoff into the archive
+    ARCHIVE_BATCH_SQL = """
+    WITH batch AS (
+        SELECT id, created_at
+        FROM chat_message AS m
+        WHERE m.created_at < %(cutoff)s
+          AND NOT EXISTS (
+              SELECT 1
+              FROM chat_message AS r
+              WHERE r.parent_message_id = m.id
+                AND r.created_at >= %(cutoff)s
+          )
+        ORDER BY created_at, id
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    ),
+    moved AS (
+        DELETE FROM chat_message AS m
+        USING batch AS b
+        WHERE m.id = b.id AND m.created_at = b.created_at
+        RETURNING m.*
+    ),
+    archived AS (
+        INSERT INTO chat_message_archive (
+            id, conversation_id, sender_id, message_type, content,
+            parent_message_id, reply_count, edited_at, edit_count,
+            original_content, reaction_counts, edit_history, is_deleted,
+            deleted_at, created_at, updated_at, archived_at
+        )
+        SELECT
+            m.id, m.conversation_id, m.sender_id, m.message_type, m.content,
+            m.parent_message_id, m.reply_count, m.edited_at, m.edit_count,
+            m.original_content, COALESCE(m.reaction_counts, '{}'::jsonb),
+            COALESCE(
+                (
+                    SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'id', h.id,
+                            'edit_number', h.edit_number,
+                            'content', h.content,
+                            'created_at', h.created_at
+                        )
+                        ORDER BY h.created_at DESC
+                    )
+                    FROM chat_message_edit_history AS h
+                    WHERE h.message_id = m.id
+                ),
+                '[]'::jsonb
+            ),
+            m.is_deleted, m.deleted_at, m.created_at, m.updated_at, NOW()
+        FROM moved AS m
+        RETURNING id, conversation_id, created_at
+    ),
+    edits AS (
+        DELETE FROM chat_message_edit_history
+        WHERE message_id IN (SELECT id FROM archived)
+    ),
+    watermarks AS (
+        UPDATE chat_conversation AS c
+        SET archived_until = GREATEST(c.archived_until, a.newest)
+        FROM (
+            SELECT conversation_id, MAX(created_at) AS newest
+            FROM archived
+            GROUP BY conversation_id
+        ) AS a
+        WHERE c.id = a.conversation_id
+    )
+    SELECT COUNT(*) FROM archived
+    """
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Check whether this deployment archives cold messages."""
+        return getattr(settings, "CHAT_ARCHIVE_AFTER_DAYS", 0) > 0
+
+    @classmethod
+    def archive(
+        cls,
+        cutoff: datetime | None = None,
+        batch_size: int = MESSAGE_ARCHIVE_CONFIG.BATCH_SIZE,
+        max_batches: int = MESSAGE_ARCHIVE_CONFIG.MAX_BATCHES_PER_RUN,
+    ) -> ServiceResult[int]:
+        """
+        Move messages created before cutoff into the archive.
+
+        Args:
+            cutoff: Archive messages older than this (defaults to now minus
+                CHAT_ARCHIVE_AFTER_DAYS)
+            batch_size: Messages per transaction
+            max_batches: Stop after this many batches (the next run continues)
+
+        Returns:
+            ServiceResult with number of messages archived
+
+        Error codes:
+            ARCHIVE_DISABLED: No cutoff given and CHAT_ARCHIVE_AFTER_DAYS is 0
+        """
+        if cutoff is None:
+            if not cls.is_enabled():
+                return ServiceResult.failure(
+                    "Message archival is disabled",
+                    error_code="ARCHIVE_DISABLED",
+                )
+            cutoff = timezone.now() - timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS)
+
+        total = 0
+        for _ in range(max_batches):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    cls.ARCHIVE_BATCH_SQL, {"cutoff": cutoff, "limit": batch_size}
+                )
+                archived = cursor.fetchone()[0]
+            total += archived
+            if archived < batch_size:
+                break
+
+        if total:
+            cls.get_logger().info(f"Archived {total} messages older than {cutoff}")
+
+        return ServiceResult.success(total)
+
+    @staticmethod
+    def timeline(conversation: Conversation) -> QuerySet[MessageTimeline]:
+        """
+        Get hot and archived messages of a conversation, oldest first.
+
+        Args:
+            conversation: Conversation to read
+
+        Returns:
+            MessageTimeline queryset with sender profiles selected
+        """
+        return (
+            MessageTimeline.objects.filter(conversation=conversation)
+            .select_related("sender__profile")
+            .order_by("created_at", "id")
+        )
+
+    @staticmethod
+    def edit_history(message: ArchivedMessage) -> list[MessageEditHistory]:
+        """
+        Rebuild the edit history embedded in an archived message.
+
+        Args:
+            message: Archived message
+
+        Returns:
+            Unsaved MessageEditHistory entries, newest first
+        """
+        return [
+            MessageEditHistory(
+                id=entry["id"],
+                message_id=message.id,
+                edit_number=entry["edit_number"],
+                content=entry["content"],
+                created_at=parse_datetime(entry["created_at"]),
+            )
+            for entry in message.edit_history
+        ]
@@ -0,0 +1,117 @@
+"""
+Async Redis access for the ASGI path.
+
+django-redis clients are synchronous, so every cache lookup from a consumer
+costs a thread hop. This module gives coroutines a redis.asyncio client on
+the same Redis database as the default cache, plus get/set/add helpers that
+use the cache's key and value encoding, so entries written by sync code
+(e.g. MembershipCache) are readable here and vice versa.
+
+Design Decisions:
+    - One client per event loop (redis.asyncio connections are bound to the
+      loop that opened them); production ASGI workers run a single loop
+    - Redis errors are logged and reported as cache misses, matching the
+      default cache's IGNORE_EXCEPTIONS behaviour
+
+Usage:
+    from chat import async_redis
+
+    members = await async_redis.cache_get("chat:members:42")
+    await async_redis.cache_set("chat:members:42", members, timeout=300)
+    await async_redis.cache_add("chat:members:42:version", 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# (event loop, client) of the most recent get_client call
+_client: tuple[asyncio.AbstractEventLoop, Redis] | None = None
+
+
+def get_client() -> Redis:
+    """
+    Get the async Redis client for the running event loop.
+
+    Returns:
+        redis.asyncio client for the default cache's Redis database
+    """
+    global _client
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client[0] is not loop:
+        _client = (loop, Redis.from_url(settings.CACHES["default"]["LOCATION"]))
+    return _client[1]
+
+
+async def cache_get(key: str, default: Any = None) -> Any:
+    """
+    Read a value stored through the default cache.
+
+    Args:
+        key: Cache key (without prefix or version)
+        default: Returned on a miss or Redis error
+
+    Returns:
+        Decoded cached value, or default
+    """
+    try:
+        raw = await get_client().get(cache.client.make_key(key))
+    except RedisError as e:
+        logger.warning(f"Async cache get failed for {key}: {e}")
+        return default
+    if raw is None:
+        return default
+    return cache.client.decode(raw)
+
+
+async def cache_set(key: str, value: Any, timeout: int) -> None:
+    """
+    Store a value readable through the default cache.
+
+    Args:
+        key: Cache key (without prefix or version)
+        value: Value to store
+        timeout: Expiry in seconds
+    """
+    try:
+        await get_client().set(
+            cache.client.make_key(key), cache.client.encode(value), ex=timeout
+        )
+    except RedisError as e:
+        logger.warning(f"Async cache set failed for {key}: {e}")
+
+
+async def cache_add(key: str, value: Any, timeout: int | None = None) -> bool:
+    """
+    Store a value readable through the default cache, unless the key exists.
+
+    Args:
+        key: Cache key (without prefix or version)
+        value: Value to store
+        timeout: Expiry in seconds, or None to never expire
+
+    Returns:
+        True if the value was stored
+    """
+    try:
+        return bool(
+            await get_client().set(
+                cache.client.make_key(key),
+                cache.client.encode(value),
+                ex=timeout,
+                nx=True,
+            )
+        )
+    except RedisError as e:
+        logger.warning(f"Async cache add failed for {key}: {e}")
+        return False
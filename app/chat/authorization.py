@@ -55,7 +55,7 @@ class ChatAuthorizationService:
 
     Performance Notes:
         - Methods use optimized queries with select_related where appropriate
-        - Results are not cached; callers should cache if needed
+        - Membership and role lookups are served from MembershipCache
         - Bulk operations (get_user_conversation_ids) return lists for efficiency
     """
 
@@ -78,13 +78,9 @@ class ChatAuthorizationService:
         Returns:
             True if user is active participant, False otherwise
         """
-        from chat.models import Participant
+        from chat.membership import MembershipCache
 
-        return Participant.objects.filter(
-            conversation_id=conversation_id,
-            user=user,
-            left_at__isnull=True,
-        ).exists()
+        return MembershipCache.is_member(conversation_id, user.id)
 
     @classmethod
     def is_message_author(
@@ -163,14 +159,9 @@ class ChatAuthorizationService:
         Returns:
             List of conversation IDs (empty list if no participations)
         """
-        from chat.models import Participant
+        from chat.membership import MembershipCache
 
-        return list(
-            Participant.objects.filter(
-                user=user,
-                left_at__isnull=True,
-            ).values_list("conversation_id", flat=True)
-        )
+        return MembershipCache.get_user_conversation_ids(user.id)
 
     @classmethod
     def get_participant_role(
@@ -190,18 +181,9 @@ class ChatAuthorizationService:
             None for direct conversations (participants have no role)
             None if user is not an active participant
         """
-        from chat.models import Participant
-
-        participant = Participant.objects.filter(
-            conversation_id=conversation_id,
-            user=user,
-            left_at__isnull=True,
-        ).first()
-
-        if participant is None:
-            return None
+        from chat.membership import MembershipCache
 
-        return participant.role
+        return MembershipCache.get_role(conversation_id, user.id)
 
 
 def require_conversation_participant(
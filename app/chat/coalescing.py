@@ -0,0 +1,384 @@
+"""
+Coalesced denormalized updates for busy conversations.
+
+Every send_message normally issues an UPDATE on the conversation row
+(last_message_at) and, for replies, on the parent message (reply_count).
+In busy group chats these serialize on row locks. With
+CHAT_COALESCED_UPDATES_ENABLED, MessageService records them in Redis instead
+and the flush_coalesced_updates Celery task applies them in bulk.
+
+Buffered Data:
+    chat:coalesce:last_message_at: {conversation_id: newest created_at (epoch us)}
+    chat:coalesce:reply_count: {parent_message_id: replies not yet applied}
+
+Staleness:
+    - Flushed every COALESCE_CONFIG.FLUSH_INTERVAL_SECONDS by celery-beat, and
+      early once either hash reaches COALESCE_CONFIG.FLUSH_THRESHOLD entries
+    - Readers (ConversationCursorPagination ordering, reply_count) therefore
+      lag by at most one flush interval plus flush time
+    - last_message_at only ever moves forward, so a stale buffer can never
+      overwrite a newer value written directly (e.g. system messages)
+
+Design Decisions:
+    - Updates are buffered on transaction commit, so rolled-back sends leave
+      no trace
+    - If Redis is unavailable the update is applied directly instead
+    - reply_count increments for a root archived before the flush are
+      applied to its archive row (see chat/archive.py)
+    - A flush renames the live hash to a snapshot key and deletes it only
+      after the database commit; a flush that failed or whose worker died
+      leaves the snapshot for the next flush to apply
+    - The flush lock holds a random token. A flush re-checks and extends it
+      just before committing and rolls back if another flush has taken over
+      (its lock expired), so a snapshot's reply_count increments are
+      applied once
+    - The lock and the snapshot are released by compare-and-delete, so a
+      slow flush never touches a successor's lock or snapshot
+
+Usage:
+    from chat.coalescing import CoalescedUpdates
+
+    if CoalescedUpdates.is_enabled():
+        CoalescedUpdates.record_last_message(conversation.id, message.created_at)
+        CoalescedUpdates.record_reply(parent_message.id)
+
+    # In the Celery task
+    CoalescedUpdates.flush()
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from core.services import BaseService, ServiceResult
+
+from chat.constants import COALESCE_CONFIG
+from chat.history_cache import MessageHistoryCache
+from chat.models import ArchivedMessage, Conversation, Message
+
+# Buffered timestamps are stored as exact integer microseconds since the epoch
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class CoalescedUpdates(BaseService):
+    """
+    Redis buffer for last_message_at and reply_count updates.
+
+    All methods are classmethods; buffers are shared by every process of a
+    deployment.
+    """
+
+    # Keep the newest timestamp per conversation and report buffer size
+    # Keys: [hash_key]
+    # Args: [conversation_id, epoch_microseconds]
+    LUA_SET_MAX = """
+    local current = redis.call('HGET', KEYS[1], ARGV[1])
+    if not current or tonumber(current) < tonumber(ARGV[2]) then
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    end
+    return redis.call('HLEN', KEYS[1])
+    """
+
+    # Increment a pending reply count and report buffer size
+    # Keys: [hash_key]
+    # Args: [message_id]
+    LUA_INCREMENT = """
+    redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+    return redis.call('HLEN', KEYS[1])
+    """
+
+    # Move the live hash to the snapshot key unless a snapshot is pending
+    # Keys: [live_key, snapshot_key]
+    LUA_SNAPSHOT = """
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        return 1
+    end
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        redis.call('RENAME', KEYS[1], KEYS[2])
+        return 1
+    end
+    return 0
+    """
+
+    # Extend the flush lock only if it still holds our token
+    # Keys: [lock_key]
+    # Args: [lock_token, ttl_seconds]
+    LUA_EXTEND = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('EXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    # Delete keys only if the flush lock still holds our token
+    # Keys: [lock_key, key_to_delete]
+    # Args: [lock_token]
+    LUA_RELEASE = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[2])
+    end
+    return 0
+    """
+
+    FLUSH_LOCK_KEY = "chat:coalesce:lock"
+    FLUSH_LOCK_TTL_SECONDS = 60
+
+    # Cached registered Lua scripts (initialized lazily)
+    _lua_set_max = None
+    _lua_increment = None
+    _lua_snapshot = None
+    _lua_extend = None
+    _lua_release = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Check whether this deployment buffers denormalized updates."""
+        return getattr(settings, "CHAT_COALESCED_UPDATES_ENABLED", False)
+
+    @staticmethod
+    def _get_redis_client():
+        """Get raw Redis client from django-redis."""
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    @classmethod
+    def _get_lua_set_max(cls, redis_client):
+        """Get cached Lua script for keeping the newest timestamp."""
+        if cls._lua_set_max is None:
+            cls._lua_set_max = redis_client.register_script(cls.LUA_SET_MAX)
+        return cls._lua_set_max
+
+    @classmethod
+    def _get_lua_increment(cls, redis_client):
+        """Get cached Lua script for incrementing a pending count."""
+        if cls._lua_increment is None:
+            cls._lua_increment = redis_client.register_script(cls.LUA_INCREMENT)
+        return cls._lua_increment
+
+    @classmethod
+    def _get_lua_snapshot(cls, redis_client):
+        """Get cached Lua script for snapshotting a buffer."""
+        if cls._lua_snapshot is None:
+            cls._lua_snapshot = redis_client.register_script(cls.LUA_SNAPSHOT)
+        return cls._lua_snapshot
+
+    @classmethod
+    def _get_lua_extend(cls, redis_client):
+        """Get cached Lua script for extending the flush lock."""
+        if cls._lua_extend is None:
+            cls._lua_extend = redis_client.register_script(cls.LUA_EXTEND)
+        return cls._lua_extend
+
+    @classmethod
+    def _get_lua_release(cls, redis_client):
+        """Get cached Lua script for deleting keys while holding the lock."""
+        if cls._lua_release is None:
+            cls._lua_release = redis_client.register_script(cls.LUA_RELEASE)
+        return cls._lua_release
+
+    @staticmethod
+    def _snapshot_key(key: str) -> str:
+        """Build the snapshot key a flush works from."""
+        return f"{key}:{COALESCE_CONFIG.FLUSHING_SUFFIX}"
+
+    @classmethod
+    def _schedule_flush_if_full(cls, buffer_size: int) -> None:
+        """Trigger an early flush the moment a buffer reaches the threshold."""
+        if buffer_size != COALESCE_CONFIG.FLUSH_THRESHOLD:
+            return
+
+        from chat.tasks import flush_coalesced_updates
+
+        try:
+            flush_coalesced_updates.delay()
+        except Exception as e:
+            # The periodic flush still bounds staleness
+            cls.get_logger().warning(f"Could not schedule early flush: {e}")
+
+    @classmethod
+    def record_last_message(cls, conversation_id: int, created_at: datetime) -> None:
+        """
+        Buffer a last_message_at update for a conversation.
+
+        Args:
+            conversation_id: Conversation that received a message
+            created_at: Timestamp of the new message
+
+        Falls back to a direct UPDATE if Redis is unavailable.
+        """
+        epoch_us = (created_at - EPOCH) // MICROSECOND
+        try:
+            buffer_size = cls._get_lua_set_max(cls._get_redis_client())(
+                keys=[COALESCE_CONFIG.KEY_LAST_MESSAGE_AT],
+                args=[conversation_id, epoch_us],
+            )
+        except RedisError as e:
+            cls.get_logger().warning(f"Buffering last_message_at failed: {e}")
+            cls._apply_last_message_at({conversation_id: epoch_us})
+            return
+
+        cls._schedule_flush_if_full(buffer_size)
+
+    @classmethod
+    def record_reply(cls, parent_message_id: int) -> None:
+        """
+        Buffer a reply_count increment for a root message.
+
+        Args:
+            parent_message_id: Root message that received a reply
+
+        Falls back to a direct UPDATE if Redis is unavailable.
+        """
+        try:
+            buffer_size = cls._get_lua_increment(cls._get_redis_client())(
+                keys=[COALESCE_CONFIG.KEY_REPLY_COUNT],
+                args=[parent_message_id],
+            )
+        except RedisError as e:
+            cls.get_logger().warning(f"Buffering reply_count failed: {e}")
+            cls._apply_reply_counts({parent_message_id: 1})
+            return
+
+        cls._schedule_flush_if_full(buffer_size)
+
+    @classmethod
+    def flush(cls) -> ServiceResult[dict[str, int]]:
+        """
+        Apply buffered updates to the database.
+
+        Returns:
+            ServiceResult with counts of conversations and messages updated
+
+        Error codes:
+            FLUSH_IN_PROGRESS: Another flush holds the lock
+        """
+        redis_client = cls._get_redis_client()
+        token = str(uuid.uuid4())
+        if not redis_client.set(
+            cls.FLUSH_LOCK_KEY, token, nx=True, ex=cls.FLUSH_LOCK_TTL_SECONDS
+        ):
+            return ServiceResult.failure(
+                "Another flush is in progress",
+                error_code="FLUSH_IN_PROGRESS",
+            )
+
+        try:
+            conversations = cls._flush_buffer(
+                redis_client,
+                token,
+                COALESCE_CONFIG.KEY_LAST_MESSAGE_AT,
+                cls._apply_last_message_at,
+            )
+            messages = cls._flush_buffer(
+                redis_client,
+                token,
+                COALESCE_CONFIG.KEY_REPLY_COUNT,
+                cls._apply_reply_counts,
+            )
+        finally:
+            cls._get_lua_release(redis_client)(
+                keys=[cls.FLUSH_LOCK_KEY, cls.FLUSH_LOCK_KEY], args=[token]
+            )
+
+        if conversations or messages:
+            cls.get_logger().debug(
+                f"Flushed coalesced updates for {conversations} conversations "
+                f"and {messages} messages"
+            )
+
+        return ServiceResult.success(
+            {"conversations": conversations, "messages": messages}
+        )
+
+    @classmethod
+    def _flush_buffer(cls, redis_client, token: str, key: str, apply) -> int:
+        """
+        Snapshot one buffer, apply it in a transaction, then drop the snapshot.
+
+        Args:
+            redis_client: Raw Redis client
+            token: Flush lock token held by this flush
+            key: Live buffer key
+            apply: Callable taking {int id: int value} and writing it
+
+        Returns:
+            Number of buffered rows applied
+        """
+        snapshot_key = cls._snapshot_key(key)
+        if not cls._get_lua_snapshot(redis_client)(keys=[key, snapshot_key]):
+            return 0
+
+        values = {
+            int(row_id): int(value)
+            for row_id, value in redis_client.hgetall(snapshot_key).items()
+        }
+        with transaction.atomic():
+            apply(values)
+            if not cls._get_lua_extend(redis_client)(
+                keys=[cls.FLUSH_LOCK_KEY],
+                args=[token, cls.FLUSH_LOCK_TTL_SECONDS],
+            ):
+                # The lock expired and a newer flush owns this snapshot
+                cls.get_logger().warning("Flush lock lost; rolling back snapshot")
+                transaction.set_rollback(True)
+                return 0
+        cls._get_lua_release(redis_client)(
+            keys=[cls.FLUSH_LOCK_KEY, snapshot_key], args=[token]
+        )
+
+        return len(values)
+
+    @staticmethod
+    def _apply_last_message_at(values: dict[int, int]) -> None:
+        """Move last_message_at forward for each buffered conversation."""
+        now = timezone.now()
+        # Lock rows in a consistent order to avoid deadlocks with other flushes
+        for conversation_id in sorted(values):
+            latest = EPOCH + values[conversation_id] * MICROSECOND
+            Conversation.objects.filter(
+                Q(last_message_at__isnull=True) | Q(last_message_at__lt=latest),
+                id=conversation_id,
+            ).update(last_message_at=latest, updated_at=now)
+
+    @staticmethod
+    def _apply_reply_counts(values: dict[int, int]) -> None:
+        """
+        Add buffered reply counts to each root message.
+
+        A root archived after its replies were buffered gets them in the
+        archive instead.
+        """
+        now = timezone.now()
+        archived_ids = []
+        for message_id in sorted(values):
+            updated = Message.objects.filter(id=message_id).update(
+                reply_count=F("reply_count") + values[message_id],
+                updated_at=now,
+            )
+            if not updated:
+                archived_ids.append(message_id)
+        for message_id in archived_ids:
+            ArchivedMessage.objects.filter(id=message_id).update(
+                reply_count=F("reply_count") + values[message_id],
+                updated_at=now,
+            )
+        MessageHistoryCache.bump(
+            Message.objects.filter(id__in=values).values_list(
+                "conversation_id", flat=True
+            )
+        )
+        if archived_ids:
+            MessageHistoryCache.bump(
+                ArchivedMessage.objects.filter(id__in=archived_ids).values_list(
+                    "conversation_id", flat=True
+                )
+            )
@@ -3,8 +3,18 @@ Constants and configuration for chat module features.
 
 This module centralizes configuration values for:
 - Message operations (editing, search, content limits)
+- Message table partitioning (monthly ranges, partitions created ahead)
+- Cold message archival (batch sizes)
 - Attachment handling (via MediaFile infrastructure)
 - Reaction management (emoji restrictions, limits)
+- Presence tracking and membership caching (TTLs, key prefixes)
+- Message history page caching (TTL, key prefixes)
+- Delta sync change log (page size, retention)
+- Write-behind message persistence (stream, batching)
+- Coalesced last_message_at/reply_count updates (flush interval, threshold)
+- Debounced read receipts (flush interval)
+- WebSocket connections (per-user multiplexed socket limits, group names)
+- Typing indicators (throttle window, edges, automatic stop)
 
 These values can be overridden via Django settings if needed.
 Import example:
@@ -13,7 +23,6 @@ Import example:
 
 from typing import Final
 
-
 # =============================================================================
 # Message Configuration
 # =============================================================================
@@ -37,6 +46,53 @@ class MESSAGE_CONFIG:
     SEARCH_MIN_QUERY_LENGTH: Final[int] = 2
     SEARCH_MAX_RESULTS: Final[int] = 100
     SEARCH_DEFAULT_PAGE_SIZE: Final[int] = 20
+    # Rank only the newest N matches (None = rank all); bounds cost for very
+    # common terms at the price of ignoring older matches
+    SEARCH_RANK_CANDIDATE_LIMIT: Final[int | None] = None
+
+
+# =============================================================================
+# Message Partition Configuration
+# =============================================================================
+
+
+class MESSAGE_PARTITION_CONFIG:
+    """
+    Configuration for range partitioning of chat_message by created_at.
+
+    Each calendar month (UTC) is one partition. Rows from before
+    partitioning live in the legacy partition; rows outside every range land
+    in the default partition until their month's partition is created.
+    """
+
+    TABLE: Final[str] = "chat_message"
+    LEGACY_PARTITION: Final[str] = "chat_message_legacy"
+    DEFAULT_PARTITION: Final[str] = "chat_message_default"
+
+    # Monthly partition names, formatted with the month's first day
+    NAME_FORMAT: Final[str] = "chat_message_p%Y_%m"
+
+    # Months created ahead of the current one by create_message_partitions
+    PREMAKE_MONTHS: Final[int] = 3
+
+
+# =============================================================================
+# Message Archive Configuration
+# =============================================================================
+
+
+class MESSAGE_ARCHIVE_CONFIG:
+    """
+    Configuration for moving cold messages to chat_message_archive.
+
+    The age threshold is the CHAT_ARCHIVE_AFTER_DAYS setting (0 disables
+    archival). Each batch is one transaction.
+    """
+
+    BATCH_SIZE: Final[int] = 5000
+
+    # Upper bound on work per archive_cold_messages run
+    MAX_BATCHES_PER_RUN: Final[int] = 100
 
 
 # =============================================================================
@@ -112,3 +168,174 @@ class PRESENCE_CONFIG:
     HEARTBEAT_INTERVAL_SECONDS: Final[int] = (
         30  # How often clients should send heartbeat
     )
+
+    # Max conversations refreshed by one batch heartbeat request
+    MAX_BATCH_HEARTBEAT_CONVERSATIONS: Final[int] = 50
+
+
+# =============================================================================
+# Membership Cache Configuration
+# =============================================================================
+
+
+class MEMBERSHIP_CONFIG:
+    """Configuration for the participant membership cache."""
+
+    # TTL for cached membership (seconds); invalidation handles most changes
+    CACHE_TTL_SECONDS: Final[int] = 300  # 5 minutes
+
+    # Cache key prefixes
+    KEY_PREFIX_CONVERSATION_MEMBERS: Final[str] = "chat:members:conv"
+    KEY_PREFIX_USER_CONVERSATIONS: Final[str] = "chat:members:user"
+
+
+
+# =============================================================================
+# Message History Cache Configuration
+# =============================================================================
+
+
+class HISTORY_CACHE_CONFIG:
+    """Configuration for the serialized message page cache."""
+
+    # TTL for cached pages (seconds); version bumps handle invalidation
+    PAGE_TTL_SECONDS: Final[int] = 300  # 5 minutes
+
+    # Cache key prefixes
+    KEY_PREFIX_VERSION: Final[str] = "chat:history:version"
+    KEY_PREFIX_PAGE: Final[str] = "chat:history:page"
+
+
+# =============================================================================
+# Delta Sync Configuration
+# =============================================================================
+
+
+class SYNC_CONFIG:
+    """
+    Configuration for the message change log behind the delta-sync endpoint.
+
+    Cursors are MessageChange IDs, read in commit-safe (xid, id) order. A
+    cursor only advances past changes of finished transactions; changes
+    committed while an older transaction is still running are returned but
+    may be delivered again on the next sync.
+    """
+
+    # Changes per sync response
+    DEFAULT_LIMIT: Final[int] = 500
+    MAX_LIMIT: Final[int] = 1000
+
+    # Changes older than this are pruned; older cursors must full-reload
+    RETENTION_DAYS: Final[int] = 30
+    PRUNE_BATCH_SIZE: Final[int] = 10000
+
+
+# =============================================================================
+# Write-behind Persistence Configuration
+# =============================================================================
+
+
+class WRITE_BEHIND_CONFIG:
+    """
+    Configuration for write-behind message persistence.
+
+    Enabled per deployment via the CHAT_WRITE_BEHIND_ENABLED setting.
+    """
+
+    # Redis stream holding messages awaiting persistence
+    STREAM_KEY: Final[str] = "chat:writebehind:messages"
+    CONSUMER_GROUP: Final[str] = "chat-writers"
+
+    # Batching
+    BATCH_SIZE: Final[int] = 500  # Messages per bulk insert
+    MAX_BATCHES_PER_FLUSH: Final[int] = 20  # Bound a single flush task run
+
+    # How often celery-beat runs the flush task (seconds)
+    FLUSH_INTERVAL_SECONDS: Final[int] = 2
+
+    # Pending entries idle longer than this are reclaimed from dead writers
+    CLAIM_IDLE_MS: Final[int] = 60_000
+
+
+# =============================================================================
+# Coalesced Update Configuration
+# =============================================================================
+
+
+class COALESCE_CONFIG:
+    """
+    Configuration for buffering last_message_at and reply_count updates.
+
+    Enabled per deployment via the CHAT_COALESCED_UPDATES_ENABLED setting.
+    """
+
+    # Redis hashes: {conversation_id: epoch_us} and {message_id: pending replies}
+    KEY_LAST_MESSAGE_AT: Final[str] = "chat:coalesce:last_message_at"
+    KEY_REPLY_COUNT: Final[str] = "chat:coalesce:reply_count"
+
+    # Suffix of the snapshot key a flush works from
+    FLUSHING_SUFFIX: Final[str] = "flushing"
+
+    # Staleness bound: celery-beat flush interval (seconds)
+    FLUSH_INTERVAL_SECONDS: Final[int] = 5
+
+    # Buffered rows that trigger an early flush
+    FLUSH_THRESHOLD: Final[int] = 200
+
+
+# =============================================================================
+# Read Receipt Configuration
+# =============================================================================
+
+
+class READ_RECEIPT_CONFIG:
+    """
+    Configuration for debouncing WebSocket read frames.
+
+    Enabled per deployment via the CHAT_DEBOUNCED_READS_ENABLED setting.
+    """
+
+    # Redis hash: {"conversation_id:user_id": newest read_at (epoch us)}
+    KEY_PENDING: Final[str] = "chat:reads:pending"
+    KEY_FLUSHING: Final[str] = "chat:reads:pending:flushing"
+
+    # Debounce window: celery-beat flush interval (seconds)
+    FLUSH_INTERVAL_SECONDS: Final[int] = 2
+
+
+# =============================================================================
+# WebSocket Configuration
+# =============================================================================
+
+
+class SOCKET_CONFIG:
+    """Configuration for WebSocket consumers."""
+
+    # Max conversations one multiplexed user socket may subscribe to
+    MAX_SUBSCRIPTIONS: Final[int] = 100
+
+
+# =============================================================================
+# Typing Indicator Configuration
+# =============================================================================
+
+
+class TYPING_CONFIG:
+    """
+    Configuration for server-side typing indicator throttling.
+
+    Applied per connection and conversation before anything reaches the
+    channel layer; repeated frames with an unchanged state are always dropped.
+    """
+
+    # Minimum time between two typing broadcasts (seconds)
+    THROTTLE_SECONDS: Final[float] = 2.0
+
+    # Broadcast the first change in a quiet window immediately
+    LEADING_EDGE: Final[bool] = True
+
+    # Broadcast the latest state at the end of a window if it changed
+    TRAILING_EDGE: Final[bool] = True
+
+    # Broadcast "stopped typing" after this long without a typing frame
+    AUTO_STOP_SECONDS: Final[float] = 6.0
@@ -6,7 +6,8 @@ handling connection management, message broadcasting, and integration with
 the chat service layer.
 
 Consumers:
-    ChatConsumer: Handles WebSocket connections for conversations
+    ChatConsumer: Handles WebSocket connections for one conversation
+    UserConsumer: One multiplexed connection per user across conversations
 
 Authentication:
     Users are authenticated via JWT token passed as query parameter.
@@ -14,35 +15,435 @@ Authentication:
 
 Channel Groups:
     Each conversation has a channel group named "chat_{conversation_id}".
-    Connected users join the group and receive broadcast messages.
+    Connected users join the group and receive broadcast messages. Events
+    carry their conversation_id so a UserConsumer subscribed to several
+    groups can tell them apart. UserConsumer also joins the user's
+    notification group (NotificationSockets.group_name).
+
+Typing Throttling:
+    Typing frames are throttled per connection and conversation
+    (TYPING_CONFIG): unchanged states are dropped, changes are sent on the
+    leading and/or trailing edge of the throttle window, and "stopped typing"
+    is sent automatically when typing frames stop arriving, when the user
+    sends a message or when the socket closes.
+
+Debounced Reads:
+    With CHAT_DEBOUNCED_READS_ENABLED, read frames are buffered in Redis per
+    (conversation, user) and applied in bulk by a periodic flush, which
+    broadcasts one "receipts" frame per conversation instead of one "read"
+    frame per read. See chat/read_receipts.py.
+
+Async Service Calls:
+    Membership checks read the membership cache over async Redis
+    (MembershipCache.ais_member), so they only leave the event loop on a
+    cache miss. Sends and reads use the async service variants
+    (MessageService.asend_message, amark_as_read), which reject invalid
+    sends on the event loop and run the database work in a single
+    database_sync_to_async call. Conversation lookups, write-behind
+    enqueueing and debounced read buffering run through
+    database_sync_to_async as before.
+
+Write-behind Sends:
+    With CHAT_WRITE_BEHIND_ENABLED, messages are validated, assigned an ID and
+    timestamp, queued in Redis and broadcast without waiting for the database
+    write. See chat/write_behind.py for delivery and ordering guarantees.
 
 Message Types (from client):
     - message: Send a new message to the conversation
     - typing: Broadcast typing indicator
     - read: Mark messages as read
+    - subscribe / unsubscribe: UserConsumer only, join or leave conversations
+    (UserConsumer frames name their conversation with "conversation_id")
 
 Message Types (to client):
     - message: New message in conversation
     - typing: User is typing
+    - read: A participant read the conversation
+    - receipts: Participants who read the conversation since the last flush
+      (debounced reads)
+    - presence: A participant's presence changed (pushed by PresenceService,
+      replacing presence polling)
+    - subscribed / unsubscribed: UserConsumer subscription acknowledgements
+    - notification: UserConsumer only, a notification for the user
     - error: Error response
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from dataclasses import dataclass
 from uuid import UUID
 
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
 
-from chat.models import Conversation, Participant
+from chat.constants import SOCKET_CONFIG, TYPING_CONFIG
+from chat.membership import MembershipCache
+from chat.models import Conversation
+from chat.read_receipts import ReadReceipts
 from chat.services import MessageService
+from chat.write_behind import MessageWriteBehind
+from notifications.sockets import NotificationSockets
 
 logger = logging.getLogger(__name__)
 
 
-class ChatConsumer(AsyncJsonWebsocketConsumer):
+@dataclass
+class TypingState:
+    """
+    Typing indicator state of one connection in one conversation.
+
+    Attributes:
+        desired: Latest state reported by the client
+        sent: Latest state broadcast to the group
+        sent_at: Event loop time of the latest broadcast
+        trailing: Pending trailing-edge broadcast
+        auto_stop: Pending automatic "stopped typing" broadcast
+    """
+
+    desired: bool = False
+    sent: bool = False
+    sent_at: float = float("-inf")
+    trailing: asyncio.Task | None = None
+    auto_stop: asyncio.Task | None = None
+
+    def cancel(self) -> None:
+        """Cancel pending broadcasts."""
+        for task in (self.trailing, self.auto_stop):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self.trailing = None
+        self.auto_stop = None
+
+
+def conversation_group_name(conversation_id) -> str:
+    """Channel layer group for a conversation."""
+    return f"chat_{conversation_id}"
+
+
+class BaseChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Conversation behaviour shared by ChatConsumer and UserConsumer.
+
+    Sends messages (directly or via write-behind), marks conversations as
+    read and relays chat.* channel layer events to the client. Frames sent
+    to the client include the event's conversation_id when it has one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.typing_states: dict[int, TypingState] = {}
+
+    def _is_own_event(self, user_id) -> bool:
+        """Whether an event was caused by the connected user."""
+        user = self.scope.get("user")
+        return bool(user) and str(user.id) == str(user_id)
+
+    async def _broadcast_message(self, conversation, user, content, parent_id):
+        """
+        Create a message and broadcast it to the conversation group.
+
+        Returns an error string if the message was rejected, else None.
+        """
+        send = (
+            self._enqueue_message
+            if MessageWriteBehind.is_enabled()
+            else self._send_message
+        )
+        result = await send(
+            conversation=conversation,
+            user=user,
+            content=content,
+            parent_id=parent_id,
+        )
+
+        if not result["success"]:
+            return result["error"]
+
+        await self._stop_typing(conversation.id, user)
+        await self.channel_layer.group_send(
+            conversation_group_name(conversation.id),
+            {
+                "type": "chat.message",
+                "conversation_id": conversation.id,
+                "message": result["data"],
+            },
+        )
+        return None
+
+    async def _broadcast_typing(self, conversation_id, user, is_typing: bool):
+        """Broadcast a typing indicator to the conversation group."""
+        await self.channel_layer.group_send(
+            conversation_group_name(conversation_id),
+            {
+                "type": "chat.typing",
+                "conversation_id": conversation_id,
+                "user_id": str(user.id),
+                "is_typing": is_typing,
+            },
+        )
+
+    async def _handle_typing_frame(self, conversation_id, user, is_typing: bool):
+        """
+        Throttle a client typing frame before it reaches the channel layer.
+
+        A frame that matches the last broadcast state is dropped. A change is
+        broadcast immediately when the throttle window is open (leading edge)
+        or at the end of the window if it still differs (trailing edge).
+        While typing, the auto-stop timer restarts with every frame.
+        """
+        state = self.typing_states.setdefault(conversation_id, TypingState())
+        state.desired = is_typing
+
+        if state.auto_stop is not None:
+            state.auto_stop.cancel()
+            state.auto_stop = None
+        if is_typing:
+            state.auto_stop = asyncio.create_task(
+                self._auto_stop_typing(conversation_id, user)
+            )
+
+        if state.desired == state.sent or state.trailing is not None:
+            # Unchanged, or the pending trailing edge will send the latest state
+            return
+
+        elapsed = asyncio.get_running_loop().time() - state.sent_at
+        window_open = elapsed >= TYPING_CONFIG.THROTTLE_SECONDS
+        if window_open and TYPING_CONFIG.LEADING_EDGE:
+            await self._send_typing_state(conversation_id, user, state)
+        elif TYPING_CONFIG.TRAILING_EDGE:
+            delay = (
+                TYPING_CONFIG.THROTTLE_SECONDS
+                if window_open
+                else TYPING_CONFIG.THROTTLE_SECONDS - elapsed
+            )
+            state.trailing = asyncio.create_task(
+                self._trailing_typing(conversation_id, user, delay)
+            )
+
+    async def _send_typing_state(self, conversation_id, user, state: TypingState):
+        """Broadcast the desired typing state and record when it was sent."""
+        state.sent = state.desired
+        state.sent_at = asyncio.get_running_loop().time()
+        await self._broadcast_typing(conversation_id, user, state.sent)
+
+    async def _trailing_typing(self, conversation_id, user, delay: float):
+        """Send the latest typing state at the end of the throttle window."""
+        await asyncio.sleep(delay)
+        state = self.typing_states[conversation_id]
+        state.trailing = None
+        if state.desired != state.sent:
+            await self._send_typing_state(conversation_id, user, state)
+
+    async def _auto_stop_typing(self, conversation_id, user):
+        """Treat a user who stopped sending typing frames as stopped."""
+        await asyncio.sleep(TYPING_CONFIG.AUTO_STOP_SECONDS)
+        self.typing_states[conversation_id].auto_stop = None
+        await self._stop_typing(conversation_id, user)
+
+    async def _stop_typing(self, conversation_id, user):
+        """
+        Broadcast "stopped typing" now and forget the conversation's state.
+
+        Bypasses the throttle; nothing is sent if the group was never told
+        the user is typing.
+        """
+        state = self.typing_states.pop(conversation_id, None)
+        if state is None:
+            return
+        state.cancel()
+        if state.sent:
+            await self._broadcast_typing(conversation_id, user, False)
+
+    async def _stop_all_typing(self, user):
+        """Stop typing in every conversation (on disconnect)."""
+        for conversation_id in list(self.typing_states):
+            await self._stop_typing(conversation_id, user)
+
+    async def _broadcast_read(self, conversation, user):
+        """
+        Mark a conversation as read and tell the other participants.
+
+        With debounced reads the read is buffered and the receipt is sent
+        by the next flush.
+
+        Returns an error string if marking failed, else None.
+        """
+        if ReadReceipts.is_enabled():
+            await self._record_read(conversation, user)
+            return None
+
+        result = await self._mark_as_read(conversation, user)
+        if not result["success"]:
+            return result["error"]
+
+        await self.channel_layer.group_send(
+            conversation_group_name(conversation.id),
+            {
+                "type": "chat.read",
+                "conversation_id": conversation.id,
+                "user_id": str(user.id),
+                "read_at": result["read_at"],
+            },
+        )
+        return None
+
+    async def _send_frame(self, frame_type: str, event: dict, **fields):
+        """Send a frame to the client, tagged with the event's conversation."""
+        frame = {"type": frame_type}
+        if "conversation_id" in event:
+            frame["conversation_id"] = event["conversation_id"]
+        frame.update(fields)
+        await self.send_json(frame)
+
+    async def send_error(self, message: str):
+        """Send an error frame to the client."""
+        await self.send_json({"type": "error", "message": message})
+
+    async def chat_message(self, event):
+        """
+        Handle chat.message events from channel layer.
+
+        Sends the message to the WebSocket client.
+        """
+        await self._send_frame("message", event, message=event["message"])
+
+    async def chat_typing(self, event):
+        """
+        Handle chat.typing events from channel layer.
+
+        Sends typing indicator to the WebSocket client (except sender).
+        """
+        if self._is_own_event(event["user_id"]):
+            return
+
+        await self._send_frame(
+            "typing",
+            event,
+            user_id=event["user_id"],
+            is_typing=event["is_typing"],
+        )
+
+    async def chat_read(self, event):
+        """
+        Handle chat.read events from channel layer.
+
+        Sends the read receipt to the WebSocket client (except the reader).
+        """
+        if self._is_own_event(event["user_id"]):
+            return
+
+        await self._send_frame(
+            "read",
+            event,
+            user_id=event["user_id"],
+            read_at=event["read_at"],
+        )
+
+    async def chat_receipts(self, event):
+        """
+        Handle chat.receipts events from channel layer.
+
+        Sends the batch of read positions to the WebSocket client, without
+        the connected user's own entry.
+        """
+        reads = [
+            read for read in event["reads"] if not self._is_own_event(read["user_id"])
+        ]
+        if reads:
+            await self._send_frame("receipts", event, reads=reads)
+
+    async def chat_presence(self, event):
+        """
+        Handle chat.presence events from channel layer.
+
+        Sends the presence change to the WebSocket client (except the user
+        whose presence changed).
+        """
+        if self._is_own_event(event["presence"]["user_id"]):
+            return
+
+        await self._send_frame("presence", event, presence=event["presence"])
+
+    async def _mark_as_read(self, conversation, user) -> dict:
+        """
+        Mark conversation as read using MessageService.
+
+        Returns dict with success status and either read_at or error.
+        """
+        result = await MessageService.amark_as_read(
+            conversation=conversation, user=user
+        )
+        if not result.success:
+            return {"success": False, "error": result.error}
+        return {"success": True, "read_at": timezone.now().isoformat()}
+
+    @database_sync_to_async
+    def _record_read(self, conversation, user) -> None:
+        """Buffer a debounced read (applied directly if Redis is down)."""
+        ReadReceipts.record(conversation.id, user.id)
+
+    async def _send_message(
+        self, conversation, user, content: str, parent_id: int | None
+    ) -> dict:
+        """
+        Send a message using MessageService.
+
+        Returns dict with success status and either data or error.
+        """
+        result = await MessageService.asend_message(
+            conversation=conversation,
+            sender=user,
+            content=content,
+            parent_message_id=parent_id,
+        )
+
+        if result.success:
+            message = result.data
+            return {
+                "success": True,
+                "data": {
+                    "id": message.id,
+                    "sender_id": str(message.sender_id),
+                    "content": message.content,
+                    "message_type": message.message_type,
+                    "parent_message_id": message.parent_message_id,
+                    "created_at": message.created_at.isoformat(),
+                },
+            }
+        else:
+            return {
+                "success": False,
+                "error": result.error,
+            }
+
+    @database_sync_to_async
+    def _enqueue_message(
+        self, conversation, user, content: str, parent_id: int | None
+    ) -> dict:
+        """
+        Queue a message for write-behind persistence.
+
+        Returns dict with success status and either data or error, in the
+        same shape as _send_message.
+        """
+        result = MessageWriteBehind.enqueue(
+            conversation=conversation,
+            sender=user,
+            content=content,
+            parent_message_id=parent_id,
+        )
+
+        if result.success:
+            return {"success": True, "data": result.data}
+        return {"success": False, "error": result.error}
+
+
+class ChatConsumer(BaseChatConsumer):
     """
     WebSocket consumer for real-time chat functionality.
 
@@ -52,6 +453,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         - Sending and receiving messages
         - Typing indicators
         - Read receipts
+        - Presence change notifications
 
     Attributes:
         conversation_id: UUID of the connected conversation
@@ -77,7 +479,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         On success, joins the channel group and accepts the connection.
         """
         self.conversation_id = self.scope["url_route"]["kwargs"]["conversation_id"]
-        self.room_group_name = f"chat_{self.conversation_id}"
+        self.room_group_name = conversation_group_name(self.conversation_id)
 
         user = self.scope.get("user")
 
@@ -121,11 +523,13 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         Leaves the channel group if one was joined.
         """
         if self.room_group_name:
+            user = self.scope.get("user")
+            if user and not isinstance(user, AnonymousUser):
+                await self._stop_all_typing(user)
             await self.channel_layer.group_discard(
                 self.room_group_name,
                 self.channel_name,
             )
-            user = self.scope.get("user")
             user_id = (
                 user.id if user and not isinstance(user, AnonymousUser) else "anonymous"
             )
@@ -141,6 +545,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             {"type": "message", "content": "Hello!"}
             {"type": "message", "content": "Reply", "parent_id": 123}
             {"type": "typing", "is_typing": true}
+            {"type": "read"}
 
         Args:
             content: Parsed JSON message from client
@@ -152,6 +557,10 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             await self._handle_message(user, content)
         elif message_type == "typing":
             await self._handle_typing(user, content)
+        elif message_type == "read":
+            error = await self._broadcast_read(self.conversation, user)
+            if error:
+                await self.send_error(error)
         else:
             await self.send_json(
                 {
@@ -164,7 +573,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         """
         Handle incoming chat message.
 
-        Creates the message via MessageService and broadcasts to the group.
+        Creates the message via MessageService (or queues it for write-behind
+        persistence when enabled) and broadcasts to the group.
         """
         message_content = content.get("content", "").strip()
         parent_id = content.get("parent_id")
@@ -178,127 +588,259 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             )
             return
 
-        result = await self._send_message(
-            user=user,
-            content=message_content,
-            parent_id=parent_id,
+        error = await self._broadcast_message(
+            self.conversation, user, message_content, parent_id
         )
+        if error:
+            await self.send_error(error)
 
-        if not result["success"]:
-            await self.send_json(
-                {
-                    "type": "error",
-                    "message": result["error"],
-                }
+    async def _handle_typing(self, user, content):
+        """
+        Handle typing indicator.
+
+        Broadcasts typing status to all other participants, throttled.
+        """
+        is_typing = bool(content.get("is_typing", False))
+        await self._handle_typing_frame(self.conversation.id, user, is_typing)
+
+    @database_sync_to_async
+    def _get_conversation(self) -> Conversation | None:
+        """Get conversation by ID."""
+        try:
+            return Conversation.objects.get(
+                id=self.conversation_id,
+                is_deleted=False,
             )
+        except Conversation.DoesNotExist:
+            return None
+
+    async def _is_user_participant(self, user) -> bool:
+        """Check if user is an active participant in the conversation."""
+        return await MembershipCache.ais_member(self.conversation_id, user.id)
+
+
+class UserConsumer(BaseChatConsumer):
+    """
+    One WebSocket per user, multiplexing all of the user's conversations.
+
+    The user is authenticated once on connect; the client then subscribes to
+    the conversations it has open instead of opening a socket per
+    conversation. Membership for a subscribe frame is checked against the
+    user's cached conversation IDs (one lookup for the whole frame).
+
+    Client frames:
+        {"type": "subscribe", "conversation_ids": [1, 2]}
+        {"type": "unsubscribe", "conversation_ids": [2]}
+        {"type": "message", "conversation_id": 1, "content": "Hi"}
+        {"type": "typing", "conversation_id": 1, "is_typing": true}
+        {"type": "read", "conversation_id": 1}
+
+    Attributes:
+        subscriptions: Subscribed conversations by ID
+        notification_group_name: Channel layer group for the user's
+            notification pushes
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subscriptions: dict[int, Conversation] = {}
+        self.notification_group_name: str | None = None
+
+    async def connect(self):
+        """
+        Handle WebSocket connection.
+
+        Rejects unauthenticated users, otherwise joins the user's
+        notification group and accepts the connection.
+        """
+        user = self.scope.get("user")
+
+        if not user or isinstance(user, AnonymousUser):
+            logger.warning("Rejected unauthenticated user socket connection")
+            await self.close(code=4001)
             return
 
-        message_data = result["data"]
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                "type": "chat.message",
-                "message": message_data,
-            },
+        self.notification_group_name = NotificationSockets.group_name(user.id)
+        await self.channel_layer.group_add(
+            self.notification_group_name,
+            self.channel_name,
         )
+        await sync_to_async(NotificationSockets.register)(user.id, self.channel_name)
 
-    async def _handle_typing(self, user, content):
+        await self.accept()
+        logger.info(f"User {user.id} connected to user socket")
+
+    async def disconnect(self, close_code):
         """
-        Handle typing indicator.
+        Handle WebSocket disconnection.
 
-        Broadcasts typing status to all other participants.
+        Leaves the notification group and every subscribed conversation.
         """
-        is_typing = content.get("is_typing", False)
+        user = self.scope.get("user")
+        if user and not isinstance(user, AnonymousUser):
+            await self._stop_all_typing(user)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                "type": "chat.typing",
-                "user_id": user.id,
-                "is_typing": is_typing,
-            },
-        )
+        for conversation_id in list(self.subscriptions):
+            await self.channel_layer.group_discard(
+                conversation_group_name(conversation_id),
+                self.channel_name,
+            )
+        self.subscriptions.clear()
 
-    async def chat_message(self, event):
+        if self.notification_group_name:
+            await self.channel_layer.group_discard(
+                self.notification_group_name,
+                self.channel_name,
+            )
+            await sync_to_async(NotificationSockets.unregister)(
+                self.scope["user"].id, self.channel_name
+            )
+            logger.info(f"User {self.scope['user'].id} disconnected from user socket")
+
+    async def receive_json(self, content):
         """
-        Handle chat.message events from channel layer.
+        Handle incoming WebSocket frames.
 
-        Sends the message to the WebSocket client.
+        Subscription frames manage group membership; conversation frames
+        must name a subscribed conversation.
+
+        Args:
+            content: Parsed JSON message from client
         """
-        await self.send_json(
-            {
-                "type": "message",
-                "message": event["message"],
-            }
-        )
+        message_type = content.get("type")
+        user = self.scope["user"]
 
-    async def chat_typing(self, event):
+        if message_type == "subscribe":
+            await self._handle_subscribe(user, content)
+            return
+        if message_type == "unsubscribe":
+            await self._handle_unsubscribe(content)
+            return
+        if message_type not in ("message", "typing", "read"):
+            await self.send_error(f"Unknown message type: {message_type}")
+            return
+
+        conversation = self.subscriptions.get(content.get("conversation_id"))
+        if conversation is None:
+            await self.send_error("Not subscribed to this conversation")
+            return
+
+        if message_type == "message":
+            message_content = content.get("content", "").strip()
+            if not message_content:
+                await self.send_error("Message content cannot be empty")
+                return
+            error = await self._broadcast_message(
+                conversation, user, message_content, content.get("parent_id")
+            )
+        elif message_type == "typing":
+            error = await self._handle_typing_frame(
+                conversation.id, user, bool(content.get("is_typing", False))
+            )
+        else:
+            error = await self._broadcast_read(conversation, user)
+
+        if error:
+            await self.send_error(error)
+
+    async def _handle_subscribe(self, user, content):
         """
-        Handle chat.typing events from channel layer.
+        Subscribe to conversations the user is an active participant in.
 
-        Sends typing indicator to the WebSocket client (except sender).
+        Replies with a "subscribed" frame listing accepted and rejected IDs.
         """
-        user = self.scope.get("user")
-        if user and user.id == event["user_id"]:
+        conversation_ids = self._parse_conversation_ids(content)
+        if conversation_ids is None:
+            await self.send_error("conversation_ids must be a list of integers")
             return
 
+        new_ids = [cid for cid in conversation_ids if cid not in self.subscriptions]
+        available = SOCKET_CONFIG.MAX_SUBSCRIPTIONS - len(self.subscriptions)
+        if len(new_ids) > available:
+            await self.send_error(
+                f"Cannot subscribe to more than "
+                f"{SOCKET_CONFIG.MAX_SUBSCRIPTIONS} conversations"
+            )
+            return
+
+        conversations = await self._get_member_conversations(user, new_ids)
+        for conversation_id, conversation in conversations.items():
+            await self.channel_layer.group_add(
+                conversation_group_name(conversation_id),
+                self.channel_name,
+            )
+            self.subscriptions[conversation_id] = conversation
+
         await self.send_json(
             {
-                "type": "typing",
-                "user_id": event["user_id"],
-                "is_typing": event["is_typing"],
+                "type": "subscribed",
+                "conversation_ids": [
+                    cid for cid in conversation_ids if cid in self.subscriptions
+                ],
+                "rejected_conversation_ids": [
+                    cid for cid in conversation_ids if cid not in self.subscriptions
+                ],
             }
         )
 
-    @database_sync_to_async
-    def _get_conversation(self) -> Conversation | None:
-        """Get conversation by ID."""
-        try:
-            return Conversation.objects.get(
-                id=self.conversation_id,
-                is_deleted=False,
-            )
-        except Conversation.DoesNotExist:
-            return None
+    async def _handle_unsubscribe(self, content):
+        """Leave conversation groups and acknowledge with "unsubscribed"."""
+        conversation_ids = self._parse_conversation_ids(content)
+        if conversation_ids is None:
+            await self.send_error("conversation_ids must be a list of integers")
+            return
 
-    @database_sync_to_async
-    def _is_user_participant(self, user) -> bool:
-        """Check if user is an active participant in the conversation."""
-        return Participant.objects.filter(
-            conversation_id=self.conversation_id,
-            user=user,
-            left_at__isnull=True,
-        ).exists()
+        for conversation_id in conversation_ids:
+            if self.subscriptions.pop(conversation_id, None) is not None:
+                await self._stop_typing(conversation_id, self.scope["user"])
+                await self.channel_layer.group_discard(
+                    conversation_group_name(conversation_id),
+                    self.channel_name,
+                )
 
-    @database_sync_to_async
-    def _send_message(self, user, content: str, parent_id: int | None) -> dict:
+        await self.send_json(
+            {"type": "unsubscribed", "conversation_ids": conversation_ids}
+        )
+
+    @staticmethod
+    def _parse_conversation_ids(content) -> list[int] | None:
+        """Read a de-duplicated conversation_ids list, or None if invalid."""
+        conversation_ids = content.get("conversation_ids")
+        if not isinstance(conversation_ids, list) or not all(
+            isinstance(cid, int) and not isinstance(cid, bool)
+            for cid in conversation_ids
+        ):
+            return None
+        return list(dict.fromkeys(conversation_ids))
+
+    async def notification_message(self, event):
         """
-        Send a message using MessageService.
+        Handle notification.message events from channel layer.
 
-        Returns dict with success status and either data or error.
+        Sends the notification to the WebSocket client.
         """
-        result = MessageService.send_message(
-            conversation=self.conversation,
-            sender=user,
-            content=content,
-            parent_message_id=parent_id,
+        await self.send_json(
+            {
+                "type": "notification",
+                "notification": event["notification"],
+            }
         )
 
-        if result.success:
-            message = result.data
-            return {
-                "success": True,
-                "data": {
-                    "id": message.id,
-                    "sender_id": message.sender_id,
-                    "content": message.content,
-                    "message_type": message.message_type,
-                    "parent_message_id": message.parent_message_id,
-                    "created_at": message.created_at.isoformat(),
-                },
-            }
-        else:
-            return {
-                "success": False,
-                "error": result.error,
-            }
+    async def _get_member_conversations(
+        self, user, conversation_ids: list[int]
+    ) -> dict[int, Conversation]:
+        """Load conversations in conversation_ids the user may subscribe to."""
+        member_ids = set(await MembershipCache.aget_user_conversation_ids(user.id))
+        allowed = [cid for cid in conversation_ids if cid in member_ids]
+        if not allowed:
+            return {}
+        return await self._get_conversations(allowed)
+
+    @database_sync_to_async
+    def _get_conversations(
+        self, conversation_ids: list[int]
+    ) -> dict[int, Conversation]:
+        """Load non-deleted conversations by ID."""
+        return Conversation.objects.filter(
+            id__in=conversation_ids, is_deleted=False
+        ).in_bulk()
@@ -0,0 +1,156 @@
+"""
+Serialized message page cache for hot conversations.
+
+Opening a popular group chat re-runs the same message query and
+serialization for every member. This module caches the serialized
+MessageViewSet.list response per conversation, keyed by a conversation
+version that every change to the conversation's messages bumps.
+
+Cached Data:
+    Conversation version: integer bumped on message create, edit, delete,
+        reaction and reply count changes
+    Pages: paginated response data per (conversation, version, page URL);
+        the page URL carries the MessageCursorPagination cursor and page_size
+
+Design Decisions:
+    - Backed by the Django cache (Redis), TTL-bounded pages
+    - Versioned keys: a bump orphans every cached page of the conversation in
+      O(1) instead of deleting keys by pattern
+    - Bumps happen immediately and again after the surrounding transaction
+      commits, so a concurrent reader cannot cache pre-commit rows under the
+      new version
+    - A missing version is initialized from the clock, so an evicted version
+      never reuses a number that old pages may still be cached under
+    - Only responses that are identical for every participant are cached;
+      access checks run before the cache is consulted
+
+Usage:
+    from chat.history_cache import MessageHistoryCache
+
+    data = MessageHistoryCache.get_page(conversation.id, page_url)
+
+    # After changing messages
+    MessageHistoryCache.bump(conversation.id)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+from chat.constants import HISTORY_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class MessageHistoryCache:
+    """
+    Versioned cache of serialized message list pages.
+
+    All methods are classmethods; callers decide what a page URL is (the
+    view uses the absolute request URI, which includes cursor and page_size).
+    """
+
+    @staticmethod
+    def _version_key(conversation_id: int) -> str:
+        """Build cache key for a conversation's history version."""
+        return f"{HISTORY_CACHE_CONFIG.KEY_PREFIX_VERSION}:{conversation_id}"
+
+    @staticmethod
+    def _page_key(conversation_id: int, version: int, page_url: str) -> str:
+        """Build cache key for one page of a conversation version."""
+        digest = hashlib.sha256(page_url.encode("utf-8")).hexdigest()
+        return (
+            f"{HISTORY_CACHE_CONFIG.KEY_PREFIX_PAGE}:"
+            f"{conversation_id}:{version}:{digest}"
+        )
+
+    @classmethod
+    def get_version(cls, conversation_id: int) -> int:
+        """
+        Get the current history version of a conversation.
+
+        Args:
+            conversation_id: ID of the conversation
+
+        Returns:
+            Version number (created on first use)
+        """
+        key = cls._version_key(conversation_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def get_page(cls, conversation_id: int, page_url: str) -> tuple[int, dict | None]:
+        """
+        Look up a cached page.
+
+        Args:
+            conversation_id: ID of the conversation
+            page_url: URL identifying the page (cursor and page size)
+
+        Returns:
+            Tuple of (version, cached response data or None). Pass the
+            version to set_page so a page computed across a bump is stored
+            under the old version.
+        """
+        version = cls.get_version(conversation_id)
+        return version, cache.get(cls._page_key(conversation_id, version, page_url))
+
+    @classmethod
+    def set_page(
+        cls, conversation_id: int, version: int, page_url: str, data: dict
+    ) -> None:
+        """
+        Store a serialized page under the version it was read at.
+
+        Args:
+            conversation_id: ID of the conversation
+            version: Version returned by get_page before the page was built
+            page_url: URL identifying the page
+            data: Paginated response data
+        """
+        cache.set(
+            cls._page_key(conversation_id, version, page_url),
+            data,
+            timeout=HISTORY_CACHE_CONFIG.PAGE_TTL_SECONDS,
+        )
+
+    @classmethod
+    def bump(cls, conversation_ids: int | Iterable[int]) -> None:
+        """
+        Invalidate cached pages of one or more conversations.
+
+        Versions are bumped immediately and again once the surrounding
+        transaction commits.
+
+        Args:
+            conversation_ids: Conversation ID or IDs whose messages changed
+        """
+        if isinstance(conversation_ids, int):
+            conversation_ids = [conversation_ids]
+        keys = [cls._version_key(cid) for cid in set(conversation_ids)]
+        if not keys:
+            return
+
+        cls._incr_versions(keys)
+        transaction.on_commit(lambda: cls._incr_versions(keys))
+
+    @staticmethod
+    def _incr_versions(keys: list[str]) -> None:
+        """Increment existing version keys; missing ones start fresh anyway."""
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                pass
+
+        logger.debug(f"Bumped message history versions: {keys}")
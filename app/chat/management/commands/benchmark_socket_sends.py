@@ -0,0 +1,105 @@
+"""
+Measure WebSocket send throughput of the sync and async service paths.
+
+Sends messages concurrently from one event loop, the way a single ASGI
+worker would, first through database_sync_to_async(MessageService.send_message)
+(the consumer's former path) and then through MessageService.asend_message,
+and reports messages/sec for each. Both paths store an accepted send in a
+single thread hop (the async one checks membership over async Redis first),
+so expect them to be close; the async path mainly saves the hop for sends
+it rejects.
+
+Usage:
+    python manage.py benchmark_socket_sends --conversation <id>
+    python manage.py benchmark_socket_sends --conversation <id> --messages 2000 --concurrency 100
+
+The messages are really stored: point it at a scratch conversation.
+"""
+
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.models import Conversation
+from chat.services import MessageService
+
+
+class Command(BaseCommand):
+    help = "Compare messages/sec of the sync and async chat send paths"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--conversation",
+            type=int,
+            required=True,
+            help="Conversation ID to send benchmark messages to",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=500,
+            help="Messages per path (default 500)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Sends in flight at once, like concurrent sockets (default 50)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            conversation = Conversation.objects.get(
+                id=options["conversation"], is_deleted=False
+            )
+        except Conversation.DoesNotExist as exc:
+            raise CommandError(
+                f"Conversation {options['conversation']} not found"
+            ) from exc
+
+        participant = (
+            conversation.participants.filter(left_at__isnull=True)
+            .select_related("user")
+            .first()
+        )
+        if participant is None:
+            raise CommandError("Conversation has no active participants")
+
+        paths = {
+            "sync (thread hop)": database_sync_to_async(MessageService.send_message),
+            "async": MessageService.asend_message,
+        }
+        for name, send in paths.items():
+            elapsed = async_to_sync(self._run)(
+                send,
+                conversation,
+                participant.user,
+                options["messages"],
+                options["concurrency"],
+            )
+            self.stdout.write(
+                f"{name}: {options['messages']} messages in {elapsed:.2f}s "
+                f"({options['messages'] / elapsed:.0f} msg/s)"
+            )
+
+    @staticmethod
+    async def _run(send, conversation, user, messages: int, concurrency: int):
+        """Send messages with at most concurrency in flight; returns seconds."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send_one(i):
+            async with semaphore:
+                result = await send(
+                    conversation=conversation,
+                    sender=user,
+                    content=f"Benchmark message {i}",
+                )
+                if not result.success:
+                    raise CommandError(result.error)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send_one(i) for i in range(messages)))
+        return time.perf_counter() - started
@@ -0,0 +1,67 @@
+"""
+Detach chat_message partitions older than a cutoff month.
+
+Usage:
+    python manage.py detach_message_partitions --before 2025-01
+    python manage.py detach_message_partitions --before 2025-01 --drop
+    python manage.py detach_message_partitions --list
+
+Detached partitions become standalone tables that can be archived with
+pg_dump and dropped later. Their messages are no longer served by the API.
+"""
+
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.partitions import MessagePartitions
+
+
+class Command(BaseCommand):
+    help = "Detach (and optionally drop) old chat_message partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            help="Detach partitions ending on or before this month (YYYY-MM)",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the detached tables instead of keeping them for archiving",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List partitions and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for partition in MessagePartitions.list_partitions():
+                if partition.is_default:
+                    bounds = "DEFAULT"
+                else:
+                    start = partition.start.date() if partition.start else "MINVALUE"
+                    bounds = f"{start} .. {partition.end.date()}"
+                self.stdout.write(f"{partition.name}: {bounds}")
+            return
+
+        if not options["before"]:
+            raise CommandError("--before is required unless --list is given")
+
+        try:
+            cutoff = datetime.strptime(options["before"], "%Y-%m").replace(
+                tzinfo=timezone.utc
+            )
+        except ValueError as exc:
+            raise CommandError("--before must be a month (YYYY-MM)") from exc
+
+        result = MessagePartitions.detach_before(cutoff, drop=options["drop"])
+
+        action = "Dropped" if options["drop"] else "Detached"
+        self.stdout.write(
+            self.style.SUCCESS(f"{action} {len(result.data)} message partitions")
+        )
+        for name in result.data:
+            self.stdout.write(f"  {name}")
@@ -0,0 +1,40 @@
+"""
+Rebuild denormalized Participant.unread_count values from message history.
+
+Usage:
+    python manage.py rebuild_unread_counts
+    python manage.py rebuild_unread_counts --conversation <id>
+
+Run after bulk imports or manual data fixes that bypass MessageService.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.models import Conversation
+from chat.services import MessageService
+
+
+class Command(BaseCommand):
+    help = "Recompute unread counters for active chat participants"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--conversation",
+            type=int,
+            help="Only rebuild counters for this conversation ID",
+        )
+
+    def handle(self, *args, **options):
+        conversation = None
+        conversation_id = options.get("conversation")
+        if conversation_id:
+            try:
+                conversation = Conversation.objects.get(id=conversation_id)
+            except Conversation.DoesNotExist as exc:
+                raise CommandError(f"Conversation {conversation_id} not found") from exc
+
+        result = MessageService.rebuild_unread_counts(conversation=conversation)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt unread counts for {result.data} participants")
+        )
@@ -0,0 +1,40 @@
+"""
+Reconcile denormalized Message.reaction_counts with MessageReaction rows.
+
+Usage:
+    python manage.py reconcile_reaction_counts
+    python manage.py reconcile_reaction_counts --conversation <id>
+
+Run after bulk imports or manual data fixes that bypass ReactionService.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.models import Conversation
+from chat.services import ReactionService
+
+
+class Command(BaseCommand):
+    help = "Recompute reaction counts for chat messages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--conversation",
+            type=int,
+            help="Only reconcile messages in this conversation ID",
+        )
+
+    def handle(self, *args, **options):
+        conversation = None
+        conversation_id = options.get("conversation")
+        if conversation_id:
+            try:
+                conversation = Conversation.objects.get(id=conversation_id)
+            except Conversation.DoesNotExist as exc:
+                raise CommandError(f"Conversation {conversation_id} not found") from exc
+
+        result = ReactionService.reconcile_reaction_counts(conversation=conversation)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled reaction counts for {result.data} messages")
+        )
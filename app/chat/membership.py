@@ -0,0 +1,354 @@
+"""
+Participant membership cache for chat authorization hot paths.
+
+Permission classes, the WebSocket consumer, presence and search all need to
+know "is this user an active participant, and with which role?". This module
+answers that from Redis instead of repeating the same Participant query
+several times per request.
+
+Cached Data:
+    Conversation members: {user_id: role} for active participants
+        (role is None for direct conversations)
+    User conversations: IDs of conversations where the user is active
+
+Design Decisions:
+    - Backed by the Django cache (Redis), TTL-bounded
+    - Cache-aside: misses load from the database and populate the cache
+    - Versioned keys: entries are stored under the version read before the
+      database load, so a reader that loaded rows before a membership change
+      commits can only populate an orphaned key, never the current one
+    - ParticipantService/ConversationService bump versions on membership or
+      role changes, immediately and again after the transaction commits
+    - A missing version is initialized from the clock, so an evicted version
+      never reuses a number that stale entries may still be cached under
+    - An optional per-request memo dict avoids repeated Redis round trips
+      when several permission classes check the same conversation
+    - a-prefixed async variants read the same versioned entries via
+      chat.async_redis; only a cache miss leaves the event loop, in a single
+      database_sync_to_async call
+
+Usage:
+    from chat.membership import MembershipCache
+
+    if MembershipCache.is_member(conversation.id, user.id):
+        ...
+
+    # Share lookups between permission classes within one request
+    memo = MembershipCache.get_request_memo(request)
+    role = MembershipCache.get_role(conversation.id, user.id, memo=memo)
+
+    # After changing participants
+    MembershipCache.invalidate(conversation.id, user_ids=[user.id])
+
+    # From a consumer (async Redis, no thread hop on a cache hit)
+    if await MembershipCache.ais_member(conversation.id, user.id):
+        ...
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Iterable
+from uuid import UUID
+
+from channels.db import database_sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+from chat import async_redis
+from chat.constants import MEMBERSHIP_CONFIG
+from chat.models import Participant
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+
+class MembershipCache:
+    """
+    Cache-aside lookups of active conversation membership.
+
+    All methods are classmethods; the optional memo argument is a plain dict
+    owned by the caller (see get_request_memo) and lives only as long as it.
+    """
+
+    @staticmethod
+    def _conversation_key(conversation_id: int) -> str:
+        """Build cache key for a conversation's members."""
+        return f"{MEMBERSHIP_CONFIG.KEY_PREFIX_CONVERSATION_MEMBERS}:{conversation_id}"
+
+    @staticmethod
+    def _user_key(user_id: UUID | str) -> str:
+        """Build cache key for a user's conversation IDs."""
+        return f"{MEMBERSHIP_CONFIG.KEY_PREFIX_USER_CONVERSATIONS}:{user_id}"
+
+    @classmethod
+    def _get_version(cls, key: str) -> int:
+        """
+        Get the current version of a membership key.
+
+        Args:
+            key: Conversation or user key
+
+        Returns:
+            Version number (created on first use)
+        """
+        version_key = f"{key}:version"
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, time.time_ns(), timeout=None)
+            version = cache.get(version_key)
+        return version
+
+    @classmethod
+    async def _aget_version(cls, key: str) -> int:
+        """Async variant of _get_version over async Redis."""
+        version_key = f"{key}:version"
+        version = await async_redis.cache_get(version_key)
+        if version is None:
+            await async_redis.cache_add(version_key, time.time_ns())
+            version = await async_redis.cache_get(version_key)
+        return version
+
+    @staticmethod
+    def _load_members(conversation_id: int) -> dict[str, str | None]:
+        """Load active participants of a conversation from the database."""
+        return {
+            str(user_id): role
+            for user_id, role in Participant.objects.filter(
+                conversation_id=conversation_id,
+                left_at__isnull=True,
+            ).values_list("user_id", "role")
+        }
+
+    @staticmethod
+    def _load_user_conversation_ids(user_id: UUID | str) -> list[int]:
+        """Load IDs of the user's active conversations from the database."""
+        return list(
+            Participant.objects.filter(
+                user_id=user_id,
+                left_at__isnull=True,
+            ).values_list("conversation_id", flat=True)
+        )
+
+    @staticmethod
+    def get_request_memo(request: Request) -> dict:
+        """
+        Get (or create) the membership memo attached to a request.
+
+        Args:
+            request: DRF request shared by all permission checks
+
+        Returns:
+            Dict used as the memo argument for lookups
+        """
+        memo = getattr(request, "_chat_membership_memo", None)
+        if memo is None:
+            memo = {}
+            request._chat_membership_memo = memo
+        return memo
+
+    @classmethod
+    def get_members(
+        cls,
+        conversation_id: int,
+        memo: dict | None = None,
+    ) -> dict[str, str | None]:
+        """
+        Get active participants of a conversation mapped to their roles.
+
+        Args:
+            conversation_id: ID of the conversation
+            memo: Optional per-request memo
+
+        Returns:
+            Dict of str(user_id) -> role (None for direct conversations)
+        """
+        key = cls._conversation_key(conversation_id)
+        if memo is not None and key in memo:
+            return memo[key]
+
+        entry_key = f"{key}:{cls._get_version(key)}"
+        members = cache.get(entry_key)
+        if members is None:
+            members = cls._load_members(conversation_id)
+            cache.set(entry_key, members, timeout=MEMBERSHIP_CONFIG.CACHE_TTL_SECONDS)
+
+        if memo is not None:
+            memo[key] = members
+        return members
+
+    @classmethod
+    def is_member(
+        cls,
+        conversation_id: int,
+        user_id: UUID | str,
+        memo: dict | None = None,
+    ) -> bool:
+        """
+        Check if user is an active participant in the conversation.
+
+        Args:
+            conversation_id: ID of the conversation
+            user_id: ID of the user
+            memo: Optional per-request memo
+
+        Returns:
+            True if user is an active participant
+        """
+        return str(user_id) in cls.get_members(conversation_id, memo=memo)
+
+    @classmethod
+    def get_role(
+        cls,
+        conversation_id: int,
+        user_id: UUID | str,
+        memo: dict | None = None,
+    ) -> str | None:
+        """
+        Get user's role in the conversation.
+
+        Args:
+            conversation_id: ID of the conversation
+            user_id: ID of the user
+            memo: Optional per-request memo
+
+        Returns:
+            Role string for group participants, None for direct participants
+            or non-participants (use is_member to tell them apart)
+        """
+        return cls.get_members(conversation_id, memo=memo).get(str(user_id))
+
+    @classmethod
+    def get_user_conversation_ids(
+        cls,
+        user_id: UUID | str,
+        memo: dict | None = None,
+    ) -> list[int]:
+        """
+        Get IDs of all conversations where user is an active participant.
+
+        Args:
+            user_id: ID of the user
+            memo: Optional per-request memo
+
+        Returns:
+            List of conversation IDs
+        """
+        key = cls._user_key(user_id)
+        if memo is not None and key in memo:
+            return memo[key]
+
+        entry_key = f"{key}:{cls._get_version(key)}"
+        conversation_ids = cache.get(entry_key)
+        if conversation_ids is None:
+            conversation_ids = cls._load_user_conversation_ids(user_id)
+            cache.set(
+                entry_key,
+                conversation_ids,
+                timeout=MEMBERSHIP_CONFIG.CACHE_TTL_SECONDS,
+            )
+
+        if memo is not None:
+            memo[key] = conversation_ids
+        return conversation_ids
+
+    @classmethod
+    async def aget_members(cls, conversation_id: int) -> dict[str, str | None]:
+        """
+        Async variant of get_members for consumers.
+
+        Reads the same versioned cache entry over async Redis; a miss loads
+        from the database in one database_sync_to_async call and populates
+        the cache.
+
+        Args:
+            conversation_id: ID of the conversation
+
+        Returns:
+            Dict of str(user_id) -> role (None for direct conversations)
+        """
+        key = cls._conversation_key(conversation_id)
+        entry_key = f"{key}:{await cls._aget_version(key)}"
+        members = await async_redis.cache_get(entry_key)
+        if members is None:
+            members = await database_sync_to_async(cls._load_members)(conversation_id)
+            await async_redis.cache_set(
+                entry_key, members, timeout=MEMBERSHIP_CONFIG.CACHE_TTL_SECONDS
+            )
+        return members
+
+    @classmethod
+    async def ais_member(cls, conversation_id: int, user_id: UUID | str) -> bool:
+        """
+        Async variant of is_member for consumers.
+
+        Args:
+            conversation_id: ID of the conversation
+            user_id: ID of the user
+
+        Returns:
+            True if user is an active participant
+        """
+        return str(user_id) in await cls.aget_members(conversation_id)
+
+    @classmethod
+    async def aget_user_conversation_ids(cls, user_id: UUID | str) -> list[int]:
+        """
+        Async variant of get_user_conversation_ids for consumers.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            List of conversation IDs
+        """
+        key = cls._user_key(user_id)
+        entry_key = f"{key}:{await cls._aget_version(key)}"
+        conversation_ids = await async_redis.cache_get(entry_key)
+        if conversation_ids is None:
+            conversation_ids = await database_sync_to_async(
+                cls._load_user_conversation_ids
+            )(user_id)
+            await async_redis.cache_set(
+                entry_key,
+                conversation_ids,
+                timeout=MEMBERSHIP_CONFIG.CACHE_TTL_SECONDS,
+            )
+        return conversation_ids
+
+    @classmethod
+    def invalidate(
+        cls,
+        conversation_id: int,
+        user_ids: Iterable[UUID | str] = (),
+    ) -> None:
+        """
+        Drop cached membership for a conversation and affected users.
+
+        Versions are bumped immediately and again once the surrounding
+        transaction commits. A reader that loaded pre-commit rows stores
+        them under the version it read, which is no longer current.
+
+        Args:
+            conversation_id: Conversation whose members changed
+            user_ids: Users who joined or left (their conversation lists change)
+        """
+        keys = [cls._conversation_key(conversation_id)]
+        keys.extend(cls._user_key(user_id) for user_id in user_ids)
+
+        cls._incr_versions(keys)
+        transaction.on_commit(lambda: cls._incr_versions(keys))
+
+    @staticmethod
+    def _incr_versions(keys: list[str]) -> None:
+        """Increment existing version keys; missing ones start fresh anyway."""
+        for key in keys:
+            try:
+                cache.incr(f"{key}:version")
+            except ValueError:
+                pass
+
+        logger.debug(f"Invalidated membership cache keys: {keys}")
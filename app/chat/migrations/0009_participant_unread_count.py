@@ -0,0 +1,40 @@
+"""
+Add denormalized unread_count to Participant.
+
+Changes:
+    - Add unread_count PositiveIntegerField (maintained by MessageService)
+    - Backfill counts for active participants from message history
+"""
+
+from django.db import migrations, models
+
+# Messages from other senders since last_read_at (or joined_at if never read)
+BACKFILL_SQL = """
+UPDATE chat_participant AS p
+SET unread_count = (
+    SELECT COUNT(*)
+    FROM chat_message AS m
+    WHERE m.conversation_id = p.conversation_id
+      AND m.created_at > COALESCE(p.last_read_at, p.joined_at)
+      AND (m.sender_id IS NULL OR m.sender_id <> p.user_id)
+)
+WHERE p.left_at IS NULL;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0008_messageedithistory_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="participant",
+            name="unread_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Messages from others since last_read_at (denormalized counter)",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
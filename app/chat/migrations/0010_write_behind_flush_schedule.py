@@ -0,0 +1,52 @@
+"""
+Add Celery Beat schedule for write-behind message persistence.
+
+The flush task drains the Redis stream used when CHAT_WRITE_BEHIND_ENABLED
+is on. With an empty stream each run is a few Redis round trips.
+"""
+
+from django.db import migrations
+
+TASK_NAME = "Chat: Flush Write-behind Messages"
+
+
+def create_flush_task(apps, schema_editor):
+    """Create the write-behind flush periodic task."""
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Matches WRITE_BEHIND_CONFIG.FLUSH_INTERVAL_SECONDS
+    every_2_seconds, _ = IntervalSchedule.objects.get_or_create(
+        every=2,
+        period="seconds",
+    )
+
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "chat.tasks.flush_message_write_behind",
+            "interval": every_2_seconds,
+            "enabled": True,
+            "description": (
+                "Bulk-insert chat messages buffered in Redis by write-behind "
+                "WebSocket sends and apply coalesced conversation updates."
+            ),
+        },
+    )
+
+
+def remove_flush_task(apps, schema_editor):
+    """Remove the write-behind flush task on rollback."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0009_participant_unread_count"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_flush_task, remove_flush_task),
+    ]
@@ -0,0 +1,53 @@
+"""
+Add Celery Beat schedule for coalesced conversation updates.
+
+The flush task applies last_message_at and reply_count updates buffered in
+Redis when CHAT_COALESCED_UPDATES_ENABLED is on. Its interval is the
+staleness bound for those fields.
+"""
+
+from django.db import migrations
+
+TASK_NAME = "Chat: Flush Coalesced Updates"
+
+
+def create_flush_task(apps, schema_editor):
+    """Create the coalesced update flush periodic task."""
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Matches COALESCE_CONFIG.FLUSH_INTERVAL_SECONDS
+    every_5_seconds, _ = IntervalSchedule.objects.get_or_create(
+        every=5,
+        period="seconds",
+    )
+
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "chat.tasks.flush_coalesced_updates",
+            "interval": every_5_seconds,
+            "enabled": True,
+            "description": (
+                "Apply conversation last_message_at and message reply_count "
+                "updates buffered in Redis during message bursts."
+            ),
+        },
+    )
+
+
+def remove_flush_task(apps, schema_editor):
+    """Remove the coalesced update flush task on rollback."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0010_write_behind_flush_schedule"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_flush_task, remove_flush_task),
+    ]
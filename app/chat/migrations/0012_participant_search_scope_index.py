@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-16 20:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0011_coalesced_updates_flush_schedule"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                condition=models.Q(("left_at__isnull", True)),
+                fields=["user", "conversation"],
+                name="chat_part_user_conv_idx",
+            ),
+        ),
+    ]
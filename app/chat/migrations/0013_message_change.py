@@ -0,0 +1,88 @@
+# Generated by Django 5.2.9 on 2026-10-16 20:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import chat.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0012_participant_search_scope_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MessageChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("edited", "Edited"),
+                            ("deleted", "Deleted"),
+                            ("reactions", "Reactions"),
+                        ],
+                        help_text="What changed",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "xid",
+                    models.BigIntegerField(
+                        db_default=chat.models.CurrentTransactionId(),
+                        editable=False,
+                        help_text="ID of the transaction that recorded this change",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Timestamp when this change was recorded",
+                    ),
+                ),
+                (
+                    "conversation",
+                    models.ForeignKey(
+                        help_text="Conversation of the changed message",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="message_changes",
+                        to="chat.conversation",
+                    ),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        help_text="Message that changed",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="changes",
+                        to="chat.message",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "chat_message_change",
+                "ordering": ["xid", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["conversation", "xid", "id"],
+                        name="chat_change_conv_cursor_idx",
+                    ),
+                    models.Index(fields=["xid", "id"], name="chat_change_xid_idx"),
+                    models.Index(fields=["created_at"], name="chat_change_created_idx"),
+                ],
+            },
+        ),
+    ]
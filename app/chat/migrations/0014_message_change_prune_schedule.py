@@ -0,0 +1,55 @@
+"""
+Add Celery Beat schedule for pruning the message change log.
+
+Changes older than SYNC_CONFIG.RETENTION_DAYS are deleted; clients with an
+older sync cursor are told to reload instead of catching up.
+"""
+
+from django.db import migrations
+
+TASK_NAME = "Chat: Prune Message Changes"
+
+
+def create_prune_task(apps, schema_editor):
+    """Create the message change log prune periodic task."""
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Daily at 4:15 AM UTC (after the media maintenance tasks)
+    crontab_daily_4am, _ = CrontabSchedule.objects.get_or_create(
+        minute="15",
+        hour="4",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "chat.tasks.prune_message_changes",
+            "crontab": crontab_daily_4am,
+            "enabled": True,
+            "description": (
+                "Delete message change log entries past the delta-sync "
+                "retention window."
+            ),
+        },
+    )
+
+
+def remove_prune_task(apps, schema_editor):
+    """Remove the message change log prune task on rollback."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0013_message_change"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prune_task, remove_prune_task),
+    ]
@@ -0,0 +1,52 @@
+"""
+Add Celery Beat schedule for debounced read receipts.
+
+The flush task applies read frames buffered in Redis when
+CHAT_DEBOUNCED_READS_ENABLED is on. Its interval is the debounce window.
+"""
+
+from django.db import migrations
+
+TASK_NAME = "Chat: Flush Read Receipts"
+
+
+def create_flush_task(apps, schema_editor):
+    """Create the read receipt flush periodic task."""
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Matches READ_RECEIPT_CONFIG.FLUSH_INTERVAL_SECONDS
+    every_2_seconds, _ = IntervalSchedule.objects.get_or_create(
+        every=2,
+        period="seconds",
+    )
+
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "chat.tasks.flush_read_receipts",
+            "interval": every_2_seconds,
+            "enabled": True,
+            "description": (
+                "Apply participant read positions buffered in Redis with one "
+                "bulk UPDATE and broadcast read receipts."
+            ),
+        },
+    )
+
+
+def remove_flush_task(apps, schema_editor):
+    """Remove the read receipt flush task on rollback."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0014_message_change_prune_schedule"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_flush_task, remove_flush_task),
+    ]
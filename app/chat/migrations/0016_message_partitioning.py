@@ -0,0 +1,217 @@
+"""
+Partition chat_message by created_at (monthly ranges).
+
+This migration:
+1. Drops the database foreign keys that point at chat_message. Unique
+   constraints on a partitioned table must include the partition key, so
+   chat_message.id alone can no longer be referenced (Django still applies
+   on_delete in Python). The attachments table keeps its foreign key to
+   media_mediafile; only its message_id constraint is dropped, in SQL, since
+   db_constraint on a ManyToManyField would drop both
+2. Renames the existing table to chat_message_legacy and creates a
+   partitioned chat_message with the same columns, indexes, foreign keys and
+   search trigger, and primary key (id, created_at)
+3. Attaches chat_message_legacy as the partition for everything before next
+   month, so existing rows are not copied
+4. Creates the monthly partitions ahead and a default partition
+
+The identity sequence continues after the highest ID ever issued, including
+IDs reserved by write-behind sends that are not flushed yet. Attaching the
+legacy table scans it once and builds its (id, created_at) primary key
+index, under an exclusive lock on chat_message.
+
+Irreversible: partitions created after this migration cannot be merged
+back automatically.
+"""
+
+from datetime import datetime, timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLE = "chat_message"
+ATTACHMENTS_TABLE = "chat_message_attachments"
+LEGACY_PARTITION = "chat_message_legacy"
+DEFAULT_PARTITION = "chat_message_default"
+PARTITION_NAME_FORMAT = "chat_message_p%Y_%m"
+# Matches MESSAGE_PARTITION_CONFIG.PREMAKE_MONTHS
+PREMAKE_MONTHS = 3
+
+SEARCH_TRIGGER = "chat_message_search_vector_update"
+CREATE_SEARCH_TRIGGER_SQL = f"""
+CREATE TRIGGER {SEARCH_TRIGGER}
+    BEFORE INSERT OR UPDATE OF content, message_type
+    ON {TABLE}
+    FOR EACH ROW
+    EXECUTE FUNCTION chat_message_search_vector_trigger();
+"""
+
+
+def month_start(year, month):
+    """First instant of a month in UTC, normalizing month overflow."""
+    index = year * 12 + month - 1
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_messages(apps, schema_editor):
+    """Convert chat_message into a range-partitioned table."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND confrelid = %s::regclass",
+            [ATTACHMENTS_TABLE, TABLE],
+        )
+        for (name,) in cursor.fetchall():
+            schema_editor.execute(
+                f"ALTER TABLE {ATTACHMENTS_TABLE} "
+                f"DROP CONSTRAINT {schema_editor.quote_name(name)}"
+            )
+
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE confrelid = %s::regclass AND conrelid <> confrelid",
+            [TABLE],
+        )
+        referencing = [row[0] for row in cursor.fetchall()]
+        if referencing:
+            raise RuntimeError(f"Foreign keys still reference {TABLE}: {referencing}")
+
+        # Next identity value: past both stored rows and reserved IDs
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        sequence = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT GREATEST((SELECT COALESCE(MAX(id), 0) FROM {TABLE}), "
+            f"(SELECT last_value FROM {sequence})) + 1"
+        )
+        next_id = cursor.fetchone()[0]
+
+        # Definitions to recreate on the partitioned table
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) "
+            "FROM pg_index WHERE indrelid = %s::regclass AND NOT indisprimary",
+            [TABLE],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p'",
+            [TABLE],
+        )
+        primary_key = cursor.fetchone()[0]
+
+    now = datetime.now(timezone.utc)
+    boundary = month_start(now.year, now.month + 1)
+
+    execute = schema_editor.execute
+    quote = schema_editor.quote_name
+
+    # Free every name the partitioned table needs
+    execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_PARTITION}")
+    execute(f"ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT {quote(primary_key)}")
+    execute(f"ALTER TABLE {LEGACY_PARTITION} ALTER COLUMN id DROP IDENTITY")
+    execute(f"DROP TRIGGER {SEARCH_TRIGGER} ON {LEGACY_PARTITION}")
+    for name, _ in indexes:
+        execute(f"ALTER INDEX {quote(name)} RENAME TO {quote(name[:56] + '_legacy')}")
+
+    execute(
+        f"CREATE TABLE {TABLE} (LIKE {LEGACY_PARTITION} "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    execute(
+        f"ALTER TABLE {TABLE} ALTER COLUMN id "
+        f"ADD GENERATED BY DEFAULT AS IDENTITY (START WITH {int(next_id)})"
+    )
+    execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {quote(primary_key)} "
+        "PRIMARY KEY (id, created_at)"
+    )
+    for name, definition in foreign_keys:
+        execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {quote(name)} {definition}")
+    for _, definition in indexes:
+        execute(definition)
+
+    # Matching indexes and foreign keys of the legacy table are attached to
+    # the parent's instead of being rebuilt
+    execute(
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY_PARTITION} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    for offset in range(PREMAKE_MONTHS):
+        start = month_start(boundary.year, boundary.month + offset)
+        end = month_start(boundary.year, boundary.month + offset + 1)
+        execute(
+            f"CREATE TABLE {start.strftime(PARTITION_NAME_FORMAT)} "
+            f"PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+    # Row triggers on the parent are cloned to every partition
+    execute(CREATE_SEARCH_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0015_read_receipts_flush_schedule"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="message",
+            name="parent_message",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                help_text="Parent message for threading (null if root message)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="replies",
+                to="chat.message",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="messagechange",
+            name="message",
+            field=models.ForeignKey(
+                db_constraint=False,
+                help_text="Message that changed",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="changes",
+                to="chat.message",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="messageedithistory",
+            name="message",
+            field=models.ForeignKey(
+                db_constraint=False,
+                help_text="Message this edit belongs to",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="edit_history",
+                to="chat.message",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="messagereaction",
+            name="message",
+            field=models.ForeignKey(
+                db_constraint=False,
+                help_text="Message this reaction belongs to",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reactions",
+                to="chat.message",
+            ),
+        ),
+        migrations.RunPython(partition_messages),
+    ]
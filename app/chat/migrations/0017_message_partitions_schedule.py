@@ -0,0 +1,56 @@
+"""
+Add Celery Beat schedule for creating chat_message partitions.
+
+The task creates the current month's partition and
+MESSAGE_PARTITION_CONFIG.PREMAKE_MONTHS ahead. Running daily leaves months
+of slack before inserts would fall into the default partition.
+"""
+
+from django.db import migrations
+
+TASK_NAME = "Chat: Create Message Partitions"
+
+
+def create_partition_task(apps, schema_editor):
+    """Create the message partition periodic task."""
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Daily at 3:45 AM UTC
+    crontab_daily_3am, _ = CrontabSchedule.objects.get_or_create(
+        minute="45",
+        hour="3",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "chat.tasks.create_message_partitions",
+            "crontab": crontab_daily_3am,
+            "enabled": True,
+            "description": (
+                "Create monthly chat_message partitions for the current "
+                "month and the months ahead."
+            ),
+        },
+    )
+
+
+def remove_partition_task(apps, schema_editor):
+    """Remove the message partition task on rollback."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0016_message_partitioning"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_partition_task, remove_partition_task),
+    ]
@@ -0,0 +1,246 @@
+"""
+Add the cold message archive and the read-through timeline view.
+
+This migration:
+1. Adds Conversation.archived_until (newest archived message per conversation)
+2. Creates chat_message_archive, tuned for compression: rows over 128 bytes
+   are compressed in place (toast_tuple_target) and lz4 is used where the
+   server supports it
+3. Creates the chat_message_timeline view (UNION ALL of chat_message and
+   chat_message_archive) behind the unmanaged MessageTimeline model
+
+The view depends on the listed chat_message columns; a migration that
+changes one of them must drop and recreate the view.
+"""
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TIMELINE_COLUMNS = """
+    id, conversation_id, sender_id, message_type, content, parent_message_id,
+    reply_count, edited_at, edit_count, is_deleted, created_at, updated_at
+"""
+
+CREATE_TIMELINE_VIEW_SQL = f"""
+CREATE VIEW chat_message_timeline AS
+SELECT {TIMELINE_COLUMNS}, FALSE AS is_archived FROM chat_message
+UNION ALL
+SELECT {TIMELINE_COLUMNS}, TRUE AS is_archived FROM chat_message_archive
+"""
+
+DROP_TIMELINE_VIEW_SQL = "DROP VIEW IF EXISTS chat_message_timeline"
+
+
+def tune_archive_storage(apps, schema_editor):
+    """Compress archived rows aggressively."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "ALTER TABLE chat_message_archive SET (toast_tuple_target = 128)"
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 'lz4' = ANY(enumvals) FROM pg_settings "
+            "WHERE name = 'default_toast_compression'"
+        )
+        row = cursor.fetchone()
+    if row and row[0]:
+        for column in ("content", "original_content", "edit_history"):
+            schema_editor.execute(
+                f"ALTER TABLE chat_message_archive "
+                f"ALTER COLUMN {column} SET COMPRESSION lz4"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0017_message_partitions_schedule"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MessageTimeline",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "message_type",
+                    models.CharField(
+                        choices=[("text", "Text"), ("system", "System")], max_length=10
+                    ),
+                ),
+                ("content", models.TextField()),
+                ("parent_message_id", models.BigIntegerField(null=True)),
+                ("reply_count", models.PositiveIntegerField()),
+                ("edited_at", models.DateTimeField(null=True)),
+                ("edit_count", models.PositiveSmallIntegerField()),
+                ("is_deleted", models.BooleanField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("is_archived", models.BooleanField()),
+            ],
+            options={
+                "db_table": "chat_message_timeline",
+                "ordering": ["created_at", "id"],
+                "managed": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="archived_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Creation time of the newest archived message (null if none)",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArchivedMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        help_text="ID the message had in chat_message",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "message_type",
+                    models.CharField(
+                        choices=[("text", "Text"), ("system", "System")],
+                        default="text",
+                        help_text="Type of message (text or system)",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "content",
+                    models.TextField(
+                        help_text="Message content (text for user messages, JSON for system messages)"
+                    ),
+                ),
+                (
+                    "parent_message_id",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Parent message ID for threading (null if root message)",
+                        null=True,
+                    ),
+                ),
+                (
+                    "reply_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of replies when the message was archived",
+                    ),
+                ),
+                (
+                    "edited_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Timestamp when message was last edited",
+                        null=True,
+                    ),
+                ),
+                (
+                    "edit_count",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Number of times this message was edited"
+                    ),
+                ),
+                (
+                    "original_content",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Original content before any edits (empty if never edited)",
+                    ),
+                ),
+                (
+                    "reaction_counts",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Reaction counts when the message was archived",
+                    ),
+                ),
+                (
+                    "edit_history",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Previous versions of the message, newest first",
+                    ),
+                ),
+                (
+                    "is_deleted",
+                    models.BooleanField(
+                        default=False, help_text="Whether the message was soft deleted"
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Timestamp when the message was soft deleted",
+                        null=True,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        help_text="Timestamp when the message was sent"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="Timestamp of the last change before archiving"
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Timestamp when the message was archived",
+                    ),
+                ),
+                (
+                    "conversation",
+                    models.ForeignKey(
+                        help_text="Conversation this message belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_messages",
+                        to="chat.conversation",
+                    ),
+                ),
+                (
+                    "sender",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="User who sent this message (null for system messages)",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_messages",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "chat_message_archive",
+                "ordering": ["created_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["conversation", "created_at", "id"],
+                        name="chat_archive_conv_cursor_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(tune_archive_storage, migrations.RunPython.noop),
+        migrations.RunSQL(CREATE_TIMELINE_VIEW_SQL, DROP_TIMELINE_VIEW_SQL),
+    ]
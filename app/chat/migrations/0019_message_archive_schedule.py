@@ -0,0 +1,55 @@
+"""
+Add Celery Beat schedule for cold message archival.
+
+The task moves messages older than CHAT_ARCHIVE_AFTER_DAYS into
+chat_message_archive. It does nothing while the setting is 0 (default).
+"""
+
+from django.db import migrations
+
+TASK_NAME = "Chat: Archive Cold Messages"
+
+
+def create_archive_task(apps, schema_editor):
+    """Create the cold message archival periodic task."""
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Daily at 4:30 AM UTC (after the change log prune)
+    crontab_daily_4am, _ = CrontabSchedule.objects.get_or_create(
+        minute="30",
+        hour="4",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "chat.tasks.archive_cold_messages",
+            "crontab": crontab_daily_4am,
+            "enabled": True,
+            "description": (
+                "Move messages older than CHAT_ARCHIVE_AFTER_DAYS into the "
+                "compressed message archive."
+            ),
+        },
+    )
+
+
+def remove_archive_task(apps, schema_editor):
+    """Remove the cold message archival task on rollback."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0018_message_archive"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_archive_task, remove_archive_task),
+    ]
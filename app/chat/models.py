@@ -10,6 +10,9 @@ Models:
     DirectConversationPair: Helper for enforcing uniqueness of direct conversations
     Participant: User participation in a conversation with role and tracking
     Message: Individual message within a conversation
+    MessageChange: Append-only log of message changes for client delta sync
+    ArchivedMessage: Cold message moved out of chat_message by the archival job
+    MessageTimeline: Read-only view over hot and archived messages
 
 Design Decisions:
     - Direct conversations are immutable once created (no adding/removing participants)
@@ -28,7 +31,8 @@ from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import F, Q
+from django.db.models import Exists, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 
 from core.models import BaseModel
 from core.model_mixins import SoftDeleteMixin
@@ -79,6 +83,22 @@ class MessageType(models.TextChoices):
     SYSTEM = "system", "System"
 
 
+class MessageChangeKind(models.TextChoices):
+    """
+    Kind of change recorded in the message change log.
+
+    CREATED: Message was sent (user or system message)
+    EDITED: Message content was edited
+    DELETED: Message was soft deleted
+    REACTIONS: Message reaction counts changed
+    """
+
+    CREATED = "created", "Created"
+    EDITED = "edited", "Edited"
+    DELETED = "deleted", "Deleted"
+    REACTIONS = "reactions", "Reactions"
+
+
 class SystemMessageEvent:
     """
     System message event types.
@@ -114,6 +134,90 @@ class SystemMessageEvent:
     TITLE_CHANGED = "title_changed"
 
 
+class ConversationQuerySet(models.QuerySet):
+    """
+    QuerySet for conversations with list-view helpers.
+
+    Methods:
+        for_user(user): Active conversations where user is an active participant
+        with_list_data(user): Precompute per-viewer fields used by list serializers
+
+    Usage:
+        conversations = (
+            Conversation.objects.for_user(request.user)
+            .with_list_data(request.user)
+        )
+    """
+
+    def for_user(self, user: User) -> ConversationQuerySet:
+        """
+        Filter to non-deleted conversations where user is an active participant.
+
+        Uses EXISTS rather than a join so no DISTINCT is needed.
+
+        Args:
+            user: User whose conversations to return
+
+        Returns:
+            Filtered queryset
+        """
+        return self.filter(
+            Exists(
+                Participant.objects.filter(
+                    conversation=OuterRef("pk"),
+                    user=user,
+                    left_at__isnull=True,
+                )
+            ),
+            is_deleted=False,
+        )
+
+    def with_list_data(self, user: User) -> ConversationQuerySet:
+        """
+        Precompute everything ConversationListSerializer needs in one pass.
+
+        Adds:
+            viewer_unread_count: Viewer's Participant.unread_count (annotation)
+            prefetched_last_message: List with the newest message (0 or 1 items)
+            prefetched_participants: All participants with user/profile loaded
+
+        The page is evaluated with a constant number of queries (the main
+        query plus one batched query per prefetch), regardless of page size.
+
+        Args:
+            user: Viewing user (unread counts are relative to this user)
+
+        Returns:
+            Annotated queryset
+        """
+        viewer = Participant.objects.filter(
+            conversation=OuterRef("pk"),
+            user=user,
+            left_at__isnull=True,
+        )
+
+        return self.annotate(
+            viewer_unread_count=Coalesce(
+                Subquery(viewer.values("unread_count")[:1]), 0
+            ),
+        ).prefetch_related(
+            Prefetch(
+                "messages",
+                queryset=Message.objects.select_related("sender__profile").order_by(
+                    "-created_at", "-id"
+                )[:1],
+                to_attr="prefetched_last_message",
+            ),
+            Prefetch(
+                "participants",
+                queryset=Participant.objects.select_related("user__profile").order_by(
+                    "joined_at", "id"
+                ),
+                to_attr="prefetched_participants",
+            ),
+        )
+
+
 class Conversation(SoftDeleteMixin, BaseModel):
     """
     A conversation between two or more users.
@@ -138,6 +242,8 @@ class Conversation(SoftDeleteMixin, BaseModel):
         created_by: User who created the conversation (nullable for direct)
         participant_count: Cached count of active participants
         last_message_at: Timestamp of most recent message (for sorting)
+        archived_until: created_at of the newest archived message (NULL if
+            nothing is archived)
 
     Relationships:
         participants: All Participant records for this conversation
@@ -145,6 +251,8 @@ class Conversation(SoftDeleteMixin, BaseModel):
         direct_pair: DirectConversationPair if type is DIRECT
     """
 
+    objects = ConversationQuerySet.as_manager()
+
     conversation_type = models.CharField(
         max_length=10,
         choices=ConversationType.choices,
@@ -181,6 +289,12 @@ class Conversation(SoftDeleteMixin, BaseModel):
         help_text="Timestamp of most recent message (for sorting conversation lists)",
     )
 
+    archived_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Creation time of the newest archived message (null if none)",
+    )
+
     class Meta:
         db_table = "chat_conversation"
         ordering = ["-last_message_at", "-created_at"]
@@ -344,6 +458,8 @@ class Participant(BaseModel):
         left_voluntarily: True if user left, False if removed
         removed_by: User who removed this participant (if applicable)
         last_read_at: Last time user read messages (for unread counts)
+        unread_count: Denormalized count of unread messages, maintained by
+            MessageService (incremented on send, reset on read)
 
     Constraints:
         - UniqueConstraint(conversation, user) WHERE left_at IS NULL:
@@ -406,6 +522,11 @@ class Participant(BaseModel):
         help_text="Last time user marked conversation as read (for unread counts)",
     )
 
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Messages from others since last_read_at (denormalized counter)",
+    )
+
     class Meta:
         db_table = "chat_participant"
         ordering = ["joined_at"]
@@ -426,6 +547,12 @@ class Participant(BaseModel):
                 name="chat_part_conv_role_idx",
                 condition=Q(left_at__isnull=True),
             ),
+            # Message search scope: semi-join on the user's active conversations
+            models.Index(
+                fields=["user", "conversation"],
+                name="chat_part_user_conv_idx",
+                condition=Q(left_at__isnull=True),
+            ),
         ]
         constraints = [
             # Only one active participation per user per conversation
@@ -536,6 +663,7 @@ class Message(SoftDeleteMixin, BaseModel):
     parent_message = models.ForeignKey(
         "self",
         on_delete=models.SET_NULL,
+        db_constraint=False,
         null=True,
         blank=True,
         related_name="replies",
@@ -579,7 +707,8 @@ class Message(SoftDeleteMixin, BaseModel):
         help_text="Cached count of reactions by emoji (e.g., {'👍': 3, '❤️': 5})",
     )
 
-    # Attachments (M2M to MediaFile)
+    # Attachments (M2M to MediaFile). Migration 0016 drops the through
+    # table's database FK to chat_message; the one to media_mediafile stays
     attachments = models.ManyToManyField(
         "media.MediaFile",
         blank=True,
@@ -700,6 +829,7 @@ class MessageReaction(BaseModel):
     message = models.ForeignKey(
         Message,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="reactions",
         help_text="Message this reaction belongs to",
     )
@@ -769,6 +899,7 @@ class MessageEditHistory(BaseModel):
     message = models.ForeignKey(
         Message,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="edit_history",
         help_text="Message this edit belongs to",
     )
@@ -804,3 +935,283 @@ class MessageEditHistory(BaseModel):
     def __str__(self) -> str:
         """Return human-readable representation."""
         return f"Edit #{self.edit_number} of message {self.message_id}"
+
+
+class CurrentTransactionId(models.Func):
+    """64-bit ID of the current transaction, assigning one if needed."""
+
+    function = "pg_current_xact_id"
+    template = "%(function)s()::text::bigint"
+    output_field = models.BigIntegerField()
+
+
+class MessageChange(models.Model):
+    """
+    Append-only log of message changes, read by the delta-sync endpoint.
+
+    Reconnecting clients send the ID of the last change they applied and
+    receive only messages changed since, so catching up costs in proportion
+    to what changed rather than to history size.
+
+    Design:
+        - Changes are read in (xid, id) order and the sync cursor is the ID
+          of the last change read. IDs are allocated before commit, so ID
+          order alone would let a slow transaction commit behind a cursor;
+          every transaction with an xid below the snapshot xmin has finished,
+          so changes below it never appear behind a cursor
+        - Rows are written by MessageService, ReactionService and the
+          write-behind flush in the same transaction as the change
+        - Rows only point at the message; clients receive its current state
+        - Old rows are pruned after SYNC_CONFIG.RETENTION_DAYS
+
+    Fields:
+        conversation: Conversation of the changed message (sync scope)
+        message: Message that changed
+        kind: What changed (see MessageChangeKind)
+        xid: Transaction that recorded the change (set by the database)
+        created_at: When the change was recorded
+    """
+
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="message_changes",
+        help_text="Conversation of the changed message",
+    )
+
+    message = models.ForeignKey(
+        Message,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="changes",
+        help_text="Message that changed",
+    )
+
+    kind = models.CharField(
+        max_length=16,
+        choices=MessageChangeKind.choices,
+        help_text="What changed",
+    )
+
+    xid = models.BigIntegerField(
+        db_default=CurrentTransactionId(),
+        editable=False,
+        help_text="ID of the transaction that recorded this change",
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Timestamp when this change was recorded",
+    )
+
+    class Meta:
+        db_table = "chat_message_change"
+        ordering = ["xid", "id"]
+        indexes = [
+            # Changes since a cursor in a user's conversations
+            models.Index(
+                fields=["conversation", "xid", "id"],
+                name="chat_change_conv_cursor_idx",
+            ),
+            # Head cursor
+            models.Index(
+                fields=["xid", "id"],
+                name="chat_change_xid_idx",
+            ),
+            # Retention pruning
+            models.Index(
+                fields=["created_at"],
+                name="chat_change_created_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return human-readable representation."""
+        return f"Change #{self.id}: message {self.message_id} {self.kind}"
+
+
+class ArchivedMessage(models.Model):
+    """
+    A cold message moved out of chat_message by the archival job.
+
+    Messages older than CHAT_ARCHIVE_AFTER_DAYS are moved here so the hot
+    table and its indexes only hold recent history. Rows are read-only:
+    message history and edit history read through to them, but they cannot
+    be edited, deleted, reacted to or searched. Existing reactions can still
+    be removed.
+
+    Storage:
+        - One row per message, keyed by its original ID
+        - Edit history is embedded as JSON (newest first) instead of rows
+        - Reactions stay in chat_message_reaction; reaction_counts is kept
+        - Attachment links stay in chat_message_attachments
+        - Only the (conversation, created_at, id) cursor index is kept
+
+    Fields:
+        Same as Message (without search_vector and attachments), plus:
+        edit_history: [{"id", "edit_number", "content", "created_at"}, ...]
+        archived_at: When the message was archived
+    """
+
+    id = models.BigIntegerField(
+        primary_key=True,
+        help_text="ID the message had in chat_message",
+    )
+
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="archived_messages",
+        help_text="Conversation this message belongs to",
+    )
+
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_messages",
+        help_text="User who sent this message (null for system messages)",
+    )
+
+    message_type = models.CharField(
+        max_length=10,
+        choices=MessageType.choices,
+        default=MessageType.TEXT,
+        help_text="Type of message (text or system)",
+    )
+
+    content = models.TextField(
+        help_text="Message content (text for user messages, JSON for system messages)",
+    )
+
+    parent_message_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Parent message ID for threading (null if root message)",
+    )
+
+    reply_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of replies when the message was archived",
+    )
+
+    edited_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Timestamp when message was last edited",
+    )
+
+    edit_count = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Number of times this message was edited",
+    )
+
+    original_content = models.TextField(
+        blank=True,
+        default="",
+        help_text="Original content before any edits (empty if never edited)",
+    )
+
+    reaction_counts = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Reaction counts when the message was archived",
+    )
+
+    edit_history = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Previous versions of the message, newest first",
+    )
+
+    is_deleted = models.BooleanField(
+        default=False,
+        help_text="Whether the message was soft deleted",
+    )
+
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Timestamp when the message was soft deleted",
+    )
+
+    created_at = models.DateTimeField(
+        help_text="Timestamp when the message was sent",
+    )
+
+    updated_at = models.DateTimeField(
+        help_text="Timestamp of the last change before archiving",
+    )
+
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Timestamp when the message was archived",
+    )
+
+    class Meta:
+        db_table = "chat_message_archive"
+        ordering = ["created_at", "id"]
+        indexes = [
+            # Messages in a conversation (cursor pagination)
+            models.Index(
+                fields=["conversation", "created_at", "id"],
+                name="chat_archive_conv_cursor_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return human-readable representation."""
+        return f"Archived message #{self.id} in conversation {self.conversation_id}"
+
+    @property
+    def is_system_message(self) -> bool:
+        """Check if this is a system-generated message."""
+        return self.message_type == MessageType.SYSTEM
+
+
+class MessageTimeline(models.Model):
+    """
+    Read-only view of a conversation's hot and archived messages.
+
+    Backed by the chat_message_timeline database view (UNION ALL of
+    chat_message and chat_message_archive). Filters on conversation and
+    created_at are pushed into both tables, so cursor pagination over the
+    view reads each side through its own cursor index.
+
+    MessageViewSet only uses it when a page can reach archived messages;
+    pages within the hot window query Message directly.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+    )
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        related_name="+",
+    )
+    message_type = models.CharField(max_length=10, choices=MessageType.choices)
+    content = models.TextField()
+    parent_message_id = models.BigIntegerField(null=True)
+    reply_count = models.PositiveIntegerField()
+    edited_at = models.DateTimeField(null=True)
+    edit_count = models.PositiveSmallIntegerField()
+    is_deleted = models.BooleanField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_archived = models.BooleanField()
+
+    class Meta:
+        managed = False
+        db_table = "chat_message_timeline"
+        ordering = ["created_at", "id"]
+
+    @property
+    def is_system_message(self) -> bool:
+        """Check if this is a system-generated message."""
+        return self.message_type == MessageType.SYSTEM
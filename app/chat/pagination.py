@@ -17,6 +17,9 @@ Design Decisions:
     - Page sizes balanced for mobile performance
 """
 
+from datetime import datetime
+
+from django.utils.dateparse import parse_datetime
 from rest_framework.pagination import CursorPagination
 
 
@@ -41,6 +44,20 @@ class MessageCursorPagination(CursorPagination):
     ordering = ("created_at", "id")
     cursor_query_param = "cursor"
 
+    def starts_after(self, request, moment: datetime) -> bool:
+        """
+        Check whether the requested page only holds messages newer than moment.
+
+        True for forward cursors positioned at or after moment (the page
+        filters created_at > position); the first page and backward cursors
+        can reach older messages.
+        """
+        cursor = self.decode_cursor(request)
+        if cursor is None or cursor.reverse or cursor.position is None:
+            return False
+        position = parse_datetime(cursor.position)
+        return position is not None and position >= moment
+
 
 class ConversationCursorPagination(CursorPagination):
     """
@@ -0,0 +1,267 @@
+"""
+Monthly range partitions of chat_message.
+
+chat_message is partitioned by created_at (migration 0016), one partition
+per calendar month in UTC. Inserts land in the current month's partition,
+and history reads bounded by created_at only scan the partitions that can
+hold matching rows, so index and vacuum work follow the hot months instead
+of total history.
+
+Layout:
+    chat_message_legacy:  every row created before partitioning
+    chat_message_pYYYY_MM: one month, [first day, first day of next month)
+    chat_message_default: rows outside every range (should stay empty)
+
+Maintenance:
+    - create_message_partitions (celery-beat, daily) keeps the current month
+      and MESSAGE_PARTITION_CONFIG.PREMAKE_MONTHS ahead created
+    - Rows that reached the default partition before their month existed are
+      moved into the new partition when it is created
+    - Old partitions are detached with the detach_message_partitions command.
+      A detached partition is an ordinary table that can be archived
+      (pg_dump) and dropped; its messages disappear from the API
+
+Design Decisions:
+    - The primary key is (id, created_at) because unique constraints on a
+      partitioned table must include the partition key. IDs still come from
+      one sequence, so id alone stays unique in practice
+    - Foreign keys into chat_message are not enforced by the database
+      (db_constraint=False); Django still applies on_delete in Python
+
+Usage:
+    from chat.partitions import MessagePartitions
+
+    MessagePartitions.ensure()
+    MessagePartitions.detach_before(cutoff)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.services import BaseService, ServiceResult
+
+from chat.constants import MESSAGE_PARTITION_CONFIG
+
+# Partition bounds as printed by pg_get_expr(relpartbound)
+BOUND_RE = re.compile(r"FROM \((?P<start>[^)]*)\) TO \((?P<end>[^)]*)\)")
+
+
+@dataclass
+class MessagePartition:
+    """
+    One partition of chat_message.
+
+    start is None for the legacy partition (FROM MINVALUE); both bounds are
+    None for the default partition.
+    """
+
+    name: str
+    start: datetime | None
+    end: datetime | None
+
+    @property
+    def is_default(self) -> bool:
+        """Check if this is the catch-all default partition."""
+        return self.start is None and self.end is None
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the first instant of value's month in UTC."""
+    value = value.astimezone(dt_timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Return the first instant of the month `months` after value's month."""
+    index = value.year * 12 + value.month - 1 + months
+    return month_start(value).replace(year=index // 12, month=index % 12 + 1)
+
+
+def _parse_bound(bound: str) -> datetime | None:
+    """Parse one side of a range bound ('2026-11-01 00:00:00+00' or MINVALUE)."""
+    if bound in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(bound.strip("'"))
+
+
+class MessagePartitions(BaseService):
+    """
+    Creation, listing and detaching of chat_message partitions.
+
+    All methods are classmethods and run DDL on the default connection.
+    """
+
+    # Partitions of chat_message with their bound expressions
+    LIST_SQL = """
+    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+    FROM pg_inherits AS i
+    JOIN pg_class AS c ON c.oid = i.inhrelid
+    WHERE i.inhparent = %s::regclass
+    ORDER BY c.relname
+    """
+
+    # Move rows that landed in the default partition into a new partition
+    MOVE_FROM_DEFAULT_SQL = """
+    WITH moved AS (
+        DELETE FROM {default}
+        WHERE created_at >= %s AND created_at < %s
+        RETURNING *
+    )
+    INSERT INTO {partition} SELECT * FROM moved
+    """
+
+    @classmethod
+    def list_partitions(cls) -> list[MessagePartition]:
+        """
+        List partitions of chat_message, oldest first, default last.
+
+        Returns:
+            List of MessagePartition
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(cls.LIST_SQL, [MESSAGE_PARTITION_CONFIG.TABLE])
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = BOUND_RE.search(bound)
+            if match is None:
+                partitions.append(MessagePartition(name, None, None))
+                continue
+            partitions.append(
+                MessagePartition(
+                    name,
+                    _parse_bound(match.group("start")),
+                    _parse_bound(match.group("end")),
+                )
+            )
+
+        epoch = datetime.min.replace(tzinfo=dt_timezone.utc)
+        return sorted(
+            partitions, key=lambda p: (p.is_default, p.start or epoch, p.name)
+        )
+
+    @classmethod
+    def ensure(
+        cls,
+        months_ahead: int = MESSAGE_PARTITION_CONFIG.PREMAKE_MONTHS,
+        now: datetime | None = None,
+    ) -> ServiceResult[list[str]]:
+        """
+        Create partitions for the current month and the months ahead.
+
+        Months already covered by a partition (including the legacy one) are
+        skipped, so running this repeatedly is harmless.
+
+        Args:
+            months_ahead: Number of future months to create
+            now: Reference time (defaults to now)
+
+        Returns:
+            ServiceResult with names of the partitions created
+
+        Error codes:
+            NOT_PARTITIONED: chat_message is not a partitioned table
+        """
+        partitions = cls.list_partitions()
+        if not partitions:
+            return ServiceResult.failure(
+                "chat_message is not partitioned",
+                error_code="NOT_PARTITIONED",
+            )
+
+        current = month_start(now or timezone.now())
+        created = []
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            end = add_months(current, offset + 1)
+            if any(cls._overlaps(p, start, end) for p in partitions):
+                continue
+            name = start.strftime(MESSAGE_PARTITION_CONFIG.NAME_FORMAT)
+            cls._create(name, start, end)
+            partitions.append(MessagePartition(name, start, end))
+            created.append(name)
+
+        if created:
+            cls.get_logger().info(f"Created message partitions: {created}")
+
+        return ServiceResult.success(created)
+
+    @classmethod
+    def detach_before(
+        cls, cutoff: datetime, drop: bool = False
+    ) -> ServiceResult[list[str]]:
+        """
+        Detach partitions whose whole range is older than cutoff.
+
+        Detached partitions become standalone tables (for archiving) unless
+        drop is set. Their messages are no longer visible to the API.
+
+        Args:
+            cutoff: Partitions ending at or before this time are detached
+            drop: Drop the detached tables as well
+
+        Returns:
+            ServiceResult with names of the partitions detached
+        """
+        table = connection.ops.quote_name(MESSAGE_PARTITION_CONFIG.TABLE)
+        detached = []
+        for partition in cls.list_partitions():
+            if partition.is_default or partition.end > cutoff:
+                continue
+            name = connection.ops.quote_name(partition.name)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {name}")
+            detached.append(partition.name)
+
+        if detached:
+            cls.get_logger().info(
+                f"{'Dropped' if drop else 'Detached'} message partitions: {detached}"
+            )
+
+        return ServiceResult.success(detached)
+
+    @staticmethod
+    def _overlaps(partition: MessagePartition, start: datetime, end: datetime):
+        """Check if a partition's range intersects [start, end)."""
+        if partition.is_default:
+            return False
+        return (partition.start is None or partition.start < end) and (
+            partition.end is None or partition.end > start
+        )
+
+    @classmethod
+    def _create(cls, name: str, start: datetime, end: datetime) -> None:
+        """
+        Create and attach one monthly partition.
+
+        The table is created standalone, filled with any matching rows from
+        the default partition, then attached; attaching directly would fail
+        while the default partition holds rows of the new range.
+        """
+        quote = connection.ops.quote_name
+        table = quote(MESSAGE_PARTITION_CONFIG.TABLE)
+        partition = quote(name)
+        default = quote(MESSAGE_PARTITION_CONFIG.DEFAULT_PARTITION)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {partition} "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+            cursor.execute(
+                cls.MOVE_FROM_DEFAULT_SQL.format(default=default, partition=partition),
+                [start, end],
+            )
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
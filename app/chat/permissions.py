@@ -32,6 +32,8 @@ Permission Hierarchy:
 
 Design Decisions:
     - Permissions check against Participant model, not User
+    - Membership and roles are read through MembershipCache, memoized per
+      request so stacked permission classes share one lookup
     - Active participant = left_at IS NULL
     - Permission classes are composable via DRF's AND logic
     - View-level permissions use get_object() for efficiency
@@ -43,6 +45,7 @@ from typing import TYPE_CHECKING
 
 from rest_framework import permissions
 
+from chat.membership import MembershipCache
 from chat.models import Conversation, ConversationType, Participant, ParticipantRole
 
 if TYPE_CHECKING:
@@ -71,18 +74,16 @@ class IsConversationParticipant(permissions.BasePermission):
         from chat.models import Message
 
         # Handle Conversation, Participant, and Message objects
-        if isinstance(obj, Participant):
-            conversation = obj.conversation
-        elif isinstance(obj, Message):
-            conversation = obj.conversation
+        if isinstance(obj, (Participant, Message)):
+            conversation_id = obj.conversation_id
         else:
-            conversation = obj
+            conversation_id = obj.id
 
-        return Participant.objects.filter(
-            conversation=conversation,
-            user=request.user,
-            left_at__isnull=True,
-        ).exists()
+        return MembershipCache.is_member(
+            conversation_id,
+            request.user.id,
+            memo=MembershipCache.get_request_memo(request),
+        )
 
 
 class IsConversationOwner(permissions.BasePermission):
@@ -106,16 +107,16 @@ class IsConversationOwner(permissions.BasePermission):
 
         # Handle both Conversation and Participant objects
         if isinstance(obj, Participant):
-            conversation = obj.conversation
+            conversation_id = obj.conversation_id
         else:
-            conversation = obj
+            conversation_id = obj.id
 
-        return Participant.objects.filter(
-            conversation=conversation,
-            user=request.user,
-            role=ParticipantRole.OWNER,
-            left_at__isnull=True,
-        ).exists()
+        role = MembershipCache.get_role(
+            conversation_id,
+            request.user.id,
+            memo=MembershipCache.get_request_memo(request),
+        )
+        return role == ParticipantRole.OWNER
 
 
 class IsConversationAdminOrOwner(permissions.BasePermission):
@@ -139,16 +140,16 @@ class IsConversationAdminOrOwner(permissions.BasePermission):
 
         # Handle both Conversation and Participant objects
         if isinstance(obj, Participant):
-            conversation = obj.conversation
+            conversation_id = obj.conversation_id
         else:
-            conversation = obj
+            conversation_id = obj.id
 
-        return Participant.objects.filter(
-            conversation=conversation,
-            user=request.user,
-            role__in=[ParticipantRole.OWNER, ParticipantRole.ADMIN],
-            left_at__isnull=True,
-        ).exists()
+        role = MembershipCache.get_role(
+            conversation_id,
+            request.user.id,
+            memo=MembershipCache.get_request_memo(request),
+        )
+        return role in (ParticipantRole.OWNER, ParticipantRole.ADMIN)
 
 
 class CanManageParticipants(permissions.BasePermission):
@@ -187,32 +188,30 @@ class CanManageParticipants(permissions.BasePermission):
 
         # Get conversation from object
         if isinstance(obj, Participant):
-            conversation = obj.conversation
+            conversation_id = obj.conversation_id
             target_participant = obj
         else:
-            conversation = obj
+            conversation_id = obj.id
             target_participant = None
 
-        # Get current user's participant record
-        try:
-            actor = Participant.objects.get(
-                conversation=conversation,
-                user=request.user,
-                left_at__isnull=True,
-            )
-        except Participant.DoesNotExist:
+        # Get current user's role (must be an active participant)
+        memo = MembershipCache.get_request_memo(request)
+        if not MembershipCache.is_member(conversation_id, request.user.id, memo=memo):
             return False
+        actor_role = MembershipCache.get_role(
+            conversation_id, request.user.id, memo=memo
+        )
 
         # For creating participants (POST), check role in request data
         if request.method == "POST":
             requested_role = request.data.get("role", ParticipantRole.MEMBER)
 
             # OWNER can add admins or members
-            if actor.role == ParticipantRole.OWNER:
+            if actor_role == ParticipantRole.OWNER:
                 return requested_role in [ParticipantRole.ADMIN, ParticipantRole.MEMBER]
 
             # ADMIN can only add members
-            if actor.role == ParticipantRole.ADMIN:
+            if actor_role == ParticipantRole.ADMIN:
                 return requested_role == ParticipantRole.MEMBER
 
             return False
@@ -220,16 +219,16 @@ class CanManageParticipants(permissions.BasePermission):
         # For removing participants (DELETE)
         if request.method == "DELETE" and target_participant:
             # Cannot remove yourself via this endpoint (use leave)
-            if target_participant.user == request.user:
+            if target_participant.user_id == request.user.id:
                 self.message = "Use the leave endpoint to remove yourself."
                 return False
 
             # OWNER can remove anyone
-            if actor.role == ParticipantRole.OWNER:
+            if actor_role == ParticipantRole.OWNER:
                 return True
 
             # ADMIN can only remove members
-            if actor.role == ParticipantRole.ADMIN:
+            if actor_role == ParticipantRole.ADMIN:
                 return target_participant.role == ParticipantRole.MEMBER
 
             return False
@@ -237,7 +236,7 @@ class CanManageParticipants(permissions.BasePermission):
         # For updating participant role (PATCH)
         if request.method in ["PATCH", "PUT"] and target_participant:
             # Only owner can change roles
-            return actor.role == ParticipantRole.OWNER
+            return actor_role == ParticipantRole.OWNER
 
         return True
 
@@ -0,0 +1,330 @@
+"""
+Debounced read receipts for WebSocket read frames.
+
+Clients send a read frame whenever new messages scroll into view, and each
+one used to update the participant row and broadcast a receipt. With
+CHAT_DEBOUNCED_READS_ENABLED, read frames are collapsed per
+(conversation, user) in Redis and the flush_read_receipts Celery task
+applies them with one bulk UPDATE, then broadcasts one compact receipt
+event per conversation.
+
+Buffered Data:
+    chat:reads:pending: {"conversation_id:user_id": newest read_at (epoch us)}
+
+Staleness:
+    - Flushed every READ_RECEIPT_CONFIG.FLUSH_INTERVAL_SECONDS by celery-beat
+    - last_read_at, unread_count and receipts seen by other participants lag
+      read frames by at most one flush interval plus flush time
+    - The REST read endpoint and mark_all_as_read stay synchronous
+
+Design Decisions:
+    - last_read_at only moves forward, so a late flush cannot undo a newer
+      synchronous read
+    - unread_count is recomputed from messages after read_at, so messages
+      that arrive between the read frame and the flush stay unread
+    - The participant rows are locked before the recount, so the UPDATE's
+      snapshot includes every send whose unread increment already committed,
+      and later sends wait and increment on top of the recount
+    - A flush renames the live hash to a snapshot key and deletes it only
+      after the database commit; a failed flush is retried from the same
+      snapshot
+    - Flushes hold a lock with a random token, and the snapshot is deleted
+      by compare-and-delete on it, so a flush whose lock expired never
+      deletes a snapshot a newer flush has not applied yet. Applying a
+      snapshot twice is harmless, so no further fencing is needed
+    - If Redis is unavailable the read is applied directly instead
+
+Usage:
+    from chat.read_receipts import ReadReceipts
+
+    if ReadReceipts.is_enabled():
+        ReadReceipts.record(conversation.id, user.id)
+
+    # In the Celery task
+    ReadReceipts.flush()
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from core.services import BaseService, ServiceResult
+
+from chat.constants import READ_RECEIPT_CONFIG
+
+# Buffered timestamps are stored as exact integer microseconds since the epoch
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class ReadReceipts(BaseService):
+    """
+    Redis buffer for participant read positions.
+
+    All methods are classmethods; the buffer is shared by every process of a
+    deployment.
+    """
+
+    # Keep the newest read timestamp per (conversation, user)
+    # Keys: [hash_key]
+    # Args: [field, epoch_microseconds]
+    LUA_SET_MAX = """
+    local current = redis.call('HGET', KEYS[1], ARGV[1])
+    if not current or tonumber(current) < tonumber(ARGV[2]) then
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    end
+    return 1
+    """
+
+    # Move the live hash to the snapshot key unless a snapshot is pending
+    # Keys: [live_key, snapshot_key]
+    LUA_SNAPSHOT = """
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        return 1
+    end
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        redis.call('RENAME', KEYS[1], KEYS[2])
+        return 1
+    end
+    return 0
+    """
+
+    # Delete keys only if the flush lock still holds our token
+    # Keys: [lock_key, key_to_delete]
+    # Args: [lock_token]
+    LUA_RELEASE = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[2])
+    end
+    return 0
+    """
+
+    # Lock the participant rows a flush updates, in a consistent order; a
+    # send that already incremented unread_count commits first
+    LOCK_READERS_SQL = """
+    SELECT p.id
+    FROM chat_participant AS p
+    JOIN unnest(%s::bigint[], %s::uuid[]) AS r(conversation_id, user_id)
+        ON p.conversation_id = r.conversation_id AND p.user_id = r.user_id
+    WHERE p.left_at IS NULL
+    ORDER BY p.id
+    FOR UPDATE OF p
+    """
+
+    # Apply many reads in one statement; unread counts are recomputed from
+    # the messages after each read position (same rule as
+    # MessageService.rebuild_unread_counts)
+    APPLY_READS_SQL = """
+    UPDATE chat_participant AS p
+    SET
+        last_read_at = r.read_at,
+        unread_count = (
+            SELECT COUNT(*)
+            FROM chat_message AS m
+            WHERE m.conversation_id = p.conversation_id
+              AND m.created_at > r.read_at
+              AND m.sender_id IS DISTINCT FROM p.user_id
+        ),
+        updated_at = NOW()
+    FROM unnest(%s::bigint[], %s::uuid[], %s::timestamptz[])
+        AS r(conversation_id, user_id, read_at)
+    WHERE p.conversation_id = r.conversation_id
+      AND p.user_id = r.user_id
+      AND p.left_at IS NULL
+      AND (p.last_read_at IS NULL OR p.last_read_at < r.read_at)
+    RETURNING p.conversation_id, p.user_id, p.last_read_at
+    """
+
+    FLUSH_LOCK_KEY = "chat:reads:lock"
+    FLUSH_LOCK_TTL_SECONDS = 60
+
+    # Cached registered Lua scripts (initialized lazily)
+    _lua_set_max = None
+    _lua_snapshot = None
+    _lua_release = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Check whether this deployment debounces WebSocket read frames."""
+        return getattr(settings, "CHAT_DEBOUNCED_READS_ENABLED", False)
+
+    @staticmethod
+    def _get_redis_client():
+        """Get raw Redis client from django-redis."""
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    @classmethod
+    def _get_lua_set_max(cls, redis_client):
+        """Get cached Lua script for keeping the newest read timestamp."""
+        if cls._lua_set_max is None:
+            cls._lua_set_max = redis_client.register_script(cls.LUA_SET_MAX)
+        return cls._lua_set_max
+
+    @classmethod
+    def _get_lua_snapshot(cls, redis_client):
+        """Get cached Lua script for snapshotting the buffer."""
+        if cls._lua_snapshot is None:
+            cls._lua_snapshot = redis_client.register_script(cls.LUA_SNAPSHOT)
+        return cls._lua_snapshot
+
+    @classmethod
+    def _get_lua_release(cls, redis_client):
+        """Get cached Lua script for deleting keys while holding the lock."""
+        if cls._lua_release is None:
+            cls._lua_release = redis_client.register_script(cls.LUA_RELEASE)
+        return cls._lua_release
+
+    @classmethod
+    def record(
+        cls, conversation_id: int, user_id, read_at: datetime | None = None
+    ) -> None:
+        """
+        Buffer a read position for a participant.
+
+        Args:
+            conversation_id: Conversation that was read
+            user_id: Reader's user ID
+            read_at: Read timestamp (defaults to now)
+
+        Falls back to a direct UPDATE and broadcast if Redis is unavailable.
+        """
+        read_at = read_at or timezone.now()
+        epoch_us = (read_at - EPOCH) // MICROSECOND
+        try:
+            cls._get_lua_set_max(cls._get_redis_client())(
+                keys=[READ_RECEIPT_CONFIG.KEY_PENDING],
+                args=[f"{conversation_id}:{user_id}", epoch_us],
+            )
+        except RedisError as e:
+            cls.get_logger().warning(f"Buffering read receipt failed: {e}")
+            with transaction.atomic():
+                applied = cls.apply({(conversation_id, str(user_id)): read_at})
+            cls.publish(applied)
+
+    @classmethod
+    def flush(cls) -> ServiceResult[int]:
+        """
+        Apply buffered reads to the database and broadcast receipts.
+
+        Returns:
+            ServiceResult with number of participants whose read position
+            moved forward
+
+        Error codes:
+            FLUSH_IN_PROGRESS: Another flush holds the lock
+        """
+        redis_client = cls._get_redis_client()
+        token = str(uuid.uuid4())
+        if not redis_client.set(
+            cls.FLUSH_LOCK_KEY, token, nx=True, ex=cls.FLUSH_LOCK_TTL_SECONDS
+        ):
+            return ServiceResult.failure(
+                "Another flush is in progress",
+                error_code="FLUSH_IN_PROGRESS",
+            )
+
+        snapshot_key = READ_RECEIPT_CONFIG.KEY_FLUSHING
+        release = cls._get_lua_release(redis_client)
+        try:
+            if not cls._get_lua_snapshot(redis_client)(
+                keys=[READ_RECEIPT_CONFIG.KEY_PENDING, snapshot_key]
+            ):
+                return ServiceResult.success(0)
+
+            reads = {}
+            for field, value in redis_client.hgetall(snapshot_key).items():
+                conversation_id, user_id = field.decode().split(":")
+                read_at = EPOCH + int(value) * MICROSECOND
+                reads[(int(conversation_id), user_id)] = read_at
+
+            with transaction.atomic():
+                applied = cls.apply(reads)
+            release(keys=[cls.FLUSH_LOCK_KEY, snapshot_key], args=[token])
+        finally:
+            release(keys=[cls.FLUSH_LOCK_KEY, cls.FLUSH_LOCK_KEY], args=[token])
+
+        cls.publish(applied)
+
+        if applied:
+            cls.get_logger().debug(f"Flushed {len(applied)} read receipts")
+
+        return ServiceResult.success(len(applied))
+
+    @classmethod
+    def apply(cls, reads: dict[tuple[int, str], datetime]) -> list[tuple]:
+        """
+        Move read positions forward in one UPDATE.
+
+        Must be called inside a transaction: the participant rows are locked
+        first so the unread recount cannot miss a concurrent send's
+        increment (the UPDATE alone counts under its own snapshot, and the
+        row recheck after waiting on a sender's lock would drop the +1).
+
+        Args:
+            reads: {(conversation_id, user_id): read_at}
+
+        Returns:
+            (conversation_id, user_id, last_read_at) of the updated rows
+        """
+        if not reads:
+            return []
+
+        keys = list(reads)
+        conversation_ids = [conversation_id for conversation_id, _ in keys]
+        user_ids = [user_id for _, user_id in keys]
+        with connection.cursor() as cursor:
+            cursor.execute(cls.LOCK_READERS_SQL, [conversation_ids, user_ids])
+            cursor.execute(
+                cls.APPLY_READS_SQL,
+                [conversation_ids, user_ids, [reads[key] for key in keys]],
+            )
+            return cursor.fetchall()
+
+    @classmethod
+    def publish(cls, applied: list[tuple]) -> None:
+        """
+        Broadcast one chat.receipts event per conversation.
+
+        Each event lists the participants whose read position moved, so a
+        burst of read frames reaches the group as a single delta.
+        Publishing is best-effort: a channel layer failure is logged.
+
+        Args:
+            applied: (conversation_id, user_id, last_read_at) rows
+        """
+        channel_layer = get_channel_layer()
+        if channel_layer is None or not applied:
+            return
+
+        reads_by_conversation = defaultdict(list)
+        for conversation_id, user_id, read_at in applied:
+            reads_by_conversation[conversation_id].append(
+                {"user_id": str(user_id), "read_at": read_at.isoformat()}
+            )
+
+        async def send_all():
+            for conversation_id, reads in reads_by_conversation.items():
+                await channel_layer.group_send(
+                    f"chat_{conversation_id}",
+                    {
+                        "type": "chat.receipts",
+                        "conversation_id": conversation_id,
+                        "reads": reads,
+                    },
+                )
+
+        try:
+            async_to_sync(send_all)()
+        except Exception as e:
+            cls.get_logger().warning(f"Failed to publish read receipts: {e}")
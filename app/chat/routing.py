@@ -5,6 +5,7 @@ This module defines the URL patterns for WebSocket connections,
 mapping paths to their corresponding consumers.
 
 URL Patterns:
+    ws/chat/ - One multiplexed connection for all of the user's conversations
     ws/chat/<conversation_id>/ - Connect to a specific conversation
 
 Authentication:
@@ -18,6 +19,10 @@ from django.urls import path
 from chat import consumers
 
 websocket_urlpatterns = [
+    path(
+        "ws/chat/",
+        consumers.UserConsumer.as_asgi(),
+    ),
     path(
         "ws/chat/<uuid:conversation_id>/",
         consumers.ChatConsumer.as_asgi(),
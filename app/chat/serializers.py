@@ -37,6 +37,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from authentication.serializers import UserSerializer
+from chat.constants import PRESENCE_CONFIG, SYNC_CONFIG
 from chat.models import (
     Conversation,
     ConversationType,
@@ -205,6 +206,56 @@ class MessageSerializer(serializers.ModelSerializer):
         return obj.content
 
 
+class SyncMessageSerializer(MessageSerializer):
+    """
+    Message serializer for delta sync.
+
+    Adds reaction counts so a reconnecting client can apply reaction changes
+    without fetching each message's reactions.
+    """
+
+    reaction_counts = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+    class Meta(MessageSerializer.Meta):
+        fields = MessageSerializer.Meta.fields + ["reaction_counts"]
+        read_only_fields = fields
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for the delta-sync endpoint.
+    """
+
+    cursor = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        help_text="Cursor from the previous sync; omit to get the current head",
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=SYNC_CONFIG.MAX_LIMIT,
+        default=SYNC_CONFIG.DEFAULT_LIMIT,
+        help_text="Maximum number of changes to read",
+    )
+
+
+class SyncResponseSerializer(serializers.Serializer):
+    """
+    Response serializer for the delta-sync endpoint.
+
+    Each changed message appears once, in its current state; deleted
+    messages are listed by ID only.
+    """
+
+    cursor = serializers.IntegerField()
+    has_more = serializers.BooleanField()
+    messages = SyncMessageSerializer(many=True)
+    deleted_message_ids = serializers.ListField(child=serializers.IntegerField())
+
+
 class MessageCreateSerializer(serializers.Serializer):
     """
     Serializer for sending messages.
@@ -356,6 +407,19 @@ class SearchResponseSerializer(serializers.Serializer):
     has_more = serializers.BooleanField()
 
 
+class UnreadTotalSerializer(serializers.Serializer):
+    """
+    Response serializer for the global unread badge endpoint.
+
+    Fields:
+        unread_count: Total unread messages across all conversations
+        unread_conversations: Number of conversations with unread messages
+    """
+
+    unread_count = serializers.IntegerField()
+    unread_conversations = serializers.IntegerField()
+
+
 # =============================================================================
 # Presence Serializers
 # =============================================================================
@@ -402,6 +466,30 @@ class BulkPresenceRequestSerializer(serializers.Serializer):
     )
 
 
+class BatchHeartbeatSerializer(serializers.Serializer):
+    """
+    Input serializer for a heartbeat covering several open conversations.
+    """
+
+    conversation_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        max_length=PRESENCE_CONFIG.MAX_BATCH_HEARTBEAT_CONVERSATIONS,
+        help_text="Conversations currently open in the client",
+    )
+
+
+class BatchHeartbeatResultSerializer(PresenceSerializer):
+    """
+    Serializer for batch heartbeat results.
+
+    Rejected IDs are conversations the user is not an active participant in;
+    they are skipped without failing the rest of the batch.
+    """
+
+    conversation_ids = serializers.ListField(child=serializers.IntegerField())
+    rejected_conversation_ids = serializers.ListField(child=serializers.IntegerField())
+
+
 # =============================================================================
 # Participant Serializers
 # =============================================================================
@@ -520,28 +608,44 @@ class ConversationListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_unread_count(self, obj: Conversation) -> int:
-        """Count messages after user's last_read_at."""
+    def _get_viewer(self) -> User | None:
+        """Get the authenticated request user, if any."""
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
-            return 0
+            return None
+        return request.user
 
-        user = request.user
-        participant = obj.participants.filter(user=user, left_at__isnull=True).first()
+    @staticmethod
+    def _get_prefetched_participants(obj: Conversation) -> list[Participant] | None:
+        """
+        Get participants precomputed by ConversationQuerySet.with_list_data.
+
+        Returns None when the conversation was not loaded through the list
+        queryset (e.g. freshly created), so callers fall back to queries.
+        """
+        return getattr(obj, "prefetched_participants", None)
 
-        if not participant:
+    def get_unread_count(self, obj: Conversation) -> int:
+        """Get the viewer's denormalized unread counter."""
+        viewer = self._get_viewer()
+        if viewer is None:
             return 0
 
-        queryset = obj.messages.exclude(sender=user)
+        if hasattr(obj, "viewer_unread_count"):
+            return obj.viewer_unread_count
 
-        if participant.last_read_at:
-            queryset = queryset.filter(created_at__gt=participant.last_read_at)
+        participant = obj.participants.filter(user=viewer, left_at__isnull=True).first()
 
-        return queryset.count()
+        return participant.unread_count if participant else 0
 
     def get_last_message(self, obj: Conversation) -> dict | None:
         """Get most recent message preview."""
-        last_message = obj.messages.order_by("-created_at").first()
+        prefetched = getattr(obj, "prefetched_last_message", None)
+        if prefetched is not None:
+            last_message = prefetched[0] if prefetched else None
+        else:
+            last_message = obj.messages.order_by("-created_at").first()
+
         if last_message:
             return MessagePreviewSerializer(last_message).data
         return None
@@ -557,13 +661,19 @@ class ConversationListSerializer(serializers.ModelSerializer):
             return obj.title
 
         if obj.conversation_type == ConversationType.DIRECT:
-            request = self.context.get("request")
-            if request and request.user.is_authenticated:
-                other = (
-                    obj.participants.exclude(user=request.user)
-                    .select_related("user")
-                    .first()
-                )
+            viewer = self._get_viewer()
+            if viewer is not None:
+                participants = self._get_prefetched_participants(obj)
+                if participants is not None:
+                    other = next(
+                        (p for p in participants if p.user_id != viewer.id), None
+                    )
+                else:
+                    other = (
+                        obj.participants.exclude(user=viewer)
+                        .select_related("user")
+                        .first()
+                    )
                 if other:
                     return other.user.get_full_name() or other.user.email
 
@@ -571,15 +681,21 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_other_participants(self, obj: Conversation) -> list[dict]:
         """Get list of other participant info (for display)."""
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
+        viewer = self._get_viewer()
+        if viewer is None:
             return []
 
-        others = (
-            obj.participants.filter(left_at__isnull=True)
-            .exclude(user=request.user)
-            .select_related("user__profile")[:5]
-        )  # Limit for performance
+        participants = self._get_prefetched_participants(obj)
+        if participants is not None:
+            others = [
+                p for p in participants if p.is_active and p.user_id != viewer.id
+            ][:5]
+        else:
+            others = (
+                obj.participants.filter(left_at__isnull=True)
+                .exclude(user=viewer)
+                .select_related("user__profile")[:5]
+            )  # Limit for performance
 
         result = []
         for p in others:
@@ -618,23 +734,34 @@ class ConversationDetailSerializer(ConversationListSerializer):
 
     def get_participants(self, obj: Conversation) -> list[dict]:
         """Get all active participants."""
-        participants = (
-            obj.participants.filter(left_at__isnull=True)
-            .select_related("user__profile")
-            .order_by("joined_at")
-        )
+        prefetched = self._get_prefetched_participants(obj)
+        if prefetched is not None:
+            participants = [p for p in prefetched if p.is_active]
+        else:
+            participants = (
+                obj.participants.filter(left_at__isnull=True)
+                .select_related("user__profile")
+                .order_by("joined_at")
+            )
         return ParticipantSerializer(participants, many=True).data
 
     def get_current_user_role(self, obj: Conversation) -> str | None:
         """Get current user's role in conversation."""
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
+        viewer = self._get_viewer()
+        if viewer is None:
             return None
 
-        participant = obj.participants.filter(
-            user=request.user,
-            left_at__isnull=True,
-        ).first()
+        prefetched = self._get_prefetched_participants(obj)
+        if prefetched is not None:
+            participant = next(
+                (p for p in prefetched if p.is_active and p.user_id == viewer.id),
+                None,
+            )
+        else:
+            participant = obj.participants.filter(
+                user=viewer,
+                left_at__isnull=True,
+            ).first()
 
         return participant.role if participant else None
 
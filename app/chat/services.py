@@ -8,6 +8,7 @@ Services:
     ConversationService: Conversation lifecycle (create, update, delete)
     ParticipantService: Participant management (add, remove, leave, roles, ownership)
     MessageService: Message operations (send, delete, mark as read)
+    SyncService: Message change log and client delta sync
 
 Design Principles:
     - Services are stateless (use class methods)
@@ -44,20 +45,53 @@ from __future__ import annotations
 import json
 import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
-
-from django.db import transaction
-from django.db.models import F
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterable
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.db import connection, transaction
+from django.db.models import (
+    BigIntegerField,
+    Count,
+    DateTimeField,
+    Exists,
+    F,
+    Field,
+    FloatField,
+    Func,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from core.services import BaseService, ServiceResult
 
-from chat.constants import MESSAGE_CONFIG, PRESENCE_CONFIG, REACTION_CONFIG
+from chat.archive import MessageArchive
+from chat.coalescing import CoalescedUpdates
+from chat.constants import (
+    MESSAGE_CONFIG,
+    PRESENCE_CONFIG,
+    REACTION_CONFIG,
+    SYNC_CONFIG,
+)
+from chat.history_cache import MessageHistoryCache
+from chat.membership import MembershipCache
+from chat.read_receipts import ReadReceipts
 from chat.models import (
+    ArchivedMessage,
     Conversation,
     ConversationType,
     DirectConversationPair,
     Message,
+    MessageChange,
+    MessageChangeKind,
     MessageEditHistory,
     MessageReaction,
     MessageType,
@@ -171,6 +205,10 @@ class ConversationService(BaseService):
                 role=None,
             )
 
+            MembershipCache.invalidate(
+                conversation.id, user_ids=[user_lower.id, user_higher.id]
+            )
+
         cls.get_logger().info(
             f"Created direct conversation {conversation.id} "
             f"between users {user_lower.id} and {user_higher.id}"
@@ -240,6 +278,11 @@ class ConversationService(BaseService):
                     role=ParticipantRole.MEMBER,
                 )
 
+            MembershipCache.invalidate(
+                conversation.id,
+                user_ids=[creator.id, *(member.id for member in members)],
+            )
+
             # Create system message for group creation
             MessageService._create_system_message(
                 conversation=conversation,
@@ -498,6 +541,7 @@ class ParticipantService(BaseService):
                 user=user_to_add,
                 role=role,
             )
+            MembershipCache.invalidate(conversation.id, user_ids=[user_to_add.id])
 
             # Update participant count
             conversation.participant_count = F("participant_count") + 1
@@ -616,6 +660,7 @@ class ParticipantService(BaseService):
                     "updated_at",
                 ]
             )
+            MembershipCache.invalidate(conversation.id, user_ids=[user_to_remove.id])
 
             # Update participant count
             conversation.participant_count = F("participant_count") - 1
@@ -693,6 +738,7 @@ class ParticipantService(BaseService):
                     "updated_at",
                 ]
             )
+            MembershipCache.invalidate(conversation.id, user_ids=[user.id])
 
             # Update participant count
             conversation.participant_count = F("participant_count") - 1
@@ -831,6 +877,7 @@ class ParticipantService(BaseService):
         with transaction.atomic():
             target_participant.role = new_role
             target_participant.save(update_fields=["role", "updated_at"])
+            MembershipCache.invalidate(conversation.id)
 
             # Create system message
             MessageService._create_system_message(
@@ -925,6 +972,7 @@ class ParticipantService(BaseService):
             # Promote new owner
             new_participant.role = ParticipantRole.OWNER
             new_participant.save(update_fields=["role", "updated_at"])
+            MembershipCache.invalidate(conversation.id)
 
             # Create system message
             MessageService._create_system_message(
@@ -1036,9 +1084,24 @@ class MessageService(BaseService):
 
     Methods:
         send_message: Send a text message
+        asend_message: Async send_message for consumers
         delete_message: Soft delete a message
         mark_as_read: Update last_read_at for user
+        amark_as_read: Async mark_as_read for consumers
+        mark_all_as_read: Mark every conversation read in one UPDATE
         get_unread_count: Get count of unread messages
+        get_total_unread: Get unread totals across all conversations
+        rebuild_unread_counts: Recompute unread counters from message history
+    """
+
+    # Clear every unread active participation of one user
+    MARK_ALL_READ_SQL = """
+    UPDATE chat_participant
+    SET last_read_at = %(now)s, unread_count = 0, updated_at = %(now)s
+    WHERE user_id = %(user_id)s
+      AND left_at IS NULL
+      AND (unread_count > 0 OR last_read_at IS NULL)
+    RETURNING conversation_id
     """
 
     @classmethod
@@ -1066,6 +1129,139 @@ class MessageService(BaseService):
         Returns:
             ServiceResult with new Message
 
+        Error codes:
+            NOT_PARTICIPANT: User is not active in conversation
+            EMPTY_CONTENT: Message content cannot be empty
+            INVALID_PARENT: Parent message not in this conversation
+            CONVERSATION_DELETED: Cannot send to deleted conversation
+        """
+        validation = cls._validate_new_message(
+            conversation=conversation,
+            sender=sender,
+            content=content,
+            parent_message_id=parent_message_id,
+        )
+        if not validation.success:
+            return validation
+        content, parent_message = validation.data
+
+        coalesce = CoalescedUpdates.is_enabled()
+
+        with transaction.atomic():
+            # Create message
+            message = Message.objects.create(
+                conversation=conversation,
+                sender=sender,
+                message_type=MessageType.TEXT,
+                content=content,
+                parent_message=parent_message,
+            )
+
+            # Update conversation last_message_at
+            conversation.last_message_at = message.created_at
+            if not coalesce:
+                conversation.save(update_fields=["last_message_at", "updated_at"])
+
+            # Bump unread counters for every other active participant
+            cls._increment_unread_counts(conversation, exclude_user=sender)
+
+            # Update parent's reply_count if this is a reply
+            if parent_message and not coalesce:
+                parent_message.reply_count = F("reply_count") + 1
+                parent_message.save(update_fields=["reply_count", "updated_at"])
+
+            # Busy conversations: buffer both updates, flushed in bulk later
+            if coalesce:
+                transaction.on_commit(lambda: cls._record_coalesced_updates(message))
+
+            MessageHistoryCache.bump(conversation.id)
+            SyncService.record(
+                MessageChangeKind.CREATED, [(conversation.id, message.id)]
+            )
+
+        cls.get_logger().debug(
+            f"User {sender.id} sent message {message.id} "
+            f"to conversation {conversation.id}"
+        )
+
+        return ServiceResult.success(message)
+
+    @classmethod
+    async def asend_message(
+        cls,
+        conversation: Conversation,
+        sender: User,
+        content: str,
+        parent_message_id: int | None = None,
+    ) -> ServiceResult[Message]:
+        """
+        Async variant of send_message for the ASGI path.
+
+        Membership and content checks run on the event loop against the
+        async membership cache, so rejected sends never leave it. Accepted
+        sends run send_message in a single database_sync_to_async call: the
+        parent lookup, insert and counter updates share one transaction,
+        which the async ORM cannot open.
+
+        Args:
+            conversation: Target conversation
+            sender: User sending the message
+            content: Message text
+            parent_message_id: Optional ID of message to reply to
+
+        Returns:
+            ServiceResult with new Message
+
+        Error codes:
+            Same as send_message
+        """
+        if conversation.is_deleted:
+            return ServiceResult.failure(
+                "Cannot send messages to a deleted conversation",
+                error_code="CONVERSATION_DELETED",
+            )
+
+        if not await MembershipCache.ais_member(conversation.id, sender.id):
+            return ServiceResult.failure(
+                "You are not a participant in this conversation",
+                error_code="NOT_PARTICIPANT",
+            )
+
+        if not (content and content.strip()):
+            return ServiceResult.failure(
+                "Message content cannot be empty",
+                error_code="EMPTY_CONTENT",
+            )
+
+        return await database_sync_to_async(cls.send_message)(
+            conversation=conversation,
+            sender=sender,
+            content=content,
+            parent_message_id=parent_message_id,
+        )
+
+    @classmethod
+    def _validate_new_message(
+        cls,
+        conversation: Conversation,
+        sender: User,
+        content: str,
+        parent_message_id: int | None = None,
+    ) -> ServiceResult[tuple[str, Message | None]]:
+        """
+        Internal: Validate a new text message before it is stored.
+
+        Shared by send_message and write-behind enqueueing (chat.write_behind).
+
+        Args:
+            conversation: Target conversation
+            sender: User sending the message
+            content: Message text
+            parent_message_id: Optional ID of message to reply to
+
+        Returns:
+            ServiceResult with (stripped content, root parent message or None)
+
         Error codes:
             NOT_PARTICIPANT: User is not active in conversation
             EMPTY_CONTENT: Message content cannot be empty
@@ -1080,8 +1276,7 @@ class MessageService(BaseService):
             )
 
         # Check user is active participant
-        participant = conversation.get_active_participant_for_user(sender)
-        if not participant:
+        if not MembershipCache.is_member(conversation.id, sender.id):
             return ServiceResult.failure(
                 "You are not a participant in this conversation",
                 error_code="NOT_PARTICIPANT",
@@ -1112,31 +1307,7 @@ class MessageService(BaseService):
                     error_code="INVALID_PARENT",
                 )
 
-        with transaction.atomic():
-            # Create message
-            message = Message.objects.create(
-                conversation=conversation,
-                sender=sender,
-                message_type=MessageType.TEXT,
-                content=content,
-                parent_message=parent_message,
-            )
-
-            # Update conversation last_message_at
-            conversation.last_message_at = message.created_at
-            conversation.save(update_fields=["last_message_at", "updated_at"])
-
-            # Update parent's reply_count if this is a reply
-            if parent_message:
-                parent_message.reply_count = F("reply_count") + 1
-                parent_message.save(update_fields=["reply_count", "updated_at"])
-
-        cls.get_logger().debug(
-            f"User {sender.id} sent message {message.id} "
-            f"to conversation {conversation.id}"
-        )
-
-        return ServiceResult.success(message)
+        return ServiceResult.success((content, parent_message))
 
     @classmethod
     def delete_message(
@@ -1198,9 +1369,14 @@ class MessageService(BaseService):
             )
 
         # Soft delete
-        message.is_deleted = True
-        message.deleted_at = timezone.now()
-        message.save(update_fields=["is_deleted", "deleted_at", "updated_at"])
+        with transaction.atomic():
+            message.is_deleted = True
+            message.deleted_at = timezone.now()
+            message.save(update_fields=["is_deleted", "deleted_at", "updated_at"])
+            SyncService.record(
+                MessageChangeKind.DELETED, [(conversation.id, message.id)]
+            )
+        MessageHistoryCache.bump(conversation.id)
 
         cls.get_logger().info(
             f"User {user.id} deleted message {message.id} "
@@ -1331,6 +1507,10 @@ class MessageService(BaseService):
 
             # Refresh to get the actual edit_count value (not F() expression)
             message.refresh_from_db()
+            MessageHistoryCache.bump(message.conversation_id)
+            SyncService.record(
+                MessageChangeKind.EDITED, [(message.conversation_id, message.id)]
+            )
 
         cls.get_logger().info(
             f"User {user.id} edited message {message.id} (edit #{message.edit_count})"
@@ -1347,7 +1527,8 @@ class MessageService(BaseService):
         """
         Get edit history for a message.
 
-        Only conversation participants can view edit history.
+        Only conversation participants can view edit history. Archived
+        messages return the history embedded in their archive row.
 
         Args:
             user: User requesting history
@@ -1360,10 +1541,15 @@ class MessageService(BaseService):
             MESSAGE_NOT_FOUND: Message does not exist
             NOT_PARTICIPANT: User is not in the conversation
         """
-        # Get the message
-        try:
-            message = Message.objects.select_related("conversation").get(id=message_id)
-        except Message.DoesNotExist:
+        # Get the message, reading through to the archive for cold messages
+        message = (
+            Message.objects.select_related("conversation").filter(id=message_id).first()
+        ) or (
+            ArchivedMessage.objects.select_related("conversation")
+            .filter(id=message_id)
+            .first()
+        )
+        if message is None:
             return ServiceResult.failure(
                 "Message not found",
                 error_code="MESSAGE_NOT_FOUND",
@@ -1377,8 +1563,11 @@ class MessageService(BaseService):
                 error_code="NOT_PARTICIPANT",
             )
 
-        # Get edit history (ordered by created_at descending per model Meta)
-        history = list(message.edit_history.all())
+        # Get edit history (newest first)
+        if isinstance(message, ArchivedMessage):
+            history = MessageArchive.edit_history(message)
+        else:
+            history = list(message.edit_history.all())
 
         return ServiceResult.success(history)
 
@@ -1411,7 +1600,59 @@ class MessageService(BaseService):
             )
 
         participant.last_read_at = timezone.now()
-        participant.save(update_fields=["last_read_at", "updated_at"])
+        participant.unread_count = 0
+        participant.save(update_fields=["last_read_at", "unread_count", "updated_at"])
+
+        cls.get_logger().debug(
+            f"User {user.id} marked conversation {conversation.id} as read"
+        )
+
+        return ServiceResult.success(None)
+
+    @classmethod
+    async def amark_as_read(
+        cls,
+        conversation: Conversation,
+        user: User,
+    ) -> ServiceResult[None]:
+        """
+        Async variant of mark_as_read for the ASGI path.
+
+        Resets the active participation in one UPDATE instead of loading and
+        saving the Participant, run in a single database_sync_to_async call.
+
+        Args:
+            conversation: Conversation to mark as read
+            user: User marking as read
+
+        Returns:
+            ServiceResult with None on success
+
+        Error codes:
+            NOT_PARTICIPANT: User is not in this conversation
+        """
+        return await database_sync_to_async(cls._mark_participant_read)(
+            conversation, user
+        )
+
+    @classmethod
+    def _mark_participant_read(
+        cls,
+        conversation: Conversation,
+        user: User,
+    ) -> ServiceResult[None]:
+        """Internal: Reset the user's active participation in one UPDATE."""
+        now = timezone.now()
+        updated = Participant.objects.filter(
+            conversation=conversation,
+            user=user,
+            left_at__isnull=True,
+        ).update(last_read_at=now, unread_count=0, updated_at=now)
+        if not updated:
+            return ServiceResult.failure(
+                "You are not a participant in this conversation",
+                error_code="NOT_PARTICIPANT",
+            )
 
         cls.get_logger().debug(
             f"User {user.id} marked conversation {conversation.id} as read"
@@ -1419,6 +1660,40 @@ class MessageService(BaseService):
 
         return ServiceResult.success(None)
 
+    @classmethod
+    def mark_all_as_read(cls, user: User) -> ServiceResult[int]:
+        """
+        Mark all of a user's conversations as read.
+
+        Runs as a single UPDATE over the user's active participations that
+        have anything unread, then broadcasts read receipts to those
+        conversations after commit.
+
+        Args:
+            user: User marking everything as read
+
+        Returns:
+            ServiceResult with number of conversations marked read
+        """
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                cls.MARK_ALL_READ_SQL,
+                {"user_id": user.id, "now": now},
+            )
+            conversation_ids = [row[0] for row in cursor.fetchall()]
+
+        receipts = [
+            (conversation_id, user.id, now) for conversation_id in conversation_ids
+        ]
+        transaction.on_commit(lambda: ReadReceipts.publish(receipts))
+
+        cls.get_logger().debug(
+            f"User {user.id} marked {len(conversation_ids)} conversations as read"
+        )
+
+        return ServiceResult.success(len(conversation_ids))
+
     @classmethod
     def get_unread_count(
         cls,
@@ -1428,9 +1703,9 @@ class MessageService(BaseService):
         """
         Get count of unread messages for a user in a conversation.
 
-        Unread messages are those created after the user's last_read_at.
-        If last_read_at is None, all messages are considered unread.
-        Messages from the user themselves are excluded from the count.
+        Reads the participant's denormalized unread_count, which is
+        incremented by send_message/_create_system_message and reset by
+        mark_as_read. Messages from the user themselves are never counted.
 
         Args:
             conversation: Conversation to count unread messages
@@ -1443,12 +1718,120 @@ class MessageService(BaseService):
         if not participant:
             return 0
 
-        queryset = conversation.messages.exclude(sender=user)
+        return participant.unread_count
 
-        if participant.last_read_at:
-            queryset = queryset.filter(created_at__gt=participant.last_read_at)
+    @classmethod
+    def get_total_unread(cls, user: User) -> dict[str, int]:
+        """
+        Get unread totals across all of a user's active conversations.
+
+        Sums the denormalized Participant.unread_count values in a single
+        aggregate query, suitable for a global badge.
+
+        Args:
+            user: User to get unread totals for
+
+        Returns:
+            Dict with unread_count (total unread messages) and
+            unread_conversations (conversations with at least one unread)
+        """
+        totals = Participant.objects.filter(
+            user=user,
+            left_at__isnull=True,
+            conversation__is_deleted=False,
+        ).aggregate(
+            total=Coalesce(Sum("unread_count"), 0),
+            conversations=Count("id", filter=Q(unread_count__gt=0)),
+        )
+
+        return {
+            "unread_count": totals["total"],
+            "unread_conversations": totals["conversations"],
+        }
+
+    @classmethod
+    def rebuild_unread_counts(
+        cls,
+        conversation: Conversation | None = None,
+    ) -> ServiceResult[int]:
+        """
+        Recompute unread counters for active participants from message history.
+
+        A participant's count is the number of messages from other senders
+        created after last_read_at, or after joined_at if they have never
+        read the conversation. Runs as a single UPDATE.
+
+        Args:
+            conversation: Limit the rebuild to one conversation (all if None)
+
+        Returns:
+            ServiceResult with the number of participants updated
+        """
+        unread_messages = (
+            Message.objects.filter(
+                conversation=OuterRef("conversation"),
+                created_at__gt=Coalesce(
+                    OuterRef("last_read_at"), OuterRef("joined_at")
+                ),
+            )
+            .exclude(sender=OuterRef("user"))
+            .order_by()
+            .values("conversation")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+
+        participants = Participant.objects.filter(left_at__isnull=True)
+        if conversation is not None:
+            participants = participants.filter(conversation=conversation)
+
+        updated = participants.update(
+            unread_count=Coalesce(Subquery(unread_messages), 0)
+        )
+
+        cls.get_logger().info(f"Rebuilt unread counts for {updated} participants")
+
+        return ServiceResult.success(updated)
+
+    @classmethod
+    def _increment_unread_counts(
+        cls,
+        conversation: Conversation,
+        exclude_user: User | None = None,
+    ) -> None:
+        """
+        Internal: Increment unread_count for active participants in one UPDATE.
+
+        This method should be called within an existing transaction.
+
+        Args:
+            conversation: Conversation that received a message
+            exclude_user: The sender, whose own count is left unchanged
+        """
+        participants = Participant.objects.filter(
+            conversation=conversation,
+            left_at__isnull=True,
+        )
+        if exclude_user is not None:
+            participants = participants.exclude(user=exclude_user)
+
+        participants.update(unread_count=F("unread_count") + 1)
+
+    @classmethod
+    def _record_coalesced_updates(cls, message: Message) -> None:
+        """
+        Internal: Buffer last_message_at and reply_count updates for a message.
+
+        Called on commit when CHAT_COALESCED_UPDATES_ENABLED is set.
 
-        return queryset.count()
+        Args:
+            message: Newly created message
+        """
+        CoalescedUpdates.record_last_message(
+            message.conversation_id, message.created_at
+        )
+        if message.parent_message_id:
+            CoalescedUpdates.record_reply(message.parent_message_id)
 
     @classmethod
     def _create_system_message(
@@ -1487,6 +1870,11 @@ class MessageService(BaseService):
         # Update conversation last_message_at
         conversation.last_message_at = message.created_at
         conversation.save(update_fields=["last_message_at", "updated_at"])
+        MessageHistoryCache.bump(conversation.id)
+        SyncService.record(MessageChangeKind.CREATED, [(conversation.id, message.id)])
+
+        # System messages are unread for every active participant
+        cls._increment_unread_counts(conversation)
 
         return message
 
@@ -1505,7 +1893,55 @@ class ReactionService:
     - Removing reactions from messages
     - Toggle reaction (add/remove)
     - Getting reactions for messages
-    - Atomic count updates in Message.reaction_counts
+    - Atomic count updates in Message.reaction_counts (in-place JSONB)
+    """
+
+    # Increment one emoji counter in place; drop the key when it reaches 0
+    UPDATE_REACTION_COUNT_SQL = """
+    UPDATE chat_message
+    SET
+        reaction_counts = CASE
+            WHEN COALESCE((reaction_counts ->> %(emoji)s)::int, 0) + %(delta)s > 0
+            THEN jsonb_set(
+                COALESCE(reaction_counts, '{}'::jsonb),
+                ARRAY[%(emoji)s],
+                to_jsonb(COALESCE((reaction_counts ->> %(emoji)s)::int, 0) + %(delta)s)
+            )
+            ELSE COALESCE(reaction_counts, '{}'::jsonb) - %(emoji)s
+        END,
+        updated_at = NOW()
+    WHERE id = %(id)s
+    """
+
+    # Same update for reactions removed from archived messages
+    UPDATE_ARCHIVED_REACTION_COUNT_SQL = UPDATE_REACTION_COUNT_SQL.replace(
+        "UPDATE chat_message\n", "UPDATE chat_message_archive\n", 1
+    )
+
+    # Rebuild counters from chat_message_reaction, touching only drifted rows
+    RECONCILE_REACTION_COUNTS_SQL = """
+    WITH actual AS (
+        SELECT
+            m.id,
+            COALESCE(
+                jsonb_object_agg(r.emoji, r.total) FILTER (WHERE r.emoji IS NOT NULL),
+                '{}'::jsonb
+            ) AS counts
+        FROM chat_message AS m
+        LEFT JOIN (
+            SELECT message_id, emoji, COUNT(*) AS total
+            FROM chat_message_reaction
+            GROUP BY message_id, emoji
+        ) AS r ON r.message_id = m.id
+        WHERE %(conversation_id)s::bigint IS NULL
+           OR m.conversation_id = %(conversation_id)s
+        GROUP BY m.id
+    )
+    UPDATE chat_message AS m
+    SET reaction_counts = actual.counts, updated_at = NOW()
+    FROM actual
+    WHERE m.id = actual.id AND m.reaction_counts IS DISTINCT FROM actual.counts
+    RETURNING m.conversation_id, m.id
     """
 
     @classmethod
@@ -1538,38 +1974,92 @@ class ReactionService:
     @classmethod
     def _update_reaction_count(
         cls,
-        message: Message,
+        message: Message | ArchivedMessage,
         emoji: str,
         delta: int,
     ) -> None:
         """
         Atomically update reaction count for an emoji.
 
-        Uses select_for_update() to lock the row and prevent race conditions.
-        Must be called within a transaction.atomic() block.
+        A single UPDATE increments the JSONB counter in SQL (jsonb_set with
+        COALESCE), so concurrent reactions on one message do not read and
+        rewrite the whole reaction_counts object in Python. The emoji key is
+        removed when its count reaches 0.
+        Should be called last within the caller's transaction.atomic() block
+        so the row lock is held only until commit.
 
         Args:
-            message: Message to update
+            message: Message (or archived message) to update
             emoji: Emoji to update count for
             delta: Amount to change (1 to add, -1 to remove)
         """
-        # Lock the row to prevent concurrent modifications
-        locked_message = Message.objects.select_for_update().get(id=message.id)
-        counts = locked_message.reaction_counts or {}
+        sql = cls.UPDATE_REACTION_COUNT_SQL
+        if isinstance(message, ArchivedMessage):
+            sql = cls.UPDATE_ARCHIVED_REACTION_COUNT_SQL
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"id": message.id, "emoji": emoji, "delta": delta})
+        MessageHistoryCache.bump(message.conversation_id)
 
-        current_count = counts.get(emoji, 0)
-        new_count = max(0, current_count + delta)
+    @staticmethod
+    def _get_message(message_id: int) -> Message | ArchivedMessage | None:
+        """Get a message with its conversation, reading through to the archive."""
+        return (
+            Message.objects.select_related("conversation").filter(id=message_id).first()
+        ) or (
+            ArchivedMessage.objects.select_related("conversation")
+            .filter(id=message_id)
+            .first()
+        )
 
-        if new_count == 0:
-            # Remove the emoji key when count reaches 0
-            counts.pop(emoji, None)
-        else:
-            counts[emoji] = new_count
+    @classmethod
+    def _record_reaction_change(cls, message: Message | ArchivedMessage) -> None:
+        """
+        Log a reaction change for delta sync.
 
-        locked_message.reaction_counts = counts
-        locked_message.save(update_fields=["reaction_counts", "updated_at"])
+        Called before _update_reaction_count, which stays last in the
+        transaction.
 
-    @classmethod
+        Args:
+            message: Message whose reactions changed
+        """
+        SyncService.record(
+            MessageChangeKind.REACTIONS, [(message.conversation_id, message.id)]
+        )
+
+    @classmethod
+    def reconcile_reaction_counts(
+        cls,
+        conversation: Conversation | None = None,
+    ) -> ServiceResult[int]:
+        """
+        Recompute Message.reaction_counts from MessageReaction rows.
+
+        Repairs drift from manual data fixes or bulk operations that bypass
+        ReactionService. Only messages whose counts differ are rewritten.
+
+        Args:
+            conversation: Optional conversation to limit the reconcile to
+
+        Returns:
+            ServiceResult with number of messages corrected
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    cls.RECONCILE_REACTION_COUNTS_SQL,
+                    {"conversation_id": conversation.id if conversation else None},
+                )
+                rows = cursor.fetchall()
+            SyncService.record(MessageChangeKind.REACTIONS, rows)
+
+        corrected = len(rows)
+        MessageHistoryCache.bump(conversation_id for conversation_id, _ in rows)
+
+        logger.info(f"Reconciled reaction counts for {corrected} messages")
+
+        return ServiceResult.success(corrected)
+
+    @classmethod
     def add_reaction(
         cls,
         user: "User",
@@ -1651,7 +2141,8 @@ class ReactionService:
                 emoji=emoji,
             )
 
-            # Update count
+            # Log the change, then update count
+            cls._record_reaction_change(message)
             cls._update_reaction_count(message, emoji, 1)
 
         return ServiceResult.success(reaction)
@@ -1666,7 +2157,8 @@ class ReactionService:
         """
         Remove a reaction from a message.
 
-        Updates Message.reaction_counts atomically.
+        Updates Message.reaction_counts atomically. Works on archived
+        messages too, so users can take back reactions on cold messages.
 
         Args:
             user: User removing the reaction
@@ -1676,10 +2168,9 @@ class ReactionService:
         Returns:
             ServiceResult (data is None on success)
         """
-        # Get message
-        try:
-            message = Message.objects.select_related("conversation").get(id=message_id)
-        except Message.DoesNotExist:
+        # Get message, reading through to the archive for cold messages
+        message = cls._get_message(message_id)
+        if message is None:
             return ServiceResult.failure(
                 "Message not found",
                 error_code="MESSAGE_NOT_FOUND",
@@ -1695,7 +2186,7 @@ class ReactionService:
 
         # Find reaction
         reaction = MessageReaction.objects.filter(
-            message=message,
+            message_id=message.id,
             user=user,
             emoji=emoji,
         ).first()
@@ -1709,6 +2200,7 @@ class ReactionService:
         # Delete reaction and update count
         with transaction.atomic():
             reaction.delete()
+            cls._record_reaction_change(message)
             cls._update_reaction_count(message, emoji, -1)
 
         return ServiceResult.success(None)
@@ -1723,7 +2215,8 @@ class ReactionService:
         """
         Toggle a reaction on a message.
 
-        If reaction exists, removes it. If not, adds it.
+        If reaction exists, removes it. If not, adds it. On archived
+        messages, existing reactions can only be removed.
 
         Args:
             user: User toggling the reaction
@@ -1734,6 +2227,9 @@ class ReactionService:
             ServiceResult containing tuple (added: bool, reaction: MessageReaction | None)
             - added=True, reaction=MessageReaction if reaction was added
             - added=False, reaction=None if reaction was removed
+
+        Error codes:
+            MESSAGE_ARCHIVED: Adding a reaction to an archived message
         """
         # Validate emoji
         if not cls._validate_emoji(emoji):
@@ -1742,10 +2238,9 @@ class ReactionService:
                 error_code="INVALID_EMOJI",
             )
 
-        # Get message
-        try:
-            message = Message.objects.select_related("conversation").get(id=message_id)
-        except Message.DoesNotExist:
+        # Get message, reading through to the archive for cold messages
+        message = cls._get_message(message_id)
+        if message is None:
             return ServiceResult.failure(
                 "Message not found",
                 error_code="MESSAGE_NOT_FOUND",
@@ -1768,7 +2263,7 @@ class ReactionService:
 
         # Check if reaction exists
         existing = MessageReaction.objects.filter(
-            message=message,
+            message_id=message.id,
             user=user,
             emoji=emoji,
         ).first()
@@ -1777,9 +2272,17 @@ class ReactionService:
             # Remove reaction
             with transaction.atomic():
                 existing.delete()
+                cls._record_reaction_change(message)
                 cls._update_reaction_count(message, emoji, -1)
             return ServiceResult.success((False, None))
         else:
+            # Archived messages only allow taking reactions back
+            if isinstance(message, ArchivedMessage):
+                return ServiceResult.failure(
+                    "Cannot react to archived messages",
+                    error_code="MESSAGE_ARCHIVED",
+                )
+
             # Check max reactions limit before adding
             user_reaction_count = MessageReaction.objects.filter(
                 message=message,
@@ -1799,6 +2302,7 @@ class ReactionService:
                     user=user,
                     emoji=emoji,
                 )
+                cls._record_reaction_change(message)
                 cls._update_reaction_count(message, emoji, 1)
 
             return ServiceResult.success((True, reaction))
@@ -1887,28 +2391,238 @@ class ReactionService:
         return ServiceResult.success(result)
 
 
+# =============================================================================
+# SyncService
+# =============================================================================
+
+
+class SyncService(BaseService):
+    """
+    Service for the message change log and client delta sync.
+
+    Methods:
+        record: Append message changes to the log (inside the change's transaction)
+        get_changes: Messages changed since a cursor in the user's conversations
+        prune: Delete changes past the retention window
+    """
+
+    @classmethod
+    def record(cls, kind: str, changes: Iterable[tuple[int, int]]) -> None:
+        """
+        Append message changes to the change log.
+
+        Call inside the transaction that makes the change, so the log entry
+        commits or rolls back with it.
+
+        Args:
+            kind: MessageChangeKind value
+            changes: (conversation_id, message_id) pairs
+        """
+        MessageChange.objects.bulk_create(
+            MessageChange(
+                conversation_id=conversation_id, message_id=message_id, kind=kind
+            )
+            for conversation_id, message_id in changes
+        )
+
+    @classmethod
+    def get_changes(
+        cls,
+        user: User,
+        cursor: int | None = None,
+        limit: int = SYNC_CONFIG.DEFAULT_LIMIT,
+    ) -> ServiceResult[dict]:
+        """
+        Get messages changed since a cursor in the user's active conversations.
+
+        Changes are collapsed per message: each changed message is returned
+        once in its current state (content, edit metadata, reaction counts),
+        and soft-deleted messages are returned as IDs only.
+
+        Without a cursor, returns the current head cursor and no changes;
+        clients call this after a full load and sync from there.
+
+        Args:
+            user: User syncing
+            cursor: Cursor returned by the previous sync
+            limit: Maximum number of changes to read
+
+        Returns:
+            ServiceResult with dict containing:
+            - cursor: Cursor to send on the next sync
+            - has_more: Whether more changes are ready now
+            - messages: Changed messages, oldest first
+            - deleted_message_ids: IDs of messages deleted since the cursor
+
+        Error codes:
+            CURSOR_EXPIRED: Changes after the cursor were pruned; reload
+        """
+        horizon = cls._commit_horizon()
+
+        if cursor is None:
+            head = (
+                MessageChange.objects.filter(xid__lt=horizon)
+                .order_by("-xid", "-id")
+                .values_list("id", flat=True)
+                .first()
+            )
+            return ServiceResult.success(
+                {
+                    "cursor": head or 0,
+                    "has_more": False,
+                    "messages": [],
+                    "deleted_message_ids": [],
+                }
+            )
+
+        # Issued cursors are change IDs (or 0 before the first change); a
+        # missing change means the log was pruned past the client's position
+        cursor_xid = 0
+        if cursor:
+            cursor_xid = (
+                MessageChange.objects.filter(id=cursor)
+                .values_list("xid", flat=True)
+                .first()
+            )
+            if cursor_xid is None:
+                return ServiceResult.failure(
+                    "Sync cursor has expired; reload conversations",
+                    error_code="CURSOR_EXPIRED",
+                )
+
+        conversation_ids = MembershipCache.get_user_conversation_ids(user.id)
+        rows = list(
+            MessageChange.objects.filter(
+                Q(xid__gt=cursor_xid) | Q(xid=cursor_xid, id__gt=cursor),
+                conversation_id__in=conversation_ids,
+            )
+            .order_by("xid", "id")
+            .values_list("id", "message_id", "xid")[: limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Transactions at or above the horizon may still be running and
+        # commit changes that sort before visible ones: deliver those, but
+        # keep the cursor behind them so the next sync reads them again
+        next_cursor = cursor
+        for change_id, _, xid in rows:
+            if xid >= horizon:
+                has_more = False
+                break
+            next_cursor = change_id
+
+        message_ids = {message_id for _, message_id, _ in rows}
+        changed = list(
+            Message.objects.filter(id__in=message_ids).select_related("sender__profile")
+        )
+        # Change rows outlive archival; archived messages come from the archive
+        archived_ids = message_ids - {message.id for message in changed}
+        if archived_ids:
+            changed.extend(
+                ArchivedMessage.objects.filter(id__in=archived_ids).select_related(
+                    "sender__profile"
+                )
+            )
+
+        messages = []
+        deleted_message_ids = []
+        for message in sorted(changed, key=lambda m: (m.created_at, m.id)):
+            if message.is_deleted:
+                deleted_message_ids.append(message.id)
+            else:
+                messages.append(message)
+
+        return ServiceResult.success(
+            {
+                "cursor": next_cursor,
+                "has_more": has_more,
+                "messages": messages,
+                "deleted_message_ids": deleted_message_ids,
+            }
+        )
+
+    @staticmethod
+    def _commit_horizon() -> int:
+        """
+        Get the oldest transaction ID that may still be running.
+
+        Every transaction below it has committed or rolled back, so the set
+        of visible changes below it is final.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+            )
+            return cursor.fetchone()[0]
+
+    @classmethod
+    def prune(cls) -> ServiceResult[int]:
+        """
+        Delete changes older than SYNC_CONFIG.RETENTION_DAYS, in batches.
+
+        Returns:
+            ServiceResult with number of changes deleted
+        """
+        cutoff = timezone.now() - timedelta(days=SYNC_CONFIG.RETENTION_DAYS)
+        deleted = 0
+        while True:
+            batch = list(
+                MessageChange.objects.filter(created_at__lt=cutoff)
+                .order_by("id")
+                .values_list("id", flat=True)[: SYNC_CONFIG.PRUNE_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            deleted += MessageChange.objects.filter(id__in=batch).delete()[0]
+
+        cls.get_logger().info(f"Pruned {deleted} message changes")
+
+        return ServiceResult.success(deleted)
+
+
 # =============================================================================
 # MessageSearchService
 # =============================================================================
 
 
+class RowValue(Func):
+    """SQL row constructor, e.g. ROW(rank, created_at, id), for keyset filters."""
+
+    function = "ROW"
+    output_field = Field()
+
+
 @dataclass
 class SearchCursor:
     """
-    Cursor for keyset pagination in search results.
+    Keyset cursor for search results ordered by (-rank, -created_at, -id).
+
+    The next page is everything strictly after the last returned row, i.e.
+    ROW(rank, created_at, id) < ROW(cursor.rank, cursor.created_at, cursor.id).
+    The key is unique (id), so pages never skip or repeat rows while the
+    matched messages are unchanged.
 
-    Uses message_id for simple, reliable pagination since IDs are unique
-    and the results are always ordered deterministically.
+    snapshot_id pins the candidate set when rank computation is capped (see
+    MESSAGE_CONFIG.SEARCH_RANK_CANDIDATE_LIMIT), so newer messages cannot
+    push earlier candidates out between pages.
     """
 
-    last_message_id: int
+    rank: float
+    created_at: datetime
+    message_id: int
+    snapshot_id: int | None = None
 
     def encode(self) -> str:
         """Encode cursor as base64 JSON string."""
         import base64
-        import json
 
-        data = {"last_id": self.last_message_id}
+        data = {
+            "rank": self.rank,
+            "created_at": self.created_at.isoformat(),
+            "id": self.message_id,
+            "snapshot_id": self.snapshot_id,
+        }
         json_str = json.dumps(data)
         return base64.b64encode(json_str.encode()).decode()
 
@@ -1916,15 +2630,35 @@ class SearchCursor:
     def decode(cls, encoded: str) -> "SearchCursor":
         """Decode cursor from base64 JSON string."""
         import base64
-        import json
 
         try:
             json_str = base64.b64decode(encoded.encode()).decode()
             data = json.loads(json_str)
-            return cls(last_message_id=int(data["last_id"]))
+            snapshot_id = data.get("snapshot_id")
+            return cls(
+                rank=float(data["rank"]),
+                created_at=datetime.fromisoformat(data["created_at"]),
+                message_id=int(data["id"]),
+                snapshot_id=int(snapshot_id) if snapshot_id is not None else None,
+            )
         except Exception:
             raise ValueError("Invalid cursor")
 
+    def as_row_value(self) -> RowValue:
+        """Build the ROW(...) literal to compare result keys against."""
+        # ts_rank() returns real; compare as real so the decimal text of the
+        # rank round-trips to exactly the stored value
+        rank = Func(
+            Value(self.rank),
+            template="%(expressions)s::real",
+            output_field=FloatField(),
+        )
+        return RowValue(
+            rank,
+            Value(self.created_at, output_field=DateTimeField()),
+            Value(self.message_id, output_field=BigIntegerField()),
+        )
+
 
 class MessageSearchService:
     """
@@ -1942,24 +2676,27 @@ class MessageSearchService:
     - Cursor-based pagination
     """
 
-    @classmethod
-    def _get_user_conversation_ids(cls, user: "User") -> list[int]:
+    @staticmethod
+    def _accessible_scope(user: "User") -> Exists:
         """
-        Get IDs of all conversations the user has access to.
+        Build the EXISTS filter limiting messages to the user's conversations.
+
+        The membership check runs inside the search SQL (a semi-join against
+        chat_participant) instead of sending an IN list of conversation IDs,
+        so query size and planning time do not grow with membership count.
 
         Args:
-            user: User to get conversations for
+            user: User performing the search
 
         Returns:
-            List of conversation IDs
+            Exists expression to pass to Message.objects.filter()
         """
-        from chat.models import Participant
-
-        return list(
+        return Exists(
             Participant.objects.filter(
-                user=user,
+                conversation_id=OuterRef("conversation_id"),
+                user_id=user.id,
                 left_at__isnull=True,
-            ).values_list("conversation_id", flat=True)
+            )
         )
 
     @classmethod
@@ -1970,16 +2707,22 @@ class MessageSearchService:
         conversation_id: int | None = None,
         cursor: str | None = None,
         page_size: int = MESSAGE_CONFIG.SEARCH_DEFAULT_PAGE_SIZE,
+        max_ranked: int | None = MESSAGE_CONFIG.SEARCH_RANK_CANDIDATE_LIMIT,
     ) -> ServiceResult[dict]:
         """
         Full-text search for messages.
 
+        Results are ordered by (-rank, -created_at, -id) and paginated with a
+        keyset cursor over that key, so deep pages cost the same as the first.
+
         Args:
             user: User performing the search
             query: Search query string
             conversation_id: Optional - limit search to specific conversation
             cursor: Optional - pagination cursor from previous search
             page_size: Number of results per page
+            max_ranked: Optional - only rank the newest N matching messages
+                (None ranks every match)
 
         Returns:
             ServiceResult containing:
@@ -1990,7 +2733,6 @@ class MessageSearchService:
             }
         """
         from django.contrib.postgres.search import SearchQuery, SearchRank
-        from django.db.models import F
 
         # Validate query
         if not query or not query.strip():
@@ -2009,7 +2751,7 @@ class MessageSearchService:
         # Validate page size
         page_size = min(page_size, MESSAGE_CONFIG.SEARCH_MAX_RESULTS)
 
-        # Handle conversation filter FIRST (before getting accessible IDs)
+        # Resolve the search scope
         if conversation_id is not None:
             # Check conversation exists
             try:
@@ -2021,61 +2763,63 @@ class MessageSearchService:
                 )
 
             # Check user has access to this specific conversation
-            is_participant = Participant.objects.filter(
-                conversation_id=conversation_id,
-                user=user,
-                left_at__isnull=True,
-            ).exists()
-
-            if not is_participant:
+            if not MembershipCache.is_member(conversation_id, user.id):
                 return ServiceResult.failure(
                     "You don't have access to this conversation",
                     error_code="CONVERSATION_NOT_ACCESSIBLE",
                 )
 
             # Limit search to this conversation
-            accessible_ids = [conversation_id]
+            scope = Q(conversation_id=conversation_id)
         else:
-            # Get all accessible conversation IDs
-            accessible_ids = cls._get_user_conversation_ids(user)
-            if not accessible_ids:
-                return ServiceResult.success(
-                    {
-                        "results": [],
-                        "next_cursor": None,
-                        "has_more": False,
-                    }
-                )
-
-        # Build search query
-        search_query = SearchQuery(query, config="english")
-
-        # Base queryset - only text messages with search_vector
-        qs = (
-            Message.objects.filter(
-                conversation_id__in=accessible_ids,
-                is_deleted=False,
-                message_type=MessageType.TEXT,
-                search_vector__isnull=False,
-            )
-            .annotate(rank=SearchRank(F("search_vector"), search_query))
-            .filter(search_vector=search_query)
-        )
+            # All conversations where the user is an active participant
+            scope = cls._accessible_scope(user)
 
-        # Handle cursor for pagination
+        # Decode cursor before touching the database
+        search_cursor = None
         if cursor:
             try:
-                c = SearchCursor.decode(cursor)
-                # Simple pagination: exclude messages we've already seen
-                # Since we order by -rank, -created_at, -id, we need to exclude
-                # all messages with ID >= cursor ID in the same result set
-                qs = qs.exclude(id__gte=c.last_message_id)
+                search_cursor = SearchCursor.decode(cursor)
             except ValueError:
                 return ServiceResult.failure(
                     "Invalid pagination cursor",
                     error_code="INVALID_CURSOR",
                 )
 
+        # Build search query
+        search_query = SearchQuery(query, config="english")
+
+        # Base queryset - only text messages matching the GIN index
+        matches = Message.objects.filter(
+            scope,
+            is_deleted=False,
+            message_type=MessageType.TEXT,
+            search_vector__isnull=False,
+        ).filter(search_vector=search_query)
+
+        # Optionally rank only the newest N matches, pinned to the first page's
+        # newest message so later pages see the same candidate set
+        snapshot_id = None
+        if max_ranked:
+            if search_cursor and search_cursor.snapshot_id is not None:
+                snapshot_id = search_cursor.snapshot_id
+            else:
+                snapshot_id = Message.objects.aggregate(max_id=Max("id"))["max_id"]
+            candidates = (
+                matches.filter(id__lte=snapshot_id)
+                .order_by("-created_at", "-id")
+                .values("id")[:max_ranked]
+            )
+            matches = Message.objects.filter(id__in=Subquery(candidates))
+
+        qs = matches.annotate(rank=SearchRank(F("search_vector"), search_query))
+
+        # Keyset pagination: strictly after the last row of the previous page
+        if search_cursor:
+            qs = qs.alias(
+                search_key=RowValue(F("rank"), F("created_at"), F("id"))
+            ).filter(search_key__lt=search_cursor.as_row_value())
+
         # Order by relevance (rank), then by recency, then by id for stability
         qs = qs.order_by("-rank", "-created_at", "-id")
 
@@ -2088,7 +2832,12 @@ class MessageSearchService:
         next_cursor = None
         if has_more and results:
             last = results[-1]
-            next_cursor = SearchCursor(last_message_id=last.id).encode()
+            next_cursor = SearchCursor(
+                rank=last.rank,
+                created_at=last.created_at,
+                message_id=last.id,
+                snapshot_id=snapshot_id,
+            ).encode()
 
         return ServiceResult.success(
             {
@@ -2126,12 +2875,18 @@ class PresenceService(BaseService):
     - Per-conversation presence (who's viewing which chat)
     - Automatic expiration via TTL
     - Atomic operations using Lua scripts
+    - Presence change events pushed to connected conversation members
 
     Design Decisions:
         - Redis-only storage (no database persistence)
         - TTL-based auto-expiry for stale presence
         - Separate keys for global and per-conversation presence
-        - Lua scripts for atomic set/get operations
+        - Per-conversation presence is a sorted set scored by last heartbeat;
+          each member goes stale on its own instead of sharing the set's TTL
+        - One Lua call per set/heartbeat writes both keys and prunes stale
+          conversation members
+        - Only changes are broadcast: a heartbeat that keeps the same status
+          publishes nothing, so clients can stop polling
 
     Usage:
         from chat.services import PresenceService, PresenceStatus
@@ -2149,27 +2904,40 @@ class PresenceService(BaseService):
         result = PresenceService.get_conversation_presence(conv.id)
     """
 
-    # Lua script for atomic presence set with TTL
-    # Keys: [user_presence_key]
-    # Args: [status, last_seen_timestamp, ttl_seconds]
+    # Lua script for atomic presence set with TTL, optionally also recording
+    # the heartbeat in conversation sorted sets and pruning stale members
+    # Keys: [user_presence_key, conversation_presence_key...]
+    # Args: [status ('' keeps the current status), default_status,
+    #        last_seen_timestamp, ttl_seconds, user_id, heartbeat_score,
+    #        conversation_ttl_seconds, stale_before_score]
+    # Returns: [previous status ('' if none), stored status, then per
+    #           conversation key 1 if the user was not live in it before, else 0]
     LUA_SET_PRESENCE = """
-    redis.call('HSET', KEYS[1], 'status', ARGV[1], 'last_seen', ARGV[2])
-    redis.call('EXPIRE', KEYS[1], ARGV[3])
-    return 1
-    """
-
-    # Lua script for atomic conversation presence update
-    # Keys: [conversation_presence_key]
-    # Args: [user_id, ttl_seconds]
-    LUA_SET_CONVERSATION_PRESENCE = """
-    redis.call('SADD', KEYS[1], ARGV[1])
-    redis.call('EXPIRE', KEYS[1], ARGV[2])
-    return 1
+    local previous = redis.call('HGET', KEYS[1], 'status')
+    local status = ARGV[1]
+    if status == '' then
+        status = previous or ARGV[2]
+    end
+    redis.call('HSET', KEYS[1], 'status', status, 'last_seen', ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+
+    local result = {previous or '', status}
+    for i = 2, #KEYS do
+        local score = redis.call('ZSCORE', KEYS[i], ARGV[5])
+        local joined = 0
+        if not score or tonumber(score) < tonumber(ARGV[8]) then
+            joined = 1
+        end
+        redis.call('ZADD', KEYS[i], ARGV[6], ARGV[5])
+        redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', '(' .. ARGV[8])
+        redis.call('EXPIRE', KEYS[i], ARGV[7])
+        result[#result + 1] = joined
+    end
+    return result
     """
 
     # Cached registered Lua scripts (initialized lazily)
     _lua_set_presence = None
-    _lua_set_conversation_presence = None
 
     @staticmethod
     def _get_cache():
@@ -2196,15 +2964,6 @@ class PresenceService(BaseService):
             cls._lua_set_presence = redis_client.register_script(cls.LUA_SET_PRESENCE)
         return cls._lua_set_presence
 
-    @classmethod
-    def _get_lua_set_conversation_presence(cls, redis_client):
-        """Get cached Lua script for setting conversation presence."""
-        if cls._lua_set_conversation_presence is None:
-            cls._lua_set_conversation_presence = redis_client.register_script(
-                cls.LUA_SET_CONVERSATION_PRESENCE
-            )
-        return cls._lua_set_conversation_presence
-
     @staticmethod
     def _user_presence_key(user_id) -> str:
         """Build Redis key for user presence."""
@@ -2215,6 +2974,170 @@ class PresenceService(BaseService):
         """Build Redis key for conversation presence."""
         return f"{PRESENCE_CONFIG.KEY_PREFIX_CONVERSATION_PRESENCE}:{conversation_id}"
 
+    @staticmethod
+    def _stale_before(now: datetime) -> float:
+        """Score below which a conversation presence entry is stale."""
+        return now.timestamp() - PRESENCE_CONFIG.CONVERSATION_PRESENCE_TTL_SECONDS
+
+    @staticmethod
+    def _decode_presence(user_id, values) -> dict:
+        """
+        Build presence data from an HMGET of (status, last_seen).
+
+        Missing hashes (expired or never set) are reported as offline.
+        """
+        status, last_seen = values
+        if status is None:
+            return {
+                "user_id": str(user_id),
+                "status": PresenceStatus.OFFLINE,
+                "last_seen": None,
+            }
+        return {
+            "user_id": str(user_id),
+            "status": status.decode("utf-8"),
+            "last_seen": last_seen.decode("utf-8") if last_seen else None,
+        }
+
+    @staticmethod
+    def _check_participation(
+        user_id, conversation_id: int | None
+    ) -> ServiceResult | None:
+        """Return a failure result if user is not in the given conversation."""
+        if conversation_id is not None and not MembershipCache.is_member(
+            conversation_id, user_id
+        ):
+            return ServiceResult.failure(
+                error="You are not a participant in this conversation",
+                error_code="not_participant",
+            )
+        return None
+
+    @classmethod
+    def _store_presence(cls, user_id, status: str, conversation_ids=()) -> dict:
+        """
+        Write presence in a single Lua round trip and publish any change.
+
+        Args:
+            user_id: User's UUID
+            status: Status to store, or "" to keep the current one (online
+                if the user has no presence entry)
+            conversation_ids: Conversations to record a heartbeat in
+
+        Returns:
+            The stored presence data
+        """
+        redis_client = cls._get_redis_client()
+        now = timezone.now()
+
+        keys = [cls._user_presence_key(user_id)]
+        keys.extend(cls._conversation_presence_key(cid) for cid in conversation_ids)
+
+        lua_set = cls._get_lua_set_presence(redis_client)
+        previous_status, stored_status, *joined = lua_set(
+            keys=keys,
+            args=[
+                status,
+                PresenceStatus.ONLINE,
+                now.isoformat(),
+                PRESENCE_CONFIG.PRESENCE_TTL_SECONDS,
+                str(user_id),
+                now.timestamp(),
+                PRESENCE_CONFIG.CONVERSATION_PRESENCE_TTL_SECONDS,
+                cls._stale_before(now),
+            ],
+        )
+
+        result_data = {
+            "user_id": str(user_id),
+            "status": stored_status.decode("utf-8"),
+            "last_seen": now.isoformat(),
+        }
+
+        cls._publish_status_change(
+            user_id,
+            result_data,
+            status_changed=previous_status != stored_status,
+            joined_conversation_ids=[
+                cid for cid, was_joined in zip(conversation_ids, joined) if was_joined
+            ],
+        )
+        return result_data
+
+    @classmethod
+    def _store_presence_in(
+        cls, user_id, status: str, conversation_id: int | None
+    ) -> dict:
+        """Store presence for at most one conversation (set/heartbeat)."""
+        if not conversation_id:
+            return cls._store_presence(user_id, status)
+
+        result_data = cls._store_presence(user_id, status, [conversation_id])
+        result_data["conversation_id"] = conversation_id
+        return result_data
+
+    @classmethod
+    def _publish_presence(cls, presence: dict, conversation_ids) -> None:
+        """
+        Broadcast a presence change to conversation channel groups.
+
+        Sends a chat.presence event to the same "chat_{conversation_id}"
+        groups ChatConsumer joins. Publishing is best-effort: a channel
+        layer failure is logged and never fails the presence update.
+
+        Args:
+            presence: Presence data (user_id, status, last_seen and
+                optionally conversation_id)
+            conversation_ids: Conversations whose members should be told
+        """
+        conversation_ids = list(conversation_ids)
+        channel_layer = get_channel_layer()
+        if channel_layer is None or not conversation_ids:
+            return
+
+        async def send_all():
+            for conversation_id in conversation_ids:
+                await channel_layer.group_send(
+                    f"chat_{conversation_id}",
+                    {
+                        "type": "chat.presence",
+                        "conversation_id": conversation_id,
+                        "presence": presence,
+                    },
+                )
+
+        try:
+            async_to_sync(send_all)()
+        except Exception as e:
+            logger.warning(
+                f"Failed to publish presence for user {presence['user_id']}: {e}"
+            )
+
+    @classmethod
+    def _publish_status_change(
+        cls,
+        user_id,
+        presence: dict,
+        status_changed: bool,
+        joined_conversation_ids=(),
+    ) -> None:
+        """
+        Publish a presence delta if anything visible to other users changed.
+
+        A global status change goes to every conversation the user is an
+        active participant in; joining a conversation's presence only goes
+        to that conversation.
+        """
+        if status_changed:
+            cls._publish_presence(
+                presence, MembershipCache.get_user_conversation_ids(user_id)
+            )
+            return
+        for conversation_id in joined_conversation_ids:
+            cls._publish_presence(
+                {**presence, "conversation_id": conversation_id}, [conversation_id]
+            )
+
     @classmethod
     def set_presence(
         cls,
@@ -2225,6 +3148,10 @@ class PresenceService(BaseService):
         """
         Set user presence status.
 
+        If the status changed (or the user started viewing the conversation),
+        the change is pushed to connected conversation members as a
+        "presence" frame.
+
         Args:
             user_id: User's UUID
             status: Presence status (online, away, offline)
@@ -2240,67 +3167,36 @@ class PresenceService(BaseService):
             )
 
         # Verify conversation participation if conversation_id provided
-        if conversation_id is not None:
-            is_participant = Participant.objects.filter(
-                conversation_id=conversation_id,
-                user_id=user_id,
-                left_at__isnull=True,
-            ).exists()
-            if not is_participant:
-                return ServiceResult.failure(
-                    error="You are not a participant in this conversation",
-                    error_code="not_participant",
-                )
+        not_participant = cls._check_participation(user_id, conversation_id)
+        if not_participant is not None:
+            return not_participant
 
         try:
-            redis_client = cls._get_redis_client()
-            now = timezone.now().isoformat()
-
-            if status == PresenceStatus.OFFLINE:
-                # Remove presence entry using raw Redis client
-                user_key = cls._user_presence_key(user_id)
-                redis_client.delete(user_key)
-
-                # Remove from conversation presence if specified
-                if conversation_id:
-                    conv_key = cls._conversation_presence_key(conversation_id)
-                    redis_client.srem(conv_key, str(user_id))
-
+            if status != PresenceStatus.OFFLINE:
                 return ServiceResult.success(
-                    {
-                        "user_id": str(user_id),
-                        "status": status,
-                        "last_seen": now,
-                    }
+                    cls._store_presence_in(user_id, status, conversation_id)
                 )
 
-            # Set user presence using Lua script for atomicity
+            # Remove presence entry using raw Redis client
+            redis_client = cls._get_redis_client()
             user_key = cls._user_presence_key(user_id)
-            lua_set = cls._get_lua_set_presence(redis_client)
-            lua_set(
-                keys=[user_key],
-                args=[status, now, PRESENCE_CONFIG.PRESENCE_TTL_SECONDS],
-            )
+            was_present = redis_client.delete(user_key)
+
+            # Remove from conversation presence if specified
+            if conversation_id:
+                conv_key = cls._conversation_presence_key(conversation_id)
+                redis_client.zrem(conv_key, str(user_id))
 
             result_data = {
                 "user_id": str(user_id),
                 "status": status,
-                "last_seen": now,
+                "last_seen": timezone.now().isoformat(),
             }
-
-            # Set conversation presence if specified
-            if conversation_id:
-                conv_key = cls._conversation_presence_key(conversation_id)
-                lua_conv = cls._get_lua_set_conversation_presence(redis_client)
-                lua_conv(
-                    keys=[conv_key],
-                    args=[
-                        str(user_id),
-                        PRESENCE_CONFIG.CONVERSATION_PRESENCE_TTL_SECONDS,
-                    ],
-                )
-                result_data["conversation_id"] = conversation_id
-
+            cls._publish_status_change(
+                user_id,
+                result_data,
+                status_changed=bool(was_present),
+            )
             return ServiceResult.success(result_data)
 
         except Exception as e:
@@ -2374,36 +3270,20 @@ class PresenceService(BaseService):
             redis_client = cls._get_redis_client()
             pipeline = redis_client.pipeline()
 
-            # Queue all HGETALL commands
+            # Queue all HMGET commands
             for user_id in user_ids:
                 user_key = cls._user_presence_key(user_id)
-                pipeline.hgetall(user_key)
+                pipeline.hmget(user_key, "status", "last_seen")
 
             # Execute pipeline
             results = pipeline.execute()
 
-            # Build response
-            presence_list = []
-            for i, user_id in enumerate(user_ids):
-                presence_data = results[i]
-                if presence_data:
-                    status = presence_data.get(b"status", b"offline").decode("utf-8")
-                    last_seen = (
-                        presence_data.get(b"last_seen", b"").decode("utf-8") or None
-                    )
-                else:
-                    status = PresenceStatus.OFFLINE
-                    last_seen = None
-
-                presence_list.append(
-                    {
-                        "user_id": str(user_id),
-                        "status": status,
-                        "last_seen": last_seen,
-                    }
-                )
-
-            return ServiceResult.success(presence_list)
+            return ServiceResult.success(
+                [
+                    cls._decode_presence(user_id, values)
+                    for user_id, values in zip(user_ids, results)
+                ]
+            )
 
         except Exception as e:
             logger.exception(f"Error getting bulk presence: {e}")
@@ -2418,6 +3298,10 @@ class PresenceService(BaseService):
         Get presence of all users in a conversation.
 
         Only returns users who are currently online or away in the conversation.
+        Conversation presence is a sorted set scored by last heartbeat, so
+        this reads only live entries (one ZRANGEBYSCORE) and then fetches
+        their status with one HMGET pipeline. Stale entries are pruned in
+        the same round trip as the range read.
 
         Args:
             conversation_id: Conversation ID
@@ -2428,9 +3312,13 @@ class PresenceService(BaseService):
         try:
             redis_client = cls._get_redis_client()
             conv_key = cls._conversation_presence_key(conversation_id)
+            stale_before = cls._stale_before(timezone.now())
 
-            # Get all user IDs present in conversation
-            user_ids_bytes = redis_client.smembers(conv_key)
+            # Prune stale entries and read live user IDs in one round trip
+            pipeline = redis_client.pipeline(transaction=False)
+            pipeline.zremrangebyscore(conv_key, "-inf", f"({stale_before}")
+            pipeline.zrangebyscore(conv_key, stale_before, "+inf")
+            _, user_ids_bytes = pipeline.execute()
 
             if not user_ids_bytes:
                 return ServiceResult.success([])
@@ -2439,32 +3327,25 @@ class PresenceService(BaseService):
             user_ids = [uid.decode("utf-8") for uid in user_ids_bytes]
 
             # Get presence for all these users
-            pipeline = redis_client.pipeline()
+            pipeline = redis_client.pipeline(transaction=False)
             for user_id in user_ids:
                 user_key = cls._user_presence_key(user_id)
-                pipeline.hgetall(user_key)
+                pipeline.hmget(user_key, "status", "last_seen")
 
             results = pipeline.execute()
 
-            # Filter to only online/away users and build response
-            presence_list = []
-            for i, user_id in enumerate(user_ids):
-                presence_data = results[i]
-                if presence_data:
-                    status = presence_data.get(b"status", b"offline").decode("utf-8")
-                    if status != PresenceStatus.OFFLINE:
-                        last_seen = (
-                            presence_data.get(b"last_seen", b"").decode("utf-8") or None
-                        )
-                        presence_list.append(
-                            {
-                                "user_id": user_id,
-                                "status": status,
-                                "last_seen": last_seen,
-                            }
-                        )
-
-            return ServiceResult.success(presence_list)
+            # Filter to only online/away users
+            presence_list = [
+                cls._decode_presence(user_id, values)
+                for user_id, values in zip(user_ids, results)
+            ]
+            return ServiceResult.success(
+                [
+                    presence
+                    for presence in presence_list
+                    if presence["status"] != PresenceStatus.OFFLINE
+                ]
+            )
 
         except Exception as e:
             logger.exception(f"Error getting conversation presence: {e}")
@@ -2483,7 +3364,8 @@ class PresenceService(BaseService):
         Update presence heartbeat.
 
         Refreshes TTL and updates last_seen timestamp. If user has no presence
-        entry, sets them as online.
+        entry, sets them as online. Only a transition (e.g. offline to online)
+        is published; routine heartbeats broadcast nothing.
 
         Args:
             user_id: User's UUID
@@ -2492,27 +3374,63 @@ class PresenceService(BaseService):
         Returns:
             ServiceResult with updated presence data
         """
+        not_participant = cls._check_participation(user_id, conversation_id)
+        if not_participant is not None:
+            return not_participant
+
         try:
-            # Get current status
-            current = cls.get_presence(user_id)
-            if not current.success:
-                return current
+            # Keep current status (or default to online) in one Lua call
+            return ServiceResult.success(
+                cls._store_presence_in(user_id, "", conversation_id)
+            )
 
-            # Use current status or default to online
-            status = current.data["status"]
-            if status == PresenceStatus.OFFLINE:
-                status = PresenceStatus.ONLINE
+        except Exception as e:
+            logger.exception(f"Error heartbeat for user {user_id}: {e}")
+            return ServiceResult.failure(
+                error="Failed to process heartbeat",
+                error_code="presence_error",
+            )
 
-            # Set presence (which updates TTL)
-            return cls.set_presence(user_id, status, conversation_id)
+    @classmethod
+    def batch_heartbeat(cls, user_id, conversation_ids: list[int]) -> ServiceResult:
+        """
+        Update presence heartbeat for several open conversations at once.
 
+        Membership is checked against the user's cached conversation IDs (one
+        lookup for the whole batch) and the user hash plus every conversation
+        set are refreshed in a single Lua call. Conversations the user is not
+        an active participant in are skipped and reported instead of failing
+        the batch, so one stale tab does not stop the others' heartbeats.
+
+        Args:
+            user_id: User's UUID
+            conversation_ids: Conversations open in the client
+
+        Returns:
+            ServiceResult with presence data plus "conversation_ids"
+            (refreshed) and "rejected_conversation_ids"
+        """
+        member_ids = set(MembershipCache.get_user_conversation_ids(user_id))
+        accepted, rejected = [], []
+        for conversation_id in dict.fromkeys(conversation_ids):
+            if conversation_id in member_ids:
+                accepted.append(conversation_id)
+            else:
+                rejected.append(conversation_id)
+
+        try:
+            result_data = cls._store_presence(user_id, "", accepted)
         except Exception as e:
-            logger.exception(f"Error heartbeat for user {user_id}: {e}")
+            logger.exception(f"Error batch heartbeat for user {user_id}: {e}")
             return ServiceResult.failure(
                 error="Failed to process heartbeat",
                 error_code="presence_error",
             )
 
+        result_data["conversation_ids"] = accepted
+        result_data["rejected_conversation_ids"] = rejected
+        return ServiceResult.success(result_data)
+
     @classmethod
     def leave_conversation(cls, user_id, conversation_id: int) -> ServiceResult:
         """
@@ -2531,7 +3449,7 @@ class PresenceService(BaseService):
             redis_client = cls._get_redis_client()
             conv_key = cls._conversation_presence_key(conversation_id)
 
-            redis_client.srem(conv_key, str(user_id))
+            redis_client.zrem(conv_key, str(user_id))
 
             return ServiceResult.success({"conversation_id": conversation_id})
 
@@ -2548,6 +3466,7 @@ class PresenceService(BaseService):
         Clear all presence data for a user.
 
         Removes global presence and from all conversation presence sets.
+        Conversation members are told the user went offline.
 
         Args:
             user_id: User's UUID
@@ -2560,11 +3479,22 @@ class PresenceService(BaseService):
 
             # Delete user presence using raw Redis client
             user_key = cls._user_presence_key(user_id)
-            redis_client.delete(user_key)
+            was_present = redis_client.delete(user_key)
+
+            if was_present:
+                cls._publish_status_change(
+                    user_id,
+                    {
+                        "user_id": str(user_id),
+                        "status": PresenceStatus.OFFLINE,
+                        "last_seen": timezone.now().isoformat(),
+                    },
+                    status_changed=True,
+                )
 
             # Note: Removing from all conversation sets would require tracking
-            # which conversations the user is in. For simplicity, we rely on
-            # TTL expiration for conversation presence cleanup.
+            # which conversations the user is in. Their entries stop counting
+            # once stale and are pruned lazily on the next write or read.
 
             return ServiceResult.success({"user_id": str(user_id), "cleared": True})
 
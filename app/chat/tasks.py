@@ -0,0 +1,151 @@
+"""
+Celery tasks for the chat application.
+
+Tasks:
+    flush_message_write_behind: Persist messages buffered by write-behind sends
+    flush_coalesced_updates: Apply buffered last_message_at/reply_count updates
+    prune_message_changes: Delete delta-sync change log entries past retention
+    flush_read_receipts: Apply debounced WebSocket read frames in bulk
+    create_message_partitions: Create chat_message partitions ahead of time
+    archive_cold_messages: Move messages past CHAT_ARCHIVE_AFTER_DAYS to the archive
+
+Usage:
+    from chat.tasks import flush_message_write_behind
+
+    # Scheduled via celery-beat (see migrations 0010, 0011, 0014, 0015, 0017, 0019); can also run manually
+    flush_message_write_behind.delay()
+    flush_coalesced_updates.delay()
+"""
+
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def flush_message_write_behind() -> dict:
+    """
+    Periodic task to drain the write-behind stream into the database.
+
+    Runs every WRITE_BEHIND_CONFIG.FLUSH_INTERVAL_SECONDS. Also drains
+    leftovers after CHAT_WRITE_BEHIND_ENABLED is switched off, so it is safe
+    to keep scheduled on every deployment.
+
+    Returns:
+        Dict with count of messages inserted.
+    """
+    from chat.write_behind import MessageWriteBehind
+
+    result = MessageWriteBehind.flush()
+
+    return {"inserted_count": result.data}
+
+
+@shared_task(ignore_result=True)
+def flush_coalesced_updates() -> dict:
+    """
+    Periodic task to apply buffered conversation and reply count updates.
+
+    Runs every COALESCE_CONFIG.FLUSH_INTERVAL_SECONDS, which bounds how stale
+    last_message_at and reply_count can be, and early when a buffer reaches
+    COALESCE_CONFIG.FLUSH_THRESHOLD entries.
+
+    Returns:
+        Dict with counts of conversations and messages updated.
+    """
+    from chat.coalescing import CoalescedUpdates
+
+    result = CoalescedUpdates.flush()
+    if not result.success:
+        logger.debug(f"Skipped coalesced update flush: {result.error}")
+        return {"conversations": 0, "messages": 0}
+
+    return result.data
+
+
+@shared_task(ignore_result=True)
+def prune_message_changes() -> dict:
+    """
+    Periodic task to delete message changes past SYNC_CONFIG.RETENTION_DAYS.
+
+    Runs daily. Clients whose sync cursor predates the pruned range get
+    CURSOR_EXPIRED and reload.
+
+    Returns:
+        Dict with count of changes deleted.
+    """
+    from chat.services import SyncService
+
+    result = SyncService.prune()
+
+    return {"deleted_count": result.data}
+
+
+@shared_task(ignore_result=True)
+def flush_read_receipts() -> dict:
+    """
+    Periodic task to apply debounced read frames and broadcast receipts.
+
+    Runs every READ_RECEIPT_CONFIG.FLUSH_INTERVAL_SECONDS, which is the
+    debounce window. Also drains leftovers after CHAT_DEBOUNCED_READS_ENABLED
+    is switched off.
+
+    Returns:
+        Dict with count of participants updated.
+    """
+    from chat.read_receipts import ReadReceipts
+
+    result = ReadReceipts.flush()
+    if not result.success:
+        logger.debug(f"Skipped read receipt flush: {result.error}")
+        return {"updated_count": 0}
+
+    return {"updated_count": result.data}
+
+
+@shared_task(ignore_result=True)
+def create_message_partitions() -> dict:
+    """
+    Periodic task to keep chat_message partitions created ahead of time.
+
+    Runs daily. Creates the current month and
+    MESSAGE_PARTITION_CONFIG.PREMAKE_MONTHS ahead, so inserts never fall
+    into the default partition while beat is healthy.
+
+    Returns:
+        Dict with names of the partitions created.
+    """
+    from chat.partitions import MessagePartitions
+
+    result = MessagePartitions.ensure()
+    if not result.success:
+        logger.warning(f"Message partitions not created: {result.error}")
+        return {"created": []}
+
+    return {"created": result.data}
+
+
+@shared_task(ignore_result=True)
+def archive_cold_messages() -> dict:
+    """
+    Periodic task to move cold messages into chat_message_archive.
+
+    Runs daily and does nothing unless CHAT_ARCHIVE_AFTER_DAYS is set. Work
+    per run is capped by MESSAGE_ARCHIVE_CONFIG.MAX_BATCHES_PER_RUN; a
+    backlog is worked off over several runs.
+
+    Returns:
+        Dict with count of messages archived.
+    """
+    from chat.archive import MessageArchive
+
+    result = MessageArchive.archive()
+    if not result.success:
+        logger.debug(f"Skipped message archival: {result.error}")
+        return {"archived_count": 0}
+
+    return {"archived_count": result.data}
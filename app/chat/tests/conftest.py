@@ -15,6 +15,7 @@ Usage:
 """
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -31,6 +32,19 @@ from chat.models import (
 )
 
 
+# =============================================================================
+# Cache Fixtures
+# =============================================================================
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear cache (membership, presence) before and after each test."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 # =============================================================================
 # User Fixtures
 # =============================================================================
@@ -0,0 +1,319 @@
+"""
+Tests for cold message archival and read-through.
+
+Test Categories:
+    1. Archival - old messages move to the archive with their edit history
+    2. Read-through - history pages and edit history span hot and archive,
+       reactions stay removable
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from chat.archive import MessageArchive
+from chat.coalescing import CoalescedUpdates
+from chat.models import (
+    ArchivedMessage,
+    Conversation,
+    Message,
+    MessageChange,
+    MessageEditHistory,
+    MessageReaction,
+    MessageType,
+)
+from chat.services import MessageService, ReactionService, SyncService
+
+CUTOFF_DAYS = 365
+SYNC_URL = "/api/v1/chat/sync/"
+
+
+@pytest.fixture
+def old_conversation(group_conversation):
+    """A group conversation created two years ago."""
+    Conversation.objects.filter(pk=group_conversation.pk).update(
+        created_at=timezone.now() - timedelta(days=2 * CUTOFF_DAYS)
+    )
+    group_conversation.refresh_from_db()
+    return group_conversation
+
+
+def send(conversation, sender, content, days_ago=0):
+    """Create a message sent days_ago days ago."""
+    message = Message.objects.create(
+        conversation=conversation,
+        sender=sender,
+        message_type=MessageType.TEXT,
+        content=content,
+    )
+    if days_ago:
+        Message.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=days_ago, seconds=-message.id)
+        )
+    return message
+
+
+def archive():
+    """Archive messages older than CUTOFF_DAYS."""
+    return MessageArchive.archive(
+        cutoff=timezone.now() - timedelta(days=CUTOFF_DAYS)
+    ).data
+
+
+def messages_url(conversation):
+    """Build the message list URL for a conversation."""
+    return f"/api/v1/chat/conversations/{conversation.id}/messages/"
+
+
+def walk_history(client, conversation, page_size=2):
+    """Follow next links through a conversation's history."""
+    cache.clear()
+    pages = []
+    url = f"{messages_url(conversation)}?page_size={page_size}"
+    while url:
+        data = client.get(url).json()
+        pages.append(data["results"])
+        url = data["next"]
+    return pages
+
+
+# =============================================================================
+# Archival
+# =============================================================================
+
+
+class TestArchival:
+    """Tests for moving cold messages into the archive."""
+
+    def test_old_messages_archived(self, old_conversation, owner_user):
+        """
+        Messages past the cutoff leave chat_message; recent ones stay.
+
+        Why it matters: The hot table and its indexes only hold the window
+        that is actually read.
+        """
+        old = send(old_conversation, owner_user, "Cold", days_ago=CUTOFF_DAYS + 30)
+        recent = send(old_conversation, owner_user, "Hot")
+
+        assert archive() == 1
+
+        assert list(Message.objects.values_list("id", flat=True)) == [recent.id]
+        archived = ArchivedMessage.objects.get(pk=old.pk)
+        assert archived.content == "Cold"
+        old_conversation.refresh_from_db()
+        assert old_conversation.archived_until == archived.created_at
+
+    def test_dependent_rows_folded_into_archive(self, old_conversation, owner_user):
+        """Edit history is embedded; reactions keep their rows and counts."""
+        message = send(old_conversation, owner_user, "First")
+        MessageService.edit_message(
+            user=owner_user, message_id=message.id, new_content="Second"
+        )
+        ReactionService.add_reaction(user=owner_user, message_id=message.id, emoji="👍")
+        Message.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=CUTOFF_DAYS + 1)
+        )
+
+        archive()
+
+        archived = ArchivedMessage.objects.get(pk=message.pk)
+        assert archived.content == "Second"
+        assert archived.reaction_counts == {"👍": 1}
+        assert [entry["content"] for entry in archived.edit_history] == ["First"]
+        assert not MessageEditHistory.objects.filter(message_id=message.id).exists()
+        assert MessageReaction.objects.filter(message_id=message.id).exists()
+
+    def test_root_with_hot_reply_stays_hot(self, old_conversation, owner_user):
+        """
+        A cold root is archived only once its replies are cold too.
+
+        Why it matters: Hot replies would otherwise point at a parent that
+        no longer exists in chat_message.
+        """
+        root = send(old_conversation, owner_user, "Root", days_ago=CUTOFF_DAYS + 2)
+        reply = Message.objects.create(
+            conversation=old_conversation,
+            sender=owner_user,
+            message_type=MessageType.TEXT,
+            content="Reply",
+            parent_message=root,
+        )
+
+        assert archive() == 0
+        assert Message.objects.filter(pk=root.pk).exists()
+
+        Message.objects.filter(pk=reply.pk).update(
+            created_at=timezone.now() - timedelta(days=CUTOFF_DAYS + 1)
+        )
+        assert archive() == 2
+
+    def test_buffered_reply_count_applied_to_archived_root(
+        self, old_conversation, owner_user
+    ):
+        """Reply counts buffered before the root was archived are not dropped."""
+        root = send(old_conversation, owner_user, "Root", days_ago=CUTOFF_DAYS + 1)
+        CoalescedUpdates.record_reply(root.id)
+        archive()
+
+        CoalescedUpdates.flush()
+
+        assert ArchivedMessage.objects.get(pk=root.pk).reply_count == 1
+
+    def test_archives_in_batches(self, old_conversation, owner_user):
+        """Batches repeat until no message past the cutoff is left."""
+        for i in range(5):
+            send(old_conversation, owner_user, f"M{i}", days_ago=CUTOFF_DAYS + 1)
+
+        result = MessageArchive.archive(
+            cutoff=timezone.now() - timedelta(days=CUTOFF_DAYS), batch_size=2
+        )
+
+        assert result.data == 5
+        assert not Message.objects.exists()
+
+    def test_disabled_without_setting(self, db):
+        """Without CHAT_ARCHIVE_AFTER_DAYS nothing is archived."""
+        result = MessageArchive.archive()
+
+        assert result.error_code == "ARCHIVE_DISABLED"
+
+    def test_setting_sets_cutoff(self, settings, old_conversation, owner_user):
+        """CHAT_ARCHIVE_AFTER_DAYS is the archive age."""
+        settings.CHAT_ARCHIVE_AFTER_DAYS = 30
+        send(old_conversation, owner_user, "Cold", days_ago=31)
+        send(old_conversation, owner_user, "Warm", days_ago=29)
+
+        assert MessageArchive.archive().data == 1
+
+
+# =============================================================================
+# Read-through
+# =============================================================================
+
+
+class TestReadThrough:
+    """Tests that history reads span hot and archived messages."""
+
+    def test_history_unchanged_by_archival(
+        self, owner_client, old_conversation, owner_user
+    ):
+        """
+        Paging through history returns the same pages before and after.
+
+        Why it matters: Archival must be invisible to clients, including
+        pages that straddle the archive boundary.
+        """
+        for i in range(3):
+            send(
+                old_conversation, owner_user, f"Cold {i}", days_ago=CUTOFF_DAYS + 3 - i
+            )
+        for i in range(2):
+            send(old_conversation, owner_user, f"Hot {i}")
+        before = walk_history(owner_client, old_conversation)
+
+        archive()
+        after = walk_history(owner_client, old_conversation)
+
+        assert after == before
+        assert [len(page) for page in after] == [2, 2, 1]
+
+    def test_hot_pages_skip_archive(self, owner_client, old_conversation, owner_user):
+        """Pages past the archive boundary only query chat_message."""
+        send(old_conversation, owner_user, "Cold", days_ago=CUTOFF_DAYS + 1)
+        send(old_conversation, owner_user, "Hot 1")
+        send(old_conversation, owner_user, "Hot 2")
+        archive()
+
+        first = owner_client.get(messages_url(old_conversation), {"page_size": 1})
+        with CaptureQueriesContext(connection) as queries:
+            second = owner_client.get(first.json()["next"])
+
+        assert [m["content"] for m in first.json()["results"]] == ["Cold"]
+        assert [m["content"] for m in second.json()["results"]] == ["Hot 1"]
+        assert not any("chat_message_timeline" in q["sql"] for q in queries)
+
+    def test_archived_edit_history(self, owner_client, old_conversation, owner_user):
+        """Edit history of an archived message is served from the archive."""
+        message = send(old_conversation, owner_user, "First")
+        MessageService.edit_message(
+            user=owner_user, message_id=message.id, new_content="Second"
+        )
+        url = f"{messages_url(old_conversation)}{message.id}/history/"
+        before = owner_client.get(url).json()
+        Message.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=CUTOFF_DAYS + 1)
+        )
+
+        archive()
+        response = owner_client.get(url)
+
+        assert response.status_code == 200
+        assert response.json() == before
+        assert before[0]["content"] == "First"
+
+    def test_sync_cursor_survives_archival(
+        self, mocker, owner_client, old_conversation, owner_user
+    ):
+        """Archiving a message keeps sync cursors into its change log valid."""
+        mocker.patch.object(SyncService, "_commit_horizon", return_value=2**63 - 1)
+        message = send(old_conversation, owner_user, "First")
+        before_edit = owner_client.get(SYNC_URL).json()["cursor"]
+        MessageService.edit_message(
+            user=owner_user, message_id=message.id, new_content="Second"
+        )
+        after_edit = owner_client.get(SYNC_URL, {"cursor": before_edit}).json()[
+            "cursor"
+        ]
+        Message.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=CUTOFF_DAYS + 1)
+        )
+
+        archive()
+        current = owner_client.get(SYNC_URL, {"cursor": after_edit})
+        behind = owner_client.get(SYNC_URL, {"cursor": before_edit})
+
+        assert MessageChange.objects.filter(message_id=message.id).exists()
+        assert current.status_code == 200
+        assert current.json()["messages"] == []
+        assert behind.status_code == 200
+        assert [m["content"] for m in behind.json()["messages"]] == ["Second"]
+
+    def test_reaction_removable_after_archival(
+        self, owner_client, old_conversation, owner_user
+    ):
+        """
+        Users can take back reactions on archived messages, not add new ones.
+
+        Why it matters: Archival must not lock a reaction in place forever.
+        """
+        message = send(old_conversation, owner_user, "Cold")
+        ReactionService.add_reaction(user=owner_user, message_id=message.id, emoji="👍")
+        Message.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=CUTOFF_DAYS + 1)
+        )
+        archive()
+        reactions_url = f"{messages_url(old_conversation)}{message.id}/reactions/"
+
+        removed = owner_client.delete(f"{reactions_url}%F0%9F%91%8D/")
+        added = owner_client.post(f"{reactions_url}toggle/", {"emoji": "👍"})
+
+        assert removed.status_code == 204
+        assert ArchivedMessage.objects.get(pk=message.pk).reaction_counts == {}
+        assert not MessageReaction.objects.filter(message_id=message.id).exists()
+        assert added.status_code == 400
+        assert added.json()["error_code"] == "MESSAGE_ARCHIVED"
+
+    def test_archived_message_not_deletable(
+        self, owner_client, old_conversation, owner_user
+    ):
+        """Archived messages are read-only."""
+        message = send(old_conversation, owner_user, "Cold", days_ago=CUTOFF_DAYS + 1)
+        archive()
+
+        response = owner_client.delete(f"{messages_url(old_conversation)}{message.id}/")
+
+        assert response.status_code == 404
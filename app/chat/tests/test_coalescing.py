@@ -0,0 +1,268 @@
+"""
+Tests for coalesced last_message_at and reply_count updates.
+
+Test Categories:
+    1. Buffering - send_message records updates in Redis instead of the DB
+    2. Flush - buffered updates are applied in bulk and never move backwards
+    3. Resilience - rolled-back sends, Redis failures, early flush threshold
+"""
+
+from datetime import timedelta
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from chat.coalescing import CoalescedUpdates
+from chat.constants import COALESCE_CONFIG
+from chat.services import MessageService
+
+
+@pytest.fixture
+def coalescing(settings):
+    """Enable coalesced updates for the test."""
+    settings.CHAT_COALESCED_UPDATES_ENABLED = True
+
+
+def send(conversation, sender, content="Hello", parent_message_id=None):
+    """Send a message and return the created Message."""
+    return MessageService.send_message(
+        conversation=conversation,
+        sender=sender,
+        content=content,
+        parent_message_id=parent_message_id,
+    ).data
+
+
+# =============================================================================
+# Buffering
+# =============================================================================
+
+
+class TestCoalescedBuffering:
+    """Tests that send_message defers denormalized updates."""
+
+    def test_disabled_by_default_updates_immediately(
+        self, db, group_conversation, owner_user
+    ):
+        """Without the setting, last_message_at is written in the send."""
+        message = send(group_conversation, owner_user)
+
+        group_conversation.refresh_from_db()
+        assert group_conversation.last_message_at == message.created_at
+
+    def test_send_defers_conversation_update(
+        self,
+        db,
+        coalescing,
+        group_conversation,
+        owner_user,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        With coalescing, the conversation row is not updated per message.
+
+        Why it matters: Busy groups otherwise serialize on this row lock.
+        """
+        with django_capture_on_commit_callbacks(execute=True):
+            send(group_conversation, owner_user)
+
+        group_conversation.refresh_from_db()
+        assert group_conversation.last_message_at is None
+
+    def test_send_defers_reply_count(
+        self,
+        db,
+        coalescing,
+        group_conversation,
+        owner_user,
+        text_message,
+        django_capture_on_commit_callbacks,
+    ):
+        """Replies do not touch the parent row until the flush."""
+        with django_capture_on_commit_callbacks(execute=True):
+            send(group_conversation, owner_user, parent_message_id=text_message.id)
+
+        text_message.refresh_from_db()
+        assert text_message.reply_count == 0
+
+
+# =============================================================================
+# Flush
+# =============================================================================
+
+
+class TestCoalescedFlush:
+    """Tests for CoalescedUpdates.flush."""
+
+    def test_flush_applies_latest_timestamp_and_reply_total(
+        self,
+        db,
+        coalescing,
+        group_conversation,
+        owner_user,
+        text_message,
+        django_capture_on_commit_callbacks,
+    ):
+        """A burst collapses into one update per conversation and parent."""
+        with django_capture_on_commit_callbacks(execute=True):
+            replies = [
+                send(
+                    group_conversation,
+                    owner_user,
+                    content=f"Reply {i}",
+                    parent_message_id=text_message.id,
+                )
+                for i in range(3)
+            ]
+
+        result = CoalescedUpdates.flush()
+
+        assert result.data == {"conversations": 1, "messages": 1}
+        group_conversation.refresh_from_db()
+        text_message.refresh_from_db()
+        assert group_conversation.last_message_at == replies[-1].created_at
+        assert text_message.reply_count == 3
+
+    def test_flush_never_moves_last_message_at_backwards(
+        self, db, group_conversation, owner_user
+    ):
+        """A newer value written directly wins over an older buffered one."""
+        message = send(group_conversation, owner_user)
+        CoalescedUpdates.record_last_message(
+            group_conversation.id, message.created_at - timedelta(minutes=5)
+        )
+
+        CoalescedUpdates.flush()
+
+        group_conversation.refresh_from_db()
+        assert group_conversation.last_message_at == message.created_at
+
+    def test_flush_with_empty_buffers(self, db):
+        """Idle deployments flush nothing."""
+        result = CoalescedUpdates.flush()
+
+        assert result.data == {"conversations": 0, "messages": 0}
+
+    def test_concurrent_flush_is_rejected(self, db):
+        """Only one flush applies a snapshot at a time."""
+        redis_client = CoalescedUpdates._get_redis_client()
+        redis_client.set(CoalescedUpdates.FLUSH_LOCK_KEY, 1)
+
+        result = CoalescedUpdates.flush()
+
+        assert result.error_code == "FLUSH_IN_PROGRESS"
+
+    def test_failed_flush_is_retried_from_snapshot(
+        self, db, group_conversation, owner_user, text_message, mocker
+    ):
+        """
+        Buffered increments survive a failed flush and apply exactly once.
+
+        Why it matters: reply_count increments cannot be recomputed from Redis.
+        """
+        CoalescedUpdates.record_reply(text_message.id)
+        mocker.patch.object(
+            CoalescedUpdates,
+            "_apply_reply_counts",
+            side_effect=RuntimeError("db down"),
+        )
+        with pytest.raises(RuntimeError):
+            CoalescedUpdates.flush()
+        mocker.stopall()
+
+        CoalescedUpdates.record_reply(text_message.id)
+        CoalescedUpdates.flush()  # Pending snapshot
+        CoalescedUpdates.flush()  # Reply buffered after the failure
+
+        text_message.refresh_from_db()
+        assert text_message.reply_count == 2
+
+    def test_flush_that_lost_its_lock_rolls_back(self, db, text_message, mocker):
+        """
+        A flush whose lock was taken over commits nothing and keeps the snapshot.
+
+        Why it matters: the lock TTL can run out mid-apply; the flush that
+        took over applies the same snapshot, so the increments must not be
+        committed twice, and must not be dropped either.
+        """
+        redis_client = CoalescedUpdates._get_redis_client()
+        apply_reply_counts = CoalescedUpdates._apply_reply_counts
+
+        def apply_then_lose_lock(values):
+            apply_reply_counts(values)
+            redis_client.set(CoalescedUpdates.FLUSH_LOCK_KEY, "other")
+
+        CoalescedUpdates.record_reply(text_message.id)
+        mocker.patch.object(
+            CoalescedUpdates, "_apply_reply_counts", side_effect=apply_then_lose_lock
+        )
+        result = CoalescedUpdates.flush()
+        mocker.stopall()
+
+        text_message.refresh_from_db()
+        assert result.data["messages"] == 0
+        assert text_message.reply_count == 0
+        assert redis_client.get(CoalescedUpdates.FLUSH_LOCK_KEY) == b"other"
+
+        redis_client.delete(CoalescedUpdates.FLUSH_LOCK_KEY)  # Other flush died
+        CoalescedUpdates.flush()
+
+        text_message.refresh_from_db()
+        assert text_message.reply_count == 1
+
+
+# =============================================================================
+# Resilience
+# =============================================================================
+
+
+class TestCoalescedResilience:
+    """Tests for rollbacks, Redis outages and the early flush threshold."""
+
+    def test_rolled_back_send_buffers_nothing(
+        self,
+        db,
+        coalescing,
+        group_conversation,
+        owner_user,
+        django_capture_on_commit_callbacks,
+    ):
+        """Buffering happens on commit only."""
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            send(group_conversation, owner_user)
+
+        # Simulate rollback: callbacks are discarded. The second one is the
+        # message history cache bump (chat.history_cache)
+        assert len(callbacks) == 2
+        assert CoalescedUpdates.flush().data["conversations"] == 0
+
+    def test_redis_failure_falls_back_to_direct_update(
+        self, db, group_conversation, owner_user, text_message, mocker
+    ):
+        """Sends keep denormalized fields correct when Redis is down."""
+        mocker.patch.object(
+            CoalescedUpdates,
+            "_get_redis_client",
+            side_effect=RedisConnectionError("down"),
+        )
+
+        CoalescedUpdates.record_last_message(
+            group_conversation.id, text_message.created_at
+        )
+        CoalescedUpdates.record_reply(text_message.id)
+
+        group_conversation.refresh_from_db()
+        text_message.refresh_from_db()
+        assert group_conversation.last_message_at == text_message.created_at
+        assert text_message.reply_count == 1
+
+    def test_threshold_schedules_early_flush(self, db, mocker):
+        """Reaching the threshold queues a flush once per buffer fill."""
+        delay = mocker.patch("chat.tasks.flush_coalesced_updates.delay")
+        mocker.patch.object(COALESCE_CONFIG, "FLUSH_THRESHOLD", 2)
+
+        CoalescedUpdates.record_reply(1)
+        CoalescedUpdates.record_reply(2)
+        CoalescedUpdates.record_reply(3)
+
+        delay.assert_called_once()
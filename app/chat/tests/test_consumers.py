@@ -0,0 +1,448 @@
+"""
+Tests for the multiplexed per-user WebSocket consumer.
+
+Test Categories:
+    1. Connection - authentication and notification group
+    2. Subscriptions - subscribe/unsubscribe with membership checks
+    3. Routing - message, typing and read frames per conversation
+    4. Typing throttle - dropped repeats, leading/trailing edges, auto-stop
+
+Consumers are driven through asgiref's ApplicationCommunicator (channels'
+WebsocketCommunicator needs daphne, which is not a dependency) inside
+async_to_sync, so database_sync_to_async calls run on the test's database
+connection. database_sync_to_async closes connections that are inside an
+atomic block, so socket tests run with transaction=True.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import get_channel_layer
+from django.contrib.auth.models import AnonymousUser
+
+from chat.constants import TYPING_CONFIG
+from chat.consumers import ChatConsumer, UserConsumer
+from chat.models import Message, Participant
+from chat.read_receipts import ReadReceipts
+from notifications.sockets import NotificationSockets
+
+
+class SocketClient(ApplicationCommunicator):
+    """Minimal WebSocket client for a consumer application."""
+
+    def __init__(self, user):
+        super().__init__(
+            UserConsumer.as_asgi(),
+            {"type": "websocket", "path": "/ws/chat/", "user": user},
+        )
+
+    async def connect(self):
+        """Open the socket; returns (accepted, close_code)."""
+        await self.send_input({"type": "websocket.connect"})
+        response = await self.receive_output(1)
+        return response["type"] == "websocket.accept", response.get("code")
+
+    async def send_json_to(self, data):
+        """Send a JSON text frame."""
+        await self.send_input({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json_from(self, timeout=1):
+        """Receive a JSON text frame."""
+        response = await self.receive_output(timeout)
+        return json.loads(response["text"])
+
+    async def disconnect(self):
+        """Close the socket and wait for the consumer to finish."""
+        await self.send_input({"type": "websocket.disconnect", "code": 1000})
+        await self.wait(1)
+
+
+def run_socket(user, scenario):
+    """Connect a UserConsumer as user and run scenario(client)."""
+
+    async def run():
+        client = SocketClient(user)
+        connected, close_code = await client.connect()
+        if not connected:
+            return close_code
+        try:
+            return await scenario(client)
+        finally:
+            await client.disconnect()
+
+    return async_to_sync(run)()
+
+
+async def subscribe(client, conversation_ids):
+    """Send a subscribe frame and return the acknowledgement."""
+    await client.send_json_to(
+        {"type": "subscribe", "conversation_ids": conversation_ids}
+    )
+    return await client.receive_json_from()
+
+
+# =============================================================================
+# Connection
+# =============================================================================
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserConsumerConnection:
+    """Tests for connecting the multiplexed socket."""
+
+    def test_unauthenticated_connection_rejected(self, db):
+        """Anonymous users are closed with 4001."""
+        close_code = run_socket(AnonymousUser(), None)
+
+        assert close_code == 4001
+
+    def test_notification_push_delivered(self, db, owner_user):
+        """
+        Notification pushes reach the user's socket without a subscription.
+
+        Why it matters: One socket carries chat and notification traffic.
+        """
+
+        async def scenario(client):
+            await get_channel_layer().group_send(
+                NotificationSockets.group_name(owner_user.id),
+                {"type": "notification.message", "notification": {"title": "Hi"}},
+            )
+            return await client.receive_json_from()
+
+        frame = run_socket(owner_user, scenario)
+
+        assert frame == {"type": "notification", "notification": {"title": "Hi"}}
+
+    def test_socket_registered_for_notifications(self, db, owner_user):
+        """Open sockets are counted so notification pushes can skip offline users."""
+
+        async def scenario(client):
+            return await sync_to_async(NotificationSockets.count)(owner_user.id)
+
+        assert run_socket(owner_user, scenario) == 1
+        assert NotificationSockets.count(owner_user.id) == 0
+
+
+# =============================================================================
+# Subscriptions
+# =============================================================================
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserConsumerSubscriptions:
+    """Tests for subscribe and unsubscribe frames."""
+
+    def test_subscribe_accepts_only_member_conversations(
+        self, group_conversation, direct_conversation, owner_user, other_user
+    ):
+        """Conversations the user is not in are rejected."""
+
+        async def scenario(client):
+            return await subscribe(
+                client, [group_conversation.id, direct_conversation.id]
+            )
+
+        frame = run_socket(other_user, scenario)
+
+        assert frame == {
+            "type": "subscribed",
+            "conversation_ids": [direct_conversation.id],
+            "rejected_conversation_ids": [group_conversation.id],
+        }
+
+    def test_unsubscribed_conversation_frames_rejected(
+        self, group_conversation, owner_user
+    ):
+        """Frames for conversations the socket has not subscribed to fail."""
+
+        async def scenario(client):
+            await subscribe(client, [group_conversation.id])
+            await client.send_json_to(
+                {"type": "unsubscribe", "conversation_ids": [group_conversation.id]}
+            )
+            await client.receive_json_from()
+            await client.send_json_to(
+                {
+                    "type": "message",
+                    "conversation_id": group_conversation.id,
+                    "content": "Hello",
+                }
+            )
+            return await client.receive_json_from()
+
+        frame = run_socket(owner_user, scenario)
+
+        assert frame["type"] == "error"
+        assert not Message.objects.filter(conversation=group_conversation).exists()
+
+    def test_invalid_conversation_ids_rejected(self, db, owner_user):
+        """conversation_ids must be a list of integers."""
+
+        async def scenario(client):
+            await client.send_json_to({"type": "subscribe", "conversation_ids": "1,2"})
+            return await client.receive_json_from()
+
+        frame = run_socket(owner_user, scenario)
+
+        assert frame["type"] == "error"
+
+
+# =============================================================================
+# Routing
+# =============================================================================
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserConsumerRouting:
+    """Tests for per-conversation message, typing and read frames."""
+
+    def test_message_broadcast_tagged_with_conversation(
+        self, group_conversation, owner_user
+    ):
+        """
+        Messages are persisted and echoed with their conversation_id.
+
+        Why it matters: Clients route frames from many conversations.
+        """
+
+        async def scenario(client):
+            await subscribe(client, [group_conversation.id])
+            await client.send_json_to(
+                {
+                    "type": "message",
+                    "conversation_id": group_conversation.id,
+                    "content": "Hello",
+                }
+            )
+            return await client.receive_json_from()
+
+        frame = run_socket(owner_user, scenario)
+
+        assert frame["type"] == "message"
+        assert frame["conversation_id"] == group_conversation.id
+        assert frame["message"]["content"] == "Hello"
+        assert Message.objects.filter(conversation=group_conversation).count() == 1
+
+    def test_typing_reaches_other_subscribers_only(
+        self, direct_conversation, owner_user, other_user
+    ):
+        """Typing indicators are not echoed back to the typist."""
+
+        async def scenario(client):
+            await subscribe(client, [direct_conversation.id])
+            await get_channel_layer().group_send(
+                f"chat_{direct_conversation.id}",
+                {
+                    "type": "chat.typing",
+                    "conversation_id": direct_conversation.id,
+                    "user_id": str(owner_user.id),
+                    "is_typing": True,
+                },
+            )
+            await get_channel_layer().group_send(
+                f"chat_{direct_conversation.id}",
+                {
+                    "type": "chat.typing",
+                    "conversation_id": direct_conversation.id,
+                    "user_id": str(other_user.id),
+                    "is_typing": True,
+                },
+            )
+            return await client.receive_json_from()
+
+        frame = run_socket(other_user, scenario)
+
+        assert frame == {
+            "type": "typing",
+            "conversation_id": direct_conversation.id,
+            "user_id": str(owner_user.id),
+            "is_typing": True,
+        }
+
+    def test_read_frame_marks_conversation_read(self, group_conversation, owner_user):
+        """A read frame updates the participant's read state."""
+        Participant.objects.filter(
+            conversation=group_conversation, user=owner_user
+        ).update(unread_count=3)
+
+        async def scenario(client):
+            await subscribe(client, [group_conversation.id])
+            await client.send_json_to(
+                {"type": "read", "conversation_id": group_conversation.id}
+            )
+            return await client.receive_nothing(timeout=0.2)
+
+        assert run_socket(owner_user, scenario) is True
+
+        participant = Participant.objects.get(
+            conversation=group_conversation, user=owner_user
+        )
+        assert participant.unread_count == 0
+        assert participant.last_read_at is not None
+
+    def test_debounced_read_frame_is_buffered(
+        self, settings, group_conversation, owner_user
+    ):
+        """With debounced reads, a read frame is left for the next flush."""
+        settings.CHAT_DEBOUNCED_READS_ENABLED = True
+
+        async def scenario(client):
+            await subscribe(client, [group_conversation.id])
+            await client.send_json_to(
+                {"type": "read", "conversation_id": group_conversation.id}
+            )
+            return await client.receive_nothing(timeout=0.2)
+
+        assert run_socket(owner_user, scenario) is True
+
+        participant = Participant.objects.get(
+            conversation=group_conversation, user=owner_user
+        )
+        assert participant.last_read_at is None
+        assert ReadReceipts.flush().data == 1
+
+    def test_receipts_skip_own_read(self, direct_conversation, owner_user, other_user):
+        """Receipt batches are relayed without the connected user's entry."""
+
+        async def scenario(client):
+            await subscribe(client, [direct_conversation.id])
+            await get_channel_layer().group_send(
+                f"chat_{direct_conversation.id}",
+                {
+                    "type": "chat.receipts",
+                    "conversation_id": direct_conversation.id,
+                    "reads": [
+                        {"user_id": str(owner_user.id), "read_at": "t1"},
+                        {"user_id": str(other_user.id), "read_at": "t2"},
+                    ],
+                },
+            )
+            return await client.receive_json_from()
+
+        frame = run_socket(other_user, scenario)
+
+        assert frame == {
+            "type": "receipts",
+            "conversation_id": direct_conversation.id,
+            "reads": [{"user_id": str(owner_user.id), "read_at": "t1"}],
+        }
+
+
+# =============================================================================
+# Typing Throttle
+# =============================================================================
+
+
+@pytest.fixture
+def typing_config(mocker):
+    """Shrink the typing windows so tests run in milliseconds."""
+    mocker.patch.object(TYPING_CONFIG, "THROTTLE_SECONDS", 0.05)
+    mocker.patch.object(TYPING_CONFIG, "AUTO_STOP_SECONDS", 0.2)
+    return TYPING_CONFIG
+
+
+@pytest.fixture
+def typing_consumer():
+    """ChatConsumer with a recording channel layer and no socket."""
+    consumer = ChatConsumer()
+    consumer.scope = {"user": SimpleNamespace(id=uuid4())}
+    consumer.channel_layer = Mock(group_send=AsyncMock(), group_discard=AsyncMock())
+    consumer.channel_name = "test-channel"
+    return consumer
+
+
+def run_typing(consumer, frames):
+    """
+    Feed (delay_before, is_typing) frames to consumer and let timers settle.
+
+    Returns the is_typing values that reached group_send, in order.
+    """
+
+    async def run():
+        user = consumer.scope["user"]
+        for delay, is_typing in frames:
+            await asyncio.sleep(delay)
+            await consumer._handle_typing_frame(1, user, is_typing)
+        await asyncio.sleep(0.1)
+
+    async_to_sync(run)()
+    return [
+        call.args[1]["is_typing"]
+        for call in consumer.channel_layer.group_send.await_args_list
+    ]
+
+
+class TestTypingThrottle:
+    """Tests for server-side typing indicator throttling."""
+
+    def test_repeated_typing_frames_broadcast_once(
+        self, typing_config, typing_consumer
+    ):
+        """
+        A keystroke burst becomes one channel layer publish.
+
+        Why it matters: Typing noise dominated channel layer traffic.
+        """
+        sent = run_typing(typing_consumer, [(0, True)] * 10)
+
+        assert sent == [True]
+
+    def test_change_within_window_sent_on_trailing_edge(
+        self, typing_config, typing_consumer
+    ):
+        """A stop right after a start is delayed to the end of the window."""
+        sent = run_typing(typing_consumer, [(0, True), (0, False)])
+
+        assert sent == [True, False]
+
+    def test_flapping_within_window_is_dropped(self, typing_config, typing_consumer):
+        """Start-stop-start inside one window never broadcasts the stop."""
+        sent = run_typing(typing_consumer, [(0, True), (0, False), (0, True)])
+
+        assert sent == [True]
+
+    def test_leading_edge_disabled_delays_first_broadcast(
+        self, mocker, typing_config, typing_consumer
+    ):
+        """Without a leading edge, the state is sent when the window closes."""
+        mocker.patch.object(TYPING_CONFIG, "LEADING_EDGE", False)
+
+        async def first_broadcast_delayed():
+            user = typing_consumer.scope["user"]
+            await typing_consumer._handle_typing_frame(1, user, True)
+            assert typing_consumer.channel_layer.group_send.await_count == 0
+            await asyncio.sleep(0.1)
+            assert typing_consumer.channel_layer.group_send.await_count == 1
+
+        async_to_sync(first_broadcast_delayed)()
+
+    def test_typing_stops_automatically(self, typing_config, typing_consumer):
+        """Users who stop sending typing frames are reported as stopped."""
+        sent = run_typing(typing_consumer, [(0, True), (0.3, True)])
+
+        assert sent == [True, False, True]
+
+    def test_disconnect_stops_typing(self, typing_config, typing_consumer):
+        """Closing the socket clears the indicator for other members."""
+        typing_consumer.room_group_name = "chat_1"
+
+        async def type_then_disconnect():
+            user = typing_consumer.scope["user"]
+            await typing_consumer._handle_typing_frame(1, user, True)
+            await typing_consumer.disconnect(1000)
+
+        async_to_sync(type_then_disconnect)()
+
+        sent = [
+            call.args[1]["is_typing"]
+            for call in typing_consumer.channel_layer.group_send.await_args_list
+        ]
+        assert sent == [True, False]
+        assert typing_consumer.typing_states == {}
@@ -0,0 +1,155 @@
+"""
+Tests for the serialized message history page cache.
+
+Test Categories:
+    1. Serving - repeated opens hit the cache, cursors are cached per page
+    2. Invalidation - sends, edits, deletes and reactions bump the version
+    3. Access - the cache never bypasses participant checks
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chat.history_cache import MessageHistoryCache
+from chat.models import Message, MessageType
+from chat.services import MessageService, ReactionService
+
+
+def messages_url(conversation_id):
+    """Build the message list URL for a conversation."""
+    return f"/api/v1/chat/conversations/{conversation_id}/messages/"
+
+
+def message_queries(client, url):
+    """GET url and return (response, number of chat_message queries)."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, sum('"chat_message"' in q["sql"] for q in queries)
+
+
+# =============================================================================
+# Serving
+# =============================================================================
+
+
+class TestHistoryCacheServing:
+    """Tests that repeated opens are served from the cache."""
+
+    def test_repeated_open_served_from_cache(
+        self, owner_client, group_conversation, text_message
+    ):
+        """
+        The second open of a conversation skips the message query.
+
+        Why it matters: Popular group chats are opened by every member.
+        """
+        url = messages_url(group_conversation.id)
+        first, first_queries = message_queries(owner_client, url)
+        second, second_queries = message_queries(owner_client, url)
+
+        assert first_queries >= 1
+        assert second_queries == 0
+        assert second.json() == first.json()
+
+    def test_cursor_pages_cached_separately(
+        self, owner_client, group_conversation, owner_user
+    ):
+        """Each cursor position is its own cache entry with its own links."""
+        for i in range(3):
+            Message.objects.create(
+                conversation=group_conversation,
+                sender=owner_user,
+                message_type=MessageType.TEXT,
+                content=f"Message {i}",
+            )
+        url = f"{messages_url(group_conversation.id)}?page_size=2"
+        first_page = owner_client.get(url).json()
+        next_url = first_page["next"]
+
+        second_page = owner_client.get(next_url).json()
+        second_page_again, queries = message_queries(owner_client, next_url)
+
+        assert [m["content"] for m in second_page["results"]] == ["Message 2"]
+        assert second_page_again.json() == second_page
+        assert queries == 0
+
+
+# =============================================================================
+# Invalidation
+# =============================================================================
+
+
+class TestHistoryCacheInvalidation:
+    """Tests that message changes bump the conversation version."""
+
+    def test_new_message_invalidates(
+        self, owner_client, group_conversation, owner_user, text_message
+    ):
+        """A sent message appears on the next open."""
+        url = messages_url(group_conversation.id)
+        owner_client.get(url)
+
+        MessageService.send_message(
+            conversation=group_conversation, sender=owner_user, content="Fresh"
+        )
+        results = owner_client.get(url).json()["results"]
+
+        assert results[-1]["content"] == "Fresh"
+
+    def test_edit_and_delete_invalidate(
+        self, owner_client, group_conversation, owner_user, text_message
+    ):
+        """Edits and deletes are visible immediately."""
+        url = messages_url(group_conversation.id)
+        owner_client.get(url)
+
+        MessageService.edit_message(
+            user=owner_user, message_id=text_message.id, new_content="Edited"
+        )
+        text_message.refresh_from_db()
+        assert owner_client.get(url).json()["results"][0]["content"] == "Edited"
+
+        MessageService.delete_message(message=text_message, user=owner_user)
+        assert owner_client.get(url).json()["results"][0]["is_deleted"] is True
+
+    def test_reaction_bumps_version(self, group_conversation, owner_user, text_message):
+        """Reaction changes invalidate the conversation's pages."""
+        version = MessageHistoryCache.get_version(group_conversation.id)
+
+        ReactionService.add_reaction(
+            user=owner_user, message_id=text_message.id, emoji="👍"
+        )
+
+        assert MessageHistoryCache.get_version(group_conversation.id) > version
+
+    def test_other_conversations_unaffected(
+        self, group_conversation, direct_conversation, owner_user
+    ):
+        """A bump only touches the conversation that changed."""
+        version = MessageHistoryCache.get_version(direct_conversation.id)
+
+        MessageService.send_message(
+            conversation=group_conversation, sender=owner_user, content="Hi"
+        )
+
+        assert MessageHistoryCache.get_version(direct_conversation.id) == version
+
+
+# =============================================================================
+# Access
+# =============================================================================
+
+
+class TestHistoryCacheAccess:
+    """Tests that cached pages are only served to participants."""
+
+    def test_non_participant_denied_after_caching(
+        self, owner_client, non_participant_client, group_conversation, text_message
+    ):
+        """A warm cache does not leak messages to non-participants."""
+        url = messages_url(group_conversation.id)
+        owner_client.get(url)
+
+        response = non_participant_client.get(url)
+
+        assert response.status_code == 403
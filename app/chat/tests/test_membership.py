@@ -0,0 +1,263 @@
+"""
+Tests for MembershipCache.
+
+Test Categories:
+    1. Cache reads - membership, roles, user conversation IDs
+    2. Per-request memo - repeated lookups skip the cache backend
+    3. Invalidation - service operations drop stale membership
+    4. Async lookups - consumers share cache entries with sync callers
+"""
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from chat.membership import MembershipCache
+from chat.models import ParticipantRole
+from chat.services import ConversationService, MessageService, ParticipantService
+
+# =============================================================================
+# Cache Reads
+# =============================================================================
+
+
+class TestMembershipCacheReads:
+    """Tests for is_member, get_role and get_user_conversation_ids."""
+
+    def test_is_member_for_active_participant(
+        self, db, group_conversation, owner_user, non_participant_user
+    ):
+        """Active participants are members, others are not."""
+        assert MembershipCache.is_member(group_conversation.id, owner_user.id)
+        assert not MembershipCache.is_member(
+            group_conversation.id, non_participant_user.id
+        )
+
+    def test_second_lookup_hits_cache(
+        self, db, group_conversation, owner_user, django_assert_num_queries
+    ):
+        """
+        Repeated lookups are served without querying Participant.
+
+        Why it matters: Permission checks run several times per request.
+        """
+        MembershipCache.is_member(group_conversation.id, owner_user.id)
+
+        with django_assert_num_queries(0):
+            assert MembershipCache.is_member(group_conversation.id, owner_user.id)
+            assert (
+                MembershipCache.get_role(group_conversation.id, owner_user.id)
+                == ParticipantRole.OWNER
+            )
+
+    def test_get_role_is_none_for_direct(self, db, direct_conversation, owner_user):
+        """Direct participants are members without a role."""
+        assert MembershipCache.is_member(direct_conversation.id, owner_user.id)
+        assert MembershipCache.get_role(direct_conversation.id, owner_user.id) is None
+
+    def test_user_conversation_ids(
+        self, db, group_conversation, direct_conversation, owner_user
+    ):
+        """Returns every conversation the user is active in."""
+        conversation_ids = MembershipCache.get_user_conversation_ids(owner_user.id)
+
+        assert set(conversation_ids) == {group_conversation.id, direct_conversation.id}
+
+
+# =============================================================================
+# Per-request Memo
+# =============================================================================
+
+
+class TestMembershipCacheMemo:
+    """Tests for the per-request memo."""
+
+    def test_memo_short_circuits_cache(
+        self, db, group_conversation, owner_user, mocker
+    ):
+        """
+        Lookups with a populated memo do not touch the cache backend.
+
+        Why it matters: Stacked permission classes share one lookup.
+        """
+        memo = {}
+        MembershipCache.is_member(group_conversation.id, owner_user.id, memo=memo)
+
+        cache_get = mocker.patch("chat.membership.cache.get")
+        assert MembershipCache.is_member(
+            group_conversation.id, owner_user.id, memo=memo
+        )
+        cache_get.assert_not_called()
+
+
+# =============================================================================
+# Invalidation
+# =============================================================================
+
+
+class TestMembershipCacheInvalidation:
+    """Tests that membership changes are visible immediately."""
+
+    def test_add_participant_invalidates(
+        self, db, group_conversation, owner_user, non_participant_user
+    ):
+        """Newly added users can send messages right away."""
+        assert not MembershipCache.is_member(
+            group_conversation.id, non_participant_user.id
+        )
+        MembershipCache.get_user_conversation_ids(non_participant_user.id)
+
+        ParticipantService.add_participant(
+            conversation=group_conversation,
+            user_to_add=non_participant_user,
+            added_by=owner_user,
+        )
+
+        assert MembershipCache.is_member(group_conversation.id, non_participant_user.id)
+        assert group_conversation.id in MembershipCache.get_user_conversation_ids(
+            non_participant_user.id
+        )
+
+    def test_remove_participant_invalidates(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
+        """Removed users lose access immediately."""
+        conv = group_conversation_with_members
+        assert MembershipCache.is_member(conv.id, member_user.id)
+
+        ParticipantService.remove_participant(
+            conversation=conv,
+            user_to_remove=member_user,
+            removed_by=owner_user,
+        )
+
+        assert not MembershipCache.is_member(conv.id, member_user.id)
+        result = MessageService.send_message(
+            conversation=conv, sender=member_user, content="Still here?"
+        )
+        assert result.error_code == "NOT_PARTICIPANT"
+
+    def test_reader_racing_removal_cannot_cache_stale_members(
+        self, db, group_conversation_with_members, owner_user, member_user, mocker
+    ):
+        """
+        Members loaded before a removal are not served after it.
+
+        Why it matters: A reader that populates the cache after the
+        invalidation would otherwise keep a removed user authorized until
+        the entry expires.
+        """
+        conv = group_conversation_with_members
+        cache_set = cache.set
+
+        def remove_then_set(*args, **kwargs):
+            mocker.stopall()
+            ParticipantService.remove_participant(
+                conversation=conv,
+                user_to_remove=member_user,
+                removed_by=owner_user,
+            )
+            cache_set(*args, **kwargs)
+
+        mocker.patch.object(cache, "set", side_effect=remove_then_set)
+        assert MembershipCache.is_member(conv.id, member_user.id)
+
+        assert not MembershipCache.is_member(conv.id, member_user.id)
+
+    def test_leave_invalidates_membership_and_roles(
+        self, db, group_conversation_with_members, owner_user, admin_user
+    ):
+        """Leaving drops membership and reflects the ownership transfer."""
+        conv = group_conversation_with_members
+        MembershipCache.get_members(conv.id)
+        MembershipCache.get_user_conversation_ids(owner_user.id)
+
+        ParticipantService.leave(conversation=conv, user=owner_user)
+
+        assert not MembershipCache.is_member(conv.id, owner_user.id)
+        assert conv.id not in MembershipCache.get_user_conversation_ids(owner_user.id)
+        assert MembershipCache.get_role(conv.id, admin_user.id) == ParticipantRole.OWNER
+
+    def test_create_group_invalidates(self, db, owner_user, other_user):
+        """Members of a new group are visible without waiting for the TTL."""
+        MembershipCache.get_user_conversation_ids(other_user.id)
+
+        result = ConversationService.create_group(
+            creator=owner_user, title="New", initial_members=[other_user]
+        )
+
+        assert result.data.id in MembershipCache.get_user_conversation_ids(
+            other_user.id
+        )
+
+
+# =============================================================================
+# Async Lookups
+# =============================================================================
+
+
+class TestMembershipCacheAsync:
+    """Tests for the async variants used by consumers."""
+
+    def test_ais_member(self, db, group_conversation, owner_user, non_participant_user):
+        """Async lookups agree with the sync ones."""
+        ais_member = async_to_sync(MembershipCache.ais_member)
+
+        assert ais_member(group_conversation.id, owner_user.id)
+        assert not ais_member(group_conversation.id, non_participant_user.id)
+
+    def test_async_reads_entry_written_by_sync(
+        self, db, group_conversation, owner_user, django_assert_num_queries
+    ):
+        """
+        An entry cached by a sync lookup is served to async callers.
+
+        Why it matters: Views and consumers must share one cache, or each
+        side would query Participant on its own.
+        """
+        MembershipCache.get_members(group_conversation.id)
+
+        with django_assert_num_queries(0):
+            members = async_to_sync(MembershipCache.aget_members)(group_conversation.id)
+
+        assert members[str(owner_user.id)] == ParticipantRole.OWNER
+
+    def test_sync_reads_entry_written_by_async(
+        self,
+        db,
+        group_conversation,
+        direct_conversation,
+        owner_user,
+        django_assert_num_queries,
+    ):
+        """A miss filled by an async lookup is served to sync callers."""
+        conversation_ids = async_to_sync(MembershipCache.aget_user_conversation_ids)(
+            owner_user.id
+        )
+
+        with django_assert_num_queries(0):
+            assert (
+                MembershipCache.get_user_conversation_ids(owner_user.id)
+                == conversation_ids
+            )
+        assert set(conversation_ids) == {group_conversation.id, direct_conversation.id}
+
+    def test_async_lookup_sees_invalidation(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
+        """
+        Async lookups read the current version, not a stale entry.
+
+        Why it matters: A user removed over HTTP must not keep sending over
+        an open socket until the entry expires.
+        """
+        conv = group_conversation_with_members
+        ais_member = async_to_sync(MembershipCache.ais_member)
+        assert ais_member(conv.id, member_user.id)
+
+        ParticipantService.remove_participant(
+            conversation=conv,
+            user_to_remove=member_user,
+            removed_by=owner_user,
+        )
+
+        assert not ais_member(conv.id, member_user.id)
@@ -12,7 +12,10 @@ This module tests the ReactionService which handles:
 TDD approach: These tests are written first to drive implementation.
 """
 
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 
 from authentication.tests.factories import UserFactory
 from chat.constants import REACTION_CONFIG
@@ -604,6 +607,90 @@ class TestReactionLimits:
         assert result.error_code == "MAX_REACTIONS_EXCEEDED"
 
 
+# =============================================================================
+# TestReactionService - Count Updates and Reconcile
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestReactionCounts:
+    """Tests for in-place JSONB counter updates and reconciliation."""
+
+    def test_count_update_does_not_lock_with_select_for_update(
+        self, message, owner_user, django_assert_num_queries
+    ):
+        """
+        The counter is updated by a single UPDATE, without SELECT FOR UPDATE.
+
+        Why it matters: Popular messages serialized every reaction on the lock.
+        """
+        with django_assert_num_queries(1) as captured:
+            ReactionService._update_reaction_count(message, "👍", 1)
+
+        sql = captured.captured_queries[0]["sql"]
+        assert sql.lstrip().startswith("UPDATE")
+        assert "FOR UPDATE" not in sql
+
+    def test_count_update_preserves_other_emojis(self, message):
+        """Only the targeted emoji key changes."""
+        Message.objects.filter(id=message.id).update(reaction_counts={"❤️": 4, "👍": 1})
+
+        ReactionService._update_reaction_count(message, "👍", 1)
+        ReactionService._update_reaction_count(message, "❤️", -1)
+
+        message.refresh_from_db()
+        assert message.reaction_counts == {"❤️": 3, "👍": 2}
+
+    def test_count_never_goes_negative(self, message):
+        """Decrementing a missing emoji leaves no negative key behind."""
+        ReactionService._update_reaction_count(message, "👍", -1)
+
+        message.refresh_from_db()
+        assert message.reaction_counts == {}
+
+    def test_reconcile_fixes_drifted_counts(
+        self, message, owner_user, member_user, member_participant
+    ):
+        """Reconcile recomputes counts from MessageReaction rows."""
+        ReactionService.add_reaction(user=owner_user, message_id=message.id, emoji="👍")
+        ReactionService.add_reaction(
+            user=member_user, message_id=message.id, emoji="👍"
+        )
+        Message.objects.filter(id=message.id).update(reaction_counts={"👍": 7, "🎉": 1})
+
+        result = ReactionService.reconcile_reaction_counts()
+
+        assert result.success is True
+        assert result.data >= 1
+        message.refresh_from_db()
+        assert message.reaction_counts == {"👍": 2}
+
+    def test_reconcile_skips_correct_rows(self, message, owner_user):
+        """Messages whose counts already match are not rewritten."""
+        ReactionService.add_reaction(user=owner_user, message_id=message.id, emoji="👍")
+
+        result = ReactionService.reconcile_reaction_counts(
+            conversation=message.conversation
+        )
+
+        assert result.data == 0
+
+    def test_reconcile_command(self, message, owner_user):
+        """The management command reconciles a single conversation."""
+        Message.objects.filter(id=message.id).update(reaction_counts={"👍": 3})
+        out = StringIO()
+
+        call_command(
+            "reconcile_reaction_counts",
+            conversation=message.conversation_id,
+            stdout=out,
+        )
+
+        message.refresh_from_db()
+        assert message.reaction_counts == {}
+        assert "Reconciled reaction counts for 1 messages" in out.getvalue()
+
+
 # =============================================================================
 # TestReactionAPI
 # =============================================================================
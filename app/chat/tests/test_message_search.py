@@ -17,6 +17,7 @@ TDD approach: These tests are written first to drive implementation.
 
 import base64
 import pytest
+from django.utils import timezone
 
 from authentication.tests.factories import UserFactory
 from chat.models import (
@@ -346,6 +347,43 @@ class TestSearchAuthorization:
         result = MessageSearchService.search(user=user, query="searchable")
         assert not any(m.id == message.id for m in result.data["results"])
 
+    def test_search_excludes_conversations_user_left(self, user, conversation1):
+        """
+        Messages from conversations the user has left are not returned.
+
+        Why it matters: The EXISTS scope must check active participation.
+        """
+        Message.objects.create(
+            conversation=conversation1,
+            sender=user,
+            message_type=MessageType.TEXT,
+            content="Departure searchable",
+        )
+        conversation1.participants.filter(user=user).update(left_at=timezone.now())
+
+        result = MessageSearchService.search(user=user, query="departure")
+
+        assert result.data["results"] == []
+
+    def test_search_scope_is_a_subquery_not_an_id_list(
+        self, user, searchable_messages, django_assert_num_queries
+    ):
+        """
+        Global search scopes by EXISTS in one query, independent of membership.
+
+        Why it matters: Large IN lists made latency grow with membership count.
+        """
+        for _ in range(30):
+            conversation = ConversationFactory(conversation_type=ConversationType.GROUP)
+            ParticipantFactory(conversation=conversation, user=user)
+
+        with django_assert_num_queries(1) as captured:
+            MessageSearchService.search(user=user, query="Python")
+
+        sql = captured.captured_queries[0]["sql"]
+        assert "EXISTS" in sql
+        assert 'conversation_id" IN' not in sql
+
 
 # =============================================================================
 # TestMessageSearchService - Conversation Filtering
@@ -547,6 +585,125 @@ class TestSearchPagination:
         assert result.success is False
         assert result.error_code == "INVALID_CURSOR"
 
+    def test_search_pagination_legacy_cursor_rejected(self, user, many_messages):
+        """
+        Cursors without the (rank, created_at, id) key are rejected.
+
+        Why it matters: Old id-only cursors cannot position a keyset page.
+        """
+        legacy = base64.b64encode(b'{"last_id": 10}').decode()
+
+        result = MessageSearchService.search(
+            user=user,
+            query="searchterm",
+            cursor=legacy,
+        )
+
+        assert result.error_code == "INVALID_CURSOR"
+
+
+# =============================================================================
+# TestMessageSearchService - Keyset Pagination
+# =============================================================================
+
+
+def collect_pages(user, query, page_size, **kwargs):
+    """Follow next_cursor until exhausted and return all result IDs."""
+    ids = []
+    cursor = None
+    while True:
+        result = MessageSearchService.search(
+            user=user, query=query, page_size=page_size, cursor=cursor, **kwargs
+        )
+        assert result.success is True
+        ids.extend(m.id for m in result.data["results"])
+        if not result.data["has_more"]:
+            return ids
+        cursor = result.data["next_cursor"]
+
+
+@pytest.mark.django_db
+class TestSearchKeysetPagination:
+    """Tests for (rank, created_at, id) keyset cursors."""
+
+    @pytest.fixture
+    def ranked_messages(self, conversation1, user):
+        """Messages with varied ranks and duplicate (rank, created_at) keys."""
+        messages = [
+            Message.objects.create(
+                conversation=conversation1,
+                sender=user,
+                message_type=MessageType.TEXT,
+                content=" ".join(["keyset"] * (i % 4 + 1)) + f" filler {i}",
+            )
+            for i in range(23)
+        ]
+        # Force created_at ties so only id breaks them
+        Message.objects.filter(id__in=[m.id for m in messages[:8]]).update(
+            created_at=messages[0].created_at
+        )
+        return messages
+
+    def test_pages_match_single_ordered_query(self, user, ranked_messages):
+        """
+        Walking every page yields the full ordering with no skips or repeats.
+
+        Why it matters: The old id-based exclusion dropped lower-ID matches
+        that ranked below the cursor row.
+        """
+        expected = [
+            m.id
+            for m in MessageSearchService.search(
+                user=user, query="keyset", page_size=100
+            ).data["results"]
+        ]
+
+        paged = collect_pages(user, "keyset", page_size=4)
+
+        assert len(expected) == len(ranked_messages)
+        assert paged == expected
+
+    def test_rank_cap_limits_candidates_to_newest(self, user, ranked_messages):
+        """Only the newest N matches are ranked and returned."""
+        ids = collect_pages(user, "keyset", page_size=3, max_ranked=10)
+
+        newest_ids = set(
+            Message.objects.filter(id__in=[m.id for m in ranked_messages])
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[:10]
+        )
+        assert len(ids) == 10
+        assert set(ids) == newest_ids
+
+    def test_rank_cap_candidate_set_is_stable_across_pages(
+        self, user, conversation1, ranked_messages
+    ):
+        """New matches after the first page do not shift later pages."""
+        first = MessageSearchService.search(
+            user=user, query="keyset", page_size=5, max_ranked=10
+        )
+        Message.objects.create(
+            conversation=conversation1,
+            sender=user,
+            message_type=MessageType.TEXT,
+            content="keyset keyset keyset keyset late arrival",
+        )
+
+        ids = [m.id for m in first.data["results"]]
+        cursor = first.data["next_cursor"]
+        while cursor:
+            page = MessageSearchService.search(
+                user=user,
+                query="keyset",
+                page_size=5,
+                max_ranked=10,
+                cursor=cursor,
+            )
+            ids.extend(m.id for m in page.data["results"])
+            cursor = page.data["next_cursor"]
+
+        assert len(ids) == len(set(ids)) == 10
+
 
 # =============================================================================
 # TestSearchAPI
@@ -0,0 +1,240 @@
+"""
+Tests for monthly range partitions of chat_message.
+
+Test Categories:
+    1. Creation - partitions created ahead, rows rescued from the default
+    2. Detaching - old partitions leave the table and the API
+    3. History - history and search read across partitions
+
+Dates are far in the future so tests do not depend on the month the
+partitioning migration ran in.
+"""
+
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chat.constants import MESSAGE_PARTITION_CONFIG
+from chat.models import Conversation, Message, MessageType
+from chat.partitions import MessagePartitions
+from chat.services import MessageSearchService
+
+JAN_2030 = datetime(2030, 1, 1, tzinfo=timezone.utc)
+MAR_2030 = datetime(2030, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def immediate_constraints(db):
+    """Check deferred foreign keys now so partition DDL can run in the test."""
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+@pytest.fixture
+def future_partitions(db):
+    """Create partitions for January and February 2030."""
+    MessagePartitions.ensure(months_ahead=1, now=JAN_2030)
+
+
+def create_message(conversation, sender, created_at, content="Partitioned"):
+    """Create a message stored at created_at."""
+    message = Message.objects.create(
+        conversation=conversation,
+        sender=sender,
+        message_type=MessageType.TEXT,
+        content=content,
+    )
+    Message.objects.filter(pk=message.pk).update(created_at=created_at)
+    return message
+
+
+def stored_in(message):
+    """Name of the partition holding a message."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text FROM chat_message WHERE id = %s",
+            [message.id],
+        )
+        return cursor.fetchone()[0]
+
+
+def message_query(queries):
+    """The captured query that selects messages."""
+    return next(
+        q["sql"] for q in queries if q["sql"].startswith('SELECT "chat_message"."id"')
+    )
+
+
+# =============================================================================
+# Creation
+# =============================================================================
+
+
+class TestPartitionCreation:
+    """Tests for creating monthly partitions."""
+
+    def test_layout_after_migration(self, db):
+        """Legacy rows come first and the default partition last."""
+        partitions = MessagePartitions.list_partitions()
+
+        assert partitions[0].name == MESSAGE_PARTITION_CONFIG.LEGACY_PARTITION
+        assert partitions[0].start is None
+        assert partitions[-1].name == MESSAGE_PARTITION_CONFIG.DEFAULT_PARTITION
+        assert partitions[-1].is_default
+
+    def test_attachments_keep_media_foreign_key(self, db):
+        """
+        Only the attachments foreign key to chat_message is dropped.
+
+        Why it matters: Deleting a media file must still be blocked or
+        cascaded by the database, not leave dangling attachment rows.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT confrelid::regclass::text FROM pg_constraint "
+                "WHERE conrelid = 'chat_message_attachments'::regclass "
+                "AND contype = 'f'"
+            )
+            targets = [row[0] for row in cursor.fetchall()]
+
+        assert targets == ["media_mediafile"]
+
+    def test_ensure_creates_months_ahead_once(self, db):
+        """Missing months are created; existing ones are left alone."""
+        first = MessagePartitions.ensure(months_ahead=2, now=JAN_2030)
+        second = MessagePartitions.ensure(months_ahead=2, now=JAN_2030)
+
+        assert first.data == [
+            "chat_message_p2030_01",
+            "chat_message_p2030_02",
+            "chat_message_p2030_03",
+        ]
+        assert second.data == []
+
+    def test_inserts_routed_by_month(self, future_partitions, group_conversation):
+        """A message is stored in the partition of its created_at month."""
+        message = create_message(
+            group_conversation, None, datetime(2030, 2, 14, tzinfo=timezone.utc)
+        )
+
+        assert stored_in(message) == "chat_message_p2030_02"
+
+    def test_rows_moved_out_of_default(self, db, group_conversation, owner_user):
+        """
+        Rows that arrived before their month existed move into it.
+
+        Why it matters: Attaching a partition fails while the default
+        partition holds rows of its range, so a stalled beat would otherwise
+        block partition creation for good.
+        """
+        message = create_message(group_conversation, owner_user, MAR_2030)
+        assert stored_in(message) == MESSAGE_PARTITION_CONFIG.DEFAULT_PARTITION
+
+        result = MessagePartitions.ensure(months_ahead=0, now=MAR_2030)
+
+        assert result.data == ["chat_message_p2030_03"]
+        assert stored_in(message) == "chat_message_p2030_03"
+        assert Message.objects.get(pk=message.pk).content == "Partitioned"
+
+
+# =============================================================================
+# Detaching
+# =============================================================================
+
+
+class TestPartitionDetach:
+    """Tests for detaching old partitions."""
+
+    def test_detached_partition_kept_as_table(
+        self, future_partitions, group_conversation, owner_user
+    ):
+        """Detached months stay queryable as tables but leave chat_message."""
+        message = create_message(
+            group_conversation, owner_user, datetime(2030, 1, 20, tzinfo=timezone.utc)
+        )
+
+        result = MessagePartitions.detach_before(
+            datetime(2030, 2, 1, tzinfo=timezone.utc)
+        )
+
+        assert "chat_message_p2030_01" in result.data
+        assert MESSAGE_PARTITION_CONFIG.LEGACY_PARTITION in result.data
+        assert "chat_message_p2030_02" not in result.data
+        assert not Message.objects.filter(pk=message.pk).exists()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id FROM chat_message_p2030_01")
+            assert cursor.fetchall() == [(message.id,)]
+
+    def test_drop_removes_table(self, future_partitions):
+        """--drop deletes the detached tables."""
+        out = StringIO()
+
+        call_command(
+            "detach_message_partitions", "--before", "2030-02", "--drop", stdout=out
+        )
+
+        assert "chat_message_p2030_01" in out.getvalue()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('chat_message_p2030_01')")
+            assert cursor.fetchone()[0] is None
+
+
+# =============================================================================
+# History
+# =============================================================================
+
+
+@pytest.fixture
+def imported_conversation(future_partitions, group_conversation, owner_user):
+    """A conversation created in February 2030 holding an older message."""
+    Conversation.objects.filter(pk=group_conversation.pk).update(
+        created_at=datetime(2030, 2, 1, tzinfo=timezone.utc)
+    )
+    group_conversation.refresh_from_db()
+    create_message(
+        group_conversation,
+        owner_user,
+        datetime(2030, 1, 15, tzinfo=timezone.utc),
+        content="Imported keyword",
+    )
+    return group_conversation
+
+
+class TestPartitionedHistory:
+    """Tests for reading history and search across partitions."""
+
+    def test_history_does_not_join_parent(self, owner_client, imported_conversation):
+        """
+        Message history reads chat_message once, without the parent join.
+
+        Why it matters: A join back into chat_message cannot be pruned and
+        scans every partition's index for each page.
+        """
+        url = f"/api/v1/chat/conversations/{imported_conversation.id}/messages/"
+        with CaptureQueriesContext(connection) as queries:
+            response = owner_client.get(url)
+
+        assert response.status_code == 200
+        assert 'JOIN "chat_message"' not in message_query(queries)
+
+    def test_messages_older_than_conversation_listed(
+        self, owner_user, owner_client, imported_conversation
+    ):
+        """
+        History and search include messages that predate the conversation.
+
+        Why it matters: Imported and restored messages keep their original
+        timestamps, which can be older than the conversation row.
+        """
+        url = f"/api/v1/chat/conversations/{imported_conversation.id}/messages/"
+        response = owner_client.get(url)
+        result = MessageSearchService.search(user=owner_user, query="keyword")
+
+        assert [m["content"] for m in response.json()["results"]] == [
+            "Imported keyword"
+        ]
+        assert len(result.data["results"]) == 1
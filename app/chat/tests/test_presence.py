@@ -9,6 +9,7 @@ Features tested:
 - Heartbeat mechanism
 - Presence queries (who's online, conversation presence)
 - TTL-based auto-expiry
+- Presence change broadcasts to conversation channel groups
 
 Design Decisions:
 - Redis-only storage (no database writes for presence)
@@ -17,9 +18,14 @@ Design Decisions:
 - Automatic cleanup via Redis TTL
 """
 
-from unittest.mock import patch
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -530,6 +536,50 @@ class TestPresenceTTL:
         assert result.success
         assert result.data["status"] == PresenceStatus.OFFLINE
 
+    def test_stale_conversation_member_expires_while_others_active(
+        self, user, other_user, conversation
+    ):
+        """
+        A member who stopped heartbeating drops out of conversation presence.
+
+        Why it matters: With a shared set TTL, one active user kept every
+        stale member alive forever.
+        """
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(other_user.id, PresenceStatus.ONLINE)
+        redis_client = PresenceService._get_redis_client()
+        conv_key = PresenceService._conversation_presence_key(conversation.id)
+        stale_score = timezone.now().timestamp() - 3600
+        redis_client.zadd(conv_key, {str(other_user.id): stale_score})
+
+        PresenceService.heartbeat(user.id, conversation.id)
+        result = PresenceService.get_conversation_presence(conversation.id)
+
+        assert [p["user_id"] for p in result.data] == [str(user.id)]
+        assert redis_client.zscore(conv_key, str(other_user.id)) is None
+
+    def test_heartbeat_is_one_script_call(self, user, conversation):
+        """
+        A heartbeat with a conversation writes both keys in one Lua call.
+
+        Why it matters: Heartbeats are the hottest presence path.
+        """
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(user.id, PresenceStatus.AWAY, conversation.id)
+        redis_client = PresenceService._get_redis_client()
+
+        with patch.object(
+            redis_client, "evalsha", wraps=redis_client.evalsha
+        ) as evalsha, patch.object(
+            PresenceService, "_get_redis_client", return_value=redis_client
+        ):
+            result = PresenceService.heartbeat(user.id, conversation.id)
+
+        assert evalsha.call_count == 1
+        assert result.data["status"] == PresenceStatus.AWAY
+
 
 # =============================================================================
 # Leave Conversation Presence Tests
@@ -610,6 +660,129 @@ class TestClearPresence:
         assert global_result.data["status"] == PresenceStatus.OFFLINE
 
 
+# =============================================================================
+# Presence Broadcast Tests
+# =============================================================================
+
+
+@pytest.fixture
+def publish():
+    """Capture presence deltas instead of sending them to the channel layer."""
+    from chat.services import PresenceService
+
+    with patch.object(PresenceService, "_publish_presence") as mock_publish:
+        yield mock_publish
+
+
+class TestPresenceBroadcast:
+    """Test that presence changes are pushed instead of polled."""
+
+    def test_status_change_published_to_user_conversations(
+        self, user, conversation, group_conversation, publish
+    ):
+        """
+        Going online notifies every conversation the user participates in.
+
+        Why it matters: Members see the change without polling presence.
+        """
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(user.id, PresenceStatus.ONLINE)
+
+        publish.assert_called_once()
+        presence, conversation_ids = publish.call_args.args
+        assert presence["user_id"] == str(user.id)
+        assert presence["status"] == PresenceStatus.ONLINE
+        assert sorted(conversation_ids) == sorted(
+            [conversation.id, group_conversation.id]
+        )
+
+    def test_unchanged_heartbeat_publishes_nothing(self, user, publish):
+        """
+        Heartbeats that keep the same status are not broadcast.
+
+        Why it matters: Heartbeats arrive every 30s per client; only deltas
+        should reach other users.
+        """
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(user.id, PresenceStatus.ONLINE)
+        publish.reset_mock()
+
+        PresenceService.heartbeat(user.id)
+
+        publish.assert_not_called()
+
+    def test_joining_conversation_published_to_that_conversation(
+        self, user, conversation, group_conversation, publish
+    ):
+        """Viewing a conversation only notifies that conversation."""
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(user.id, PresenceStatus.ONLINE)
+        publish.reset_mock()
+
+        PresenceService.heartbeat(user.id, conversation_id=conversation.id)
+
+        publish.assert_called_once()
+        presence, conversation_ids = publish.call_args.args
+        assert presence["conversation_id"] == conversation.id
+        assert conversation_ids == [conversation.id]
+
+    def test_clear_presence_publishes_offline(self, user, conversation, publish):
+        """Clearing an online user tells members they went offline."""
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(user.id, PresenceStatus.ONLINE)
+        publish.reset_mock()
+
+        PresenceService.clear_presence(user.id)
+        PresenceService.clear_presence(user.id)
+
+        publish.assert_called_once()
+        presence, conversation_ids = publish.call_args.args
+        assert presence["status"] == PresenceStatus.OFFLINE
+        assert conversation_ids == [conversation.id]
+
+    def test_presence_event_reaches_conversation_group(self, user, conversation):
+        """
+        Presence deltas are delivered through the channel layer.
+
+        Why it matters: ChatConsumer receives them via its chat_{id} group.
+        """
+        from chat.services import PresenceService, PresenceStatus
+
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"chat_{conversation.id}", channel_name)
+
+        PresenceService.set_presence(user.id, PresenceStatus.AWAY)
+
+        async def receive():
+            return await asyncio.wait_for(channel_layer.receive(channel_name), 2)
+
+        event = async_to_sync(receive)()
+        assert event["type"] == "chat.presence"
+        assert event["presence"]["status"] == PresenceStatus.AWAY
+
+    def test_consumer_forwards_presence_of_other_users(self, user, other_user):
+        """ChatConsumer sends presence frames, skipping the user's own."""
+        from chat.consumers import ChatConsumer
+
+        consumer = ChatConsumer()
+        consumer.scope = {"user": user}
+        consumer.send_json = AsyncMock()
+
+        own = {"user_id": str(user.id), "status": "online", "last_seen": None}
+        other = {"user_id": str(other_user.id), "status": "online", "last_seen": None}
+        async_to_sync(consumer.chat_presence)({"presence": own})
+        async_to_sync(consumer.chat_presence)({"presence": other})
+
+        consumer.send_json.assert_awaited_once_with(
+            {"type": "presence", "presence": other}
+        )
+
+
 # =============================================================================
 # API Endpoint Tests
 # =============================================================================
@@ -685,6 +858,89 @@ class TestPresenceAPI:
 
         assert response.status_code == status.HTTP_200_OK
 
+    def test_batch_heartbeat_endpoint(
+        self, auth_client, user, conversation, group_conversation
+    ):
+        """
+        POST /api/v1/chat/presence/heartbeat/batch/ refreshes every open chat.
+
+        Why it matters: One request replaces a heartbeat per open conversation.
+        """
+        from chat.services import PresenceService
+
+        url = "/api/v1/chat/presence/heartbeat/batch/"
+        response = auth_client.post(
+            url,
+            {"conversation_ids": [conversation.id, group_conversation.id]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == "online"
+        assert response.data["conversation_ids"] == [
+            conversation.id,
+            group_conversation.id,
+        ]
+        for conv in (conversation, group_conversation):
+            present = PresenceService.get_conversation_presence(conv.id).data
+            assert [p["user_id"] for p in present] == [str(user.id)]
+
+    def test_batch_heartbeat_skips_non_member_conversations(
+        self, auth_client, user, conversation, third_user
+    ):
+        """Conversations the user is not in are rejected, the rest refreshed."""
+        other_conv = ConversationFactory(conversation_type=ConversationType.GROUP)
+        ParticipantFactory(conversation=other_conv, user=third_user)
+
+        url = "/api/v1/chat/presence/heartbeat/batch/"
+        response = auth_client.post(
+            url,
+            {"conversation_ids": [conversation.id, other_conv.id, conversation.id]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["conversation_ids"] == [conversation.id]
+        assert response.data["rejected_conversation_ids"] == [other_conv.id]
+
+    def test_batch_heartbeat_checks_membership_once(
+        self, auth_client, user, conversation, group_conversation
+    ):
+        """Membership for the whole batch comes from one cached lookup."""
+        from chat.membership import MembershipCache
+        from chat.services import PresenceService, PresenceStatus
+
+        PresenceService.set_presence(user.id, PresenceStatus.ONLINE)
+
+        url = "/api/v1/chat/presence/heartbeat/batch/"
+        with patch.object(
+            MembershipCache,
+            "get_user_conversation_ids",
+            wraps=MembershipCache.get_user_conversation_ids,
+        ) as lookup, patch.object(MembershipCache, "is_member") as is_member:
+            auth_client.post(
+                url,
+                {"conversation_ids": [conversation.id, group_conversation.id]},
+                format="json",
+            )
+
+        lookup.assert_called_once()
+        is_member.assert_not_called()
+
+    def test_batch_heartbeat_limits_conversation_count(self, auth_client):
+        """Oversized batches are rejected."""
+        from chat.constants import PRESENCE_CONFIG
+
+        url = "/api/v1/chat/presence/heartbeat/batch/"
+        conversation_ids = list(
+            range(PRESENCE_CONFIG.MAX_BATCH_HEARTBEAT_CONVERSATIONS + 1)
+        )
+        response = auth_client.post(
+            url, {"conversation_ids": conversation_ids}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_presence_requires_authentication(self, api_client):
         """
         Presence endpoints should require authentication.
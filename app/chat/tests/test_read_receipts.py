@@ -0,0 +1,285 @@
+"""
+Tests for debounced read receipts and bulk mark-all-read.
+
+Test Categories:
+    1. Buffering - read frames collapse per (conversation, user) in Redis
+    2. Flush - one bulk UPDATE, forward-only positions, compact broadcasts
+    3. Mark all read - one statement across every conversation
+"""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from chat.constants import READ_RECEIPT_CONFIG
+from chat.models import Message, MessageType, Participant
+from chat.read_receipts import ReadReceipts
+from chat.services import MessageService
+
+
+@pytest.fixture
+def channel_layer(mocker):
+    """Record chat.receipts events instead of publishing them."""
+    layer = Mock(group_send=AsyncMock())
+    mocker.patch("chat.read_receipts.get_channel_layer", return_value=layer)
+    return layer
+
+
+def participant(conversation, user):
+    """Reload a user's participant row."""
+    return Participant.objects.get(conversation=conversation, user=user)
+
+
+def sent_events(channel_layer):
+    """Events passed to group_send, in order."""
+    return [call.args[1] for call in channel_layer.group_send.await_args_list]
+
+
+# =============================================================================
+# Buffering
+# =============================================================================
+
+
+class TestReadBuffering:
+    """Tests that read frames are collapsed in Redis."""
+
+    def test_repeated_reads_collapse(self, db, group_conversation, owner_user):
+        """
+        Many reads of one conversation keep a single buffered entry.
+
+        Why it matters: Scrolling clients send a read frame per viewport.
+        """
+        for _ in range(5):
+            ReadReceipts.record(group_conversation.id, owner_user.id)
+
+        redis_client = ReadReceipts._get_redis_client()
+        assert redis_client.hlen(READ_RECEIPT_CONFIG.KEY_PENDING) == 1
+        assert participant(group_conversation, owner_user).last_read_at is None
+
+    def test_newest_read_kept(self, db, group_conversation, owner_user, channel_layer):
+        """An older read arriving late does not replace a newer one."""
+        newer = timezone.now()
+        ReadReceipts.record(group_conversation.id, owner_user.id, newer)
+        ReadReceipts.record(
+            group_conversation.id, owner_user.id, newer - timedelta(minutes=1)
+        )
+
+        ReadReceipts.flush()
+
+        assert participant(group_conversation, owner_user).last_read_at == newer
+
+    def test_redis_failure_applies_directly(
+        self, db, group_conversation, owner_user, channel_layer, mocker
+    ):
+        """Reads are not lost when Redis is down."""
+        mocker.patch.object(
+            ReadReceipts,
+            "_get_redis_client",
+            side_effect=RedisConnectionError("down"),
+        )
+
+        ReadReceipts.record(group_conversation.id, owner_user.id)
+
+        assert participant(group_conversation, owner_user).last_read_at is not None
+        assert len(sent_events(channel_layer)) == 1
+
+
+# =============================================================================
+# Flush
+# =============================================================================
+
+
+class TestReadFlush:
+    """Tests for applying buffered reads."""
+
+    def test_flush_locks_then_updates_once(
+        self,
+        db,
+        group_conversation_with_members,
+        owner_user,
+        admin_user,
+        member_user,
+        channel_layer,
+    ):
+        """
+        Reads of many participants are applied with one lock and one UPDATE.
+
+        Why it matters: without locking the rows first, the unread recount
+        can miss a send that commits while the UPDATE waits on its row lock.
+        """
+        for user in (owner_user, admin_user, member_user):
+            ReadReceipts.record(group_conversation_with_members.id, user.id)
+
+        with CaptureQueriesContext(connection) as captured:
+            result = ReadReceipts.flush()
+
+        statements = [
+            q["sql"] for q in captured.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+        assert len(statements) == 2
+        assert statements[0].rstrip().endswith("FOR UPDATE OF p")
+        assert statements[1].lstrip().startswith("UPDATE")
+        assert result.data == 3
+        assert not Participant.objects.filter(
+            conversation=group_conversation_with_members, last_read_at__isnull=True
+        ).exists()
+
+    def test_one_receipt_event_per_conversation(
+        self,
+        db,
+        group_conversation_with_members,
+        owner_user,
+        admin_user,
+        channel_layer,
+    ):
+        """A flush broadcasts a compact delta instead of one event per read."""
+        conversation = group_conversation_with_members
+        ReadReceipts.record(conversation.id, owner_user.id)
+        ReadReceipts.record(conversation.id, admin_user.id)
+
+        ReadReceipts.flush()
+
+        events = sent_events(channel_layer)
+        assert len(events) == 1
+        assert events[0]["type"] == "chat.receipts"
+        assert events[0]["conversation_id"] == conversation.id
+        assert {read["user_id"] for read in events[0]["reads"]} == {
+            str(owner_user.id),
+            str(admin_user.id),
+        }
+
+    def test_messages_after_read_stay_unread(
+        self, db, group_conversation, owner_user, member_user, channel_layer
+    ):
+        """unread_count counts messages newer than the buffered read."""
+        read_at = timezone.now() - timedelta(seconds=30)
+        Message.objects.create(
+            conversation=group_conversation,
+            sender=None,
+            message_type=MessageType.SYSTEM,
+            content="{}",
+        )
+        Participant.objects.filter(
+            conversation=group_conversation, user=owner_user
+        ).update(unread_count=5)
+
+        ReadReceipts.record(group_conversation.id, owner_user.id, read_at)
+        ReadReceipts.flush()
+
+        assert participant(group_conversation, owner_user).unread_count == 1
+
+    def test_never_moves_backwards(
+        self, db, group_conversation, owner_user, channel_layer
+    ):
+        """A stale buffered read cannot undo a newer synchronous read."""
+        stale = timezone.now() - timedelta(minutes=1)
+        MessageService.mark_as_read(conversation=group_conversation, user=owner_user)
+        read_at = participant(group_conversation, owner_user).last_read_at
+
+        ReadReceipts.record(group_conversation.id, owner_user.id, stale)
+        result = ReadReceipts.flush()
+
+        assert result.data == 0
+        assert participant(group_conversation, owner_user).last_read_at == read_at
+        assert sent_events(channel_layer) == []
+
+    def test_empty_flush(self, db, channel_layer, django_assert_num_queries):
+        """Nothing buffered means no queries."""
+        with django_assert_num_queries(0):
+            assert ReadReceipts.flush().data == 0
+
+    def test_concurrent_flush_skipped(self, db, group_conversation, owner_user):
+        """A flush while another holds the lock leaves the buffer alone."""
+        ReadReceipts.record(group_conversation.id, owner_user.id)
+        redis_client = ReadReceipts._get_redis_client()
+        redis_client.set(ReadReceipts.FLUSH_LOCK_KEY, "other")
+
+        result = ReadReceipts.flush()
+
+        assert result.error_code == "FLUSH_IN_PROGRESS"
+        assert redis_client.hlen(READ_RECEIPT_CONFIG.KEY_PENDING) == 1
+
+    def test_flush_that_lost_its_lock_keeps_snapshot(
+        self, db, group_conversation, owner_user, channel_layer, mocker
+    ):
+        """
+        A flush whose lock expired does not delete the current snapshot.
+
+        Why it matters: The snapshot may already hold reads a newer flush
+        renamed in and has not applied yet; deleting it would lose them.
+        """
+        ReadReceipts.record(group_conversation.id, owner_user.id)
+        redis_client = ReadReceipts._get_redis_client()
+        apply = ReadReceipts.apply
+
+        def apply_then_lose_lock(reads):
+            redis_client.set(ReadReceipts.FLUSH_LOCK_KEY, "other")
+            return apply(reads)
+
+        mocker.patch.object(ReadReceipts, "apply", side_effect=apply_then_lose_lock)
+        ReadReceipts.flush()
+
+        assert redis_client.exists(READ_RECEIPT_CONFIG.KEY_FLUSHING)
+        assert redis_client.get(ReadReceipts.FLUSH_LOCK_KEY) == b"other"
+
+
+# =============================================================================
+# Mark All Read
+# =============================================================================
+
+
+class TestMarkAllRead:
+    """Tests for marking every conversation read."""
+
+    def test_single_statement(
+        self,
+        db,
+        group_conversation,
+        direct_conversation,
+        owner_user,
+        channel_layer,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        All conversations are marked read with one UPDATE.
+
+        Why it matters: Users with hundreds of chats hit "mark all read".
+        """
+        Participant.objects.filter(user=owner_user).update(unread_count=3)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_num_queries(1):
+                result = MessageService.mark_all_as_read(owner_user)
+
+        assert result.data == 2
+        assert not Participant.objects.filter(
+            user=owner_user, unread_count__gt=0
+        ).exists()
+        assert {event["conversation_id"] for event in sent_events(channel_layer)} == {
+            group_conversation.id,
+            direct_conversation.id,
+        }
+
+    def test_left_conversations_untouched(self, db, left_participant, channel_layer):
+        """Conversations the user left are not marked."""
+        result = MessageService.mark_all_as_read(left_participant.user)
+
+        assert result.data == 0
+
+    def test_read_all_endpoint(
+        self, owner_client, group_conversation, owner_user, channel_layer
+    ):
+        """POST /conversations/read-all/ clears every unread count."""
+        Participant.objects.filter(user=owner_user).update(unread_count=2)
+
+        response = owner_client.post("/api/v1/chat/conversations/read-all/")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "read", "conversations": 1}
+        assert participant(group_conversation, owner_user).unread_count == 0
@@ -21,7 +21,10 @@ Testing Philosophy:
 
 import json
 from datetime import timedelta
+from io import StringIO
 
+import pytest
+from asgiref.sync import async_to_sync
 from django.utils import timezone
 
 from authentication.tests.factories import UserFactory
@@ -1628,6 +1631,100 @@ class TestMessageServiceMarkAsRead:
         assert result.error_code == "NOT_PARTICIPANT"
 
 
+class TestMessageServiceAsync:
+    """
+    Tests for MessageService.asend_message() and amark_as_read().
+
+    Verifies:
+    - Async variants store the same state as the sync ones
+    - Validation failures use the same error codes
+    """
+
+    @pytest.mark.django_db(transaction=True)
+    def test_asend_message(
+        self, group_conversation_with_members, owner_user, member_user
+    ):
+        """
+        Async sends create the message and bump other members' unread counts.
+
+        Why it matters: Consumers send through this path.
+        """
+        result = async_to_sync(MessageService.asend_message)(
+            conversation=group_conversation_with_members,
+            sender=owner_user,
+            content="  Hello async  ",
+        )
+
+        assert result.success is True
+        assert Message.objects.get(pk=result.data.pk).content == "Hello async"
+        member = Participant.objects.get(
+            conversation=group_conversation_with_members, user=member_user
+        )
+        assert member.unread_count == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_asend_reply_to_reply_goes_to_root(self, group_conversation, owner_user):
+        """Async replies are flattened to the thread root like sync ones."""
+        root = MessageService.send_message(
+            conversation=group_conversation, sender=owner_user, content="Root"
+        ).data
+        reply = MessageService.send_message(
+            conversation=group_conversation,
+            sender=owner_user,
+            content="Reply",
+            parent_message_id=root.id,
+        ).data
+
+        result = async_to_sync(MessageService.asend_message)(
+            conversation=group_conversation,
+            sender=owner_user,
+            content="Nested",
+            parent_message_id=reply.id,
+        )
+
+        assert result.data.parent_message_id == root.id
+
+    def test_asend_rejects_non_participant(
+        self, db, group_conversation, non_participant_user
+    ):
+        """Non-participants are rejected without touching the database."""
+        result = async_to_sync(MessageService.asend_message)(
+            conversation=group_conversation,
+            sender=non_participant_user,
+            content="Hello",
+        )
+
+        assert result.error_code == "NOT_PARTICIPANT"
+        assert not Message.objects.filter(conversation=group_conversation).exists()
+
+    def test_amark_as_read(self, db, group_conversation, owner_user):
+        """Async mark as read resets the counter and sets last_read_at."""
+        Participant.objects.filter(
+            conversation=group_conversation, user=owner_user
+        ).update(unread_count=3)
+
+        result = async_to_sync(MessageService.amark_as_read)(
+            conversation=group_conversation, user=owner_user
+        )
+
+        assert result.success is True
+        participant = Participant.objects.get(
+            conversation=group_conversation, user=owner_user
+        )
+        assert participant.unread_count == 0
+        assert participant.last_read_at is not None
+
+    def test_amark_as_read_non_participant(
+        self, db, group_conversation, non_participant_user
+    ):
+        """Non-participants cannot mark the conversation as read."""
+        result = async_to_sync(MessageService.amark_as_read)(
+            conversation=group_conversation, user=non_participant_user
+        )
+
+        assert result.error_code == "NOT_PARTICIPANT"
+
+
 # =============================================================================
 # TestMessageServiceGetUnreadCount
 # =============================================================================
@@ -1641,25 +1738,64 @@ class TestMessageServiceGetUnreadCount:
     - Counts messages after last_read_at
     - Excludes own messages
     - Returns 0 for non-participants
+    - Counter is reset by mark_as_read
     """
 
-    def test_counts_unread_messages(self, db, conversation_with_messages, owner_user):
+    def test_counts_unread_messages(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
         """
-        Returns count of messages after last_read_at.
+        Returns count of messages sent since the last read.
 
         Why it matters: Unread badge/indicator functionality.
         """
-        conv = conversation_with_messages["conversation"]
+        conv = group_conversation_with_members
+        MessageService.mark_as_read(conversation=conv, user=owner_user)
 
-        # Mark as read at a point in time
-        participant = Participant.objects.get(conversation=conv, user=owner_user)
-        participant.last_read_at = timezone.now() - timedelta(hours=1)
-        participant.save()
+        for i in range(3):
+            MessageService.send_message(
+                conversation=conv,
+                sender=member_user,
+                content=f"Message {i}",
+            )
 
         count = MessageService.get_unread_count(conversation=conv, user=owner_user)
 
-        # Should count messages from other users created after last_read_at
-        assert count > 0
+        assert count == 3
+
+    def test_mark_as_read_resets_count(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
+        """
+        Marking as read zeroes the unread counter.
+
+        Why it matters: Badge must clear once the user has seen messages.
+        """
+        conv = group_conversation_with_members
+        MessageService.send_message(
+            conversation=conv, sender=member_user, content="Hello"
+        )
+
+        MessageService.mark_as_read(conversation=conv, user=owner_user)
+
+        assert MessageService.get_unread_count(conversation=conv, user=owner_user) == 0
+
+    def test_system_messages_count_for_everyone(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
+        """
+        System messages increment every active participant's counter.
+
+        Why it matters: System events have no sender to exclude.
+        """
+        conv = group_conversation_with_members
+
+        ConversationService.update_title(
+            conversation=conv, user=owner_user, new_title="Renamed"
+        )
+
+        assert MessageService.get_unread_count(conversation=conv, user=owner_user) == 1
+        assert MessageService.get_unread_count(conversation=conv, user=member_user) == 1
 
     def test_excludes_own_messages(self, db, group_conversation, owner_user):
         """
@@ -1700,3 +1836,68 @@ class TestMessageServiceGetUnreadCount:
         )
 
         assert count == 0
+
+
+# =============================================================================
+# TestMessageServiceRebuildUnreadCounts
+# =============================================================================
+
+
+class TestMessageServiceRebuildUnreadCounts:
+    """
+    Tests for MessageService.rebuild_unread_counts() and its command.
+
+    Verifies:
+    - Counters are recomputed from message history
+    - Own messages and already-read messages are excluded
+    - Management command delegates to the service
+    """
+
+    def test_rebuilds_counts_from_history(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
+        """
+        Counters match messages created outside MessageService.
+
+        Why it matters: Repairs drift after imports or manual fixes.
+        """
+        conv = group_conversation_with_members
+        Participant.objects.filter(conversation=conv, user=owner_user).update(
+            last_read_at=timezone.now() - timedelta(hours=1)
+        )
+        Message.objects.create(conversation=conv, sender=member_user, content="A")
+        Message.objects.create(conversation=conv, sender=member_user, content="B")
+        Message.objects.create(conversation=conv, sender=owner_user, content="C")
+        Message.objects.create(
+            conversation=conv,
+            sender=None,
+            message_type=MessageType.SYSTEM,
+            content=json.dumps({"event": "title_changed", "data": {}}),
+        )
+
+        result = MessageService.rebuild_unread_counts(conversation=conv)
+
+        assert result.success is True
+        assert result.data == 3
+        owner = Participant.objects.get(conversation=conv, user=owner_user)
+        member = Participant.objects.get(conversation=conv, user=member_user)
+        assert owner.unread_count == 3
+        assert member.unread_count == 2
+
+    def test_command_rebuilds_counts(
+        self, db, group_conversation_with_members, owner_user, member_user
+    ):
+        """
+        rebuild_unread_counts management command updates counters.
+
+        Why it matters: Operators run the rebuild from the CLI.
+        """
+        from django.core.management import call_command
+
+        conv = group_conversation_with_members
+        Message.objects.create(conversation=conv, sender=member_user, content="A")
+
+        call_command("rebuild_unread_counts", conversation=conv.id, stdout=StringIO())
+
+        owner = Participant.objects.get(conversation=conv, user=owner_user)
+        assert owner.unread_count == 1
@@ -0,0 +1,246 @@
+"""
+Tests for the message change log and delta-sync endpoint.
+
+Test Categories:
+    1. Recording - services append changes in the change's transaction
+    2. Sync API - collapsed changes since a cursor, scoped to the user
+    3. Cursors - head cursor, commit horizon, paging, expiry after pruning
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from chat.constants import SYNC_CONFIG
+from chat.models import MessageChange, MessageChangeKind
+from chat.services import MessageService, ReactionService, SyncService
+
+SYNC_URL = "/api/v1/chat/sync/"
+
+
+@pytest.fixture
+def settled(mocker):
+    """
+    Treat every transaction as finished so cursors advance immediately.
+
+    Each test runs in one open transaction, which holds the real horizon at
+    its own changes. Set return_value to pin the horizon elsewhere.
+    """
+    return mocker.patch.object(SyncService, "_commit_horizon", return_value=2**63 - 1)
+
+
+def head_cursor(client):
+    """Get the current head cursor for a client."""
+    return client.get(SYNC_URL).json()["cursor"]
+
+
+def send(conversation, sender, content):
+    """Send a message and return it."""
+    return MessageService.send_message(
+        conversation=conversation, sender=sender, content=content
+    ).data
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+
+class TestChangeRecording:
+    """Tests that message changes are written to the change log."""
+
+    def test_message_lifecycle_recorded(self, group_conversation, owner_user):
+        """Send, edit, react and delete each append one change."""
+        message = send(group_conversation, owner_user, "Hello")
+        MessageService.edit_message(
+            user=owner_user, message_id=message.id, new_content="Edited"
+        )
+        ReactionService.add_reaction(user=owner_user, message_id=message.id, emoji="👍")
+        message.refresh_from_db()
+        MessageService.delete_message(message=message, user=owner_user)
+
+        kinds = list(
+            MessageChange.objects.filter(message=message).values_list("kind", flat=True)
+        )
+        assert kinds == [
+            MessageChangeKind.CREATED,
+            MessageChangeKind.EDITED,
+            MessageChangeKind.REACTIONS,
+            MessageChangeKind.DELETED,
+        ]
+
+    def test_failed_change_not_recorded(self, group_conversation, owner_user):
+        """Rejected operations leave no change behind."""
+        result = MessageService.send_message(
+            conversation=group_conversation, sender=owner_user, content="   "
+        )
+
+        assert not result.success
+        assert not MessageChange.objects.exists()
+
+
+# =============================================================================
+# Sync API
+# =============================================================================
+
+
+class TestSyncEndpoint:
+    """Tests for GET /sync/."""
+
+    def test_changes_collapsed_per_message(
+        self, settled, owner_client, group_conversation, owner_user, member_user
+    ):
+        """
+        Each changed message is returned once, in its current state.
+
+        Why it matters: Reconnect cost scales with what changed, not with the
+        number of edits, reactions or history size.
+        """
+        cursor = head_cursor(owner_client)
+        message = send(group_conversation, owner_user, "Hello")
+        MessageService.edit_message(
+            user=owner_user, message_id=message.id, new_content="Edited"
+        )
+        ReactionService.add_reaction(user=owner_user, message_id=message.id, emoji="👍")
+        doomed = send(group_conversation, owner_user, "Oops")
+        MessageService.delete_message(message=doomed, user=owner_user)
+
+        data = owner_client.get(SYNC_URL, {"cursor": cursor}).json()
+
+        assert [m["id"] for m in data["messages"]] == [message.id]
+        assert data["messages"][0]["content"] == "Edited"
+        assert data["messages"][0]["edit_count"] == 1
+        assert data["messages"][0]["reaction_counts"] == {"👍": 1}
+        assert data["deleted_message_ids"] == [doomed.id]
+        assert data["cursor"] == MessageChange.objects.latest("id").id
+        assert data["has_more"] is False
+
+    def test_nothing_changed(self, settled, owner_client, group_conversation):
+        """Syncing at the head returns no changes and the same cursor."""
+        cursor = head_cursor(owner_client)
+
+        data = owner_client.get(SYNC_URL, {"cursor": cursor}).json()
+
+        assert data == {
+            "cursor": cursor,
+            "has_more": False,
+            "messages": [],
+            "deleted_message_ids": [],
+        }
+
+    def test_only_member_conversations_synced(
+        self,
+        settled,
+        other_client,
+        group_conversation,
+        direct_conversation,
+        owner_user,
+    ):
+        """Changes in conversations the user is not in are never returned."""
+        send(group_conversation, owner_user, "Group only")
+        direct = send(direct_conversation, owner_user, "Direct")
+
+        data = other_client.get(SYNC_URL, {"cursor": 0}).json()
+
+        assert [m["id"] for m in data["messages"]] == [direct.id]
+
+    def test_unauthenticated_rejected(self, api_client):
+        """Sync requires authentication."""
+        response = api_client.get(SYNC_URL)
+
+        assert response.status_code == 401
+
+
+# =============================================================================
+# Cursors
+# =============================================================================
+
+
+class TestSyncCursors:
+    """Tests for cursor advancement, paging and expiry."""
+
+    def test_running_transaction_changes_returned_without_advancing(
+        self, owner_client, group_conversation, owner_user
+    ):
+        """
+        Changes of a still-running transaction are delivered, cursor stays.
+
+        Why it matters: A running transaction may still commit changes that
+        sort before them; the next sync must read those. The test's own
+        transaction is still open, so its changes sit at the real horizon.
+        """
+        message = send(group_conversation, owner_user, "Just now")
+
+        data = owner_client.get(SYNC_URL, {"cursor": 0}).json()
+
+        assert [m["id"] for m in data["messages"]] == [message.id]
+        assert data["cursor"] == 0
+        assert head_cursor(owner_client) == 0
+
+    def test_late_commit_with_lower_id_delivered(
+        self, settled, owner_client, group_conversation, owner_user
+    ):
+        """
+        A change committed after the cursor passed its ID is still delivered.
+
+        Why it matters: IDs are allocated before commit, so a long transaction
+        commits behind faster ones; ordering by ID alone would skip it.
+        """
+        slow = send(group_conversation, owner_user, "Slow")
+        fast = send(group_conversation, owner_user, "Fast")
+        slow_change = MessageChange.objects.get(message=slow)
+        slow_xid = slow_change.xid + 1
+        MessageChange.objects.filter(pk=slow_change.pk).update(xid=slow_xid)
+
+        # The slow transaction is still running: the cursor stops before it
+        settled.return_value = slow_xid
+        first = owner_client.get(SYNC_URL, {"cursor": 0}).json()
+        settled.return_value = slow_xid + 1
+        second = owner_client.get(SYNC_URL, {"cursor": first["cursor"]}).json()
+
+        assert first["cursor"] == MessageChange.objects.get(message=fast).id
+        assert first["cursor"] > slow_change.id
+        assert [m["id"] for m in second["messages"]] == [slow.id]
+        assert second["cursor"] == slow_change.id
+
+    def test_limit_pages_through_changes(
+        self, settled, owner_client, group_conversation, owner_user
+    ):
+        """has_more is set until every change has been read."""
+        messages = [send(group_conversation, owner_user, f"M{i}") for i in range(3)]
+
+        first = owner_client.get(SYNC_URL, {"cursor": 0, "limit": 2}).json()
+        second = owner_client.get(
+            SYNC_URL, {"cursor": first["cursor"], "limit": 2}
+        ).json()
+
+        assert first["has_more"] is True
+        assert [m["id"] for m in first["messages"]] == [m.id for m in messages[:2]]
+        assert second["has_more"] is False
+        assert [m["id"] for m in second["messages"]] == [messages[2].id]
+
+    def test_limit_validated(self, owner_client):
+        """Limits above SYNC_CONFIG.MAX_LIMIT are rejected."""
+        response = owner_client.get(
+            SYNC_URL, {"cursor": 0, "limit": SYNC_CONFIG.MAX_LIMIT + 1}
+        )
+
+        assert response.status_code == 400
+
+    def test_pruned_cursor_expired(
+        self, settled, owner_client, group_conversation, owner_user
+    ):
+        """Cursors behind the retention window must reload."""
+        old = send(group_conversation, owner_user, "Old")
+        cursor = head_cursor(owner_client)
+        send(group_conversation, owner_user, "Recent")
+        MessageChange.objects.filter(message=old).update(
+            created_at=timezone.now() - timedelta(days=SYNC_CONFIG.RETENTION_DAYS + 1)
+        )
+
+        assert SyncService.prune().data == 1
+        response = owner_client.get(SYNC_URL, {"cursor": cursor})
+
+        assert response.status_code == 410
+        assert response.json()["error_code"] == "CURSOR_EXPIRED"
@@ -38,6 +38,7 @@ from chat.models import (
 
 
 CONVERSATIONS_URL = "/api/v1/chat/conversations/"
+UNREAD_TOTAL_URL = "/api/v1/chat/unread-total/"
 
 
 def conversation_detail_url(conversation_id):
@@ -186,6 +187,84 @@ class TestConversationViewSetList:
         assert "next" in response.data
         assert "previous" in response.data
 
+    def test_unread_count_excludes_own_and_read_messages(
+        self, db, group_conversation_with_members, owner_client, owner_user, member_user
+    ):
+        """
+        unread_count only counts others' messages since the last read.
+
+        Why it matters: The list reads the viewer's counter in the main
+        query, which must match the per-conversation semantics.
+        """
+        from chat.services import MessageService
+
+        conv = group_conversation_with_members
+        MessageService.send_message(
+            conversation=conv, sender=member_user, content="Already read"
+        )
+        MessageService.mark_as_read(conversation=conv, user=owner_user)
+        MessageService.send_message(
+            conversation=conv, sender=member_user, content="Unread"
+        )
+        MessageService.send_message(
+            conversation=conv, sender=owner_user, content="Own message"
+        )
+
+        response = owner_client.get(CONVERSATIONS_URL)
+
+        result = next(
+            c
+            for c in response.data["results"]
+            if c["id"] == group_conversation_with_members.id
+        )
+        assert result["unread_count"] == 1
+        assert result["last_message"]["content"] == "Own message"
+
+    def test_query_count_independent_of_page_size(self, db, owner_client, owner_user):
+        """
+        Listing conversations issues a constant number of queries.
+
+        Why it matters: Unread counts, last messages and participants are
+        batched, so the list endpoint must not degrade into N+1 queries.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def create_conversation(index):
+            member = UserFactory()
+            conversation = Conversation.objects.create(
+                conversation_type=ConversationType.GROUP,
+                title=f"Group {index}",
+                created_by=owner_user,
+                participant_count=2,
+            )
+            Participant.objects.create(
+                conversation=conversation,
+                user=owner_user,
+                role=ParticipantRole.OWNER,
+            )
+            Participant.objects.create(
+                conversation=conversation,
+                user=member,
+                role=ParticipantRole.MEMBER,
+            )
+            Message.objects.create(
+                conversation=conversation, sender=member, content="Hello"
+            )
+
+        create_conversation(0)
+        with CaptureQueriesContext(connection) as few:
+            response = owner_client.get(CONVERSATIONS_URL)
+        assert len(response.data["results"]) == 1
+
+        for index in range(1, 6):
+            create_conversation(index)
+        with CaptureQueriesContext(connection) as many:
+            response = owner_client.get(CONVERSATIONS_URL)
+        assert len(response.data["results"]) == 6
+
+        assert len(many.captured_queries) == len(few.captured_queries)
+
 
 # =============================================================================
 # TestConversationViewSetCreate
@@ -1333,3 +1412,96 @@ class TestMessageViewSetDestroy:
         text_message.refresh_from_db()
         assert text_message.content == original_content
         assert text_message.is_deleted is True
+
+
+# =============================================================================
+# TestUnreadTotalView
+# =============================================================================
+
+
+class TestUnreadTotalView:
+    """
+    Tests for GET /api/v1/chat/unread-total/.
+
+    Verifies:
+    - Sums unread counts across conversations
+    - ETag / If-None-Match conditional responses
+    - Authentication requirement
+    """
+
+    def test_sums_unread_across_conversations(
+        self,
+        db,
+        group_conversation_with_members,
+        direct_conversation,
+        owner_client,
+        member_user,
+        other_user,
+    ):
+        """
+        Returns total unread messages and number of unread conversations.
+
+        Why it matters: Mobile clients poll this for the global badge.
+        """
+        from chat.services import MessageService
+
+        for content in ("One", "Two"):
+            MessageService.send_message(
+                conversation=group_conversation_with_members,
+                sender=member_user,
+                content=content,
+            )
+        MessageService.send_message(
+            conversation=direct_conversation, sender=other_user, content="Hi"
+        )
+
+        response = owner_client.get(UNREAD_TOTAL_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"unread_count": 3, "unread_conversations": 2}
+        assert response["ETag"]
+
+    def test_matching_etag_returns_not_modified(self, db, owner_client):
+        """
+        If-None-Match with the current ETag returns 304 without a body.
+
+        Why it matters: Unchanged badges should cost almost nothing.
+        """
+        etag = owner_client.get(UNREAD_TOTAL_URL)["ETag"]
+
+        response = owner_client.get(UNREAD_TOTAL_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_etag_changes_when_unread_changes(
+        self, db, group_conversation_with_members, owner_client, member_user
+    ):
+        """
+        A new message invalidates the previous ETag.
+
+        Why it matters: Clients must see fresh badges after new messages.
+        """
+        from chat.services import MessageService
+
+        etag = owner_client.get(UNREAD_TOTAL_URL)["ETag"]
+        MessageService.send_message(
+            conversation=group_conversation_with_members,
+            sender=member_user,
+            content="New",
+        )
+
+        response = owner_client.get(UNREAD_TOTAL_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["unread_count"] == 1
+
+    def test_requires_authentication(self, db, api_client):
+        """
+        Unauthenticated requests are rejected.
+
+        Why it matters: Unread state is private data.
+        """
+        response = api_client.get(UNREAD_TOTAL_URL)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
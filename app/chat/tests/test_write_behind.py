@@ -0,0 +1,308 @@
+"""
+Tests for write-behind message persistence.
+
+Test Categories:
+    1. Toggle - per-deployment setting
+    2. Enqueue - validation, server-assigned ID/timestamp, stream append
+    3. Flush - bulk insert, coalesced denormalized updates
+    4. Guarantees - ordering, redelivery after a failed flush, dropped entries
+"""
+
+from datetime import datetime
+
+import pytest
+from django_redis import get_redis_connection
+
+from chat.constants import WRITE_BEHIND_CONFIG
+from chat.models import Message, Participant
+from chat.services import MessageService
+from chat.write_behind import MessageWriteBehind
+
+
+@pytest.fixture
+def redis_client():
+    """Raw Redis client holding the write-behind stream."""
+    return get_redis_connection("default")
+
+
+def stream_length(redis_client) -> int:
+    """Number of entries still in the write-behind stream."""
+    return redis_client.xlen(WRITE_BEHIND_CONFIG.STREAM_KEY)
+
+
+# =============================================================================
+# Toggle
+# =============================================================================
+
+
+class TestWriteBehindToggle:
+    """Tests for the CHAT_WRITE_BEHIND_ENABLED setting."""
+
+    def test_disabled_by_default(self):
+        """Deployments keep synchronous persistence unless they opt in."""
+        assert MessageWriteBehind.is_enabled() is False
+
+    def test_enabled_via_setting(self, settings):
+        """The fast path is switched on per deployment."""
+        settings.CHAT_WRITE_BEHIND_ENABLED = True
+
+        assert MessageWriteBehind.is_enabled() is True
+
+
+# =============================================================================
+# Enqueue
+# =============================================================================
+
+
+class TestWriteBehindEnqueue:
+    """Tests for MessageWriteBehind.enqueue."""
+
+    def test_returns_payload_without_writing_message(
+        self, db, group_conversation, owner_user, redis_client
+    ):
+        """
+        Enqueue assigns an ID and timestamp but does not insert the row.
+
+        Why it matters: The broadcast must not wait for the database write.
+        """
+        result = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="  Hi  "
+        )
+
+        assert result.success
+        assert result.data["id"] > 0
+        assert result.data["content"] == "Hi"
+        assert result.data["sender_id"] == str(owner_user.id)
+        assert datetime.fromisoformat(result.data["created_at"])
+        assert not Message.objects.filter(id=result.data["id"]).exists()
+        assert stream_length(redis_client) == 1
+
+    def test_ids_are_unique_and_increasing(self, db, group_conversation, owner_user):
+        """IDs come from the message sequence, never colliding with sync sends."""
+        first = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="One"
+        )
+        synchronous = MessageService.send_message(
+            conversation=group_conversation, sender=owner_user, content="Two"
+        )
+        second = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="Three"
+        )
+
+        assert first.data["id"] < synchronous.data.id < second.data["id"]
+
+    def test_rejects_non_participant(
+        self, db, group_conversation, non_participant_user, redis_client
+    ):
+        """Validation matches send_message and nothing is queued."""
+        result = MessageWriteBehind.enqueue(
+            conversation=group_conversation,
+            sender=non_participant_user,
+            content="Hello",
+        )
+
+        assert result.error_code == "NOT_PARTICIPANT"
+        assert stream_length(redis_client) == 0
+
+    def test_reply_to_reply_is_flattened(
+        self, db, group_conversation, owner_user, text_message
+    ):
+        """Replies reference the root message, as with synchronous sends."""
+        reply = MessageService.send_message(
+            conversation=group_conversation,
+            sender=owner_user,
+            content="Reply",
+            parent_message_id=text_message.id,
+        ).data
+
+        result = MessageWriteBehind.enqueue(
+            conversation=group_conversation,
+            sender=owner_user,
+            content="Nested",
+            parent_message_id=reply.id,
+        )
+
+        assert result.data["parent_message_id"] == text_message.id
+
+
+# =============================================================================
+# Flush
+# =============================================================================
+
+
+class TestWriteBehindFlush:
+    """Tests for MessageWriteBehind.flush."""
+
+    def test_persists_with_assigned_id_and_timestamp(
+        self, db, group_conversation, owner_user, redis_client
+    ):
+        """Stored rows match what was broadcast and the stream is emptied."""
+        data = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="Hello"
+        ).data
+
+        result = MessageWriteBehind.flush()
+
+        assert result.data == 1
+        message = Message.objects.get(id=data["id"])
+        assert message.content == "Hello"
+        assert message.created_at.isoformat() == data["created_at"]
+        assert message.search_vector is not None
+        assert stream_length(redis_client) == 0
+
+    def test_coalesces_conversation_and_unread_updates(
+        self,
+        db,
+        group_conversation_with_members,
+        owner_user,
+        admin_user,
+        member_user,
+        django_assert_max_num_queries,
+    ):
+        """
+        A burst becomes one insert and one update per conversation.
+
+        Why it matters: Busy groups otherwise serialize on the conversation row.
+        """
+        conv = group_conversation_with_members
+        payloads = [
+            MessageWriteBehind.enqueue(
+                conversation=conv, sender=sender, content=f"Message {i}"
+            ).data
+            for i, sender in enumerate([owner_user, owner_user, admin_user] * 5)
+        ]
+
+        with django_assert_max_num_queries(6):
+            assert MessageWriteBehind.flush().data == 15
+
+        conv.refresh_from_db()
+        assert conv.last_message_at.isoformat() == payloads[-1]["created_at"]
+        unread = dict(
+            Participant.objects.filter(conversation=conv).values_list(
+                "user_id", "unread_count"
+            )
+        )
+        assert unread[owner_user.id] == 5
+        assert unread[admin_user.id] == 10
+        assert unread[member_user.id] == 15
+
+    def test_updates_reply_count(
+        self, db, group_conversation, owner_user, text_message
+    ):
+        """Replies in a batch bump the parent's reply_count once."""
+        for i in range(3):
+            MessageWriteBehind.enqueue(
+                conversation=group_conversation,
+                sender=owner_user,
+                content=f"Reply {i}",
+                parent_message_id=text_message.id,
+            )
+
+        MessageWriteBehind.flush()
+
+        text_message.refresh_from_db()
+        assert text_message.reply_count == 3
+
+    def test_batches_respect_batch_size(self, db, group_conversation, owner_user):
+        """Large backlogs are drained in several bounded batches."""
+        for i in range(5):
+            MessageWriteBehind.enqueue(
+                conversation=group_conversation, sender=owner_user, content=str(i)
+            )
+
+        assert MessageWriteBehind.flush(batch_size=2).data == 5
+
+    def test_empty_stream_is_noop(self, db):
+        """Scheduled runs on idle deployments do nothing."""
+        assert MessageWriteBehind.flush().data == 0
+
+
+# =============================================================================
+# Ordering and Delivery Guarantees
+# =============================================================================
+
+
+class TestWriteBehindGuarantees:
+    """Tests for the documented ordering and delivery guarantees."""
+
+    def test_history_order_matches_send_order(self, db, group_conversation, owner_user):
+        """History order (created_at, id) is fixed at enqueue time."""
+        ids = [
+            MessageWriteBehind.enqueue(
+                conversation=group_conversation, sender=owner_user, content=str(i)
+            ).data["id"]
+            for i in range(5)
+        ]
+
+        MessageWriteBehind.flush(batch_size=2)
+
+        stored = list(Message.objects.filter(id__in=ids).values_list("id", flat=True))
+        assert stored == ids
+
+    def test_failed_flush_is_redelivered_once(
+        self, db, group_conversation, owner_user, other_user, mocker
+    ):
+        """
+        Entries are acknowledged only after commit and applied exactly once.
+
+        Why it matters: A crashed writer must neither lose nor duplicate
+        messages or unread counts.
+        """
+        Participant.objects.create(conversation=group_conversation, user=other_user)
+        data = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="Retry me"
+        ).data
+
+        mocker.patch.object(
+            MessageWriteBehind, "_persist", side_effect=RuntimeError("db down")
+        )
+        with pytest.raises(RuntimeError):
+            MessageWriteBehind.flush(consumer_name="writer-1")
+        mocker.stopall()
+
+        assert MessageWriteBehind.flush(consumer_name="writer-1").data == 1
+        assert MessageWriteBehind.flush(consumer_name="writer-1").data == 0
+        assert Message.objects.filter(id=data["id"]).count() == 1
+        assert (
+            Participant.objects.get(
+                conversation=group_conversation, user=other_user
+            ).unread_count
+            == 1
+        )
+
+    def test_redelivered_entry_does_not_double_count(
+        self, db, group_conversation, owner_user, other_user, redis_client
+    ):
+        """Entries persisted but not acknowledged are skipped on replay."""
+        Participant.objects.create(conversation=group_conversation, user=other_user)
+        data = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="Once"
+        ).data
+
+        MessageWriteBehind._ensure_group(redis_client)
+        entries = MessageWriteBehind._read_batch(redis_client, "writer-1", 10)
+        MessageWriteBehind._persist([payload for _, payload in entries])
+
+        # The writer "crashed" before XACK; the next flush replays the entry
+        assert MessageWriteBehind.flush(consumer_name="writer-1").data == 0
+        assert Message.objects.filter(id=data["id"]).count() == 1
+        assert (
+            Participant.objects.get(
+                conversation=group_conversation, user=other_user
+            ).unread_count
+            == 1
+        )
+
+    def test_drops_messages_for_deleted_conversation(
+        self, db, group_conversation, owner_user, redis_client
+    ):
+        """Messages for conversations deleted before the flush are not stored."""
+        data = MessageWriteBehind.enqueue(
+            conversation=group_conversation, sender=owner_user, content="Late"
+        ).data
+        group_conversation.is_deleted = True
+        group_conversation.save(update_fields=["is_deleted"])
+
+        assert MessageWriteBehind.flush().data == 0
+        assert not Message.objects.filter(id=data["id"]).exists()
+        assert stream_length(redis_client) == 0
@@ -4,6 +4,7 @@ URL configuration for chat API.
 URL Structure:
     Conversations:
         /conversations/                          GET, POST
+        /conversations/read-all/                 POST
         /conversations/{id}/                     GET, PATCH, DELETE
         /conversations/{id}/read/                POST
         /conversations/{id}/leave/               POST
@@ -28,10 +29,17 @@ URL Structure:
     Search:
         /messages/search/                        GET
 
+    Unread:
+        /unread-total/                           GET
+
+    Sync:
+        /sync/                                   GET
+
     Presence:
         /presence/                               POST
         /presence/bulk/                          POST
         /presence/heartbeat/                     POST
+        /presence/heartbeat/batch/               POST
         /presence/{user_id}/                     GET
 
 All URLs are prefixed with /api/v1/chat/ in the main URL configuration.
@@ -41,6 +49,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from chat.views import (
+    BatchHeartbeatView,
     BulkPresenceView,
     ConversationViewSet,
     HeartbeatView,
@@ -48,6 +57,8 @@ from chat.views import (
     MessageViewSet,
     ParticipantViewSet,
     PresenceView,
+    SyncView,
+    UnreadTotalView,
     UserPresenceView,
 )
 
@@ -61,10 +72,19 @@ urlpatterns = [
     path("", include(router.urls)),
     # Message search endpoint (searches across all user's conversations)
     path("messages/search/", MessageSearchView.as_view(), name="message-search"),
+    # Global unread badge across all of the user's conversations
+    path("unread-total/", UnreadTotalView.as_view(), name="unread-total"),
+    # Delta sync of message changes for reconnecting clients
+    path("sync/", SyncView.as_view(), name="sync"),
     # Presence endpoints
     path("presence/", PresenceView.as_view(), name="presence"),
     path("presence/bulk/", BulkPresenceView.as_view(), name="presence-bulk"),
     path("presence/heartbeat/", HeartbeatView.as_view(), name="presence-heartbeat"),
+    path(
+        "presence/heartbeat/batch/",
+        BatchHeartbeatView.as_view(),
+        name="presence-heartbeat-batch",
+    ),
     path("presence/<uuid:user_id>/", UserPresenceView.as_view(), name="presence-user"),
     # Conversation presence endpoint
     path(
@@ -16,6 +16,7 @@ URL Structure:
     /api/v1/chat/conversations/{id}/participants/{pk}/   PATCH, DELETE
     /api/v1/chat/conversations/{id}/messages/            GET, POST
     /api/v1/chat/conversations/{id}/messages/{pk}/       DELETE
+    /api/v1/chat/unread-total/                           GET
 
 Design Decisions:
     - ViewSets use DRF's ModelViewSet for standard CRUD
@@ -30,7 +31,10 @@ from __future__ import annotations
 from urllib.parse import unquote
 
 from django.contrib.auth import get_user_model
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -44,7 +48,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from chat.models import Conversation, ConversationType, Message, Participant
+from chat.archive import MessageArchive
+from chat.history_cache import MessageHistoryCache
+from chat.models import (
+    ArchivedMessage,
+    Conversation,
+    ConversationType,
+    Message,
+    Participant,
+)
 from chat.pagination import ConversationCursorPagination, MessageCursorPagination
 from chat.permissions import (
     CanManageParticipants,
@@ -55,6 +67,8 @@ from chat.permissions import (
     IsGroupConversation,
 )
 from chat.serializers import (
+    BatchHeartbeatResultSerializer,
+    BatchHeartbeatSerializer,
     BulkPresenceRequestSerializer,
     ConversationCreateSerializer,
     ConversationDetailSerializer,
@@ -73,6 +87,9 @@ from chat.serializers import (
     ReactionCreateSerializer,
     ReactionSerializer,
     ReactionToggleResponseSerializer,
+    SyncQuerySerializer,
+    SyncResponseSerializer,
+    UnreadTotalSerializer,
 )
 from chat.services import (
     ConversationService,
@@ -81,6 +98,7 @@ from chat.services import (
     ParticipantService,
     PresenceService,
     ReactionService,
+    SyncService,
 )
 
 User = get_user_model()
@@ -161,19 +179,20 @@ class ConversationViewSet(viewsets.ModelViewSet):
     pagination_class = ConversationCursorPagination
 
     def get_queryset(self):
-        """Filter to conversations where user is an active participant."""
+        """
+        Filter to conversations where user is an active participant.
+
+        Unread counts, last message and participants are precomputed via
+        ConversationQuerySet.with_list_data so list serialization runs a
+        constant number of queries regardless of page size.
+        """
         if not self.request.user.is_authenticated:
             return Conversation.objects.none()
 
         return (
-            Conversation.objects.filter(
-                participants__user=self.request.user,
-                participants__left_at__isnull=True,
-                is_deleted=False,
-            )
+            Conversation.objects.for_user(self.request.user)
+            .with_list_data(self.request.user)
             .select_related("created_by")
-            .prefetch_related("participants__user__profile")
-            .distinct()
             .order_by("-last_message_at", "-created_at")
         )
 
@@ -317,6 +336,26 @@ class ConversationViewSet(viewsets.ModelViewSet):
 
         return Response({"status": "read"})
 
+    @extend_schema(
+        operation_id="mark_all_conversations_read",
+        summary="Mark all conversations as read",
+        description=(
+            "Mark every conversation the user participates in as read with a "
+            "single update, and notify the other participants."
+        ),
+        request=None,
+        responses={
+            200: OpenApiResponse(description="Number of conversations marked read"),
+        },
+        tags=["Chat - Conversations"],
+    )
+    @action(detail=False, methods=["post"], url_path="read-all")
+    def read_all(self, request):
+        """Mark all conversations as read."""
+        result = MessageService.mark_all_as_read(user=request.user)
+
+        return Response({"status": "read", "conversations": result.data})
+
     @extend_schema(
         operation_id="leave_conversation",
         summary="Leave conversation",
@@ -646,7 +685,8 @@ class MessageViewSet(viewsets.ModelViewSet):
     list:
         Get all messages in the conversation.
         Includes soft-deleted messages (content replaced with placeholder).
-        Uses cursor pagination, oldest first.
+        Uses cursor pagination, oldest first. Reads through to archived
+        messages when the page reaches past the hot window.
 
     create:
         Send a message to the conversation.
@@ -669,19 +709,34 @@ class MessageViewSet(viewsets.ModelViewSet):
         )
 
     def get_queryset(self):
-        """Get all messages in the conversation."""
+        """
+        Get all messages in the conversation.
+
+        Only parent_message_id is serialized, so the parent is not joined
+        (that join could not be partition-pruned).
+        """
         conversation = self.get_conversation()
         return (
             Message.objects.filter(
                 conversation=conversation,
             )
-            .select_related(
-                "sender__profile",
-                "parent_message",
-            )
+            .select_related("sender__profile")
             .order_by("created_at", "id")
         )
 
+    def get_message_or_archived(self) -> Message | ArchivedMessage:
+        """Get the message, reading through to the archive for cold messages."""
+        try:
+            return self.get_object()
+        except Http404:
+            # Cold messages only exist in the archive (see chat/archive.py)
+            return get_object_or_404(
+                ArchivedMessage.objects.filter(
+                    conversation_id=self.kwargs.get("conversation_pk")
+                ),
+                pk=self.kwargs.get("pk"),
+            )
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == "create":
@@ -726,12 +781,29 @@ class MessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
+        # Serialized pages are shared by all participants until a message
+        # in the conversation changes (see chat/history_cache.py)
+        page_url = request.build_absolute_uri()
+        version, cached = MessageHistoryCache.get_page(conversation.id, page_url)
+        if cached is not None:
+            return Response(cached)
+
+        # Read through to archived messages only when the page can reach
+        # them (see chat/archive.py)
         queryset = self.get_queryset()
+        if conversation.archived_until is not None and not (
+            self.paginator.starts_after(request, conversation.archived_until)
+        ):
+            queryset = MessageArchive.timeline(conversation)
         page = self.paginate_queryset(queryset)
 
         if page is not None:
             serializer = MessageSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(serializer.data)
+            MessageHistoryCache.set_page(
+                conversation.id, version, page_url, response.data
+            )
+            return response
 
         serializer = MessageSerializer(queryset, many=True)
         return Response(serializer.data)
@@ -854,7 +926,7 @@ class MessageViewSet(viewsets.ModelViewSet):
 
         GET /api/v1/chat/conversations/{conversation_id}/messages/{id}/history/
         """
-        message = self.get_object()
+        message = self.get_message_or_archived()
 
         result = MessageService.get_edit_history(
             user=request.user,
@@ -960,7 +1032,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         description=(
             "Remove your emoji reaction from a message. Only the user who added "
             "the reaction can remove it. The emoji must be URL-encoded if it contains "
-            "special characters."
+            "special characters. Reactions on archived messages can still be removed."
         ),
         parameters=[
             OpenApiParameter(
@@ -984,7 +1056,7 @@ class MessageViewSet(viewsets.ModelViewSet):
 
         DELETE /api/v1/chat/conversations/{conversation_id}/messages/{id}/reactions/{emoji}/
         """
-        message = self.get_object()
+        message = self.get_message_or_archived()
 
         # URL decode the emoji
         emoji = unquote(emoji)
@@ -1019,7 +1091,8 @@ class MessageViewSet(viewsets.ModelViewSet):
         description=(
             "Toggle an emoji reaction on a message. If the reaction exists, it will be "
             "removed; if it doesn't exist, it will be added. This is the recommended "
-            "endpoint for implementing reaction buttons in the UI."
+            "endpoint for implementing reaction buttons in the UI. Archived messages "
+            "only allow removing a reaction (MESSAGE_ARCHIVED otherwise)."
         ),
         request=ReactionCreateSerializer,
         responses={
@@ -1039,7 +1112,7 @@ class MessageViewSet(viewsets.ModelViewSet):
 
         POST /api/v1/chat/conversations/{conversation_id}/messages/{id}/reactions/toggle/
         """
-        message = self.get_object()
+        message = self.get_message_or_archived()
 
         serializer = ReactionCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -1196,6 +1269,107 @@ class MessageSearchView(APIView):
         )
 
 
+class SyncView(APIView):
+    """
+    Delta sync for reconnecting clients.
+
+    GET /api/v1/chat/sync/?cursor=X&limit=Y
+
+    Returns the messages created, edited, deleted or reacted to since the
+    cursor across the user's conversations, instead of reloading pages.
+    Without a cursor, returns the current head cursor to sync from after a
+    full load. An expired cursor returns 410 and the client reloads.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        operation_id="sync_messages",
+        summary="Sync message changes",
+        description=(
+            "Get messages changed since a cursor in all conversations the user "
+            "participates in. Each changed message is returned once in its current "
+            "state; deleted messages are returned by ID. Repeat with the returned "
+            "cursor while has_more is true. Applying a response twice is harmless."
+        ),
+        parameters=[SyncQuerySerializer],
+        responses={
+            200: OpenApiResponse(
+                response=SyncResponseSerializer,
+                description="Changes since the cursor and the next cursor",
+            ),
+            400: OpenApiResponse(description="Invalid cursor or limit"),
+            410: OpenApiResponse(
+                description="Cursor expired (changes were pruned); reload"
+            ),
+        },
+        tags=["Chat - Messages"],
+    )
+    def get(self, request):
+        """Get message changes since the cursor."""
+        serializer = SyncQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        result = SyncService.get_changes(
+            user=request.user,
+            cursor=serializer.validated_data.get("cursor"),
+            limit=serializer.validated_data["limit"],
+        )
+
+        if not result.success:
+            return Response(
+                {"error": result.error, "error_code": result.error_code},
+                status=status.HTTP_410_GONE,
+            )
+
+        return Response(SyncResponseSerializer(result.data).data)
+
+
+class UnreadTotalView(APIView):
+    """
+    Global unread badge across all of the user's conversations.
+
+    GET /api/v1/chat/unread-total/
+
+    Supports conditional requests: the response carries an ETag derived
+    from the totals, and a matching If-None-Match returns 304 with no body.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        operation_id="get_unread_total",
+        summary="Get total unread count",
+        description=(
+            "Get the total number of unread messages across all conversations the "
+            "user participates in. Send the returned ETag in If-None-Match to get a "
+            "304 Not Modified response while the badge is unchanged."
+        ),
+        responses={
+            200: OpenApiResponse(
+                response=UnreadTotalSerializer,
+                description="Unread totals",
+            ),
+            304: OpenApiResponse(description="Unread totals unchanged"),
+        },
+        tags=["Chat - Conversations"],
+    )
+    def get(self, request):
+        """Get unread totals for the current user."""
+        totals = MessageService.get_total_unread(request.user)
+        etag = quote_etag(f"{totals['unread_count']}-{totals['unread_conversations']}")
+
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in client_etags or "*" in client_etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(UnreadTotalSerializer(totals).data)
+
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 # =============================================================================
 # Presence Views
 # =============================================================================
@@ -1407,3 +1581,54 @@ class HeartbeatView(APIView):
             )
 
         return Response(PresenceSerializer(result.data).data)
+
+
+class BatchHeartbeatView(APIView):
+    """
+    Send one heartbeat for several open conversations.
+
+    POST /api/v1/chat/presence/heartbeat/batch/
+        Update last_seen, extend TTL and refresh presence in each conversation.
+
+    Payload:
+        conversation_ids: Conversations currently open in the client
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        operation_id="send_batch_heartbeat",
+        summary="Send presence heartbeat for multiple conversations",
+        description=(
+            "Replaces one heartbeat request per open conversation. Membership is "
+            "checked in one lookup and all presence entries are refreshed together. "
+            "Conversations the user is not a participant in are returned in "
+            "rejected_conversation_ids and do not fail the request."
+        ),
+        request=BatchHeartbeatSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=BatchHeartbeatResultSerializer,
+                description="Heartbeat processed for the accepted conversations",
+            ),
+            400: OpenApiResponse(description="Invalid or too many conversation IDs"),
+        },
+        tags=["Chat - Presence"],
+    )
+    def post(self, request):
+        """Process a batch heartbeat for current user."""
+        serializer = BatchHeartbeatSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = PresenceService.batch_heartbeat(
+            user_id=request.user.id,
+            conversation_ids=serializer.validated_data["conversation_ids"],
+        )
+
+        if not result.success:
+            return Response(
+                {"error": result.error, "error_code": result.error_code},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(BatchHeartbeatResultSerializer(result.data).data)
@@ -0,0 +1,403 @@
+"""
+Write-behind persistence for chat messages sent over WebSocket.
+
+With CHAT_WRITE_BEHIND_ENABLED, ChatConsumer no longer waits for the
+send_message transaction. It validates the message, reserves its ID and
+timestamp, appends it to a Redis stream and broadcasts immediately. The
+flush_message_write_behind Celery task drains the stream and persists
+messages in batches.
+
+Flow:
+    ChatConsumer -> MessageWriteBehind.enqueue()  (validate, XADD)
+                 -> group_send to chat_{conversation_id}
+    celery-beat  -> flush_message_write_behind -> MessageWriteBehind.flush()
+                 -> one INSERT per batch, coalesced conversation/parent/unread
+                    UPDATEs, then XACK + XDEL
+
+Delivery Guarantees:
+    - At-least-once from stream to database: entries are acknowledged only
+      after the batch transaction commits. Entries left pending by a crashed
+      writer are reclaimed (XAUTOCLAIM) after WRITE_BEHIND_CONFIG.CLAIM_IDLE_MS
+    - Exactly-once effect: the INSERT uses ON CONFLICT (id, created_at)
+      DO NOTHING (the partitioned table's primary key; both come from the
+      stream entry) and denormalized counters are only bumped for rows
+      actually inserted, so redelivered entries are harmless
+    - Durability before flush equals Redis durability (AOF/replication).
+      A message broadcast but lost by Redis before a flush is never stored
+    - Messages whose conversation was deleted, or whose sender no longer
+      exists, by flush time are dropped (logged)
+
+Ordering Guarantees:
+    - Message IDs come from the chat_message sequence and created_at from the
+      server clock at enqueue time, so history order (created_at, id) is fixed
+      before the broadcast and does not depend on flush timing
+    - Messages from one connection are enqueued and broadcast in send order
+    - Across connections, broadcast order and (created_at, id) order may
+      differ by in-flight races, exactly as with synchronous sends
+    - Readers (REST history, unread counts, last_message_at) lag the broadcast
+      by at most one flush interval plus batch time
+
+Usage:
+    from chat.write_behind import MessageWriteBehind
+
+    if MessageWriteBehind.is_enabled():
+        result = MessageWriteBehind.enqueue(conversation, user, "Hello!")
+        if result.success:
+            broadcast(result.data)
+
+    # In the Celery task
+    MessageWriteBehind.flush()
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+from redis.exceptions import ResponseError
+
+from core.services import BaseService, ServiceResult
+
+from chat.constants import WRITE_BEHIND_CONFIG
+from chat.history_cache import MessageHistoryCache
+from chat.models import (
+    Conversation,
+    Message,
+    MessageChangeKind,
+    MessageType,
+    Participant,
+)
+from chat.services import MessageService, SyncService
+
+if TYPE_CHECKING:
+    from authentication.models import User
+
+
+class MessageWriteBehind(BaseService):
+    """
+    Redis stream buffer and batching writer for chat messages.
+
+    All methods are classmethods; the stream and consumer group are shared by
+    every web and worker process of a deployment.
+    """
+
+    # Reserve an ID without a transaction or row lock
+    RESERVE_ID_SQL = "SELECT nextval(pg_get_serial_sequence('chat_message', 'id'))"
+
+    # Idempotent bulk insert. Rows for deleted conversations or users are
+    # skipped; a parent that disappeared is stored as NULL (like SET_NULL).
+    INSERT_SQL = """
+    INSERT INTO chat_message (
+        id, created_at, updated_at, is_deleted, conversation_id, sender_id,
+        message_type, content, parent_message_id, reply_count, edit_count,
+        original_content, reaction_counts
+    )
+    SELECT
+        v.id, v.created_at, v.created_at, FALSE, v.conversation_id, v.sender_id,
+        %s, v.content,
+        (SELECT p.id FROM chat_message AS p WHERE p.id = v.parent_message_id),
+        0, 0, '', '{}'::jsonb
+    FROM unnest(
+        %s::bigint[], %s::timestamptz[], %s::bigint[], %s::uuid[], %s::text[],
+        %s::bigint[]
+    ) AS v(id, created_at, conversation_id, sender_id, content, parent_message_id)
+    JOIN chat_conversation AS c
+        ON c.id = v.conversation_id AND NOT c.is_deleted
+    JOIN authentication_user AS u
+        ON u.id = v.sender_id
+    ON CONFLICT (id, created_at) DO NOTHING
+    RETURNING id, created_at, conversation_id, sender_id, parent_message_id
+    """
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Check whether this deployment uses write-behind persistence."""
+        return getattr(settings, "CHAT_WRITE_BEHIND_ENABLED", False)
+
+    @staticmethod
+    def _get_redis_client():
+        """Get raw Redis client from django-redis."""
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    @staticmethod
+    def _ensure_group(redis_client) -> None:
+        """Create the stream and consumer group if they do not exist yet."""
+        try:
+            redis_client.xgroup_create(
+                WRITE_BEHIND_CONFIG.STREAM_KEY,
+                WRITE_BEHIND_CONFIG.CONSUMER_GROUP,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    @classmethod
+    def _reserve_message_id(cls) -> int:
+        """Reserve the next chat_message ID from the database sequence."""
+        with connection.cursor() as cursor:
+            cursor.execute(cls.RESERVE_ID_SQL)
+            return cursor.fetchone()[0]
+
+    @classmethod
+    def enqueue(
+        cls,
+        conversation: Conversation,
+        sender: User,
+        content: str,
+        parent_message_id: int | None = None,
+    ) -> ServiceResult[dict]:
+        """
+        Validate a message, assign its ID and timestamp, and append it to the
+        stream for later persistence.
+
+        Validation is the same as MessageService.send_message, so callers can
+        broadcast the returned payload straight away.
+
+        Args:
+            conversation: Target conversation
+            sender: User sending the message
+            content: Message text
+            parent_message_id: Optional ID of message to reply to
+
+        Returns:
+            ServiceResult with the broadcast payload (id, sender_id, content,
+            message_type, parent_message_id, created_at)
+
+        Error codes:
+            NOT_PARTICIPANT: User is not active in conversation
+            EMPTY_CONTENT: Message content cannot be empty
+            INVALID_PARENT: Parent message not in this conversation
+            CONVERSATION_DELETED: Cannot send to deleted conversation
+        """
+        validation = MessageService._validate_new_message(
+            conversation=conversation,
+            sender=sender,
+            content=content,
+            parent_message_id=parent_message_id,
+        )
+        if not validation.success:
+            return validation
+
+        content, parent_message = validation.data
+        message_id = cls._reserve_message_id()
+        created_at = timezone.now()
+
+        data = {
+            "id": message_id,
+            "sender_id": str(sender.id),
+            "content": content,
+            "message_type": MessageType.TEXT,
+            "parent_message_id": parent_message.id if parent_message else None,
+            "created_at": created_at.isoformat(),
+        }
+        entry = {**data, "conversation_id": conversation.id}
+
+        cls._get_redis_client().xadd(
+            WRITE_BEHIND_CONFIG.STREAM_KEY,
+            {"message": json.dumps(entry)},
+        )
+
+        cls.get_logger().debug(
+            f"User {sender.id} queued message {message_id} "
+            f"for conversation {conversation.id}"
+        )
+
+        return ServiceResult.success(data)
+
+    @classmethod
+    def flush(
+        cls,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+        consumer_name: str | None = None,
+    ) -> ServiceResult[int]:
+        """
+        Drain the stream into the database in batches.
+
+        Each batch takes, in order: this consumer's own unacknowledged
+        entries, entries reclaimed from idle consumers, then new entries.
+
+        Args:
+            batch_size: Entries per batch (default WRITE_BEHIND_CONFIG.BATCH_SIZE)
+            max_batches: Batch limit for this call
+                (default WRITE_BEHIND_CONFIG.MAX_BATCHES_PER_FLUSH)
+            consumer_name: Consumer group member name (default host-pid)
+
+        Returns:
+            ServiceResult with the number of messages inserted
+        """
+        batch_size = batch_size or WRITE_BEHIND_CONFIG.BATCH_SIZE
+        max_batches = max_batches or WRITE_BEHIND_CONFIG.MAX_BATCHES_PER_FLUSH
+        consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+
+        redis_client = cls._get_redis_client()
+        cls._ensure_group(redis_client)
+
+        inserted = 0
+        for _ in range(max_batches):
+            entries = cls._read_batch(redis_client, consumer_name, batch_size)
+            if not entries:
+                break
+
+            inserted += cls._persist([payload for _, payload in entries])
+
+            entry_ids = [entry_id for entry_id, _ in entries]
+            redis_client.xack(
+                WRITE_BEHIND_CONFIG.STREAM_KEY,
+                WRITE_BEHIND_CONFIG.CONSUMER_GROUP,
+                *entry_ids,
+            )
+            redis_client.xdel(WRITE_BEHIND_CONFIG.STREAM_KEY, *entry_ids)
+
+        if inserted:
+            cls.get_logger().info(f"Persisted {inserted} write-behind messages")
+
+        return ServiceResult.success(inserted)
+
+    @classmethod
+    def _read_batch(
+        cls,
+        redis_client,
+        consumer_name: str,
+        batch_size: int,
+    ) -> list[tuple[bytes, dict]]:
+        """
+        Read the next batch of stream entries for this consumer.
+
+        Returns:
+            List of (entry_id, decoded payload) tuples
+        """
+        stream = WRITE_BEHIND_CONFIG.STREAM_KEY
+        group = WRITE_BEHIND_CONFIG.CONSUMER_GROUP
+
+        # Own pending entries (a previous flush failed before XACK)
+        response = redis_client.xreadgroup(
+            group, consumer_name, {stream: "0"}, count=batch_size
+        )
+        entries = response[0][1] if response else []
+
+        if not entries:
+            # Entries stuck with a dead consumer
+            _, entries, *_ = redis_client.xautoclaim(
+                stream,
+                group,
+                consumer_name,
+                min_idle_time=WRITE_BEHIND_CONFIG.CLAIM_IDLE_MS,
+                start_id="0-0",
+                count=batch_size,
+            )
+
+        if not entries:
+            response = redis_client.xreadgroup(
+                group, consumer_name, {stream: ">"}, count=batch_size
+            )
+            entries = response[0][1] if response else []
+
+        return [
+            (entry_id, json.loads(fields[b"message"]))
+            for entry_id, fields in entries
+            if fields
+        ]
+
+    @classmethod
+    def _persist(cls, payloads: list[dict]) -> int:
+        """
+        Insert a batch of messages and apply coalesced denormalized updates.
+
+        Per batch: one INSERT, one UPDATE per conversation for last_message_at
+        and unread counters, and one UPDATE per replied-to parent.
+
+        Args:
+            payloads: Decoded stream entries
+
+        Returns:
+            Number of messages inserted (redelivered entries are not counted)
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    cls.INSERT_SQL,
+                    [
+                        MessageType.TEXT,
+                        [p["id"] for p in payloads],
+                        [datetime.fromisoformat(p["created_at"]) for p in payloads],
+                        [p["conversation_id"] for p in payloads],
+                        [p["sender_id"] for p in payloads],
+                        [p["content"] for p in payloads],
+                        [p["parent_message_id"] for p in payloads],
+                    ],
+                )
+                rows = cursor.fetchall()
+
+            last_message_at: dict[int, datetime] = {}
+            sent_by: dict[int, Counter] = defaultdict(Counter)
+            replies: Counter = Counter()
+            for _, created_at, conversation_id, sender_id, parent_id in rows:
+                last_message_at[conversation_id] = max(
+                    created_at, last_message_at.get(conversation_id, created_at)
+                )
+                sent_by[conversation_id][sender_id] += 1
+                if parent_id:
+                    replies[parent_id] += 1
+
+            for conversation_id, latest in last_message_at.items():
+                # Never move last_message_at backwards past a synchronous send
+                Conversation.objects.filter(
+                    Q(last_message_at__isnull=True) | Q(last_message_at__lt=latest),
+                    id=conversation_id,
+                ).update(last_message_at=latest, updated_at=timezone.now())
+
+                # Each participant gains the batch's messages minus their own
+                senders = sent_by[conversation_id]
+                own_messages = Case(
+                    *[
+                        When(user_id=sender_id, then=Value(count))
+                        for sender_id, count in senders.items()
+                    ],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                Participant.objects.filter(
+                    conversation_id=conversation_id,
+                    left_at__isnull=True,
+                ).update(
+                    unread_count=F("unread_count")
+                    + Value(sum(senders.values()))
+                    - own_messages
+                )
+
+            for parent_id, count in replies.items():
+                Message.objects.filter(id=parent_id).update(
+                    reply_count=F("reply_count") + count,
+                    updated_at=timezone.now(),
+                )
+
+            SyncService.record(
+                MessageChangeKind.CREATED,
+                [
+                    (conversation_id, message_id)
+                    for message_id, _, conversation_id, _, _ in rows
+                ],
+            )
+            MessageHistoryCache.bump(last_message_at.keys())
+
+        dropped = len(payloads) - len(rows)
+        if dropped:
+            cls.get_logger().warning(
+                f"Skipped {dropped} write-behind messages "
+                "(already persisted, or conversation/sender gone)"
+            )
+
+        return len(rows)
@@ -482,6 +482,25 @@ CHUNKED_UPLOAD_PRESIGNED_URL_EXPIRY = env.int(
     "CHUNKED_UPLOAD_PRESIGNED_URL_EXPIRY", default=3600
 )
 
+# =============================================================================
+# Media Processing Configuration
+# =============================================================================
+# Processes in each Celery worker's pool for CPU-bound derivative jobs
+# (image decode/resize/encode, PDF rasterization, text extraction).
+# Opt-in: 0 runs the jobs inline in the worker process, as before the pool
+# existed (see media/processors/pool.py)
+MEDIA_PROCESSING_WORKERS = env.int("MEDIA_PROCESSING_WORKERS", default=0)
+
+# Replace a pool process after this many jobs
+MEDIA_PROCESSING_MAX_TASKS_PER_CHILD = env.int(
+    "MEDIA_PROCESSING_MAX_TASKS_PER_CHILD", default=50
+)
+
+# Replace a pool process once its resident memory exceeds this (in KiB)
+MEDIA_PROCESSING_MAX_MEMORY_PER_CHILD_KB = env.int(
+    "MEDIA_PROCESSING_MAX_MEMORY_PER_CHILD_KB", default=512 * 1024
+)
+
 # =============================================================================
 # Internationalization
 # =============================================================================
@@ -665,6 +684,24 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Write-behind persistence for WebSocket chat messages: broadcast immediately,
+# persist in batches from a Redis stream (see chat/write_behind.py)
+CHAT_WRITE_BEHIND_ENABLED = env.bool("CHAT_WRITE_BEHIND_ENABLED", default=False)
+
+# Buffer conversation last_message_at / reply_count updates in Redis and flush
+# them periodically (see chat/coalescing.py)
+CHAT_COALESCED_UPDATES_ENABLED = env.bool(
+    "CHAT_COALESCED_UPDATES_ENABLED", default=False
+)
+
+# Collapse WebSocket read frames per (user, conversation) in Redis and apply
+# them in one bulk UPDATE per flush (see chat/read_receipts.py)
+CHAT_DEBOUNCED_READS_ENABLED = env.bool("CHAT_DEBOUNCED_READS_ENABLED", default=False)
+
+# Move messages older than this many days to chat_message_archive; history
+# reads go through to the archive (see chat/archive.py). 0 disables archival
+CHAT_ARCHIVE_AFTER_DAYS = env.int("CHAT_ARCHIVE_AFTER_DAYS", default=0)
+
 # =============================================================================
 # Django Silk Configuration (Profiling - DEBUG only, not during tests)
 # =============================================================================
@@ -28,6 +28,9 @@ def pytest_configure():
         "django.contrib.auth.hashers.MD5PasswordHasher",
     ]
 
+    # Run media processing jobs inline so tests can patch processor internals
+    settings.MEDIA_PROCESSING_WORKERS = 0
+
 
 def pytest_collection_modifyitems(items):
     """
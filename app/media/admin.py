@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from media.models import MediaFile, MediaFileTag, Tag
+from media.models import ContentBlob, MediaFile, MediaFileTag, Tag
 
 
 @admin.register(MediaFile)
@@ -27,22 +27,48 @@ class MediaFileAdmin(admin.ModelAdmin):
         "scan_status",
         "is_deleted",
     ]
-    search_fields = ["original_filename", "uploader__email"]
+    search_fields = ["original_filename", "uploader__email", "content_hash"]
     readonly_fields = [
         "id",
         "file_size",
         "mime_type",
+        "content_hash",
         "created_at",
         "updated_at",
         "processing_started_at",
         "processing_completed_at",
         "scanned_at",
     ]
-    raw_id_fields = ["uploader", "version_group"]
+    raw_id_fields = ["uploader", "version_group", "blob"]
     date_hierarchy = "created_at"
     ordering = ["-created_at"]
 
 
+@admin.register(ContentBlob)
+class ContentBlobAdmin(admin.ModelAdmin):
+    """Admin configuration for ContentBlob model."""
+
+    list_display = [
+        "id",
+        "content_hash",
+        "file_size",
+        "reference_count",
+        "created_at",
+    ]
+    search_fields = ["content_hash"]
+    # Reference counts are maintained by media.services.deduplication
+    readonly_fields = [
+        "id",
+        "content_hash",
+        "file",
+        "file_size",
+        "reference_count",
+        "created_at",
+        "updated_at",
+    ]
+    ordering = ["-created_at"]
+
+
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
     """Admin configuration for Tag model."""
@@ -0,0 +1,127 @@
+"""
+Measure image derivative throughput of the media processing pool.
+
+Renders a batch of synthetic JPEGs through render_image_derivatives (the job
+process_media_file submits for every image) inline and with pools of
+increasing size, and reports images/sec and speedup for each. Nothing is
+written to storage or the database.
+
+Usage:
+    python manage.py benchmark_media_processing
+    python manage.py benchmark_media_processing --images 64 --width 6000 --height 4000
+    python manage.py benchmark_media_processing --workers 1 2 4 8
+"""
+
+import os
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from media.processors import pool
+from media.processors.image import IMAGE_DERIVATIVES, render_image_derivatives
+
+
+class Command(BaseCommand):
+    help = "Compare images/sec of inline and pooled image derivative rendering"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--images",
+            type=int,
+            default=32,
+            help="Images rendered per run (default 32)",
+        )
+        parser.add_argument(
+            "--width",
+            type=int,
+            default=4000,
+            help="Width of the synthetic JPEGs (default 4000)",
+        )
+        parser.add_argument(
+            "--height",
+            type=int,
+            default=3000,
+            help="Height of the synthetic JPEGs (default 3000)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            help="Pool sizes to measure (default 1, 2, 4, ... up to the CPU count)",
+        )
+
+    def handle(self, *args, **options):
+        images = options["images"]
+        workers_list = options["workers"] or self._default_workers()
+
+        # Jobs read their source by path, like process_media_file's
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as source_file:
+            source_file.write(self._synthetic_jpeg(options["width"], options["height"]))
+            source_file.flush()
+            source = source_file.name
+
+            self.stdout.write(
+                f"{images} images of {options['width']}x{options['height']} "
+                f"({os.path.getsize(source) // 1024} KiB), {os.cpu_count()} CPUs"
+            )
+
+            started = time.perf_counter()
+            for i in range(images):
+                render_image_derivatives(f"benchmark-{i}", source, IMAGE_DERIVATIVES)
+            inline_rate = images / (time.perf_counter() - started)
+            self.stdout.write(f"inline: {inline_rate:.1f} images/s")
+
+            for workers in workers_list:
+                rate = self._run_pool(workers, source, images)
+                self.stdout.write(
+                    f"{workers} workers: {rate:.1f} images/s "
+                    f"({rate / inline_rate:.2f}x inline)"
+                )
+
+    @staticmethod
+    def _run_pool(workers: int, source: str, images: int) -> float:
+        """Render images with a pool of the given size; returns images/sec."""
+        benchmark_pool = pool.create_pool(workers)
+        try:
+            # Start the children before timing
+            benchmark_pool.map(abs, range(workers))
+
+            started = time.perf_counter()
+            results = [
+                benchmark_pool.apply_async(
+                    render_image_derivatives,
+                    (f"benchmark-{i}", source, IMAGE_DERIVATIVES),
+                )
+                for i in range(images)
+            ]
+            for result in results:
+                result.get()
+            return images / (time.perf_counter() - started)
+        finally:
+            benchmark_pool.terminate()
+            benchmark_pool.join()
+
+    @staticmethod
+    def _default_workers() -> list[int]:
+        """Powers of two up to the CPU count, plus the CPU count itself."""
+        cpus = os.cpu_count() or 1
+        workers = [1]
+        while workers[-1] * 2 <= cpus:
+            workers.append(workers[-1] * 2)
+        if workers[-1] != cpus:
+            workers.append(cpus)
+        return workers
+
+    @staticmethod
+    def _synthetic_jpeg(width: int, height: int) -> bytes:
+        """Encode a noisy photo-like JPEG (noise keeps the codecs busy)."""
+        noise = Image.effect_noise((width, height), 48)
+        gradient = Image.linear_gradient("L").resize((width, height))
+        mirrored = noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        image = Image.merge("RGB", (noise, gradient, mirrored))
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        return buffer.getvalue()
@@ -0,0 +1,123 @@
+"""
+Track upload session parts as UploadPart rows instead of a JSON list.
+
+This migration:
+1. Creates UploadPart with a unique (session, part_number) constraint
+2. Copies UploadSession.parts_completed entries into UploadPart rows
+3. Removes UploadSession.parts_completed
+
+Rolling back rebuilds the JSON list from the rows.
+"""
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def copy_parts_to_rows(apps, schema_editor):
+    """Create an UploadPart row for every recorded part."""
+    UploadSession = apps.get_model("media", "UploadSession")
+    UploadPart = apps.get_model("media", "UploadPart")
+
+    parts = []
+    for session in UploadSession.objects.exclude(parts_completed=[]).iterator():
+        parts.extend(
+            UploadPart(
+                session_id=session.id,
+                part_number=part["part_number"],
+                etag=part["etag"],
+                size=part["size"],
+            )
+            for part in session.parts_completed or []
+        )
+    UploadPart.objects.bulk_create(parts, batch_size=1000, ignore_conflicts=True)
+
+
+def copy_rows_to_parts(apps, schema_editor):
+    """Rebuild parts_completed from UploadPart rows on rollback."""
+    UploadSession = apps.get_model("media", "UploadSession")
+    UploadPart = apps.get_model("media", "UploadPart")
+
+    parts_by_session = {}
+    for part in UploadPart.objects.order_by("session_id", "part_number").iterator():
+        parts_by_session.setdefault(part.session_id, []).append(
+            {"part_number": part.part_number, "etag": part.etag, "size": part.size}
+        )
+    for session_id, parts in parts_by_session.items():
+        UploadSession.objects.filter(id=session_id).update(parts_completed=parts)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("media", "0012_alter_mediafile_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadPart",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="Timestamp when this record was created",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when this record was last modified",
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text="Unique identifier for this record",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "part_number",
+                    models.PositiveIntegerField(help_text="Part number (1-indexed)"),
+                ),
+                (
+                    "etag",
+                    models.CharField(
+                        help_text="ETag of the stored part", max_length=200
+                    ),
+                ),
+                (
+                    "size",
+                    models.BigIntegerField(help_text="Size of the part in bytes"),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        help_text="Upload session this part belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="parts",
+                        to="media.uploadsession",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["part_number"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("session", "part_number"),
+                        name="upload_part_session_part_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(copy_parts_to_rows, copy_rows_to_parts),
+        migrations.RemoveField(
+            model_name="uploadsession",
+            name="parts_completed",
+        ),
+    ]
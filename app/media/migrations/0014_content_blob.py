@@ -0,0 +1,105 @@
+"""
+Add content hashing and content-addressed blob storage for deduplication.
+
+This migration:
+1. Creates ContentBlob (one reference-counted stored object per SHA-256)
+2. Adds MediaFile.content_hash (indexed) and MediaFile.blob
+
+Existing files keep content_hash unset and are not deduplicated.
+"""
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("media", "0013_upload_part"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentBlob",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="Timestamp when this record was created",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when this record was last modified",
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text="Unique identifier for this record",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="Hex SHA-256 of the file content",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        help_text="Stored object shared by all referencing media files",
+                        upload_to="",
+                    ),
+                ),
+                (
+                    "file_size",
+                    models.BigIntegerField(help_text="Size of the content in bytes"),
+                ),
+                (
+                    "reference_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of media files referencing the stored object",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Content Blob",
+                "verbose_name_plural": "Content Blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="mediafile",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Hex SHA-256 of the file content",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="mediafile",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Content-addressed stored object this file shares",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="media_files",
+                to="media.contentblob",
+            ),
+        ),
+    ]
@@ -3,25 +3,31 @@ Media models package.
 
 Exports:
     MediaFile: Primary model for user-uploaded media files
+    ContentBlob: Content-addressed storage shared by identical uploads
     MediaAsset: Generated assets (thumbnails, previews, etc.)
     MediaFileShare: Explicit sharing grants between users
     UploadSession: Tracks chunked/resumable uploads
+    UploadPart: Completed parts of an upload session
     Tag: Tags for categorizing media files
     MediaFileTag: Through table for file-tag relationships
 """
 
+from media.models.content_blob import ContentBlob
 from media.models.media_asset import MediaAsset
 from media.models.media_file import MediaFile
 from media.models.media_file_share import MediaFileShare
 from media.models.media_file_tag import MediaFileTag
 from media.models.tag import Tag
+from media.models.upload_part import UploadPart
 from media.models.upload_session import UploadSession
 
 __all__ = [
+    "ContentBlob",
     "MediaAsset",
     "MediaFile",
     "MediaFileShare",
     "MediaFileTag",
     "Tag",
+    "UploadPart",
     "UploadSession",
 ]
@@ -0,0 +1,97 @@
+"""
+ContentBlob model for content-addressed, reference-counted file storage.
+
+Provides:
+- One stored object per distinct file content (keyed by SHA-256)
+- Reference counting so shared storage is freed with its last MediaFile
+- Lookup of a clean, processed MediaFile whose outputs can be reused
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+
+from core.model_mixins import UUIDPrimaryKeyMixin
+from core.models import BaseModel
+
+if TYPE_CHECKING:
+    from media.models import MediaFile
+
+
+class ContentBlob(UUIDPrimaryKeyMixin, BaseModel):
+    """
+    A stored file shared by every MediaFile with the same content.
+
+    A blob is registered once a MediaFile with a content hash has been
+    scanned clean and processed without errors. Later uploads with the same
+    hash point their file field at the blob's stored object instead of
+    writing another copy, and reuse the scan result and generated assets.
+
+    Attributes:
+        content_hash: Hex SHA-256 of the file content
+        file: The stored object (the file of the MediaFile that registered it)
+        file_size: Size of the content in bytes
+        reference_count: Number of MediaFiles pointing at the stored object
+
+    Usage:
+        # Register and reuse through media.services.deduplication
+        register_content_blob(media_file)
+        duplicate = create_duplicate_upload(content_hash, uploader, ...)
+
+        # Free shared storage on hard delete
+        if release_content_blob(media_file):
+            default_storage.delete(media_file.file.name)
+    """
+
+    content_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="Hex SHA-256 of the file content",
+    )
+
+    file = models.FileField(
+        help_text="Stored object shared by all referencing media files",
+    )
+
+    file_size = models.BigIntegerField(
+        help_text="Size of the content in bytes",
+    )
+
+    reference_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of media files referencing the stored object",
+    )
+
+    class Meta:
+        """Model metadata."""
+
+        verbose_name = "Content Blob"
+        verbose_name_plural = "Content Blobs"
+
+    def __str__(self) -> str:
+        return f"ContentBlob({self.content_hash[:12]}, refs={self.reference_count})"
+
+    def get_reusable_source(self) -> "MediaFile | None":
+        """
+        Get a referencing MediaFile whose scan and processing can be reused.
+
+        Soft-deleted files qualify: their stored objects and assets remain
+        until hard delete releases them.
+
+        Returns:
+            A clean MediaFile processed without errors, or None
+        """
+        from media.models import MediaFile
+
+        return (
+            MediaFile.all_objects.filter(
+                blob=self,
+                scan_status=MediaFile.ScanStatus.CLEAN,
+                processing_status=MediaFile.ProcessingStatus.READY,
+                processing_error__isnull=True,
+            )
+            .order_by("created_at")
+            .first()
+        )
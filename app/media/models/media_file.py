@@ -7,6 +7,7 @@ Provides:
 - Soft delete support
 - Version tracking with self-referential version groups
 - Processing and scan status tracking
+- Content hashing for upload deduplication (see ContentBlob)
 """
 
 from __future__ import annotations
@@ -55,6 +56,8 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
         file_size: Size of the file in bytes.
         uploader: User who uploaded the file.
         visibility: Access level (private, shared, internal).
+        content_hash: Hex SHA-256 of the content (None if not hashed).
+        blob: Shared stored object when the content is deduplicated.
 
     Processing Fields (columns only, logic deferred):
         processing_status: Current processing state.
@@ -164,6 +167,25 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
         help_text="Access level for this file",
     )
 
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text="Hex SHA-256 of the file content",
+    )
+
+    # Identical uploads share one stored object; storage is freed when the
+    # blob's last reference is hard deleted (see media.services.deduplication)
+    blob = models.ForeignKey(
+        "media.ContentBlob",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="media_files",
+        help_text="Content-addressed stored object this file shares",
+    )
+
     # =========================================================================
     # Processing Fields (columns only, logic deferred)
     # =========================================================================
@@ -379,6 +401,7 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
         mime_type: str,
         visibility: str = "private",
         metadata: dict[str, Any] | None = None,
+        content_hash: str | None = None,
     ) -> "MediaFile":
         """
         Factory method to create a MediaFile from an uploaded file.
@@ -399,6 +422,7 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
             mime_type: Detected MIME type.
             visibility: Access level (default: private).
             metadata: Optional metadata dict.
+            content_hash: Hex SHA-256 of the file, if computed by the caller.
 
         Returns:
             Created and saved MediaFile instance with version=1,
@@ -412,6 +436,7 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
             file_size=file.size,
             uploader=uploader,
             visibility=visibility,
+            content_hash=content_hash,
             version=1,
             is_current=True,
         )
@@ -454,6 +479,8 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
         """
         from django.core.exceptions import ValidationError
 
+        from media.services.deduplication import compute_content_hash
+
         # Ownership check - only the original uploader can create versions
         if self.uploader_id != requesting_user.id:
             raise PermissionError(
@@ -498,6 +525,7 @@ class MediaFile(UUIDPrimaryKeyMixin, SoftDeleteMixin, MetadataMixin, BaseModel):
                 mime_type=self.mime_type,  # Preserve MIME type
                 file_size=new_file.size,
                 visibility=self.visibility,  # Preserve visibility
+                content_hash=compute_content_hash(new_file),
             )
             new_version.save()
 
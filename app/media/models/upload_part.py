@@ -0,0 +1,63 @@
+"""
+UploadPart model for per-part tracking of chunked uploads.
+
+Provides:
+- One row per uploaded part (upserted atomically, see UploadSession.record_part)
+- Safe parallel part uploads without rewriting a shared JSON list
+"""
+
+from __future__ import annotations
+
+from django.db import models
+
+from core.model_mixins import UUIDPrimaryKeyMixin
+from core.models import BaseModel
+
+
+class UploadPart(UUIDPrimaryKeyMixin, BaseModel):
+    """
+    A completed part of a chunked upload session.
+
+    Attributes:
+        session: Upload session this part belongs to
+        part_number: Part number (1-indexed)
+        etag: ETag of the stored part (MD5 for local, S3 ETag for S3)
+        size: Size of the part in bytes
+
+    Usage:
+        # Record parts through the session (handles bytes_received)
+        session.record_part(part_number=1, etag=etag, size=size)
+
+        # Parts in order (e.g. for S3 CompleteMultipartUpload)
+        session.parts.order_by("part_number")
+    """
+
+    session = models.ForeignKey(
+        "media.UploadSession",
+        on_delete=models.CASCADE,
+        related_name="parts",
+        help_text="Upload session this part belongs to",
+    )
+    part_number = models.PositiveIntegerField(
+        help_text="Part number (1-indexed)",
+    )
+    etag = models.CharField(
+        max_length=200,
+        help_text="ETag of the stored part",
+    )
+    size = models.BigIntegerField(
+        help_text="Size of the part in bytes",
+    )
+
+    class Meta:
+        ordering = ["part_number"]
+        constraints = [
+            # Each part is recorded once per session (re-uploads update it)
+            models.UniqueConstraint(
+                fields=["session", "part_number"],
+                name="upload_part_session_part_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"UploadPart({self.session_id}, {self.part_number})"
@@ -2,7 +2,7 @@
 UploadSession model for tracking chunked/resumable uploads.
 
 Provides:
-- Progress tracking for multi-part uploads
+- Progress tracking for multi-part uploads (parts are UploadPart rows)
 - Support for both local filesystem and S3 backends
 - Session expiration and cleanup support
 """
@@ -12,10 +12,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 
 from core.model_mixins import UUIDPrimaryKeyMixin
 from core.models import BaseModel
+from media.models.upload_part import UploadPart
 
 if TYPE_CHECKING:
     pass
@@ -36,7 +39,7 @@ class UploadSession(UUIDPrimaryKeyMixin, BaseModel):
         media_type: Category (image, video, document, audio, other)
         backend: Storage backend type ('local' or 's3')
         bytes_received: Total bytes received so far
-        parts_completed: List of completed parts with metadata
+        parts: Completed parts (UploadPart rows)
         chunk_size: Size of each chunk in bytes
         status: Current session state
         expires_at: When this session expires
@@ -147,11 +150,6 @@ class UploadSession(UUIDPrimaryKeyMixin, BaseModel):
         default=0,
         help_text="Total bytes received so far",
     )
-    parts_completed = models.JSONField(
-        default=list,
-        blank=True,
-        help_text="List of completed parts: [{'part_number': 1, 'etag': '...', 'size': ...}]",
-    )
     chunk_size = models.PositiveIntegerField(
         default=5 * 1024 * 1024,  # 5MB default (S3 minimum)
         help_text="Size of each chunk in bytes",
@@ -206,10 +204,32 @@ class UploadSession(UUIDPrimaryKeyMixin, BaseModel):
             return 0
         return (self.file_size + self.chunk_size - 1) // self.chunk_size
 
+    def expected_part_size(self, part_number: int) -> int:
+        """
+        Size in bytes a part must have.
+
+        Every part is chunk_size bytes except the last, which holds the
+        remainder of file_size.
+
+        Args:
+            part_number: Part number (1-indexed)
+
+        Returns:
+            Expected size of the part in bytes
+        """
+        if part_number == self.total_parts:
+            return self.file_size - self.chunk_size * (part_number - 1)
+        return self.chunk_size
+
+    @property
+    def parts_completed(self) -> list[dict]:
+        """Completed parts as [{'part_number', 'etag', 'size'}], in order."""
+        return list(self.parts.values("part_number", "etag", "size"))
+
     @property
     def parts_completed_count(self) -> int:
         """Number of parts that have been completed."""
-        return len(self.parts_completed) if self.parts_completed else 0
+        return self.parts.count()
 
     @property
     def progress_percent(self) -> float:
@@ -236,8 +256,6 @@ class UploadSession(UUIDPrimaryKeyMixin, BaseModel):
     @property
     def is_expired(self) -> bool:
         """Check if this session has expired."""
-        from django.utils import timezone
-
         return self.expires_at <= timezone.now()
 
     # =========================================================================
@@ -246,9 +264,7 @@ class UploadSession(UUIDPrimaryKeyMixin, BaseModel):
 
     def get_completed_part_numbers(self) -> set[int]:
         """Get set of completed part numbers."""
-        if not self.parts_completed:
-            return set()
-        return {p["part_number"] for p in self.parts_completed}
+        return set(self.parts.values_list("part_number", flat=True))
 
     def get_missing_part_numbers(self) -> list[int]:
         """Get list of part numbers that haven't been uploaded yet."""
@@ -258,49 +274,46 @@ class UploadSession(UUIDPrimaryKeyMixin, BaseModel):
 
     def is_part_completed(self, part_number: int) -> bool:
         """Check if a specific part has been completed."""
-        return part_number in self.get_completed_part_numbers()
+        return self.parts.filter(part_number=part_number).exists()
 
-    def add_completed_part(
+    def record_part(
         self,
         part_number: int,
         etag: str,
         size: int,
     ) -> None:
         """
-        Add a completed part to the tracking list.
+        Record a completed part and update bytes_received atomically.
 
-        Note: This method modifies the instance but does NOT save.
-        Caller should save after calling this method.
+        Upserts the UploadPart row (locking it if it exists, so concurrent
+        re-uploads of one part are applied one after another) and adds the
+        size difference to bytes_received with a single UPDATE. Parallel
+        uploads of different parts never overwrite each other. Saves to the
+        database; self.bytes_received is refreshed.
 
         Args:
             part_number: The part number (1-indexed)
             etag: ETag returned by storage (for S3 completion)
             size: Size of this part in bytes
         """
-        # Ensure parts_completed is a list
-        if self.parts_completed is None:
-            self.parts_completed = []
-
-        # Check if part already exists (idempotency)
-        existing = next(
-            (p for p in self.parts_completed if p["part_number"] == part_number),
-            None,
-        )
-        if existing:
-            # Already recorded - update if different (shouldn't happen normally)
-            existing["etag"] = etag
-            existing["size"] = size
-        else:
-            # Add new part
-            self.parts_completed.append(
-                {
-                    "part_number": part_number,
-                    "etag": etag,
-                    "size": size,
-                }
+        with transaction.atomic():
+            part, created = UploadPart.objects.select_for_update().get_or_create(
+                session=self,
+                part_number=part_number,
+                defaults={"etag": etag, "size": size},
             )
-            # Keep sorted by part number for consistency
-            self.parts_completed.sort(key=lambda p: p["part_number"])
-
-        # Update bytes received
-        self.bytes_received = sum(p["size"] for p in self.parts_completed)
+            delta = size
+            if not created:
+                delta = size - part.size
+                part.etag = etag
+                part.size = size
+                part.save(update_fields=["etag", "size", "updated_at"])
+
+            sessions = UploadSession.objects.filter(pk=self.pk)
+            sessions.update(
+                bytes_received=F("bytes_received") + delta,
+                updated_at=timezone.now(),
+            )
+            self.bytes_received = sessions.values_list(
+                "bytes_received", flat=True
+            ).get()
@@ -2,7 +2,7 @@
 Media processors package.
 
 Provides processing functions for different media types:
-- Image processing (thumbnails, preview, web optimization)
+- Image processing (thumbnails, preview, web optimization from one decode)
 - Video processing (poster frames, metadata extraction)
 - Document processing (PDF thumbnails, text extraction)
 
@@ -12,6 +12,10 @@ Each processor is responsible for:
 3. Creating MediaAsset records
 4. Handling errors appropriately
 
+CPU-bound steps (image decode/encode, PDF rendering, text extraction) run in
+a per-worker process pool (media.processors.pool) so independent jobs use
+separate cores and their memory is released with recycled children.
+
 Exception Hierarchy:
     ProcessingError (base)
     ├── PermanentProcessingError (don't retry)
@@ -46,8 +50,12 @@ from media.processors.base import (
     TransientProcessingError,
 )
 from media.processors.image import (
+    IMAGE_DERIVATIVES,
+    ImageDerivatives,
+    ImageDerivativeSpec,
     ImageProcessingError,
     extract_image_metadata,
+    generate_image_derivatives,
     generate_image_preview,
     generate_image_thumbnail,
     generate_image_web_optimized,
@@ -58,10 +66,12 @@ from media.processors.video import (
     extract_video_poster,
 )
 from media.processors.document import (
+    DocumentDerivatives,
     DocumentProcessingError,
     convert_to_pdf,
     extract_document_metadata,
     extract_document_text,
+    generate_document_derivatives,
     generate_document_thumbnail,
 )
 
@@ -75,6 +85,10 @@ __all__ = [
     "PROCESSING_TIMEOUT",
     # Image processing
     "ImageProcessingError",
+    "ImageDerivativeSpec",
+    "ImageDerivatives",
+    "IMAGE_DERIVATIVES",
+    "generate_image_derivatives",
     "generate_image_thumbnail",
     "generate_image_preview",
     "generate_image_web_optimized",
@@ -85,8 +99,10 @@ __all__ = [
     "extract_video_poster",
     # Document processing
     "DocumentProcessingError",
+    "DocumentDerivatives",
     "convert_to_pdf",
     "extract_document_metadata",
     "extract_document_text",
+    "generate_document_derivatives",
     "generate_document_thumbnail",
 ]
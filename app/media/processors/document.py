@@ -15,8 +15,13 @@ Uses:
 Functions:
     extract_document_metadata: Extract page count, author, title
     convert_to_pdf: Convert Office documents to PDF
+    generate_document_derivatives: Thumbnail and text in parallel (one conversion)
     generate_document_thumbnail: Create thumbnail of first page
     extract_document_text: Extract searchable text content
+
+Page rendering and text extraction (render_pdf_thumbnail, extract_pdf_text)
+work on a PDF path only, so they can run in the processing pool
+(media.processors.pool).
 """
 
 from __future__ import annotations
@@ -25,13 +30,16 @@ import logging
 import re
 import subprocess
 import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterator
 
 from django.core.files.base import ContentFile
 from PIL import Image
 
+from media.processors import pool
 from media.processors.base import (
     DOCUMENT_CONVERSION_TIMEOUT,
     DOCUMENT_THUMBNAIL_DPI,
@@ -463,10 +471,116 @@ def convert_to_pdf(media_file: "MediaFile") -> Path:
 
 
 # =============================================================================
-# Thumbnail Generation
+# Derivative Generation
 # =============================================================================
 
 
+@dataclass
+class DocumentDerivatives:
+    """
+    Result of generate_document_derivatives.
+
+    Attributes:
+        assets: Generated MediaAssets keyed by asset name ("thumbnail", "text").
+        errors: Error messages of failed derivatives keyed by asset name.
+    """
+
+    assets: dict[str, "MediaAsset"] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _RenderedPage:
+    """Encoded WebP bytes of a rendered page, ready to be stored."""
+
+    width: int
+    height: int
+    content: bytes
+
+
+@contextmanager
+def _document_pdf(media_file: "MediaFile") -> Iterator[Path]:
+    """
+    Get a PDF of the document, converting Office documents once.
+
+    Args:
+        media_file: MediaFile instance with media_type='document'.
+
+    Yields:
+        Path to the PDF (the original file for PDFs, a temp file otherwise).
+
+    Raises:
+        DocumentProcessingError: If conversion fails (permanent failure).
+        TransientProcessingError: For timeout errors that should be retried.
+    """
+    if media_file.mime_type == PDF_MIME_TYPE:
+        yield Path(media_file.file.path)
+        return
+
+    pdf_path = convert_to_pdf(media_file)
+    try:
+        yield pdf_path
+    finally:
+        # Cleanup the temporary PDF and its directory
+        try:
+            pdf_path.unlink(missing_ok=True)
+            if pdf_path.parent.exists():
+                pdf_path.parent.rmdir()
+        except OSError:
+            pass
+
+
+def generate_document_derivatives(media_file: "MediaFile") -> DocumentDerivatives:
+    """
+    Generate the thumbnail and extracted text of a document in parallel.
+
+    Office documents are converted to PDF once. The page render and the
+    text extraction are then submitted to the processing pool together, so
+    they run on separate cores. A failed derivative is recorded in the
+    result's errors; the other is still stored.
+
+    Args:
+        media_file: MediaFile instance with media_type='document'.
+
+    Returns:
+        DocumentDerivatives with generated assets and per-asset errors.
+
+    Raises:
+        DocumentProcessingError: If PDF conversion fails (permanent failure).
+        TransientProcessingError: For conversion timeouts that should be retried.
+    """
+    media_file_id = str(media_file.pk)
+    logger.info(
+        "Generating document derivatives",
+        extra={"media_file_id": media_file_id},
+    )
+
+    result = DocumentDerivatives()
+    with _document_pdf(media_file) as pdf_path:
+        deadline = pool.get_deadline()
+        jobs = {
+            "thumbnail": (
+                pool.submit(render_pdf_thumbnail, media_file_id, str(pdf_path)),
+                _store_document_thumbnail,
+            ),
+            "text": (
+                pool.submit(extract_pdf_text, media_file_id, str(pdf_path)),
+                _store_document_text,
+            ),
+        }
+        for name, (job, store) in jobs.items():
+            try:
+                result.assets[name] = store(media_file, pool.wait(job, deadline))
+            except Exception as e:
+                result.errors[name] = str(e)
+                logger.warning(
+                    f"Failed to generate document {name}",
+                    extra={"media_file_id": media_file_id, "error": str(e)},
+                )
+
+    return result
+
+
 def generate_document_thumbnail(media_file: "MediaFile") -> "MediaAsset":
     """
     Generate a thumbnail of the first page of a document.
@@ -484,8 +598,31 @@ def generate_document_thumbnail(media_file: "MediaFile") -> "MediaAsset":
         DocumentProcessingError: If document cannot be processed (permanent failure).
         TransientProcessingError: For timeout errors that should be retried.
     """
-    from media.models import MediaAsset
+    logger.info(
+        "Generating thumbnail for document",
+        extra={"media_file_id": str(media_file.pk)},
+    )
+
+    with _document_pdf(media_file) as pdf_path:
+        rendered = render_pdf_thumbnail(str(media_file.pk), str(pdf_path))
+    return _store_document_thumbnail(media_file, rendered)
+
+
+def render_pdf_thumbnail(media_file_id: str, pdf_path: str) -> _RenderedPage:
+    """
+    Render the first page of a PDF as a WebP thumbnail (processing pool job).
 
+    Args:
+        media_file_id: ID of the MediaFile (for logging).
+        pdf_path: Path to the PDF.
+
+    Returns:
+        The encoded thumbnail.
+
+    Raises:
+        DocumentProcessingError: If the page cannot be rendered (permanent failure).
+        TransientProcessingError: If pdf2image is not installed.
+    """
     try:
         from pdf2image import convert_from_path
     except ImportError:
@@ -494,100 +631,95 @@ def generate_document_thumbnail(media_file: "MediaFile") -> "MediaAsset":
             "pdf2image not installed - required for document thumbnails"
         )
 
-    logger.info(
-        "Generating thumbnail for document",
-        extra={"media_file_id": str(media_file.pk)},
+    # Convert first page to image
+    try:
+        images = convert_from_path(
+            pdf_path,
+            first_page=1,
+            last_page=1,
+            dpi=DOCUMENT_THUMBNAIL_DPI,
+        )
+    except Exception as e:
+        error_str = str(e).lower()
+        if "encrypted" in error_str or "password" in error_str:
+            raise DocumentProcessingError(
+                "Cannot generate thumbnail for encrypted PDF"
+            ) from e
+        if "invalid" in error_str or "corrupt" in error_str:
+            raise DocumentProcessingError(f"PDF is corrupted or invalid: {e}") from e
+        raise DocumentProcessingError(f"Failed to render PDF page: {e}") from e
+
+    if not images:
+        raise DocumentProcessingError("PDF has no pages to render")
+
+    # Get first page image
+    page_img = images[0]
+
+    # Create thumbnail (maintains aspect ratio)
+    page_img.thumbnail(DOCUMENT_THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+
+    # Convert to RGB if necessary
+    if page_img.mode not in ("RGB", "RGBA"):
+        page_img = page_img.convert("RGB")
+
+    # Save as WebP
+    buffer = BytesIO()
+    page_img.save(buffer, format="WEBP", quality=WEBP_QUALITY)
+
+    logger.debug(
+        "Rendered document thumbnail",
+        extra={"media_file_id": media_file_id, "size": page_img.size},
+    )
+    return _RenderedPage(
+        width=page_img.size[0],
+        height=page_img.size[1],
+        content=buffer.getvalue(),
     )
 
-    pdf_path = None
-    cleanup_pdf = False
 
-    try:
-        # Get PDF path (convert if necessary)
-        if media_file.mime_type == PDF_MIME_TYPE:
-            pdf_path = Path(media_file.file.path)
-        else:
-            pdf_path = convert_to_pdf(media_file)
-            cleanup_pdf = True
-
-        # Convert first page to image
-        try:
-            images = convert_from_path(
-                pdf_path,
-                first_page=1,
-                last_page=1,
-                dpi=DOCUMENT_THUMBNAIL_DPI,
-            )
-        except Exception as e:
-            error_str = str(e).lower()
-            if "encrypted" in error_str or "password" in error_str:
-                raise DocumentProcessingError(
-                    "Cannot generate thumbnail for encrypted PDF"
-                ) from e
-            if "invalid" in error_str or "corrupt" in error_str:
-                raise DocumentProcessingError(
-                    f"PDF is corrupted or invalid: {e}"
-                ) from e
-            raise DocumentProcessingError(f"Failed to render PDF page: {e}") from e
-
-        if not images:
-            raise DocumentProcessingError("PDF has no pages to render")
-
-        # Get first page image
-        page_img = images[0]
-
-        # Create thumbnail (maintains aspect ratio)
-        page_img.thumbnail(DOCUMENT_THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-
-        # Convert to RGB if necessary
-        if page_img.mode not in ("RGB", "RGBA"):
-            page_img = page_img.convert("RGB")
-
-        # Save as WebP
-        buffer = BytesIO()
-        page_img.save(buffer, format="WEBP", quality=WEBP_QUALITY)
-        buffer.seek(0)
-
-        width, height = page_img.size
-        file_size = buffer.getbuffer().nbytes
-
-        # Create or update the thumbnail asset
-        asset, created = MediaAsset.objects.update_or_create(
-            media_file=media_file,
-            asset_type=MediaAsset.AssetType.THUMBNAIL,
-            defaults={
-                "width": width,
-                "height": height,
-                "file_size": file_size,
-            },
-        )
+def _store_document_thumbnail(
+    media_file: "MediaFile", rendered: _RenderedPage
+) -> "MediaAsset":
+    """
+    Store a rendered thumbnail as the document's THUMBNAIL asset.
 
-        filename = f"thumb_{media_file.pk}.webp"
-        asset.file.save(filename, ContentFile(buffer.read()), save=True)
+    Args:
+        media_file: Parent MediaFile.
+        rendered: Output of render_pdf_thumbnail.
 
-        logger.info(
-            "Generated document thumbnail successfully",
-            extra={
-                "media_file_id": str(media_file.pk),
-                "asset_id": str(asset.pk),
-                "size": f"{width}x{height}",
-                "file_size": file_size,
-                "is_new": created,
-            },
-        )
+    Returns:
+        The created or updated MediaAsset.
+    """
+    from media.models import MediaAsset
 
-        return asset
+    file_size = len(rendered.content)
 
-    finally:
-        # Cleanup temporary PDF if we created one
-        if cleanup_pdf and pdf_path and pdf_path.exists():
-            try:
-                pdf_path.unlink()
-                # Also remove the temp directory
-                if pdf_path.parent.exists():
-                    pdf_path.parent.rmdir()
-            except OSError:
-                pass
+    # Create or update the thumbnail asset
+    asset, created = MediaAsset.objects.update_or_create(
+        media_file=media_file,
+        asset_type=MediaAsset.AssetType.THUMBNAIL,
+        defaults={
+            "width": rendered.width,
+            "height": rendered.height,
+            "file_size": file_size,
+        },
+    )
+
+    filename = f"thumb_{media_file.pk}.webp"
+    asset.file.save(filename, ContentFile(rendered.content), save=True)
+
+    logger.info(
+        "Generated document thumbnail successfully",
+        extra={
+            "media_file_id": str(media_file.pk),
+            "asset_id": str(asset.pk),
+            "size": f"{rendered.width}x{rendered.height}",
+            "file_size": file_size,
+            "is_new": created,
+        },
+    )
+
+    return asset
 
 
 # =============================================================================
@@ -618,8 +750,31 @@ def extract_document_text(media_file: "MediaFile") -> "MediaAsset":
         DocumentProcessingError: If document cannot be processed (permanent failure).
         TransientProcessingError: For timeout errors that should be retried.
     """
-    from media.models import MediaAsset
+    logger.info(
+        "Extracting text from document",
+        extra={"media_file_id": str(media_file.pk)},
+    )
+
+    with _document_pdf(media_file) as pdf_path:
+        text = extract_pdf_text(str(media_file.pk), str(pdf_path))
+    return _store_document_text(media_file, text)
+
+
+def extract_pdf_text(media_file_id: str, pdf_path: str) -> str:
+    """
+    Extract and clean the text of a PDF (processing pool job).
+
+    Args:
+        media_file_id: ID of the MediaFile (for logging).
+        pdf_path: Path to the PDF.
 
+    Returns:
+        Cleaned text (may be empty for scanned documents).
+
+    Raises:
+        DocumentProcessingError: If the PDF cannot be read (permanent failure).
+        TransientProcessingError: If pdfplumber is not installed.
+    """
     try:
         import pdfplumber
     except ImportError:
@@ -628,106 +783,95 @@ def extract_document_text(media_file: "MediaFile") -> "MediaAsset":
             "pdfplumber not installed - required for text extraction"
         )
 
-    logger.info(
-        "Extracting text from document",
-        extra={"media_file_id": str(media_file.pk)},
-    )
-
-    pdf_path = None
-    cleanup_pdf = False
+    extracted_text = []
 
     try:
-        # Get PDF path (convert if necessary)
-        if media_file.mime_type == PDF_MIME_TYPE:
-            pdf_path = Path(media_file.file.path)
-        else:
-            pdf_path = convert_to_pdf(media_file)
-            cleanup_pdf = True
-
-        # Extract text from PDF
-        extracted_text = []
+        with pdfplumber.open(pdf_path) as pdf:
+            # Limit pages for very large documents
+            pages_to_extract = min(len(pdf.pages), MAX_TEXT_EXTRACTION_PAGES)
 
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Limit pages for very large documents
-                pages_to_extract = min(len(pdf.pages), MAX_TEXT_EXTRACTION_PAGES)
-
-                for i in range(pages_to_extract):
-                    page_text = pdf.pages[i].extract_text()
-                    if page_text:
-                        extracted_text.append(page_text)
+            for i in range(pages_to_extract):
+                page_text = pdf.pages[i].extract_text()
+                if page_text:
+                    extracted_text.append(page_text)
 
-        except Exception as e:
-            error_str = str(e).lower()
-            if "encrypted" in error_str or "password" in error_str:
-                raise DocumentProcessingError(
-                    "Cannot extract text from encrypted PDF"
-                ) from e
+    except Exception as e:
+        error_str = str(e).lower()
+        if "encrypted" in error_str or "password" in error_str:
             raise DocumentProcessingError(
-                f"Failed to extract text from PDF: {e}"
+                "Cannot extract text from encrypted PDF"
             ) from e
+        raise DocumentProcessingError(f"Failed to extract text from PDF: {e}") from e
 
-        # Combine all extracted text
-        full_text = "\n\n".join(extracted_text)
+    logger.debug(
+        "Extracted PDF text",
+        extra={"media_file_id": media_file_id, "pages": len(extracted_text)},
+    )
 
-        # Clean up the text
-        full_text = _clean_extracted_text(full_text)
+    # Combine all extracted text and clean it up
+    return _clean_extracted_text("\n\n".join(extracted_text))
 
-        if not full_text or len(full_text.strip()) < 10:
-            # No meaningful text extracted - likely a scanned document
-            logger.info(
-                "No text extracted - document may be scanned/image-based",
-                extra={"media_file_id": str(media_file.pk)},
-            )
-            # Update metadata to indicate scanned document
-            if media_file.metadata:
-                media_file.metadata["is_scanned"] = True
-                media_file.metadata["is_searchable"] = False
-                media_file.save(update_fields=["metadata"])
 
-            raise DocumentProcessingError(
-                "No text could be extracted - document may be scanned/image-based"
-            )
+def _store_document_text(media_file: "MediaFile", full_text: str) -> "MediaAsset":
+    """
+    Store extracted text as the document's EXTRACTED_TEXT asset.
 
-        # Save as text file
-        text_bytes = full_text.encode("utf-8")
-        buffer = BytesIO(text_bytes)
-        file_size = len(text_bytes)
-
-        # Create or update the extracted text asset
-        asset, created = MediaAsset.objects.update_or_create(
-            media_file=media_file,
-            asset_type=MediaAsset.AssetType.EXTRACTED_TEXT,
-            defaults={
-                "file_size": file_size,
-            },
-        )
+    Args:
+        media_file: Parent MediaFile.
+        full_text: Output of extract_pdf_text.
 
-        filename = f"text_{media_file.pk}.txt"
-        asset.file.save(filename, ContentFile(buffer.read()), save=True)
+    Returns:
+        The created or updated MediaAsset.
+
+    Raises:
+        DocumentProcessingError: If no meaningful text was extracted.
+    """
+    from media.models import MediaAsset
 
+    if not full_text or len(full_text.strip()) < 10:
+        # No meaningful text extracted - likely a scanned document
         logger.info(
-            "Extracted document text successfully",
-            extra={
-                "media_file_id": str(media_file.pk),
-                "asset_id": str(asset.pk),
-                "text_length": len(full_text),
-                "file_size": file_size,
-                "is_new": created,
-            },
+            "No text extracted - document may be scanned/image-based",
+            extra={"media_file_id": str(media_file.pk)},
         )
+        # Update metadata to indicate scanned document
+        if media_file.metadata:
+            media_file.metadata["is_scanned"] = True
+            media_file.metadata["is_searchable"] = False
+            media_file.save(update_fields=["metadata"])
 
-        return asset
+        raise DocumentProcessingError(
+            "No text could be extracted - document may be scanned/image-based"
+        )
 
-    finally:
-        # Cleanup temporary PDF if we created one
-        if cleanup_pdf and pdf_path and pdf_path.exists():
-            try:
-                pdf_path.unlink()
-                if pdf_path.parent.exists():
-                    pdf_path.parent.rmdir()
-            except OSError:
-                pass
+    # Save as text file
+    text_bytes = full_text.encode("utf-8")
+    file_size = len(text_bytes)
+
+    # Create or update the extracted text asset
+    asset, created = MediaAsset.objects.update_or_create(
+        media_file=media_file,
+        asset_type=MediaAsset.AssetType.EXTRACTED_TEXT,
+        defaults={
+            "file_size": file_size,
+        },
+    )
+
+    filename = f"text_{media_file.pk}.txt"
+    asset.file.save(filename, ContentFile(text_bytes), save=True)
+
+    logger.info(
+        "Extracted document text successfully",
+        extra={
+            "media_file_id": str(media_file.pk),
+            "asset_id": str(asset.pk),
+            "text_length": len(full_text),
+            "file_size": file_size,
+            "is_new": created,
+        },
+    )
+
+    return asset
 
 
 def _clean_extracted_text(text: str) -> str:
@@ -9,7 +9,21 @@ Uses Pillow for image manipulation with proper error handling for:
 
 All generated images are saved as WebP for optimal web delivery.
 
+The processing task uses generate_image_derivatives, which decodes the source
+once and produces every derivative from it:
+- JPEG sources are decoded with DCT scaling (Image.draft) straight to the
+  smallest 1/2, 1/4 or 1/8 scale that still covers the largest derivative
+- Derivatives are produced largest first, each downscaled from the previous
+  one (web-optimized -> preview -> thumbnail)
+- Metadata is read from the same opened image
+- All MediaAsset rows are written in one batch
+- Decoding and encoding run as one job in the processing pool
+  (media.processors.pool), which opens the source by local path; storage and
+  database writes stay in the caller
+
 Functions:
+    generate_image_derivatives: Create all derivatives and metadata in one pass
+    render_image_derivatives: CPU part of the above (processing pool job)
     generate_image_thumbnail: Create 200x200 thumbnail
     generate_image_preview: Create 800x800 preview
     generate_image_web_optimized: Create compressed web version
@@ -19,13 +33,20 @@ Functions:
 from __future__ import annotations
 
 import logging
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from io import BytesIO
-from typing import TYPE_CHECKING, Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
 from PIL import Image
 from PIL.ExifTags import TAGS
 
+from media.processors import pool
 from media.processors.base import PermanentProcessingError
 
 if TYPE_CHECKING:
@@ -92,11 +113,188 @@ class ImageProcessingError(PermanentProcessingError):
     pass
 
 
+# =============================================================================
+# Derivative Specs
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class ImageDerivativeSpec:
+    """
+    Description of one generated image derivative.
+
+    Attributes:
+        asset_type: MediaAsset.AssetType value of the derivative.
+        max_size: Bounding box the derivative is scaled into (no upscaling).
+        quality: WebP quality (0-100).
+        filename_prefix: Prefix of the generated filename.
+    """
+
+    asset_type: str
+    max_size: tuple[int, int]
+    quality: int
+    filename_prefix: str
+
+
+THUMBNAIL_SPEC = ImageDerivativeSpec("thumbnail", THUMBNAIL_SIZE, WEBP_QUALITY, "thumb")
+PREVIEW_SPEC = ImageDerivativeSpec(
+    "preview", PREVIEW_SIZE, WEBP_QUALITY_PREVIEW, "preview"
+)
+WEB_OPTIMIZED_SPEC = ImageDerivativeSpec(
+    "web_optimized", WEB_OPTIMIZED_MAX_SIZE, WEBP_QUALITY_WEB_OPTIMIZED, "web"
+)
+
+# Derivatives generated for every image upload
+IMAGE_DERIVATIVES = (WEB_OPTIMIZED_SPEC, PREVIEW_SPEC, THUMBNAIL_SPEC)
+
+
+@dataclass
+class ImageDerivatives:
+    """
+    Result of generate_image_derivatives.
+
+    Attributes:
+        metadata: Metadata of the source image (see extract_image_metadata).
+        assets: Generated MediaAssets keyed by asset type.
+        errors: Error messages of failed derivatives keyed by asset type.
+    """
+
+    metadata: dict[str, Any]
+    assets: dict[str, "MediaAsset"] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _RenderedDerivative:
+    """Encoded WebP bytes of a derivative, ready to be stored."""
+
+    spec: ImageDerivativeSpec
+    width: int
+    height: int
+    content: bytes
+
+
 # =============================================================================
 # Processing Functions
 # =============================================================================
 
 
+def generate_image_derivatives(
+    media_file: "MediaFile",
+    specs: Iterable[ImageDerivativeSpec] = IMAGE_DERIVATIVES,
+) -> ImageDerivatives:
+    """
+    Generate all derivatives and metadata of an image from a single decode.
+
+    The decoding and encoding run as one job in the processing pool (see
+    render_image_derivatives); storing the assets happens here. A derivative
+    that fails to encode or store is recorded in the result's errors; the
+    others are still generated.
+
+    Args:
+        media_file: MediaFile instance with media_type='image'.
+        specs: Derivatives to generate (defaults to IMAGE_DERIVATIVES).
+
+    Returns:
+        ImageDerivatives with metadata, generated assets and per-asset errors.
+
+    Raises:
+        ImageProcessingError: If the source cannot be decoded (permanent failure).
+        OSError: For transient I/O errors reading the source.
+    """
+    media_file_id = str(media_file.pk)
+    specs = tuple(specs)
+    logger.info(
+        "Generating image derivatives",
+        extra={
+            "media_file_id": media_file_id,
+            "asset_types": [spec.asset_type for spec in specs],
+        },
+    )
+
+    with _source_path(media_file) as source_path:
+        metadata, rendered, errors = pool.wait(
+            pool.submit(render_image_derivatives, media_file_id, source_path, specs),
+            pool.get_deadline(),
+        )
+
+    result = ImageDerivatives(metadata=metadata, errors=errors)
+    assets, save_errors = _save_assets(media_file, rendered)
+    result.assets.update(assets)
+    result.errors.update(save_errors)
+
+    logger.info(
+        "Generated image derivatives",
+        extra={
+            "media_file_id": media_file_id,
+            "original_size": f"{metadata['width']}x{metadata['height']}",
+            "assets": {
+                asset_type: asset.dimensions for asset_type, asset in assets.items()
+            },
+            "error_count": len(result.errors),
+        },
+    )
+
+    return result
+
+
+def render_image_derivatives(
+    media_file_id: str,
+    source_path: str,
+    specs: tuple[ImageDerivativeSpec, ...],
+) -> tuple[dict[str, Any], list[_RenderedDerivative], dict[str, str]]:
+    """
+    Decode an image once and encode every derivative (processing pool job).
+
+    The source is decoded at reduced DCT scale for large JPEGs, converted to
+    RGB once, and each derivative is downscaled from the previous, larger
+    one. Reads the source from a local path, so it can run in a pool process
+    without the file contents being pickled.
+
+    Args:
+        media_file_id: ID of the MediaFile (for logging).
+        source_path: Local path of the original file.
+        specs: Derivatives to render.
+
+    Returns:
+        Tuple of (metadata, rendered derivatives, encode errors by asset type).
+
+    Raises:
+        ImageProcessingError: If the source cannot be decoded (permanent failure).
+    """
+    # Largest first, so every derivative is downscaled from the previous one
+    specs = sorted(
+        specs, key=lambda spec: spec.max_size[0] * spec.max_size[1], reverse=True
+    )
+
+    with _translate_image_errors(media_file_id, "image decoding"):
+        img, metadata = _decode_image(source_path, specs[0].max_size)
+        img = _convert_to_rgb(img)
+    decoded_size = img.size
+
+    rendered: list[_RenderedDerivative] = []
+    errors: dict[str, str] = {}
+    for spec in specs:
+        try:
+            rendered.append(_render_webp(img, spec))
+        except Exception as e:
+            errors[spec.asset_type] = str(e)
+            logger.warning(
+                f"Failed to encode {spec.asset_type}",
+                extra={"media_file_id": media_file_id, "error": str(e)},
+            )
+
+    logger.debug(
+        "Rendered image derivatives",
+        extra={
+            "media_file_id": media_file_id,
+            "decoded_size": f"{decoded_size[0]}x{decoded_size[1]}",
+            "rendered": len(rendered),
+        },
+    )
+    return metadata, rendered, errors
+
+
 def generate_image_thumbnail(media_file: "MediaFile") -> "MediaAsset":
     """
     Generate a thumbnail for an image file.
@@ -114,90 +312,320 @@ def generate_image_thumbnail(media_file: "MediaFile") -> "MediaAsset":
         ImageProcessingError: If image cannot be processed (permanent failure).
         OSError: For transient I/O errors that should be retried.
     """
-    from media.models import MediaAsset
+    return _generate_single_derivative(media_file, THUMBNAIL_SPEC)
+
+
+def generate_image_preview(media_file: "MediaFile") -> "MediaAsset":
+    """
+    Generate a medium-sized preview for an image file.
+
+    Creates an 800x800 maximum dimension preview while maintaining
+    aspect ratio. Useful for detail views and image galleries.
+
+    Args:
+        media_file: MediaFile instance with media_type='image'.
+
+    Returns:
+        MediaAsset instance containing the generated preview.
+
+    Raises:
+        ImageProcessingError: If image cannot be processed (permanent failure).
+        OSError: For transient I/O errors that should be retried.
+    """
+    return _generate_single_derivative(media_file, PREVIEW_SPEC)
+
+
+def generate_image_web_optimized(media_file: "MediaFile") -> "MediaAsset":
+    """
+    Generate a web-optimized version of an image file.
+
+    Creates a compressed WebP version with:
+    - Maximum dimensions of 2048x2048
+    - Quality setting of 75 (slightly more compressed)
+    - EXIF data stripped for privacy
+
+    This is the primary image served for web viewing, balancing
+    quality and file size for optimal loading performance.
+
+    Args:
+        media_file: MediaFile instance with media_type='image'.
+
+    Returns:
+        MediaAsset instance containing the web-optimized version.
+
+    Raises:
+        ImageProcessingError: If image cannot be processed (permanent failure).
+        OSError: For transient I/O errors that should be retried.
+    """
+    return _generate_single_derivative(media_file, WEB_OPTIMIZED_SPEC)
 
+
+def _generate_single_derivative(
+    media_file: "MediaFile", spec: ImageDerivativeSpec
+) -> "MediaAsset":
+    """
+    Generate one derivative, raising instead of collecting errors.
+
+    Args:
+        media_file: MediaFile instance with media_type='image'.
+        spec: Derivative to generate.
+
+    Returns:
+        The created or updated MediaAsset.
+
+    Raises:
+        ImageProcessingError: If image cannot be processed (permanent failure).
+        OSError: For transient I/O errors that should be retried.
+    """
     logger.info(
-        "Generating thumbnail for image",
+        f"Generating {spec.asset_type} for image",
         extra={"media_file_id": str(media_file.pk)},
     )
 
+    with _translate_image_errors(str(media_file.pk), f"{spec.asset_type} generation"):
+        img, metadata = _decode_image(_read_source(media_file), spec.max_size)
+        rendered = _render_webp(_convert_to_rgb(img), spec)
+        assets, _ = _save_assets(media_file, [rendered], raise_errors=True)
+
+    asset = assets[spec.asset_type]
+    logger.info(
+        f"Generated {spec.asset_type} successfully",
+        extra={
+            "media_file_id": str(media_file.pk),
+            "asset_id": str(asset.pk),
+            "original_size": f"{metadata['width']}x{metadata['height']}",
+            "asset_size": asset.dimensions,
+            "file_size": asset.file_size,
+        },
+    )
+    return asset
+
+
+def _read_source(media_file: "MediaFile") -> bytes:
+    """
+    Read the original file from storage.
+
+    Args:
+        media_file: MediaFile instance with media_type='image'.
+
+    Returns:
+        File contents.
+    """
+    with media_file.file.open("rb") as f:
+        return f.read()
+
+
+@contextmanager
+def _source_path(media_file: "MediaFile") -> Iterator[str]:
+    """
+    Get a local path of the original file.
+
+    Args:
+        media_file: MediaFile instance with media_type='image'.
+
+    Yields:
+        The storage path for local storage, otherwise a temporary copy
+        (written in chunks, removed afterwards).
+    """
     try:
-        # Open and load the source image
-        with media_file.file.open("rb") as f:
-            img = Image.open(f)
-
-            # Force load to detect corrupt images early
-            # This reads the entire image into memory
-            img.load()
-
-            # Store original dimensions for logging
-            original_width, original_height = img.size
-
-            # Convert color mode for WebP compatibility
-            img = _convert_to_rgb(img)
-
-            # Generate thumbnail (modifies in place, maintains aspect ratio)
-            img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-
-            # Save to WebP format in memory
-            buffer = BytesIO()
-            img.save(buffer, format="WEBP", quality=WEBP_QUALITY)
-            buffer.seek(0)
-
-            # Get thumbnail dimensions and size
-            thumb_width, thumb_height = img.size
-            file_size = buffer.getbuffer().nbytes
-
-            # Create or update the thumbnail asset
-            # Using update_or_create for idempotency
-            asset, created = MediaAsset.objects.update_or_create(
-                media_file=media_file,
-                asset_type=MediaAsset.AssetType.THUMBNAIL,
-                defaults={
-                    "width": thumb_width,
-                    "height": thumb_height,
-                    "file_size": file_size,
-                },
-            )
+        path = media_file.file.path
+    except NotImplementedError:
+        path = None
+    if path is not None:
+        yield path
+        return
+
+    suffix = Path(media_file.file.name).suffix
+    with tempfile.NamedTemporaryFile(suffix=suffix) as copy:
+        with _translate_image_errors(str(media_file.pk), "image read"):
+            with media_file.file.open("rb") as f:
+                for chunk in f.chunks():
+                    copy.write(chunk)
+            copy.flush()
+        yield copy.name
+
+
+def _decode_image(
+    source: bytes | str, max_size: tuple[int, int]
+) -> tuple[Image.Image, dict[str, Any]]:
+    """
+    Decode the source image no larger than needed for max_size.
+
+    For JPEGs, Image.draft makes the decoder produce the smallest 1/2, 1/4
+    or 1/8 scale that still covers max_size, which skips most of the IDCT
+    work and memory of a full-size decode. Other formats decode at full size.
 
-            # Generate filename based on parent UUID
-            filename = f"thumb_{media_file.pk}.webp"
-
-            # Save the file content
-            # This uses the get_asset_upload_path function for the path
-            asset.file.save(filename, ContentFile(buffer.read()), save=True)
-
-            logger.info(
-                "Generated thumbnail successfully",
-                extra={
-                    "media_file_id": str(media_file.pk),
-                    "asset_id": str(asset.pk),
-                    "original_size": f"{original_width}x{original_height}",
-                    "thumb_size": f"{thumb_width}x{thumb_height}",
-                    "file_size": file_size,
-                    "is_new": created,
-                },
+    Args:
+        source: Contents or local path of the image file.
+        max_size: Bounding box of the largest derivative that will be made.
+
+    Returns:
+        Tuple of (loaded image, metadata of the original image).
+    """
+    img = Image.open(BytesIO(source) if isinstance(source, bytes) else source)
+
+    # Read before draft() changes size and mode
+    metadata = _basic_metadata(img)
+
+    target_size = _fit_within(img.size, max_size)
+    if target_size != img.size:
+        img.draft(img.mode, target_size)
+
+    # Force load to detect corrupt images early
+    img.load()
+
+    exif_data = _extract_exif(img)
+    if exif_data:
+        metadata["exif"] = exif_data
+    return img, metadata
+
+
+def _fit_within(size: tuple[int, int], max_size: tuple[int, int]) -> tuple[int, int]:
+    """
+    Scale size down to fit max_size, keeping aspect ratio (never upscales).
+
+    Args:
+        size: (width, height) of the source.
+        max_size: Bounding box.
+
+    Returns:
+        Scaled (width, height), or size unchanged if it already fits.
+    """
+    scale = min(max_size[0] / size[0], max_size[1] / size[1])
+    if scale >= 1:
+        return size
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+
+def _render_webp(img: Image.Image, spec: ImageDerivativeSpec) -> _RenderedDerivative:
+    """
+    Downscale img in place to the spec's size and encode it as WebP.
+
+    img is left at the derivative's size so the next, smaller derivative
+    is scaled from it rather than from the full-size source.
+
+    Args:
+        img: RGB image, at least as large as the derivative.
+        spec: Derivative to render.
+
+    Returns:
+        The encoded derivative.
+    """
+    # Maintains aspect ratio, never upscales
+    img.thumbnail(spec.max_size, Image.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    img.save(buffer, format="WEBP", quality=spec.quality)
+    return _RenderedDerivative(
+        spec=spec,
+        width=img.size[0],
+        height=img.size[1],
+        content=buffer.getvalue(),
+    )
+
+
+def _save_assets(
+    media_file: "MediaFile",
+    rendered: list[_RenderedDerivative],
+    raise_errors: bool = False,
+) -> tuple[dict[str, "MediaAsset"], dict[str, str]]:
+    """
+    Store rendered derivatives and write their MediaAsset rows in one batch.
+
+    Existing assets of the same type are updated in place (idempotent
+    reprocessing), so there is one query to load them and one bulk write
+    each for new and existing rows, regardless of how many derivatives.
+
+    Args:
+        media_file: Parent MediaFile.
+        rendered: Encoded derivatives.
+        raise_errors: Re-raise storage errors instead of collecting them.
+
+    Returns:
+        Tuple of (assets keyed by asset type, storage errors keyed by asset type).
+    """
+    from media.models import MediaAsset
+
+    if not rendered:
+        return {}, {}
+
+    existing = {
+        asset.asset_type: asset
+        for asset in MediaAsset.objects.filter(
+            media_file=media_file,
+            asset_type__in=[r.spec.asset_type for r in rendered],
+        )
+    }
+
+    now = timezone.now()
+    assets: dict[str, MediaAsset] = {}
+    errors: dict[str, str] = {}
+    for r in rendered:
+        asset = existing.get(r.spec.asset_type) or MediaAsset(
+            media_file=media_file, asset_type=r.spec.asset_type
+        )
+        asset.width = r.width
+        asset.height = r.height
+        asset.file_size = len(r.content)
+        # bulk_update() does not apply auto_now
+        asset.updated_at = now
+        try:
+            # Writes to storage only; the rows are saved below
+            asset.file.save(
+                f"{r.spec.filename_prefix}_{media_file.pk}.webp",
+                ContentFile(r.content),
+                save=False,
             )
+        except OSError as e:
+            if raise_errors:
+                raise
+            errors[r.spec.asset_type] = str(e)
+            logger.warning(
+                f"Failed to store {r.spec.asset_type}",
+                extra={"media_file_id": str(media_file.pk), "error": str(e)},
+            )
+            continue
+        assets[r.spec.asset_type] = asset
+
+    fields = ["file", "width", "height", "file_size", "updated_at"]
+    with transaction.atomic():
+        MediaAsset.objects.bulk_create(
+            [asset for asset in assets.values() if asset._state.adding]
+        )
+        MediaAsset.objects.bulk_update(
+            [asset for asset in assets.values() if not asset._state.adding], fields
+        )
+
+    return assets, errors
 
-            return asset
+
+@contextmanager
+def _translate_image_errors(media_file_id: str, action: str) -> Iterator[None]:
+    """
+    Translate Pillow errors into permanent or transient processing errors.
+
+    Args:
+        media_file_id: ID of the MediaFile being processed (for logging).
+        action: Description of the step, used in log messages.
+
+    Raises:
+        ImageProcessingError: For corrupted, unidentifiable or oversized images.
+        OSError: For other I/O errors, which may be transient.
+    """
+    try:
+        yield
 
     except Image.DecompressionBombError as e:
         logger.warning(
             "Image exceeds size limit",
-            extra={
-                "media_file_id": str(media_file.pk),
-                "error": str(e),
-            },
+            extra={"media_file_id": media_file_id, "error": str(e)},
         )
         raise ImageProcessingError(f"Image exceeds maximum size limit: {e}") from e
 
     except Image.UnidentifiedImageError as e:
         logger.warning(
             "Cannot identify image format",
-            extra={
-                "media_file_id": str(media_file.pk),
-                "error": str(e),
-            },
+            extra={"media_file_id": media_file_id, "error": str(e)},
         )
         raise ImageProcessingError(
             f"Cannot identify image format - file may be corrupted: {e}"
@@ -208,10 +636,7 @@ def generate_image_thumbnail(media_file: "MediaFile") -> "MediaAsset":
         if "truncated" in error_str or "cannot identify" in error_str:
             logger.warning(
                 "Image file is truncated or corrupted",
-                extra={
-                    "media_file_id": str(media_file.pk),
-                    "error": str(e),
-                },
+                extra={"media_file_id": media_file_id, "error": str(e)},
             )
             raise ImageProcessingError(
                 f"Image file is truncated or corrupted: {e}"
@@ -220,21 +645,18 @@ def generate_image_thumbnail(media_file: "MediaFile") -> "MediaAsset":
         # Other OSError (file not found, permission denied, etc.)
         # These might be transient and should be retried
         logger.error(
-            "I/O error during thumbnail generation",
-            extra={
-                "media_file_id": str(media_file.pk),
-                "error": str(e),
-            },
+            f"I/O error during {action}",
+            extra={"media_file_id": media_file_id, "error": str(e)},
         )
         raise
 
+    except ImageProcessingError:
+        raise
+
     except Exception as e:
         logger.exception(
-            "Unexpected error generating thumbnail",
-            extra={
-                "media_file_id": str(media_file.pk),
-                "error": str(e),
-            },
+            f"Unexpected error during {action}",
+            extra={"media_file_id": media_file_id, "error": str(e)},
         )
         raise
 
@@ -300,6 +722,9 @@ def extract_image_metadata(media_file: "MediaFile") -> dict[str, Any]:
     - Has alpha channel
     - EXIF data (camera make/model, datetime, GPS, etc.)
 
+    generate_image_derivatives returns the same metadata without a separate
+    decode; use this when only the metadata is needed.
+
     Args:
         media_file: MediaFile instance with media_type='image'.
 
@@ -327,73 +752,41 @@ def extract_image_metadata(media_file: "MediaFile") -> dict[str, Any]:
         extra={"media_file_id": str(media_file.pk)},
     )
 
-    try:
-        with media_file.file.open("rb") as f:
-            img = Image.open(f)
-
-            # Force load to ensure file is valid
-            img.load()
-
-            # Basic metadata
-            metadata: dict[str, Any] = {
-                "width": img.size[0],
-                "height": img.size[1],
-                "color_space": img.mode,
-                "format": img.format or "unknown",
-                "has_alpha": img.mode in ("RGBA", "LA", "PA")
-                or "transparency" in img.info,
-            }
-
-            # Extract EXIF data if available
-            exif_data = _extract_exif(img)
-            if exif_data:
-                metadata["exif"] = exif_data
-
-            logger.info(
-                "Extracted image metadata successfully",
-                extra={
-                    "media_file_id": str(media_file.pk),
-                    "width": metadata["width"],
-                    "height": metadata["height"],
-                    "format": metadata["format"],
-                    "has_exif": bool(exif_data),
-                },
-            )
+    with _translate_image_errors(str(media_file.pk), "metadata extraction"):
+        # Decoding at thumbnail scale still validates the whole file
+        _, metadata = _decode_image(_read_source(media_file), THUMBNAIL_SIZE)
 
-            return metadata
+    logger.info(
+        "Extracted image metadata successfully",
+        extra={
+            "media_file_id": str(media_file.pk),
+            "width": metadata["width"],
+            "height": metadata["height"],
+            "format": metadata["format"],
+            "has_exif": "exif" in metadata,
+        },
+    )
 
-    except Image.DecompressionBombError as e:
-        logger.warning(
-            "Image exceeds size limit during metadata extraction",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise ImageProcessingError(f"Image exceeds maximum size limit: {e}") from e
+    return metadata
 
-    except Image.UnidentifiedImageError as e:
-        logger.warning(
-            "Cannot identify image format during metadata extraction",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise ImageProcessingError(
-            f"Cannot identify image format - file may be corrupted: {e}"
-        ) from e
 
-    except OSError as e:
-        error_str = str(e).lower()
-        if "truncated" in error_str or "cannot identify" in error_str:
-            logger.warning(
-                "Image file is truncated or corrupted",
-                extra={"media_file_id": str(media_file.pk), "error": str(e)},
-            )
-            raise ImageProcessingError(
-                f"Image file is truncated or corrupted: {e}"
-            ) from e
-        # Transient error - let it propagate for retry
-        logger.error(
-            "I/O error during metadata extraction",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise
+def _basic_metadata(img: Image.Image) -> dict[str, Any]:
+    """
+    Read dimensions, mode and format of an opened (not yet drafted) image.
+
+    Args:
+        img: PIL Image as returned by Image.open.
+
+    Returns:
+        Dictionary with width, height, color_space, format and has_alpha.
+    """
+    return {
+        "width": img.size[0],
+        "height": img.size[1],
+        "color_space": img.mode,
+        "format": img.format or "unknown",
+        "has_alpha": img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info,
+    }
 
 
 def _extract_exif(img: Image.Image) -> dict[str, Any] | None:
@@ -506,245 +899,3 @@ def _parse_gps_info(gps_info: Any) -> dict[str, float] | None:
         logger.debug(f"Could not parse GPS info: {e}")
 
     return None
-
-
-# =============================================================================
-# Preview Generation
-# =============================================================================
-
-
-def generate_image_preview(media_file: "MediaFile") -> "MediaAsset":
-    """
-    Generate a medium-sized preview for an image file.
-
-    Creates an 800x800 maximum dimension preview while maintaining
-    aspect ratio. Useful for detail views and image galleries.
-
-    Args:
-        media_file: MediaFile instance with media_type='image'.
-
-    Returns:
-        MediaAsset instance containing the generated preview.
-
-    Raises:
-        ImageProcessingError: If image cannot be processed (permanent failure).
-        OSError: For transient I/O errors that should be retried.
-    """
-    from media.models import MediaAsset
-
-    logger.info(
-        "Generating preview for image",
-        extra={"media_file_id": str(media_file.pk)},
-    )
-
-    try:
-        with media_file.file.open("rb") as f:
-            img = Image.open(f)
-            img.load()
-
-            original_width, original_height = img.size
-            img = _convert_to_rgb(img)
-
-            # Generate preview (maintains aspect ratio, max 800x800)
-            img.thumbnail(PREVIEW_SIZE, Image.Resampling.LANCZOS)
-
-            # Save to WebP format
-            buffer = BytesIO()
-            img.save(buffer, format="WEBP", quality=WEBP_QUALITY_PREVIEW)
-            buffer.seek(0)
-
-            preview_width, preview_height = img.size
-            file_size = buffer.getbuffer().nbytes
-
-            # Create or update the preview asset
-            asset, created = MediaAsset.objects.update_or_create(
-                media_file=media_file,
-                asset_type=MediaAsset.AssetType.PREVIEW,
-                defaults={
-                    "width": preview_width,
-                    "height": preview_height,
-                    "file_size": file_size,
-                },
-            )
-
-            filename = f"preview_{media_file.pk}.webp"
-            asset.file.save(filename, ContentFile(buffer.read()), save=True)
-
-            logger.info(
-                "Generated preview successfully",
-                extra={
-                    "media_file_id": str(media_file.pk),
-                    "asset_id": str(asset.pk),
-                    "original_size": f"{original_width}x{original_height}",
-                    "preview_size": f"{preview_width}x{preview_height}",
-                    "file_size": file_size,
-                    "is_new": created,
-                },
-            )
-
-            return asset
-
-    except Image.DecompressionBombError as e:
-        logger.warning(
-            "Image exceeds size limit",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise ImageProcessingError(f"Image exceeds maximum size limit: {e}") from e
-
-    except Image.UnidentifiedImageError as e:
-        logger.warning(
-            "Cannot identify image format",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise ImageProcessingError(
-            f"Cannot identify image format - file may be corrupted: {e}"
-        ) from e
-
-    except OSError as e:
-        error_str = str(e).lower()
-        if "truncated" in error_str or "cannot identify" in error_str:
-            logger.warning(
-                "Image file is truncated or corrupted",
-                extra={"media_file_id": str(media_file.pk), "error": str(e)},
-            )
-            raise ImageProcessingError(
-                f"Image file is truncated or corrupted: {e}"
-            ) from e
-        logger.error(
-            "I/O error during preview generation",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise
-
-    except Exception as e:
-        logger.exception(
-            "Unexpected error generating preview",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise
-
-
-# =============================================================================
-# Web Optimized Generation
-# =============================================================================
-
-
-def generate_image_web_optimized(media_file: "MediaFile") -> "MediaAsset":
-    """
-    Generate a web-optimized version of an image file.
-
-    Creates a compressed WebP version with:
-    - Maximum dimensions of 2048x2048
-    - Quality setting of 75 (slightly more compressed)
-    - EXIF data stripped for privacy
-
-    This is the primary image served for web viewing, balancing
-    quality and file size for optimal loading performance.
-
-    Args:
-        media_file: MediaFile instance with media_type='image'.
-
-    Returns:
-        MediaAsset instance containing the web-optimized version.
-
-    Raises:
-        ImageProcessingError: If image cannot be processed (permanent failure).
-        OSError: For transient I/O errors that should be retried.
-    """
-    from media.models import MediaAsset
-
-    logger.info(
-        "Generating web-optimized version for image",
-        extra={"media_file_id": str(media_file.pk)},
-    )
-
-    try:
-        with media_file.file.open("rb") as f:
-            img = Image.open(f)
-            img.load()
-
-            original_width, original_height = img.size
-            img = _convert_to_rgb(img)
-
-            # Resize if larger than max dimensions (maintains aspect ratio)
-            img.thumbnail(WEB_OPTIMIZED_MAX_SIZE, Image.Resampling.LANCZOS)
-
-            # Save to WebP format with slightly more compression
-            # EXIF is already stripped when we loaded through _convert_to_rgb
-            buffer = BytesIO()
-            img.save(
-                buffer,
-                format="WEBP",
-                quality=WEBP_QUALITY_WEB_OPTIMIZED,
-            )
-            buffer.seek(0)
-
-            optimized_width, optimized_height = img.size
-            file_size = buffer.getbuffer().nbytes
-
-            # Create or update the web optimized asset
-            asset, created = MediaAsset.objects.update_or_create(
-                media_file=media_file,
-                asset_type=MediaAsset.AssetType.WEB_OPTIMIZED,
-                defaults={
-                    "width": optimized_width,
-                    "height": optimized_height,
-                    "file_size": file_size,
-                },
-            )
-
-            filename = f"web_{media_file.pk}.webp"
-            asset.file.save(filename, ContentFile(buffer.read()), save=True)
-
-            logger.info(
-                "Generated web-optimized version successfully",
-                extra={
-                    "media_file_id": str(media_file.pk),
-                    "asset_id": str(asset.pk),
-                    "original_size": f"{original_width}x{original_height}",
-                    "optimized_size": f"{optimized_width}x{optimized_height}",
-                    "file_size": file_size,
-                    "is_new": created,
-                },
-            )
-
-            return asset
-
-    except Image.DecompressionBombError as e:
-        logger.warning(
-            "Image exceeds size limit",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise ImageProcessingError(f"Image exceeds maximum size limit: {e}") from e
-
-    except Image.UnidentifiedImageError as e:
-        logger.warning(
-            "Cannot identify image format",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise ImageProcessingError(
-            f"Cannot identify image format - file may be corrupted: {e}"
-        ) from e
-
-    except OSError as e:
-        error_str = str(e).lower()
-        if "truncated" in error_str or "cannot identify" in error_str:
-            logger.warning(
-                "Image file is truncated or corrupted",
-                extra={"media_file_id": str(media_file.pk), "error": str(e)},
-            )
-            raise ImageProcessingError(
-                f"Image file is truncated or corrupted: {e}"
-            ) from e
-        logger.error(
-            "I/O error during web-optimized generation",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise
-
-    except Exception as e:
-        logger.exception(
-            "Unexpected error generating web-optimized version",
-            extra={"media_file_id": str(media_file.pk), "error": str(e)},
-        )
-        raise
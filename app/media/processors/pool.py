@@ -0,0 +1,197 @@
+"""
+Process pool for CPU-bound media processing jobs.
+
+Decoding, resizing and WebP encoding (Pillow), PDF rasterization and text
+extraction (pdfplumber) are CPU-bound and hold the GIL for much of their
+work. process_media_file hands them to this pool, so independent jobs for one
+file run on separate cores. Their memory also lives in child processes that
+are recycled, not in the long-lived Celery worker.
+
+Design Decisions:
+    - billiard (Celery's multiprocessing fork) instead of concurrent.futures:
+      prefork Celery workers are daemonic processes, and the standard
+      library refuses to start children from them
+    - One pool per worker process, created on first use and re-created
+      after a fork (the pool's handler threads do not survive fork)
+    - Children are replaced after MEDIA_PROCESSING_MAX_TASKS_PER_CHILD jobs
+      or once they grow past MEDIA_PROCESSING_MAX_MEMORY_PER_CHILD_KB
+    - Jobs are module-level functions that take and return plain data
+      (paths, dataclasses); sources are passed as local file paths, never as
+      file contents, so a job's arguments are not pickled through a pipe
+    - Callers wait for jobs until the Celery task time limit minus
+      JOB_TIMEOUT_MARGIN_SECONDS; a job still running then is reported as a
+      TimeoutError and its pool is terminated, so the task can record the
+      failure before the worker is killed and a stuck child does not hold a
+      slot
+    - Opt-in: MEDIA_PROCESSING_WORKERS defaults to 0, which runs jobs inline
+
+Usage:
+    from media.processors import pool
+
+    deadline = pool.get_deadline()
+    thumbnail = pool.submit(render_pdf_thumbnail, media_file_id, pdf_path)
+    text = pool.submit(extract_pdf_text, media_file_id, pdf_path)
+
+    rendered = pool.wait(thumbnail, deadline)  # re-raises the job's exception
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import signal
+import time
+from typing import Any, Callable
+
+from billiard.exceptions import TimeoutError as JobTimeoutError
+from billiard.pool import Pool
+from billiard.util import set_pdeathsig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# (pid of the owning process, pool) of the most recent get_pool call
+_pool: tuple[int, Pool] | None = None
+
+# Time left of the task time limit for storing results and recording errors
+JOB_TIMEOUT_MARGIN_SECONDS = 60
+
+
+class InlineResult:
+    """
+    Result of a job run in the calling process.
+
+    Mirrors the get() of billiard's ApplyResult so callers do not need to
+    know whether the pool is enabled.
+    """
+
+    def __init__(self, func: Callable[..., Any], args: tuple) -> None:
+        self._value: Any = None
+        self._error: Exception | None = None
+        try:
+            self._value = func(*args)
+        except Exception as e:
+            self._error = e
+
+    def get(self, timeout: float | None = None) -> Any:
+        """
+        Return the job's value, re-raising its exception if it failed.
+
+        Args:
+            timeout: Ignored; the job has already run
+
+        Returns:
+            Return value of the job
+        """
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+def _init_child() -> None:
+    """Make pool processes exit when the worker that owns them is killed."""
+    try:
+        set_pdeathsig(signal.SIGKILL)
+    except OSError:
+        # Linux-only; without it an orphaned child still finishes its job
+        pass
+
+
+def get_pool() -> Pool | None:
+    """
+    Get the process pool of the current worker process.
+
+    Returns:
+        billiard Pool, or None when MEDIA_PROCESSING_WORKERS is 0
+    """
+    global _pool
+
+    workers = settings.MEDIA_PROCESSING_WORKERS
+    if workers <= 0:
+        return None
+
+    pid = os.getpid()
+    if _pool is None or _pool[0] != pid:
+        pool = create_pool(workers)
+        atexit.register(pool.terminate)
+        _pool = (pid, pool)
+        logger.info(f"Started media processing pool with {workers} processes")
+    return _pool[1]
+
+
+def create_pool(workers: int) -> Pool:
+    """
+    Create a pool with the configured child recycling limits.
+
+    Args:
+        workers: Number of processes
+
+    Returns:
+        New billiard Pool (the caller owns it and must terminate it)
+    """
+    return Pool(
+        processes=workers,
+        initializer=_init_child,
+        maxtasksperchild=settings.MEDIA_PROCESSING_MAX_TASKS_PER_CHILD,
+        max_memory_per_child=settings.MEDIA_PROCESSING_MAX_MEMORY_PER_CHILD_KB,
+    )
+
+
+def submit(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run func(*args) in the processing pool.
+
+    Args:
+        func: Module-level function (must be picklable)
+        *args: Picklable arguments
+
+    Returns:
+        Result handle whose get() returns the value or raises the job's error
+    """
+    pool = get_pool()
+    if pool is None:
+        return InlineResult(func, args)
+    return pool.apply_async(func, args)
+
+
+def get_deadline() -> float:
+    """
+    Get the time by which jobs submitted now must have finished.
+
+    Returns:
+        time.monotonic() value CELERY_TASK_TIME_LIMIT minus
+        JOB_TIMEOUT_MARGIN_SECONDS from now
+    """
+    timeout = settings.CELERY_TASK_TIME_LIMIT - JOB_TIMEOUT_MARGIN_SECONDS
+    return time.monotonic() + max(timeout, 1)
+
+
+def wait(result: Any, deadline: float) -> Any:
+    """
+    Wait for a submitted job until the deadline.
+
+    On timeout the pool is terminated (it is re-created on next use), since
+    its stuck child would otherwise keep a slot busy indefinitely.
+
+    Args:
+        result: Handle returned by submit
+        deadline: Value returned by get_deadline
+
+    Returns:
+        Return value of the job
+
+    Raises:
+        billiard.exceptions.TimeoutError: If the job is not done by deadline
+        Exception: The job's own exception if it failed
+    """
+    global _pool
+
+    try:
+        return result.get(timeout=max(deadline - time.monotonic(), 0))
+    except JobTimeoutError:
+        if _pool is not None and _pool[0] == os.getpid():
+            logger.error("Media processing job timed out; terminating pool")
+            _pool[1].terminate()
+            _pool = None
+        raise
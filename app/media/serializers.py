@@ -21,6 +21,7 @@ from rest_framework import serializers
 
 from authentication.models import User
 from media.models import MediaFile, MediaFileShare, MediaFileTag, Tag, UploadSession
+from media.services.deduplication import compute_content_hash, create_duplicate_upload
 from media.validators import MediaValidator
 
 if TYPE_CHECKING:
@@ -109,6 +110,10 @@ class MediaFileUploadSerializer(serializers.Serializer):
 
         Uses the factory method to create and save the media file,
         then updates user's storage quota and triggers async processing.
+        Uploads whose content matches a clean, processed file reuse its
+        stored object, scan result and assets instead (see
+        media.services.deduplication); they are still charged to the
+        uploader's quota.
 
         Args:
             validated_data: Data that passed validation.
@@ -126,14 +131,29 @@ class MediaFileUploadSerializer(serializers.Serializer):
         media_type = self._validation_result.media_type
         mime_type = self._validation_result.mime_type
 
-        # Create the media file
-        media_file = MediaFile.create_from_upload(
-            file=file,
+        # Identical content that is already scanned and processed is shared
+        # instead of being stored, scanned and processed again
+        content_hash = compute_content_hash(file)
+        media_file = create_duplicate_upload(
+            content_hash=content_hash,
             uploader=user,
+            original_filename=file.name,
             media_type=media_type,
             mime_type=mime_type,
+            file_size=file.size,
             visibility=visibility,
         )
+        deduplicated = media_file is not None
+
+        if media_file is None:
+            media_file = MediaFile.create_from_upload(
+                file=file,
+                uploader=user,
+                media_type=media_type,
+                mime_type=mime_type,
+                visibility=visibility,
+                content_hash=content_hash,
+            )
 
         # Update user's storage quota
         if hasattr(user, "profile"):
@@ -154,6 +174,11 @@ class MediaFileUploadSerializer(serializers.Serializer):
             update_search_vector_safe,
         )
 
+        if deduplicated:
+            # Already scanned and processed; only the search vector is new
+            update_search_vector_safe.delay(str(media_file.id))
+            return media_file
+
         # Chain: scan first, then process, then update search vector with content
         task_chain = chain(
             scan_file_for_malware.s(str(media_file.id)),
@@ -1,6 +1,13 @@
 """Media services for file processing, scanning, and access control."""
 
 from media.services.access_control import AccessControlService, FileAccessLevel
+from media.services.deduplication import (
+    compute_content_hash,
+    create_duplicate_upload,
+    get_shared_paths,
+    register_content_blob,
+    release_content_blob,
+)
 from media.services.delivery import FileDeliveryService
 from media.services.quarantine import (
     cleanup_old_quarantine,
@@ -18,7 +25,12 @@ __all__ = [
     "MalwareScanResult",
     "ScanResult",
     "cleanup_old_quarantine",
+    "compute_content_hash",
+    "create_duplicate_upload",
+    "get_shared_paths",
     "list_quarantined_files",
     "quarantine_infected_file",
+    "register_content_blob",
+    "release_content_blob",
     "restore_from_quarantine",
 ]
@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, BinaryIO
 
 if TYPE_CHECKING:
     from authentication.models import User
@@ -176,6 +176,29 @@ class ChunkedUploadServiceBase(ABC):
             ServiceResult containing progress information.
         """
 
+    def receive_chunk_stream(
+        self,
+        session: "UploadSession",
+        part_number: int,
+        stream: BinaryIO,
+    ) -> "ServiceResult[PartCompletionResult]":
+        """
+        Receive and store a chunk read from a stream (local backend only).
+
+        Lets implementations write the request body to storage in fixed-size
+        blocks instead of holding the whole chunk in memory. The default
+        reads the stream fully and delegates to receive_chunk.
+
+        Args:
+            session: The upload session
+            part_number: The part number (1-indexed)
+            stream: File-like object positioned at the chunk data
+
+        Returns:
+            ServiceResult containing progress information.
+        """
+        return self.receive_chunk(session, part_number, stream.read())
+
     @abstractmethod
     def finalize_upload(
         self,
@@ -3,23 +3,27 @@ Local filesystem implementation of chunked upload service.
 
 Handles chunked uploads by:
 - Writing chunks to a temporary directory
-- Concatenating chunks on finalization
-- Moving the assembled file to Django's storage
+- Concatenating chunks on finalization (streamed through a fixed-size buffer,
+  hashing in the same pass)
+- Moving the assembled file to Django's storage (a rename for local storage),
+  unless its hash matches content that is already stored and processed
 """
 
 from __future__ import annotations
 
 import hashlib
+import io
+import logging
 import os
 import shutil
 import uuid
 from datetime import timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, BinaryIO
 
 from celery import chain
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import transaction
 from django.utils import timezone
 
@@ -30,18 +34,42 @@ from media.services.chunked_upload.base import (
     ChunkTarget,
     PartCompletionResult,
 )
+from media.services.deduplication import create_duplicate_upload
 from media.tasks import process_media_file, scan_file_for_malware
 
 if TYPE_CHECKING:
     from authentication.models import User
 
+logger = logging.getLogger(__name__)
+
+# Bytes copied per read when assembling parts (peak memory per finalize)
+ASSEMBLY_BUFFER_SIZE = 1024 * 1024
+
+# Bytes read from the request per write when receiving a chunk
+RECEIVE_BUFFER_SIZE = 64 * 1024
+
+
+class AssembledFile(File):
+    """
+    Assembled upload on local disk.
+
+    Exposes temporary_file_path() like TemporaryUploadedFile, so
+    FileSystemStorage moves the file into place instead of copying it;
+    other storages read it in chunks.
+    """
+
+    def temporary_file_path(self) -> str:
+        """Return the path of the assembled file."""
+        return self.file.name
+
 
 class LocalChunkedUploadService(ChunkedUploadServiceBase):
     """
     Chunked upload service for local filesystem storage.
 
     Chunks are stored in a temporary directory and concatenated on finalization.
-    This approach allows for resumable uploads and reduces memory usage for large files.
+    This approach allows for resumable uploads and keeps memory usage constant
+    for large files.
     """
 
     def __init__(
@@ -159,34 +187,9 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
         for S3 compatibility. If called, it will update the session with the
         provided information.
         """
-        # Check if this part already exists
-        existing_parts = {p["part_number"]: p for p in session.parts_completed}
-
-        if part_number not in existing_parts:
-            # Add new part
-            session.parts_completed.append(
-                {
-                    "part_number": part_number,
-                    "etag": etag,
-                    "size": size,
-                }
-            )
-            session.bytes_received += size
-        else:
-            # Part already recorded, skip
-            pass
+        session.record_part(part_number, etag, size)
 
-        session.save()
-
-        is_complete = session.bytes_received >= session.file_size
-
-        return ServiceResult.success(
-            PartCompletionResult(
-                bytes_received=session.bytes_received,
-                parts_completed=len(session.parts_completed),
-                is_complete=is_complete,
-            )
-        )
+        return ServiceResult.success(self._part_completion(session))
 
     def receive_chunk(
         self,
@@ -199,6 +202,25 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
 
         Writes the chunk data to a part file in the temp directory.
         """
+        return self.receive_chunk_stream(session, part_number, io.BytesIO(data))
+
+    def receive_chunk_stream(
+        self,
+        session: UploadSession,
+        part_number: int,
+        stream: BinaryIO,
+    ) -> ServiceResult[PartCompletionResult]:
+        """
+        Receive and store a chunk read from a stream.
+
+        Copies the stream to the part file in RECEIVE_BUFFER_SIZE blocks,
+        updating the ETag hash as it goes, so memory use is one buffer
+        regardless of chunk size. The part must be exactly
+        session.expected_part_size() bytes; reading stops one buffer past
+        that size, so an oversized body is never written to disk. The part
+        file is replaced atomically, so an interrupted or rejected re-upload
+        leaves the previous part intact.
+        """
         # Validate session status
         if session.status != UploadSession.Status.IN_PROGRESS:
             return ServiceResult.failure(
@@ -215,49 +237,56 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
                 f"Invalid part number {part_number}. Must be between 1 and {session.total_parts}."
             )
 
-        # Write chunk to temp directory
-        part_filename = f"part_{part_number:04d}"
-        part_path = Path(session.local_temp_dir) / part_filename
-        part_path.write_bytes(data)
-
-        # Calculate ETag (MD5 hash of content)
-        etag = hashlib.md5(data).hexdigest()
-
-        # Check if this part was already recorded
-        existing_parts = {p["part_number"]: p for p in session.parts_completed}
-
-        if part_number not in existing_parts:
-            # Add new part
-            session.parts_completed.append(
-                {
-                    "part_number": part_number,
-                    "etag": etag,
-                    "size": len(data),
-                }
-            )
-            session.bytes_received += len(data)
-        else:
-            # Part already uploaded, update the file but don't double-count bytes
-            old_size = existing_parts[part_number]["size"]
-            # Update the existing part entry
-            for part in session.parts_completed:
-                if part["part_number"] == part_number:
-                    part["etag"] = etag
-                    part["size"] = len(data)
+        # Stream chunk to temp directory, computing the ETag (MD5) in the same pass
+        part_path = Path(session.local_temp_dir) / f"part_{part_number:04d}"
+        partial_path = part_path.with_suffix(".partial")
+        expected_size = session.expected_part_size(part_number)
+        md5 = hashlib.md5()
+        size = 0
+        with open(partial_path, "wb") as part:
+            while block := stream.read(RECEIVE_BUFFER_SIZE):
+                size += len(block)
+                if size > expected_size:
+                    # Oversized part: stop reading, nothing past the limit is kept
                     break
-            # Adjust bytes_received if size changed
-            session.bytes_received = session.bytes_received - old_size + len(data)
+                md5.update(block)
+                part.write(block)
 
-        session.save()
+        if not size:
+            partial_path.unlink()
+            return ServiceResult.failure("No chunk data provided.")
 
-        is_complete = session.bytes_received >= session.file_size
+        if size > expected_size:
+            partial_path.unlink()
+            return ServiceResult.failure(
+                f"Part {part_number} exceeds the expected size of "
+                f"{expected_size} bytes. Every part except the last must be "
+                f"exactly the session chunk_size ({session.chunk_size} bytes)."
+            )
 
-        return ServiceResult.success(
-            PartCompletionResult(
-                bytes_received=session.bytes_received,
-                parts_completed=len(session.parts_completed),
-                is_complete=is_complete,
+        if size < expected_size:
+            partial_path.unlink()
+            return ServiceResult.failure(
+                f"Part {part_number} must be {expected_size} bytes, "
+                f"received {size}. Every part except the last must be "
+                f"exactly the session chunk_size ({session.chunk_size} bytes)."
             )
+
+        os.replace(partial_path, part_path)
+        etag = md5.hexdigest()
+
+        # Record the part (atomic upsert, safe for parallel part uploads)
+        session.record_part(part_number, etag, size)
+
+        return ServiceResult.success(self._part_completion(session))
+
+    @staticmethod
+    def _part_completion(session: UploadSession) -> PartCompletionResult:
+        """Build progress after a part was recorded."""
+        return PartCompletionResult(
+            bytes_received=session.bytes_received,
+            parts_completed=session.parts_completed_count,
+            is_complete=session.bytes_received >= session.file_size,
         )
 
     def finalize_upload(
@@ -269,6 +298,9 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
 
         Assembles chunks into the final file, creates MediaFile,
         updates quota, triggers processing pipeline, and cleans up.
+        If the assembled content matches a clean, processed file, the
+        MediaFile shares its stored object and outputs instead, and the
+        assembled copy is discarded with the temp directory.
         """
         # Validate session status
         if session.status != UploadSession.Status.IN_PROGRESS:
@@ -277,42 +309,53 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
             )
 
         # Check all parts are present
-        completed_part_numbers = {p["part_number"] for p in session.parts_completed}
-        expected_parts = set(range(1, session.total_parts + 1))
-        missing_parts = expected_parts - completed_part_numbers
+        missing_parts = session.get_missing_part_numbers()
 
         if missing_parts:
             return ServiceResult.failure(
-                f"Missing parts: {sorted(missing_parts)}. Upload is incomplete."
+                f"Missing parts: {missing_parts}. Upload is incomplete."
             )
 
         try:
-            with transaction.atomic():
-                # Assemble chunks into final file
-                temp_dir = Path(session.local_temp_dir)
-                assembled_content = bytearray()
-
-                for part_num in range(1, session.total_parts + 1):
-                    part_path = temp_dir / f"part_{part_num:04d}"
-                    assembled_content.extend(part_path.read_bytes())
-
-                # Create ContentFile for Django storage
-                content_file = ContentFile(
-                    bytes(assembled_content), name=session.filename
+            # Stream chunks into the final file (constant memory)
+            assembled_path, sha256 = self._assemble_parts(session)
+            logger.debug(f"Assembled upload {session.id} (sha256 {sha256})")
+
+            # Quota is charged on file_size, so the stored bytes must match it
+            assembled_size = assembled_path.stat().st_size
+            if assembled_size != session.file_size:
+                assembled_path.unlink()
+                return ServiceResult.failure(
+                    f"Assembled size {assembled_size} does not match the "
+                    f"declared file size {session.file_size}."
                 )
 
-                # Create MediaFile
-                media_file = MediaFile(
-                    file=content_file,
+            with transaction.atomic(), open(assembled_path, "rb") as assembled:
+                # Share identical content that is already scanned and processed
+                media_file = create_duplicate_upload(
+                    content_hash=sha256,
+                    uploader=session.uploader,
                     original_filename=session.filename,
                     media_type=session.media_type,
                     mime_type=session.mime_type,
                     file_size=session.file_size,
-                    uploader=session.uploader,
-                    version=1,
-                    is_current=True,
                 )
-                media_file.save()
+                deduplicated = media_file is not None
+
+                if media_file is None:
+                    # Create MediaFile
+                    media_file = MediaFile(
+                        file=AssembledFile(assembled, name=session.filename),
+                        original_filename=session.filename,
+                        media_type=session.media_type,
+                        mime_type=session.mime_type,
+                        file_size=session.file_size,
+                        uploader=session.uploader,
+                        content_hash=sha256,
+                        version=1,
+                        is_current=True,
+                    )
+                    media_file.save()
 
                 # Update user's storage quota
                 if hasattr(session.uploader, "profile"):
@@ -320,13 +363,15 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
 
                 # Mark session as completed
                 session.status = UploadSession.Status.COMPLETED
-                session.save()
+                session.save(update_fields=["status", "updated_at"])
 
-            # Trigger processing pipeline (outside transaction)
-            chain(
-                scan_file_for_malware.s(str(media_file.id)),
-                process_media_file.s(),
-            ).delay()
+            # Trigger processing pipeline (outside transaction); deduplicated
+            # files reuse an existing scan result and assets
+            if not deduplicated:
+                chain(
+                    scan_file_for_malware.s(str(media_file.id)),
+                    process_media_file.s(),
+                ).delay()
 
             # Clean up temp directory
             if os.path.exists(session.local_temp_dir):
@@ -337,6 +382,33 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
         except Exception as e:
             return ServiceResult.failure(f"Failed to finalize upload: {str(e)}")
 
+    def _assemble_parts(self, session: UploadSession) -> tuple[Path, str]:
+        """
+        Concatenate part files into one file next to them.
+
+        Copies through a fixed ASSEMBLY_BUFFER_SIZE buffer and computes the
+        whole-file SHA-256 in the same pass, so memory use does not grow
+        with the upload size.
+
+        Returns:
+            Tuple of (assembled file path, hex SHA-256 digest)
+        """
+        temp_dir = Path(session.local_temp_dir)
+        assembled_path = temp_dir / "assembled"
+        digest = hashlib.sha256()
+        buffer = bytearray(ASSEMBLY_BUFFER_SIZE)
+        view = memoryview(buffer)
+
+        with open(assembled_path, "wb") as assembled:
+            for part_num in range(1, session.total_parts + 1):
+                part_path = temp_dir / f"part_{part_num:04d}"
+                with open(part_path, "rb") as part:
+                    while read := part.readinto(buffer):
+                        digest.update(view[:read])
+                        assembled.write(view[:read])
+
+        return assembled_path, digest.hexdigest()
+
     def abort_upload(
         self,
         session: UploadSession,
@@ -380,7 +452,7 @@ class LocalChunkedUploadService(ChunkedUploadServiceBase):
             "filename": session.filename,
             "file_size": session.file_size,
             "bytes_received": session.bytes_received,
-            "parts_completed": len(session.parts_completed),
+            "parts_completed": session.parts_completed_count,
             "total_parts": session.total_parts,
             "progress_percent": progress_percent,
             "status": session.status,
@@ -194,40 +194,14 @@ class S3ChunkedUploadService(ChunkedUploadServiceBase):
 
         Stores the ETag which is required for CompleteMultipartUpload.
         """
-        # Check if this part already exists
-        existing_parts = {p["part_number"]: p for p in session.parts_completed}
-
-        if part_number not in existing_parts:
-            # Add new part
-            session.parts_completed.append(
-                {
-                    "part_number": part_number,
-                    "etag": etag,
-                    "size": size,
-                }
-            )
-            session.bytes_received += size
-        else:
-            # Part already recorded - update if needed
-            old_size = existing_parts[part_number]["size"]
-            for part in session.parts_completed:
-                if part["part_number"] == part_number:
-                    part["etag"] = etag
-                    part["size"] = size
-                    break
-            session.bytes_received = session.bytes_received - old_size + size
-
-        # Sort parts by part number
-        session.parts_completed.sort(key=lambda p: p["part_number"])
-        session.save()
-
-        is_complete = session.bytes_received >= session.file_size
+        # Record the part (atomic upsert, safe for parallel part uploads)
+        session.record_part(part_number, etag, size)
 
         return ServiceResult.success(
             PartCompletionResult(
                 bytes_received=session.bytes_received,
-                parts_completed=len(session.parts_completed),
-                is_complete=is_complete,
+                parts_completed=session.parts_completed_count,
+                is_complete=session.bytes_received >= session.file_size,
             )
         )
 
@@ -262,22 +236,20 @@ class S3ChunkedUploadService(ChunkedUploadServiceBase):
             )
 
         # Check all parts are present
-        completed_part_numbers = {p["part_number"] for p in session.parts_completed}
-        expected_parts = set(range(1, session.total_parts + 1))
-        missing_parts = expected_parts - completed_part_numbers
+        missing_parts = session.get_missing_part_numbers()
 
         if missing_parts:
             return ServiceResult.failure(
-                f"Missing parts: {sorted(missing_parts)}. Upload is incomplete."
+                f"Missing parts: {missing_parts}. Upload is incomplete."
             )
 
         try:
             with transaction.atomic():
                 # Build parts list for S3 completion
                 # Parts must be sorted by part number
-                parts = sorted(session.parts_completed, key=lambda p: p["part_number"])
                 s3_parts = [
-                    {"ETag": p["etag"], "PartNumber": p["part_number"]} for p in parts
+                    {"ETag": part.etag, "PartNumber": part.part_number}
+                    for part in session.parts.order_by("part_number")
                 ]
 
                 # Complete the multipart upload
@@ -289,7 +261,9 @@ class S3ChunkedUploadService(ChunkedUploadServiceBase):
                 )
 
                 # Create MediaFile pointing to S3 location
-                # We use the S3 key directly since the file is already in S3
+                # We use the S3 key directly since the file is already in S3.
+                # Parts never pass through the server and multipart ETags are
+                # not content hashes, so content_hash stays unset (no dedup).
                 media_file = MediaFile(
                     original_filename=session.filename,
                     media_type=session.media_type,
@@ -309,7 +283,7 @@ class S3ChunkedUploadService(ChunkedUploadServiceBase):
 
                 # Mark session as completed
                 session.status = UploadSession.Status.COMPLETED
-                session.save()
+                session.save(update_fields=["status", "updated_at"])
 
             # Trigger processing pipeline (outside transaction)
             chain(
@@ -373,7 +347,7 @@ class S3ChunkedUploadService(ChunkedUploadServiceBase):
             "filename": session.filename,
             "file_size": session.file_size,
             "bytes_received": session.bytes_received,
-            "parts_completed": len(session.parts_completed),
+            "parts_completed": session.parts_completed_count,
             "total_parts": session.total_parts,
             "progress_percent": progress_percent,
             "status": session.status,
@@ -0,0 +1,272 @@
+"""
+Content-addressed upload deduplication.
+
+This module lets identical uploads share one stored object:
+- Hashes uploads (SHA-256) so MediaFiles can be matched by content
+- Registers a ContentBlob once a file is scanned clean and fully processed
+- Creates later uploads of the same content as references to that blob,
+  reusing its scan result, metadata and MediaAsset outputs
+- Reference counts the blob so shared storage is deleted with its last file;
+  rows removed by a cascade (e.g. account deletion) release their reference
+  through a pre_delete handler (media.signals)
+
+Storage quota stays per user: every upload is charged to its uploader's
+quota, whether or not its bytes are shared.
+
+Usage:
+    from media.services.deduplication import (
+        compute_content_hash,
+        create_duplicate_upload,
+    )
+
+    content_hash = compute_content_hash(uploaded_file)
+    media_file = create_duplicate_upload(
+        content_hash=content_hash,
+        uploader=user,
+        original_filename=uploaded_file.name,
+        media_type="image",
+        mime_type="image/jpeg",
+        file_size=uploaded_file.size,
+    )
+    if media_file is None:
+        # Not seen before (or not yet clean and processed): store and process
+        media_file = MediaFile.create_from_upload(..., content_hash=content_hash)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from media.models import ContentBlob, MediaAsset, MediaFile
+
+if TYPE_CHECKING:
+    from django.core.files import File
+
+logger = logging.getLogger(__name__)
+
+
+def compute_content_hash(file: "File") -> str:
+    """
+    Compute the SHA-256 of a file, reading it in chunks.
+
+    The file is rewound afterwards so it can still be saved.
+
+    Args:
+        file: Uploaded or stored file.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def create_duplicate_upload(
+    content_hash: str,
+    uploader: Any,
+    original_filename: str,
+    media_type: str,
+    mime_type: str,
+    file_size: int,
+    visibility: str = MediaFile.Visibility.PRIVATE,
+) -> MediaFile | None:
+    """
+    Create a MediaFile that reuses already stored and processed content.
+
+    The new file points at the blob's stored object, copies the source
+    file's scan result and metadata, and gets MediaAsset rows referencing the
+    source's asset files, so it is READY without scanning or processing.
+    The blob is locked while its reference count is incremented, so a
+    concurrent hard delete cannot free the storage in between.
+
+    Quota accounting is left to the caller, as for create_from_upload.
+
+    Args:
+        content_hash: Hex SHA-256 of the uploaded content.
+        uploader: User uploading the file.
+        original_filename: Filename of this upload.
+        media_type: Category of the file.
+        mime_type: Detected MIME type.
+        file_size: Size of the upload in bytes.
+        visibility: Access level (default: private).
+
+    Returns:
+        The created MediaFile, or None if no clean, processed blob exists
+        for the hash (the caller stores and processes the upload as usual).
+    """
+    with transaction.atomic():
+        blob = (
+            ContentBlob.objects.select_for_update()
+            .filter(content_hash=content_hash, file_size=file_size)
+            .first()
+        )
+        if blob is None:
+            return None
+
+        source = blob.get_reusable_source()
+        if source is None:
+            return None
+
+        now = timezone.now()
+        media_file = MediaFile(
+            original_filename=original_filename,
+            media_type=media_type,
+            mime_type=mime_type,
+            file_size=file_size,
+            uploader=uploader,
+            visibility=visibility,
+            content_hash=content_hash,
+            blob=blob,
+            version=1,
+            is_current=True,
+            metadata=dict(source.metadata or {}),
+            scan_status=source.scan_status,
+            scanned_at=source.scanned_at,
+            processing_status=MediaFile.ProcessingStatus.READY,
+            processing_started_at=now,
+            processing_completed_at=now,
+        )
+        media_file.file.name = blob.file.name
+        media_file.save()
+
+        MediaAsset.objects.bulk_create(
+            MediaAsset(
+                media_file=media_file,
+                asset_type=asset.asset_type,
+                file=asset.file.name,
+                width=asset.width,
+                height=asset.height,
+                file_size=asset.file_size,
+            )
+            for asset in source.assets.all()
+        )
+
+        ContentBlob.objects.filter(pk=blob.pk).update(
+            reference_count=F("reference_count") + 1
+        )
+
+    logger.info(
+        "Deduplicated upload",
+        extra={
+            "media_file_id": str(media_file.id),
+            "source_media_file_id": str(source.id),
+            "content_hash": content_hash,
+        },
+    )
+    return media_file
+
+
+def register_content_blob(media_file: MediaFile) -> ContentBlob | None:
+    """
+    Make a clean, processed file's content available for deduplication.
+
+    Called once processing completes without errors. If another file with
+    the same content registered first, this file keeps its own stored
+    object and is not linked.
+
+    Args:
+        media_file: MediaFile with content_hash set.
+
+    Returns:
+        The created ContentBlob, or None if nothing was registered.
+    """
+    if not media_file.content_hash or media_file.blob_id is not None:
+        return None
+
+    with transaction.atomic():
+        blob, created = ContentBlob.objects.get_or_create(
+            content_hash=media_file.content_hash,
+            defaults={
+                "file": media_file.file.name,
+                "file_size": media_file.file_size,
+                "reference_count": 1,
+            },
+        )
+        if not created:
+            return None
+
+        MediaFile.all_objects.filter(pk=media_file.pk).update(blob=blob)
+
+    media_file.blob = blob
+    logger.debug(f"Registered content blob {blob.content_hash} for {media_file.id}")
+    return blob
+
+
+def release_content_blob(media_file: MediaFile) -> bool:
+    """
+    Drop a file's reference to its blob before the file is hard deleted.
+
+    The file is detached from the blob, so a later delete of its row (and
+    the pre_delete handler in media.signals) does not release it again.
+
+    Args:
+        media_file: MediaFile about to be permanently deleted.
+
+    Returns:
+        True if the file's stored object and asset files may be deleted
+        (it was not shared, or this was the last reference), False if
+        other files still use some of them (see get_shared_paths).
+    """
+    if media_file.blob_id is None:
+        return True
+
+    with transaction.atomic():
+        blob = (
+            ContentBlob.objects.select_for_update()
+            .filter(pk=media_file.blob_id)
+            .first()
+        )
+        if blob is None:
+            return True
+
+        if blob.reference_count > 1:
+            ContentBlob.objects.filter(pk=blob.pk).update(
+                reference_count=F("reference_count") - 1
+            )
+            MediaFile.all_objects.filter(pk=media_file.pk).update(blob=None)
+            media_file.blob = None
+            return False
+
+        blob.delete()
+
+    media_file.blob = None
+    return True
+
+
+def get_shared_paths(blob_id: Any) -> set[str]:
+    """
+    Get the storage paths still used by the files referencing a blob.
+
+    Call it in the transaction that released a reference to the blob, so
+    the blob stays locked and no duplicate can start using more paths.
+
+    Args:
+        blob_id: ID of the ContentBlob.
+
+    Returns:
+        The blob's stored object and the asset files of its remaining
+        referencing files.
+    """
+    blob = ContentBlob.objects.filter(pk=blob_id).first()
+    if blob is None:
+        return set()
+
+    paths = {blob.file.name}
+    paths.update(
+        MediaFile.all_objects.filter(blob_id=blob_id).values_list("file", flat=True)
+    )
+    paths.update(
+        MediaAsset.objects.filter(media_file__blob_id=blob_id).values_list(
+            "file", flat=True
+        )
+    )
+    return paths
@@ -3,6 +3,7 @@ Django signals for the media app.
 
 Provides handlers for:
 - Search vector updates on tag changes
+- Content blob reference release on MediaFile deletion
 """
 
 from __future__ import annotations
@@ -10,7 +11,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 
 if TYPE_CHECKING:
     pass
@@ -26,7 +27,7 @@ def connect_signals():
     Called from MediaConfig.ready() to ensure signals are connected
     after all models are loaded.
     """
-    from media.models import MediaFileTag
+    from media.models import MediaFile, MediaFileTag
 
     # Connect tag change handlers
     post_save.connect(
@@ -40,6 +41,13 @@ def connect_signals():
         dispatch_uid="search_vector_tag_remove",
     )
 
+    # Release deduplicated content when rows are deleted (incl. cascades)
+    pre_delete.connect(
+        release_content_blob_on_delete,
+        sender=MediaFile,
+        dispatch_uid="release_content_blob_on_delete",
+    )
+
     logger.debug("Media signals connected")
 
 
@@ -98,3 +106,30 @@ def update_search_vector_on_tag_remove(
     except Exception as e:
         # Log but don't raise - tag removal should succeed even if search update fails
         logger.error(f"Failed to update search vector on tag remove: {e}")
+
+
+def release_content_blob_on_delete(
+    sender,
+    instance,
+    **kwargs,
+) -> None:
+    """
+    Release a MediaFile's content blob reference when its row is deleted.
+
+    hard_delete_expired_files releases the reference itself before deleting
+    storage; this covers rows removed any other way, such as the cascade
+    from deleting the uploader's account, so reference counts stay correct.
+    Storage is not deleted here, as for other cascaded MediaFiles.
+
+    Args:
+        sender: MediaFile model class.
+        instance: MediaFile instance being deleted.
+        **kwargs: Additional signal arguments.
+    """
+    if instance.blob_id is None:
+        return
+
+    from media.services.deduplication import release_content_blob
+
+    release_content_blob(instance)
+    logger.debug(f"Released content blob reference of deleted file {instance.id}")
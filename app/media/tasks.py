@@ -254,11 +254,12 @@ def process_media_file(self, scan_result: dict | str) -> dict:
     4. Extracts metadata (best effort)
     5. Generates derivative assets (each independently, partial failures OK)
     6. Always transitions to READY (graceful degradation)
+    7. Registers clean, error-free content for upload deduplication
 
     Processing is type-specific:
-    - Images: thumbnail, preview, web-optimized + metadata
+    - Images: thumbnail, preview, web-optimized + metadata (one decode)
     - Videos: poster frame + metadata
-    - Documents: thumbnail, extracted text + metadata
+    - Documents: thumbnail, extracted text (in parallel) + metadata
     - Audio: No processing yet (marked ready)
 
     Graceful Degradation:
@@ -283,15 +284,12 @@ def process_media_file(self, scan_result: dict | str) -> dict:
         PermanentProcessingError,
         TransientProcessingError,
         extract_document_metadata,
-        extract_document_text,
-        extract_image_metadata,
         extract_video_metadata,
         extract_video_poster,
-        generate_document_thumbnail,
-        generate_image_preview,
-        generate_image_thumbnail,
-        generate_image_web_optimized,
+        generate_document_derivatives,
+        generate_image_derivatives,
     )
+    from media.services.deduplication import register_content_blob
 
     # Handle both chain input (dict) and direct call (str)
     if isinstance(scan_result, dict):
@@ -374,43 +372,22 @@ def process_media_file(self, scan_result: dict | str) -> dict:
     try:
         # Dispatch to appropriate processor based on media type
         if media_file.media_type == MediaFile.MediaType.IMAGE:
-            # Extract metadata (best effort)
+            # Decode once; metadata and every derivative come from that decode.
+            # Failed derivatives are recorded, the rest are still generated.
             try:
-                meta = extract_image_metadata(media_file)
-                metadata_updates.update(meta)
+                derivatives = generate_image_derivatives(media_file)
             except Exception as e:
-                errors.append(f"metadata: {e}")
+                errors.append(f"image: {e}")
                 logger.warning(
-                    "Failed to extract image metadata",
+                    "Failed to decode image",
                     extra={"media_file_id": str(media_file_id), "error": str(e)},
                 )
-
-            # Generate assets independently (graceful degradation)
-            for generator, asset_name in [
-                (generate_image_thumbnail, "thumbnail"),
-                (generate_image_preview, "preview"),
-                (generate_image_web_optimized, "web_optimized"),
-            ]:
-                try:
-                    generator(media_file)
-                except PermanentProcessingError as e:
-                    errors.append(f"{asset_name}: {e}")
-                    logger.warning(
-                        f"Failed to generate {asset_name} (permanent)",
-                        extra={"media_file_id": str(media_file_id), "error": str(e)},
-                    )
-                except TransientProcessingError as e:
-                    errors.append(f"{asset_name}: {e}")
-                    logger.warning(
-                        f"Failed to generate {asset_name} (transient)",
-                        extra={"media_file_id": str(media_file_id), "error": str(e)},
-                    )
-                except Exception as e:
-                    errors.append(f"{asset_name}: {e}")
-                    logger.warning(
-                        f"Unexpected error generating {asset_name}",
-                        extra={"media_file_id": str(media_file_id), "error": str(e)},
-                    )
+            else:
+                metadata_updates.update(derivatives.metadata)
+                errors.extend(
+                    f"{asset_name}: {error}"
+                    for asset_name, error in derivatives.errors.items()
+                )
 
         elif media_file.media_type == MediaFile.MediaType.VIDEO:
             # Extract metadata (best effort)
@@ -458,31 +435,21 @@ def process_media_file(self, scan_result: dict | str) -> dict:
                     extra={"media_file_id": str(media_file_id), "error": str(e)},
                 )
 
-            # Generate assets independently (graceful degradation)
-            for generator, asset_name in [
-                (generate_document_thumbnail, "thumbnail"),
-                (extract_document_text, "text"),
-            ]:
-                try:
-                    generator(media_file)
-                except PermanentProcessingError as e:
-                    errors.append(f"{asset_name}: {e}")
-                    logger.warning(
-                        f"Failed to generate {asset_name} (permanent)",
-                        extra={"media_file_id": str(media_file_id), "error": str(e)},
-                    )
-                except TransientProcessingError as e:
-                    errors.append(f"{asset_name}: {e}")
-                    logger.warning(
-                        f"Failed to generate {asset_name} (transient)",
-                        extra={"media_file_id": str(media_file_id), "error": str(e)},
-                    )
-                except Exception as e:
-                    errors.append(f"{asset_name}: {e}")
-                    logger.warning(
-                        f"Unexpected error generating {asset_name}",
-                        extra={"media_file_id": str(media_file_id), "error": str(e)},
-                    )
+            # Thumbnail and text run in parallel in the processing pool;
+            # failed derivatives are recorded, the other is still stored
+            try:
+                derivatives = generate_document_derivatives(media_file)
+            except Exception as e:
+                errors.append(f"document: {e}")
+                logger.warning(
+                    "Failed to prepare document for processing",
+                    extra={"media_file_id": str(media_file_id), "error": str(e)},
+                )
+            else:
+                errors.extend(
+                    f"{asset_name}: {error}"
+                    for asset_name, error in derivatives.errors.items()
+                )
 
         elif media_file.media_type == MediaFile.MediaType.AUDIO:
             # Audio processing not yet implemented
@@ -525,6 +492,16 @@ def process_media_file(self, scan_result: dict | str) -> dict:
                 ]
             )
 
+        # Identical uploads can now reuse this file's storage and outputs
+        if not errors and media_file.scan_status == MediaFile.ScanStatus.CLEAN:
+            try:
+                register_content_blob(media_file)
+            except Exception as e:
+                logger.warning(
+                    "Failed to register content blob",
+                    extra={"media_file_id": str(media_file_id), "error": str(e)},
+                )
+
         log_level = logging.WARNING if errors else logging.INFO
         logger.log(
             log_level,
@@ -1217,6 +1194,11 @@ def hard_delete_expired_files() -> dict:
     4. Deletes the main file from storage
     5. Hard deletes the MediaFile record
 
+    Files sharing deduplicated content release their ContentBlob reference;
+    main and asset files that remaining references still point at stay in
+    storage until the last reference goes. Asset files only this file uses
+    are deleted right away.
+
     This task should be scheduled via celery-beat, e.g., daily at 2am.
 
     Returns:
@@ -1228,6 +1210,7 @@ def hard_delete_expired_files() -> dict:
     from django.core.files.storage import default_storage
 
     from media.models import MediaFile
+    from media.services.deduplication import get_shared_paths, release_content_blob
 
     retention_days = getattr(settings, "SOFT_DELETE_RETENTION_DAYS", 30)
     threshold = timezone.now() - timedelta(days=retention_days)
@@ -1249,11 +1232,20 @@ def hard_delete_expired_files() -> dict:
             file_id = str(media_file.id)
 
             with transaction.atomic():
+                # Shared content stays in storage while other files use it
+                blob_id = media_file.blob_id
+                free_storage = release_content_blob(media_file)
+                shared_paths = set() if free_storage else get_shared_paths(blob_id)
+
                 # 1. Delete associated MediaAssets and their storage files
                 if hasattr(media_file, "assets"):
                     for asset in media_file.assets.all():
                         # Delete asset file from storage
-                        if asset.file and default_storage.exists(asset.file.name):
+                        if (
+                            asset.file
+                            and asset.file.name not in shared_paths
+                            and default_storage.exists(asset.file.name)
+                        ):
                             try:
                                 default_storage.delete(asset.file.name)
                             except Exception as e:
@@ -1275,7 +1267,11 @@ def hard_delete_expired_files() -> dict:
                     media_file.file_tags.all().delete()
 
                 # 4. Delete the main file from storage
-                if media_file.file and default_storage.exists(media_file.file.name):
+                if (
+                    media_file.file
+                    and media_file.file.name not in shared_paths
+                    and default_storage.exists(media_file.file.name)
+                ):
                     try:
                         # Try to delete the containing directory if empty after file deletion
                         file_path = media_file.file.name
@@ -1310,7 +1306,8 @@ def hard_delete_expired_files() -> dict:
                 MediaFile.all_objects.filter(pk=media_file.pk).delete()
 
             deleted_count += 1
-            storage_freed_bytes += file_size
+            if media_file.file.name not in shared_paths:
+                storage_freed_bytes += file_size
 
             logger.info(
                 "Permanently deleted expired media file",
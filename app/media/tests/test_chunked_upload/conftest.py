@@ -173,12 +173,8 @@ def session_with_parts(
     part_2_path.write_bytes(chunk_data_5mb)
 
     # Update session progress
-    local_session.parts_completed = [
-        {"part_number": 1, "etag": "etag1", "size": len(chunk_data_5mb)},
-        {"part_number": 2, "etag": "etag2", "size": len(chunk_data_5mb)},
-    ]
-    local_session.bytes_received = 2 * len(chunk_data_5mb)
-    local_session.save()
+    local_session.record_part(1, "etag1", len(chunk_data_5mb))
+    local_session.record_part(2, "etag2", len(chunk_data_5mb))
 
     return local_session
 
@@ -6,6 +6,8 @@ Following TDD: These tests define the expected behavior before implementation.
 
 from __future__ import annotations
 
+import hashlib
+import io
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -16,7 +18,10 @@ import pytest
 from django.utils import timezone
 
 from media.models import MediaFile, UploadSession
-from media.services.chunked_upload.local import LocalChunkedUploadService
+from media.services.chunked_upload.local import (
+    RECEIVE_BUFFER_SIZE,
+    LocalChunkedUploadService,
+)
 
 if TYPE_CHECKING:
     from authentication.models import User
@@ -316,6 +321,159 @@ class TestLocalReceiveChunk:
         result3 = service.receive_chunk(local_session, 3, chunk_data_5mb)
         assert result3.data.is_complete is True
 
+    def test_parallel_parts_do_not_lose_updates(
+        self,
+        local_session: UploadSession,
+        chunk_data_5mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Parts recorded through separately loaded sessions are all kept.
+
+        Why it matters: Parallel part uploads each load the session; a
+        read-modify-write of shared progress would drop all but one.
+        """
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        first = UploadSession.objects.get(pk=local_session.pk)
+        second = UploadSession.objects.get(pk=local_session.pk)
+
+        service.receive_chunk(first, 1, chunk_data_5mb)
+        result = service.receive_chunk(second, 2, chunk_data_5mb)
+
+        assert result.data.parts_completed == 2
+        assert result.data.bytes_received == 2 * len(chunk_data_5mb)
+        local_session.refresh_from_db()
+        assert local_session.get_completed_part_numbers() == {1, 2}
+
+    def test_reupload_replaces_part(
+        self,
+        local_session: UploadSession,
+        chunk_data_5mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """Re-uploading a part replaces it instead of adding to bytes_received."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        replacement = b"z" * len(chunk_data_5mb)
+
+        service.receive_chunk(local_session, 1, chunk_data_5mb)
+        result = service.receive_chunk(local_session, 1, replacement)
+
+        assert result.data.bytes_received == len(replacement)
+        assert local_session.parts_completed == [
+            {
+                "part_number": 1,
+                "etag": hashlib.md5(replacement).hexdigest(),
+                "size": len(replacement),
+            }
+        ]
+
+    def test_receive_chunk_stream_reads_in_blocks(
+        self,
+        local_session: UploadSession,
+        chunk_data_5mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """Streamed chunks are written without reading the body at once."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        stream = io.BytesIO(chunk_data_5mb)
+        read_sizes = []
+        original_read = stream.read
+
+        def tracking_read(size=-1):
+            read_sizes.append(size)
+            return original_read(size)
+
+        stream.read = tracking_read
+
+        result = service.receive_chunk_stream(local_session, 1, stream)
+
+        assert result.success
+        assert result.data.bytes_received == len(chunk_data_5mb)
+        assert set(read_sizes) == {RECEIVE_BUFFER_SIZE}
+        part_path = Path(local_session.local_temp_dir) / "part_0001"
+        assert part_path.read_bytes() == chunk_data_5mb
+        etag = local_session.parts_completed[0]["etag"]
+        assert etag == hashlib.md5(chunk_data_5mb).hexdigest()
+
+    def test_receive_chunk_stream_rejects_empty_body(
+        self,
+        local_session: UploadSession,
+        tmp_path: Path,
+    ) -> None:
+        """An empty stream is rejected and leaves no part file behind."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+
+        result = service.receive_chunk_stream(local_session, 1, io.BytesIO())
+
+        assert not result.success
+        assert os.listdir(local_session.local_temp_dir) == []
+
+    def test_oversized_part_rejected(
+        self,
+        local_session: UploadSession,
+        chunk_data_5mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """
+        A part larger than chunk_size is rejected without being stored.
+
+        Why it matters: quota is charged on the declared file_size, so an
+        oversized part would store bytes the user is never charged for.
+        """
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        stream = io.BytesIO(chunk_data_5mb + b"extra" * RECEIVE_BUFFER_SIZE)
+        read_sizes = []
+        original_read = stream.read
+
+        def tracking_read(size=-1):
+            read_sizes.append(size)
+            return original_read(size)
+
+        stream.read = tracking_read
+
+        result = service.receive_chunk_stream(local_session, 1, stream)
+
+        assert not result.success
+        assert "exceeds" in result.error
+        # Reading stops one buffer past the expected size
+        assert len(read_sizes) == len(chunk_data_5mb) // RECEIVE_BUFFER_SIZE + 1
+        assert os.listdir(local_session.local_temp_dir) == []
+        assert local_session.parts_completed_count == 0
+
+    def test_undersized_part_rejected(
+        self,
+        local_session: UploadSession,
+        chunk_data_1mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """A part smaller than chunk_size (and not the last) is rejected."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+
+        result = service.receive_chunk(local_session, 1, chunk_data_1mb)
+
+        assert not result.success
+        assert os.listdir(local_session.local_temp_dir) == []
+
+    def test_last_part_holds_remainder(
+        self,
+        upload_user: "User",
+        tmp_path: Path,
+    ) -> None:
+        """The last part must be exactly the remainder of file_size."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        session = service.create_session(
+            user=upload_user,
+            filename="remainder.bin",
+            file_size=1500,
+            mime_type="application/octet-stream",
+            media_type="other",
+        ).data
+        session.chunk_size = 1000
+        session.save()
+
+        assert not service.receive_chunk(session, 2, b"r" * 1000).success
+        assert service.receive_chunk(session, 2, b"r" * 500).success
+
 
 class TestLocalFinalization:
     """Tests for LocalChunkedUploadService.finalize_upload()."""
@@ -525,6 +683,115 @@ class TestLocalFinalization:
             content = f.read()
             assert content == chunk1 + chunk2 + chunk3
 
+    def test_finalize_streams_through_fixed_buffer(
+        self,
+        upload_user: "User",
+        tmp_path: Path,
+    ) -> None:
+        """Parts larger than the copy buffer assemble intact, hashed in one pass."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        chunk1 = os.urandom(1000)
+        chunk2 = os.urandom(700)
+
+        session = service.create_session(
+            user=upload_user,
+            filename="stream.bin",
+            file_size=len(chunk1) + len(chunk2),
+            mime_type="application/octet-stream",
+            media_type="other",
+        ).data
+        session.chunk_size = len(chunk1)
+        session.save()
+        service.receive_chunk(session, 1, chunk1)
+        service.receive_chunk(session, 2, chunk2)
+
+        with patch("media.services.chunked_upload.local.ASSEMBLY_BUFFER_SIZE", 256):
+            result = service.finalize_upload(session)
+
+        assert result.success
+        assert result.data.content_hash == hashlib.sha256(chunk1 + chunk2).hexdigest()
+        with result.data.file.open("rb") as f:
+            assert f.read() == chunk1 + chunk2
+
+    def test_finalize_rejects_size_mismatch(
+        self,
+        local_session: UploadSession,
+        chunk_data_5mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """Finalize fails when the assembled bytes differ from file_size."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        for part_number in (1, 2, 3):
+            service.receive_chunk(local_session, part_number, chunk_data_5mb)
+        # A part file altered after it was recorded
+        part_path = Path(local_session.local_temp_dir) / "part_0003"
+        part_path.write_bytes(chunk_data_5mb * 2)
+
+        result = service.finalize_upload(local_session)
+
+        assert not result.success
+        assert "does not match" in result.error
+        assert not MediaFile.objects.filter(uploader=local_session.uploader).exists()
+
+    def test_finalize_stores_content_hash(
+        self,
+        local_session: UploadSession,
+        chunk_data_5mb: bytes,
+        tmp_path: Path,
+    ) -> None:
+        """The SHA-256 computed while assembling is stored on the MediaFile."""
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        for part_number in (1, 2, 3):
+            service.receive_chunk(local_session, part_number, chunk_data_5mb)
+
+        result = service.finalize_upload(local_session)
+
+        assert result.success
+        assert result.data.content_hash == (
+            hashlib.sha256(chunk_data_5mb * 3).hexdigest()
+        )
+
+    def test_finalize_deduplicates_processed_content(
+        self,
+        upload_user: "User",
+        tmp_path: Path,
+    ) -> None:
+        """Content matching a clean, processed blob reuses it without processing."""
+        from media.services.deduplication import register_content_blob
+
+        service = LocalChunkedUploadService(temp_base_dir=str(tmp_path / "chunks"))
+        content = os.urandom(1000)
+
+        def upload():
+            session = service.create_session(
+                user=upload_user,
+                filename="dup.bin",
+                file_size=len(content),
+                mime_type="application/octet-stream",
+                media_type="other",
+            ).data
+            service.receive_chunk(session, 1, content)
+            with patch("media.services.chunked_upload.local.chain") as mock_chain:
+                result = service.finalize_upload(session)
+            assert result.success
+            return result.data, mock_chain
+
+        source, _ = upload()
+        MediaFile.objects.filter(pk=source.pk).update(
+            scan_status=MediaFile.ScanStatus.CLEAN,
+            processing_status=MediaFile.ProcessingStatus.READY,
+        )
+        source.refresh_from_db()
+        register_content_blob(source)
+
+        duplicate, mock_chain = upload()
+
+        mock_chain.assert_not_called()
+        assert duplicate.file.name == source.file.name
+        assert duplicate.processing_status == MediaFile.ProcessingStatus.READY
+        upload_user.profile.refresh_from_db()
+        assert upload_user.profile.total_storage_bytes == 2 * len(content)
+
 
 class TestLocalAbort:
     """Tests for LocalChunkedUploadService.abort_upload()."""
@@ -0,0 +1,311 @@
+"""
+Tests for content-addressed upload deduplication.
+
+These tests verify:
+- Content hashing of uploads
+- Blob registration after clean, error-free processing
+- Duplicate uploads sharing storage, scan result and assets
+- Reference counting on hard delete and cascaded deletes
+- Per-user quota accounting for deduplicated uploads
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from media.models import ContentBlob, MediaAsset, MediaFile
+from media.serializers import MediaFileUploadSerializer
+from media.services.deduplication import (
+    compute_content_hash,
+    create_duplicate_upload,
+    register_content_blob,
+    release_content_blob,
+)
+
+
+@pytest.fixture
+def processed_jpeg(user, sample_jpeg_uploaded) -> MediaFile:
+    """A clean, processed JPEG with a thumbnail, registered as a blob."""
+    content_hash = compute_content_hash(sample_jpeg_uploaded)
+    media_file = MediaFile.create_from_upload(
+        file=sample_jpeg_uploaded,
+        uploader=user,
+        media_type=MediaFile.MediaType.IMAGE,
+        mime_type="image/jpeg",
+        metadata={"width": 100, "height": 100},
+        content_hash=content_hash,
+    )
+    media_file.scan_status = MediaFile.ScanStatus.CLEAN
+    media_file.scanned_at = timezone.now()
+    media_file.processing_status = MediaFile.ProcessingStatus.READY
+    media_file.save()
+    MediaAsset.objects.create(
+        media_file=media_file,
+        asset_type=MediaAsset.AssetType.THUMBNAIL,
+        file=ContentFile(b"thumbnail", name="thumbnail.webp"),
+        width=50,
+        height=50,
+        file_size=9,
+    )
+    register_content_blob(media_file)
+    return media_file
+
+
+def _duplicate_of(source: MediaFile, uploader) -> MediaFile | None:
+    return create_duplicate_upload(
+        content_hash=source.content_hash,
+        uploader=uploader,
+        original_filename="copy.jpg",
+        media_type=source.media_type,
+        mime_type=source.mime_type,
+        file_size=source.file_size,
+    )
+
+
+class TestComputeContentHash:
+    """Tests for compute_content_hash.
+
+    Why it matters: the hash is the dedup key; the file must still be
+    readable from the start afterwards so it can be stored.
+    """
+
+    def test_sha256_and_rewinds(self):
+        """Returns the hex SHA-256 and leaves the file rewound."""
+        content = b"x" * 200_000
+        uploaded = SimpleUploadedFile("a.bin", content)
+
+        assert compute_content_hash(uploaded) == hashlib.sha256(content).hexdigest()
+        assert uploaded.read() == content
+
+
+@pytest.mark.django_db
+class TestRegisterContentBlob:
+    """Tests for register_content_blob.
+
+    Why it matters: only clean, processed content may be reused, and each
+    content hash maps to one stored object.
+    """
+
+    def test_registers_blob_for_file(self, processed_jpeg):
+        """The file's stored object becomes the blob with one reference."""
+        blob = ContentBlob.objects.get(content_hash=processed_jpeg.content_hash)
+
+        assert blob.file.name == processed_jpeg.file.name
+        assert blob.reference_count == 1
+        processed_jpeg.refresh_from_db()
+        assert processed_jpeg.blob == blob
+
+    def test_skips_file_without_hash(self, user, sample_jpeg_uploaded):
+        """Files without a content hash are not registered."""
+        media_file = MediaFile.create_from_upload(
+            file=sample_jpeg_uploaded,
+            uploader=user,
+            media_type=MediaFile.MediaType.IMAGE,
+            mime_type="image/jpeg",
+        )
+
+        assert register_content_blob(media_file) is None
+        assert not ContentBlob.objects.exists()
+
+    def test_second_copy_keeps_own_storage(self, processed_jpeg, user):
+        """A copy processed after the blob exists is not linked to it."""
+        copy = MediaFile.create_from_upload(
+            file=ContentFile(b"same", name="copy.jpg"),
+            uploader=user,
+            media_type=MediaFile.MediaType.IMAGE,
+            mime_type="image/jpeg",
+            content_hash=processed_jpeg.content_hash,
+        )
+
+        assert register_content_blob(copy) is None
+        copy.refresh_from_db()
+        assert copy.blob is None
+
+
+@pytest.mark.django_db
+class TestCreateDuplicateUpload:
+    """Tests for create_duplicate_upload.
+
+    Why it matters: duplicates skip storage, scanning and processing, so
+    they must inherit exactly the outputs of a safe, complete source.
+    """
+
+    def test_reuses_storage_scan_and_assets(self, processed_jpeg, other_user):
+        """The duplicate shares the stored object and copies the outputs."""
+        duplicate = _duplicate_of(processed_jpeg, other_user)
+
+        assert duplicate.uploader == other_user
+        assert duplicate.original_filename == "copy.jpg"
+        assert duplicate.file.name == processed_jpeg.file.name
+        assert duplicate.scan_status == MediaFile.ScanStatus.CLEAN
+        assert duplicate.processing_status == MediaFile.ProcessingStatus.READY
+        assert duplicate.metadata == {"width": 100, "height": 100}
+
+        thumbnail = duplicate.assets.get()
+        source_thumbnail = processed_jpeg.assets.get()
+        assert thumbnail.file.name == source_thumbnail.file.name
+        assert thumbnail.dimensions == "50x50"
+
+        blob = ContentBlob.objects.get(content_hash=processed_jpeg.content_hash)
+        assert blob.reference_count == 2
+
+    def test_unknown_hash_returns_none(self, user):
+        """No blob for the hash means a normal upload."""
+        duplicate = create_duplicate_upload(
+            content_hash="0" * 64,
+            uploader=user,
+            original_filename="new.jpg",
+            media_type=MediaFile.MediaType.IMAGE,
+            mime_type="image/jpeg",
+            file_size=10,
+        )
+
+        assert duplicate is None
+
+    def test_failed_source_not_reused(self, processed_jpeg, other_user):
+        """Content processed with errors is stored and processed again."""
+        MediaFile.objects.filter(pk=processed_jpeg.pk).update(
+            processing_error="thumbnail: failed"
+        )
+
+        assert _duplicate_of(processed_jpeg, other_user) is None
+
+
+@pytest.mark.django_db
+class TestReleaseContentBlob:
+    """Tests for release_content_blob and hard delete of shared content.
+
+    Why it matters: deleting one user's copy must never delete bytes
+    another user's file still points at.
+    """
+
+    def test_unshared_file_may_be_deleted(self, user, sample_jpeg_uploaded):
+        """Files without a blob free their storage as before."""
+        media_file = MediaFile.create_from_upload(
+            file=sample_jpeg_uploaded,
+            uploader=user,
+            media_type=MediaFile.MediaType.IMAGE,
+            mime_type="image/jpeg",
+        )
+
+        assert release_content_blob(media_file) is True
+
+    def test_last_reference_deletes_blob(self, processed_jpeg, other_user):
+        """Storage is freed only when the last reference is released."""
+        duplicate = _duplicate_of(processed_jpeg, other_user)
+
+        assert release_content_blob(processed_jpeg) is False
+        assert ContentBlob.objects.get().reference_count == 1
+
+        assert release_content_blob(duplicate) is True
+        assert not ContentBlob.objects.exists()
+
+    def test_hard_delete_keeps_shared_files(self, processed_jpeg, other_user):
+        """Hard deleting the source leaves the duplicate's bytes in place."""
+        from media.tasks import hard_delete_expired_files
+
+        duplicate = _duplicate_of(processed_jpeg, other_user)
+        thumbnail_name = duplicate.assets.get().file.name
+        processed_jpeg.soft_delete()
+        MediaFile.all_objects.filter(pk=processed_jpeg.pk).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+
+        result = hard_delete_expired_files()
+
+        assert result["deleted_count"] == 1
+        assert result["storage_freed_bytes"] == 0
+        assert default_storage.exists(duplicate.file.name)
+        assert default_storage.exists(thumbnail_name)
+
+    def test_hard_delete_removes_assets_only_it_uses(self, processed_jpeg, other_user):
+        """
+        A shared file's own asset files are deleted; shared ones are kept.
+
+        Why it matters: A duplicate reprocessed after upload owns new asset
+        files that nothing else points at; keeping them would leak storage.
+        """
+        from media.tasks import hard_delete_expired_files
+
+        duplicate = _duplicate_of(processed_jpeg, other_user)
+        thumbnail_name = duplicate.assets.get().file.name
+        preview = MediaAsset.objects.create(
+            media_file=duplicate,
+            asset_type=MediaAsset.AssetType.PREVIEW,
+            file=ContentFile(b"preview", name="preview.webp"),
+            width=80,
+            height=80,
+            file_size=7,
+        )
+        duplicate.soft_delete()
+        MediaFile.all_objects.filter(pk=duplicate.pk).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+
+        hard_delete_expired_files()
+
+        assert not default_storage.exists(preview.file.name)
+        assert default_storage.exists(thumbnail_name)
+        assert default_storage.exists(processed_jpeg.file.name)
+        assert ContentBlob.objects.get().reference_count == 1
+
+    def test_cascade_delete_releases_reference(self, processed_jpeg, other_user):
+        """
+        Deleting an account releases its files' blob references.
+
+        Why it matters: A count left too high would keep the last copy's
+        storage forever once every real reference is gone.
+        """
+        _duplicate_of(processed_jpeg, other_user)
+        assert ContentBlob.objects.get().reference_count == 2
+
+        other_user.delete()
+
+        assert ContentBlob.objects.get().reference_count == 1
+        assert release_content_blob(processed_jpeg) is True
+        assert not ContentBlob.objects.exists()
+
+
+@pytest.mark.django_db
+class TestDeduplicatedUploadQuota:
+    """Tests for the upload serializer with duplicate content.
+
+    Why it matters: shared storage is an implementation detail; each user
+    is still charged for every file they upload.
+    """
+
+    def test_duplicate_upload_charged_to_uploader(
+        self, processed_jpeg, other_user, sample_jpeg
+    ):
+        """A deduplicated upload skips the pipeline but counts toward quota."""
+        request = Mock(user=other_user)
+        uploaded = SimpleUploadedFile(
+            "again.jpg", sample_jpeg.getvalue(), content_type="image/jpeg"
+        )
+        serializer = MediaFileUploadSerializer(
+            data={"file": uploaded}, context={"request": request}
+        )
+        assert serializer.is_valid(), serializer.errors
+        initial_storage = other_user.profile.total_storage_bytes
+
+        with (
+            patch("media.tasks.scan_file_for_malware.s") as mock_scan,
+            patch("media.tasks.update_search_vector_safe.delay"),
+        ):
+            media_file = serializer.save()
+
+        mock_scan.assert_not_called()
+        assert media_file.blob_id == processed_jpeg.blob_id
+        assert media_file.processing_status == MediaFile.ProcessingStatus.READY
+        other_user.profile.refresh_from_db()
+        assert other_user.profile.total_storage_bytes == (
+            initial_storage + processed_jpeg.file_size
+        )
@@ -3,6 +3,8 @@ Tests for media file processors.
 
 Tests cover:
 - Image thumbnail generation with Pillow
+- Single-decode derivative pipeline (draft decoding, downscale cascade)
+- Processing pool (inline mode, child processes) and parallel document jobs
 - Color mode conversion (RGBA, LA, P to RGB)
 - Error handling for corrupted/invalid images
 - File size limits
@@ -577,6 +579,138 @@ class TestGenerateImageWebOptimized:
         assert asset.height == 1638  # Maintains 5:4 ratio (rounded)
 
 
+# =============================================================================
+# Tests for the Derivative Pipeline
+# =============================================================================
+
+
+def _jpeg_media_file(user, size: tuple[int, int]) -> MediaFile:
+    """Create an image MediaFile from a solid-colour JPEG of the given size."""
+    image = Image.new("RGB", size, color="orange")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG")
+    uploaded = SimpleUploadedFile(
+        name="pipeline.jpg",
+        content=buffer.getvalue(),
+        content_type="image/jpeg",
+    )
+    return MediaFile.create_from_upload(
+        file=uploaded,
+        uploader=user,
+        media_type="image",
+        mime_type="image/jpeg",
+    )
+
+
+@pytest.mark.django_db
+class TestGenerateImageDerivatives:
+    """Tests for generate_image_derivatives.
+
+    Why it matters: the pipeline replaces three separate open/decode/convert
+    passes; it must produce the same assets and metadata from one decode.
+    """
+
+    def test_decodes_source_once(self, media_file_image):
+        """All derivatives and metadata come from a single Image.open."""
+        from media.processors.image import generate_image_derivatives
+
+        with patch("media.processors.image.Image.open", wraps=Image.open) as mock_open:
+            result = generate_image_derivatives(media_file_image)
+
+        assert mock_open.call_count == 1
+        assert set(result.assets) == {
+            MediaAsset.AssetType.THUMBNAIL,
+            MediaAsset.AssetType.PREVIEW,
+            MediaAsset.AssetType.WEB_OPTIMIZED,
+        }
+        assert result.errors == {}
+        assert result.metadata["width"] == 100
+        assert result.metadata["format"] == "JPEG"
+        assert MediaAsset.objects.filter(media_file=media_file_image).count() == 3
+
+    def test_cascade_sizes(self, user):
+        """Each derivative is scaled into its own bounding box."""
+        from media.processors.image import generate_image_derivatives
+
+        media_file = _jpeg_media_file(user, (4000, 3000))
+
+        result = generate_image_derivatives(media_file)
+
+        assets = result.assets
+        assert assets[MediaAsset.AssetType.WEB_OPTIMIZED].dimensions == "2048x1536"
+        assert assets[MediaAsset.AssetType.PREVIEW].dimensions == "800x600"
+        assert assets[MediaAsset.AssetType.THUMBNAIL].dimensions == "200x150"
+        # Metadata reports the original, not the drafted, dimensions
+        assert result.metadata["width"] == 4000
+        assert result.metadata["height"] == 3000
+
+    def test_large_jpeg_decoded_at_reduced_scale(self, user):
+        """JPEG DCT scaling decodes no larger than the biggest derivative needs."""
+        from media.processors.image import (
+            WEB_OPTIMIZED_MAX_SIZE,
+            _decode_image,
+            _read_source,
+        )
+
+        media_file = _jpeg_media_file(user, (5000, 4000))
+
+        img, metadata = _decode_image(_read_source(media_file), WEB_OPTIMIZED_MAX_SIZE)
+
+        # 1/2 scale is the smallest that still covers 2048x1638
+        assert img.size == (2500, 2000)
+        assert metadata["width"] == 5000
+        assert metadata["height"] == 4000
+
+    def test_pool_job_receives_source_path(self, media_file_image):
+        """
+        The pool job gets a local path, not the file contents.
+
+        Why it matters: Arguments are pickled to the pool process; passing
+        the contents would copy every original through a pipe.
+        """
+        from media.processors import pool
+        from media.processors.image import generate_image_derivatives
+
+        with patch.object(pool, "submit", wraps=pool.submit) as mock_submit:
+            generate_image_derivatives(media_file_image)
+
+        source_path = mock_submit.call_args.args[2]
+        assert source_path == media_file_image.file.path
+
+    def test_reprocessing_updates_existing_assets(self, media_file_image):
+        """Running the pipeline twice updates the same asset rows."""
+        from media.processors.image import generate_image_derivatives
+
+        first = generate_image_derivatives(media_file_image)
+        second = generate_image_derivatives(media_file_image)
+
+        assert {k: a.pk for k, a in first.assets.items()} == {
+            k: a.pk for k, a in second.assets.items()
+        }
+        assert MediaAsset.objects.filter(media_file=media_file_image).count() == 3
+
+    def test_corrupted_image_raises_error(self, user):
+        """A source that cannot be decoded fails the whole pipeline."""
+        from media.processors.image import generate_image_derivatives
+
+        uploaded = SimpleUploadedFile(
+            name="corrupted.jpg",
+            content=b"not a valid image",
+            content_type="image/jpeg",
+        )
+        media_file = MediaFile.create_from_upload(
+            file=uploaded,
+            uploader=user,
+            media_type="image",
+            mime_type="image/jpeg",
+        )
+
+        with pytest.raises(ImageProcessingError):
+            generate_image_derivatives(media_file)
+
+        assert not MediaAsset.objects.filter(media_file=media_file).exists()
+
+
 # =============================================================================
 # Tests for Video Processor
 # =============================================================================
@@ -777,6 +911,180 @@ class TestGenerateDocumentThumbnail:
             pass
 
 
+@pytest.mark.django_db
+class TestGenerateDocumentDerivatives:
+    """Tests for generate_document_derivatives.
+
+    Why it matters: thumbnail and text run as separate pool jobs; one
+    failing must not lose the other, and Office files convert only once.
+    """
+
+    def test_failed_job_does_not_block_other(self, user, sample_pdf_uploaded):
+        """A failed text job is recorded while the thumbnail is still stored."""
+        from media.processors.document import (
+            DocumentProcessingError,
+            _RenderedPage,
+            generate_document_derivatives,
+        )
+
+        media_file = MediaFile.create_from_upload(
+            file=sample_pdf_uploaded,
+            uploader=user,
+            media_type="document",
+            mime_type="application/pdf",
+        )
+        page = io.BytesIO()
+        Image.new("RGB", (150, 200), color="white").save(page, format="WEBP")
+
+        with (
+            patch(
+                "media.processors.document.render_pdf_thumbnail",
+                return_value=_RenderedPage(150, 200, page.getvalue()),
+            ),
+            patch(
+                "media.processors.document.extract_pdf_text",
+                side_effect=DocumentProcessingError("Encrypted PDF"),
+            ),
+        ):
+            result = generate_document_derivatives(media_file)
+
+        assert result.assets["thumbnail"].asset_type == MediaAsset.AssetType.THUMBNAIL
+        assert result.assets["thumbnail"].dimensions == "150x200"
+        assert result.errors == {"text": "Encrypted PDF"}
+
+    def test_office_document_converted_once(self, user, tmp_path):
+        """Both jobs read the same converted PDF."""
+        from media.processors.document import generate_document_derivatives
+
+        uploaded = SimpleUploadedFile(
+            name="report.docx",
+            content=b"PK fake docx",
+            content_type=(
+                "application/vnd.openxmlformats-officedocument"
+                ".wordprocessingml.document"
+            ),
+        )
+        media_file = MediaFile.create_from_upload(
+            file=uploaded,
+            uploader=user,
+            media_type="document",
+            mime_type=uploaded.content_type,
+        )
+        converted = tmp_path / "out" / "report.pdf"
+        converted.parent.mkdir()
+        converted.write_bytes(b"%PDF-1.4")
+
+        with (
+            patch(
+                "media.processors.document.convert_to_pdf", return_value=converted
+            ) as mock_convert,
+            patch("media.processors.document.render_pdf_thumbnail") as mock_render,
+            patch(
+                "media.processors.document.extract_pdf_text", return_value=""
+            ) as mock_text,
+        ):
+            generate_document_derivatives(media_file)
+
+        assert mock_convert.call_count == 1
+        assert mock_render.call_args.args[1] == str(converted)
+        assert mock_text.call_args.args[1] == str(converted)
+        # The temporary PDF is removed afterwards
+        assert not converted.exists()
+
+
+def _pid_of_job() -> int:
+    """Pool job returning the PID of the process that ran it."""
+    import os
+
+    return os.getpid()
+
+
+class TestProcessingPool:
+    """Tests for media.processors.pool.
+
+    Why it matters: CPU-bound jobs must run in child processes when the pool
+    is enabled, and errors must reach the caller either way.
+    """
+
+    def test_inline_when_disabled(self, settings):
+        """With MEDIA_PROCESSING_WORKERS = 0 jobs run in the calling process."""
+        import os
+
+        from media.processors import pool
+
+        settings.MEDIA_PROCESSING_WORKERS = 0
+
+        assert pool.get_pool() is None
+        assert pool.submit(_pid_of_job).get() == os.getpid()
+
+    def test_inline_reraises_job_error(self, settings):
+        """get() re-raises the job's exception."""
+        from media.processors import pool
+
+        settings.MEDIA_PROCESSING_WORKERS = 0
+
+        result = pool.submit(int, "not a number")
+
+        with pytest.raises(ValueError):
+            result.get()
+
+    @pytest.mark.slow
+    def test_runs_jobs_in_child_process(self, settings, monkeypatch):
+        """With the pool enabled, jobs run in another process."""
+        import os
+
+        from media.processors import pool
+
+        settings.MEDIA_PROCESSING_WORKERS = 1
+        monkeypatch.setattr(pool, "_pool", None)
+
+        try:
+            assert pool.submit(_pid_of_job).get(timeout=30) != os.getpid()
+            with pytest.raises(ValueError):
+                pool.submit(int, "not a number").get(timeout=30)
+        finally:
+            pool.get_pool().terminate()
+
+    @pytest.mark.slow
+    def test_wait_times_out_and_replaces_pool(self, settings, monkeypatch):
+        """
+        A job still running at the deadline raises and its pool is replaced.
+
+        Why it matters: The task must record the failure before Celery's
+        hard time limit kills the worker, and a stuck child must not keep
+        its slot.
+        """
+        import time
+
+        from billiard.exceptions import TimeoutError as JobTimeoutError
+
+        from media.processors import pool
+
+        settings.MEDIA_PROCESSING_WORKERS = 1
+        monkeypatch.setattr(pool, "_pool", None)
+        stuck_pool = pool.get_pool()
+
+        try:
+            with pytest.raises(JobTimeoutError):
+                pool.wait(pool.submit(time.sleep, 30), time.monotonic() + 0.5)
+            assert pool._pool is None
+        finally:
+            stuck_pool.terminate()
+
+    def test_deadline_leaves_margin_before_task_time_limit(self, settings):
+        """Jobs are waited for until the task time limit minus the margin."""
+        import time
+
+        from media.processors import pool
+
+        settings.CELERY_TASK_TIME_LIMIT = 600
+
+        remaining = pool.get_deadline() - time.monotonic()
+
+        assert 600 - pool.JOB_TIMEOUT_MARGIN_SECONDS - 1 < remaining
+        assert remaining <= 600 - pool.JOB_TIMEOUT_MARGIN_SECONDS
+
+
 # =============================================================================
 # Tests for Exception Hierarchy
 # =============================================================================
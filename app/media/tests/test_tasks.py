@@ -200,23 +200,17 @@ class TestProcessMediaFileErrorHandling:
 
     def test_partial_failure_records_errors(self, media_file_pending):
         """Test that partial failures are recorded but file is marked READY."""
+        from media.processors import image as image_module
         from media.processors.base import PermanentProcessingError
 
-        # Patch at both the source module and the re-export location
-        with (
-            patch.object(
-                __import__(
-                    "media.processors.image", fromlist=["generate_image_thumbnail"]
-                ),
-                "generate_image_thumbnail",
-                side_effect=PermanentProcessingError("Corrupted image"),
-            ),
-            patch.object(
-                __import__("media.processors", fromlist=["generate_image_thumbnail"]),
-                "generate_image_thumbnail",
-                side_effect=PermanentProcessingError("Corrupted image"),
-            ),
-        ):
+        render_webp = image_module._render_webp
+
+        def fail_thumbnail(img, spec):
+            if spec.asset_type == MediaAsset.AssetType.THUMBNAIL:
+                raise PermanentProcessingError("Corrupted image")
+            return render_webp(img, spec)
+
+        with patch.object(image_module, "_render_webp", side_effect=fail_thumbnail):
             result = process_media_file.run(str(media_file_pending.id))
 
         media_file_pending.refresh_from_db()
@@ -229,77 +223,37 @@ class TestProcessMediaFileErrorHandling:
         assert result["status"] == "processed"
         # Should report errors
         assert result.get("errors") is not None
-
-    def test_metadata_failure_is_non_blocking(self, media_file_pending):
-        """Test that metadata extraction failure doesn't block asset generation."""
-        with (
-            patch.object(
-                __import__(
-                    "media.processors.image", fromlist=["extract_image_metadata"]
-                ),
-                "extract_image_metadata",
-                side_effect=Exception("Metadata extraction failed"),
-            ),
-            patch.object(
-                __import__("media.processors", fromlist=["extract_image_metadata"]),
-                "extract_image_metadata",
-                side_effect=Exception("Metadata extraction failed"),
-            ),
+        # The other derivatives were still generated
+        assert set(media_file_pending.assets.values_list("asset_type", flat=True)) == {
+            MediaAsset.AssetType.PREVIEW,
+            MediaAsset.AssetType.WEB_OPTIMIZED,
+        }
+
+    def test_decode_failure_is_non_blocking(self, media_file_pending):
+        """Test that an undecodable image is marked READY with the error recorded."""
+        from media.processors.image import ImageProcessingError
+
+        with patch(
+            "media.processors.generate_image_derivatives",
+            side_effect=ImageProcessingError("Cannot identify image format"),
         ):
             process_media_file.run(str(media_file_pending.id))
 
         media_file_pending.refresh_from_db()
-        # File should still be READY
+        # File should still be READY (original accessible)
         assert media_file_pending.processing_status == MediaFile.ProcessingStatus.READY
-        # Error recorded
-        assert media_file_pending.processing_error is not None
-        assert "metadata" in media_file_pending.processing_error.lower()
-        # Assets should still have been generated
-        assert media_file_pending.assets.count() >= 1
+        assert "image" in media_file_pending.processing_error.lower()
+        assert media_file_pending.assets.count() == 0
 
     def test_all_assets_fail_but_file_ready(self, media_file_pending):
         """Test that even if all assets fail, file is marked READY (original accessible)."""
+        from media.processors import image as image_module
         from media.processors.base import PermanentProcessingError
 
-        # Patch all image processors
-        processors_module = __import__(
-            "media.processors", fromlist=["generate_image_thumbnail"]
-        )
-        image_module = __import__(
-            "media.processors.image", fromlist=["generate_image_thumbnail"]
-        )
-
-        with (
-            patch.object(
-                image_module,
-                "generate_image_thumbnail",
-                side_effect=PermanentProcessingError("Thumbnail failed"),
-            ),
-            patch.object(
-                image_module,
-                "generate_image_preview",
-                side_effect=PermanentProcessingError("Preview failed"),
-            ),
-            patch.object(
-                image_module,
-                "generate_image_web_optimized",
-                side_effect=PermanentProcessingError("Web optimized failed"),
-            ),
-            patch.object(
-                processors_module,
-                "generate_image_thumbnail",
-                side_effect=PermanentProcessingError("Thumbnail failed"),
-            ),
-            patch.object(
-                processors_module,
-                "generate_image_preview",
-                side_effect=PermanentProcessingError("Preview failed"),
-            ),
-            patch.object(
-                processors_module,
-                "generate_image_web_optimized",
-                side_effect=PermanentProcessingError("Web optimized failed"),
-            ),
+        with patch.object(
+            image_module,
+            "_render_webp",
+            side_effect=PermanentProcessingError("Encoding failed"),
         ):
             process_media_file.run(str(media_file_pending.id))
 
@@ -307,9 +261,13 @@ class TestProcessMediaFileErrorHandling:
         # With graceful degradation, original file is always accessible
         assert media_file_pending.processing_status == MediaFile.ProcessingStatus.READY
         # All errors are recorded
-        assert media_file_pending.processing_error is not None
+        for asset_name in ("thumbnail", "preview", "web_optimized"):
+            assert asset_name in media_file_pending.processing_error
         # No assets created
         assert media_file_pending.assets.count() == 0
+        # Metadata comes from the same decode, so it is still stored
+        assert media_file_pending.metadata["width"] == 100
+        assert media_file_pending.metadata["format"] == "JPEG"
 
 
 @pytest.mark.django_db
@@ -3,6 +3,7 @@ Tests for media upload API views.
 
 These tests verify:
 - POST /api/v1/media/upload/ endpoint
+- PUT chunk upload request validation
 - Authentication requirements
 - File validation through the API
 - Response format and status codes
@@ -351,3 +352,51 @@ class TestMediaUploadViewResponse:
 
         for field in required_fields:
             assert field in response.data, f"Missing field: {field}"
+
+
+@pytest.mark.django_db
+class TestChunkedUploadPartView:
+    """Tests for the chunk upload endpoint."""
+
+    def test_malformed_content_length_returns_400(
+        self,
+        authenticated_client: "APIClient",
+        user: "User",
+        tmp_path,
+    ):
+        """
+        A non-numeric Content-Length is a bad request, not a server error.
+
+        Why it matters: the header is client-controlled.
+        """
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from media.models import UploadSession
+
+        session = UploadSession.objects.create(
+            uploader=user,
+            filename="video.mp4",
+            file_size=1024,
+            mime_type="video/mp4",
+            media_type="video",
+            backend=UploadSession.Backend.LOCAL,
+            local_temp_dir=str(tmp_path),
+            chunk_size=1024,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        url = reverse(
+            "media:chunked-part-upload",
+            kwargs={"session_id": session.id, "part_number": 1},
+        )
+
+        response = authenticated_client.put(
+            url,
+            data=b"x" * 1024,
+            content_type="application/octet-stream",
+            CONTENT_LENGTH="abc",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "No chunk data provided"
@@ -763,7 +763,14 @@ class ChunkedUploadPartView(APIView):
         Upload raw binary chunk data.
 
     This endpoint receives chunks for local storage. For S3, clients
-    upload directly to the presigned URL.
+    upload directly to the presigned URL. The body is copied to the part
+    file in fixed-size blocks, so memory per request is one buffer rather
+    than the chunk size (a Content-Length header is required).
+
+    Every part except the last must be exactly the session's chunk_size
+    bytes, and the last part must hold the remainder of file_size. Parts of
+    any other size are rejected with 400; earlier versions accepted short
+    non-final parts.
 
     Authentication:
         Requires valid JWT token.
@@ -777,7 +784,9 @@ class ChunkedUploadPartView(APIView):
         summary="Upload chunk",
         description=(
             "Upload raw binary chunk data to the server. Only used for local storage backend. "
-            "For S3 backend, upload directly to the presigned URL from get_chunk_upload_target."
+            "For S3 backend, upload directly to the presigned URL from get_chunk_upload_target. "
+            "Every part except the last must be exactly the session's chunk_size bytes; "
+            "the last part holds the remainder of file_size."
         ),
         request={"application/octet-stream": {"type": "string", "format": "binary"}},
         responses={
@@ -785,7 +794,10 @@ class ChunkedUploadPartView(APIView):
                 response=PartCompletionResultSerializer,
                 description="Chunk uploaded with updated progress",
             ),
-            400: OpenApiResponse(description="Empty chunk data or invalid chunk size"),
+            400: OpenApiResponse(
+                description="Empty chunk data, or part size other than chunk_size "
+                "(remainder of file_size for the last part)"
+            ),
             404: OpenApiResponse(description="Session not found or not owned by user"),
             409: OpenApiResponse(description="Session not in IN_PROGRESS status"),
         },
@@ -801,17 +813,19 @@ class ChunkedUploadPartView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Read raw binary body
-        chunk_data = request.body
-
-        if not chunk_data:
+        # The raw binary body is streamed, never read into memory at once
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+        if not content_length:
             return Response(
                 {"error": "No chunk data provided"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
         service = get_chunked_upload_service()
-        result = service.receive_chunk(session, part_number, chunk_data)
+        result = service.receive_chunk_stream(session, part_number, request.stream)
 
         if not result.success:
             if "status" in result.error.lower():
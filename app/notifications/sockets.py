@@ -0,0 +1,127 @@
+"""
+WebSocket delivery targets for notifications.
+
+broadcast_websocket_notification pushes to a per-user channel layer group.
+Socket consumers that carry notifications (chat.consumers.UserConsumer) join
+that group and register their channel here, so the task can skip users
+without an open socket and record how many sockets it targeted.
+
+Tracked Data:
+    notifications:sockets:{user_id}: sorted set of channel names scored by
+        the time they joined (epoch seconds)
+
+Design Decisions:
+    - Channels of crashed workers are never unregistered; entries older than
+      SOCKET_EXPIRY_SECONDS (the channel layer's default group expiry) are
+      ignored and pruned, matching when the layer drops them from the group
+    - Redis errors are logged and reported as an unknown count, so an outage
+      never turns into skipped deliveries
+
+Usage:
+    from notifications.sockets import NotificationSockets
+
+    group = NotificationSockets.group_name(user.id)
+    NotificationSockets.register(user.id, channel_name)
+    NotificationSockets.unregister(user.id, channel_name)
+    sockets = NotificationSockets.count(user.id)  # None if unknown
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Final
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationSockets:
+    """
+    Per-user notification group name and open socket registry.
+
+    All methods are classmethods; the registry is shared by every process of
+    a deployment.
+    """
+
+    # Channel layer group carrying a user's notification pushes
+    GROUP_NAME: Final[str] = "notifications_{user_id}"
+
+    # Redis sorted set of a user's registered channel names
+    KEY_PREFIX: Final[str] = "notifications:sockets"
+
+    # channels_redis default group_expiry: the layer forgets members after this
+    SOCKET_EXPIRY_SECONDS: Final[int] = 86400
+
+    @staticmethod
+    def _get_redis_client():
+        """Get raw Redis client from django-redis."""
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    @classmethod
+    def group_name(cls, user_id: UUID | str) -> str:
+        """Build the channel layer group name for a user's notifications."""
+        return cls.GROUP_NAME.format(user_id=user_id)
+
+    @classmethod
+    def _key(cls, user_id: UUID | str) -> str:
+        """Build the registry key for a user."""
+        return f"{cls.KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def register(cls, user_id: UUID | str, channel_name: str) -> None:
+        """
+        Record an open socket that joined the user's notification group.
+
+        Args:
+            user_id: ID of the connected user
+            channel_name: Channel layer name of the socket
+        """
+        key = cls._key(user_id)
+        try:
+            pipe = cls._get_redis_client().pipeline()
+            pipe.zadd(key, {channel_name: time.time()})
+            pipe.expire(key, cls.SOCKET_EXPIRY_SECONDS)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Registering notification socket failed: {e}")
+
+    @classmethod
+    def unregister(cls, user_id: UUID | str, channel_name: str) -> None:
+        """
+        Forget a socket that left the user's notification group.
+
+        Args:
+            user_id: ID of the disconnected user
+            channel_name: Channel layer name of the socket
+        """
+        try:
+            cls._get_redis_client().zrem(cls._key(user_id), channel_name)
+        except RedisError as e:
+            logger.warning(f"Unregistering notification socket failed: {e}")
+
+    @classmethod
+    def count(cls, user_id: UUID | str) -> int | None:
+        """
+        Count the user's open sockets, pruning expired registrations.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            Number of registered sockets, or None if Redis is unavailable
+        """
+        key = cls._key(user_id)
+        try:
+            pipe = cls._get_redis_client().pipeline()
+            pipe.zremrangebyscore(key, "-inf", time.time() - cls.SOCKET_EXPIRY_SECONDS)
+            pipe.zcard(key)
+            _, sockets = pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Counting notification sockets failed: {e}")
+            return None
+        return sockets
@@ -27,7 +27,9 @@ from __future__ import annotations
 
 import logging
 
+from asgiref.sync import async_to_sync
 from celery import shared_task
+from channels.layers import get_channel_layer
 from django.utils import timezone as django_timezone
 
 from notifications.models import (
@@ -35,6 +37,8 @@ from notifications.models import (
     NotificationDelivery,
     SkipReason,
 )
+from notifications.serializers import NotificationSerializer
+from notifications.sockets import NotificationSockets
 
 logger = logging.getLogger(__name__)
 
@@ -338,8 +342,8 @@ def broadcast_websocket_notification(self, delivery_id: str) -> bool:
     Flow:
         1. Fetch delivery + notification
         2. Skip if status != PENDING
-        3. Check user presence (optional - from chat app)
-        4. Broadcast to user's channel group
+        3. Skip if the user has no open notification socket
+        4. Broadcast to the user's notification group (chat UserConsumer)
         5. Mark as DELIVERED (immediate confirmation for WebSocket)
 
     Args:
@@ -364,20 +368,9 @@ def broadcast_websocket_notification(self, delivery_id: str) -> bool:
     )
 
     try:
-        # TODO: Implement actual Channels integration
-        # Steps:
-        # 1. Check if user has active connections (PresenceService from chat)
-        # 2. If no connections, mark as SKIPPED with NO_CONNECTIONS reason
-        # 3. Serialize notification for WebSocket payload
-        # 4. Get recipient's channel group name (e.g., f"user_{recipient.id}_notifications")
-        # 5. Broadcast to user's notification channel
-        # 6. Track devices targeted vs reached
-
-        # Stub: Simulate successful broadcast
-        # In reality, check presence first
-        has_connections = True  # Stub: assume user is connected
-
-        if not has_connections:
+        # None means the registry is unavailable: broadcast anyway
+        sockets = NotificationSockets.count(recipient.id)
+        if sockets == 0:
             _mark_skipped(delivery, SkipReason.NO_CONNECTIONS)
             logger.info(
                 f"WebSocket notification skipped for delivery {delivery_id}: "
@@ -385,13 +378,26 @@ def broadcast_websocket_notification(self, delivery_id: str) -> bool:
             )
             return True
 
+        # Push to the recipient's notification group, joined by their
+        # multiplexed chat socket (chat.consumers.UserConsumer)
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            NotificationSockets.group_name(recipient.id),
+            {
+                "type": "notification.message",
+                "notification": NotificationSerializer(notification).data,
+            },
+        )
+
         # For WebSocket, we mark as DELIVERED immediately since it's synchronous
         delivery.status = DeliveryStatus.DELIVERED
         delivery.sent_at = django_timezone.now()
         delivery.delivered_at = django_timezone.now()
         delivery.attempt_count += 1
-        delivery.websocket_devices_targeted = 1  # Stub value
-        delivery.websocket_devices_reached = 1  # Stub value
+        # The channel layer does not acknowledge group sends, so every
+        # registered socket counts as reached
+        delivery.websocket_devices_targeted = sockets or 0
+        delivery.websocket_devices_reached = sockets or 0
         delivery.save(
             update_fields=[
                 "status",
@@ -32,6 +32,7 @@ from notifications.models import (
     UserNotificationPreference,
 )
 from notifications.services import NotificationService
+from notifications.sockets import NotificationSockets
 from notifications.tasks import (
     broadcast_websocket_notification,
     send_email_notification,
@@ -352,6 +353,7 @@ class TestTaskIntegration:
         self, user, notification_type_all_channels, mock_notification_tasks
     ):
         """WebSocket task marks as DELIVERED immediately."""
+        NotificationSockets.register(user.id, "specific.test!socket")
         result = NotificationService.create_notification(
             recipient=user,
             type_key="all_channels",
@@ -367,6 +369,27 @@ class TestTaskIntegration:
         assert delivery.status == DeliveryStatus.DELIVERED
         assert delivery.sent_at is not None
         assert delivery.delivered_at is not None
+        assert delivery.websocket_devices_targeted == 1
+
+    def test_websocket_task_skips_without_sockets(
+        self, user, notification_type_all_channels, mock_notification_tasks
+    ):
+        """WebSocket task skips users with no open notification socket."""
+        NotificationSockets.register(user.id, "specific.test!socket")
+        NotificationSockets.unregister(user.id, "specific.test!socket")
+        result = NotificationService.create_notification(
+            recipient=user,
+            type_key="all_channels",
+        )
+
+        notification = result.data
+        delivery = notification.deliveries.get(channel=DeliveryChannel.WEBSOCKET)
+
+        broadcast_websocket_notification(str(delivery.id))
+
+        delivery.refresh_from_db()
+        assert delivery.status == DeliveryStatus.SKIPPED
+        assert delivery.skipped_reason == SkipReason.NO_CONNECTIONS
 
     def test_task_skips_non_pending_delivery(
         self, user, notification_type_push_only, mock_notification_tasks